@@ -4,24 +4,70 @@ This library provides clients and associated models for communicating with Azure
 from an IoT device.
 """
 
-from .iothub import *
-from .provisioning import *
-from .common import *
-from . import iothub
-from . import provisioning
-from . import common
-from . import patch
+import importlib
 import sys
 
-if sys.version_info > (3, 5):  # This only works for python 3.5+ at present
-    # Dynamically patch the clients to add shim implementations for all the inherited methods.
-    # This is necessary to generate accurate online docs.
-    # It SHOULD not impact the functionality of the methods themselves in any way.
-    patch.add_shims_for_inherited_methods(IoTHubDeviceClient)  # noqa: F405
-    patch.add_shims_for_inherited_methods(IoTHubModuleClient)  # noqa: F405
-    patch.add_shims_for_inherited_methods(ProvisioningDeviceClient)  # noqa: F405
+# Public names, and the subpackage each is imported from. The subpackages, and through them the
+# clients, transports and their dependencies, are only imported once first used.
+_lazy_names = {
+    "IoTHubDeviceClient": ".iothub",
+    "IoTHubModuleClient": ".iothub",
+    "Message": ".iothub",
+    "MethodRequest": ".iothub",
+    "MethodResponse": ".iothub",
+    "ProvisioningDeviceClient": ".provisioning",
+    "RegistrationResult": ".provisioning",
+    "X509": ".common",
+}
 
+__all__ = [
+    "IoTHubDeviceClient",
+    "IoTHubModuleClient",
+    "Message",
+    "MethodRequest",
+    "MethodResponse",
+    "ProvisioningDeviceClient",
+    "RegistrationResult",
+]
 
-# iothub and common subpackages are still showing up in intellisense
 
-__all__ = iothub.__all__ + provisioning.__all__
+def _import_submodule(package, name):
+    """Import a submodule of a package for its module __getattr__, so that submodules such as
+    azure.iot.device.exceptions can be used as attributes, as they were when the package imported
+    everything up front.
+    """
+    try:
+        return importlib.import_module("." + name, package)
+    except ImportError as e:
+        if getattr(e, "name", None) != package + "." + name:
+            # The submodule exists, but failed to import
+            raise
+    raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name in _lazy_names:
+            value = getattr(importlib.import_module(_lazy_names[name], __name__), name)
+        else:
+            value = _import_submodule(__name__, name)
+        # Cache the value, so this is only called once per name
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        import pkgutil
+
+        submodules = set(module.name for module in pkgutil.iter_modules(__path__))
+        return sorted(set(globals()) | set(_lazy_names) | submodules)
+
+else:
+    # Module __getattr__ (PEP 562) is not supported, so everything is imported up front
+    from .iothub import *
+    from .provisioning import *
+    from .common import *
+    from . import iothub
+    from . import provisioning
+    from . import common
+    from . import patch
@@ -0,0 +1,16 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains the coroutine variant of the shims added by azure.iot.device.patch"""
+
+
+def make_async_shim(target_class, method_name):
+    """Create a pass-through coroutine function awaiting the parent class implementation of a
+    method"""
+
+    async def shim(self_or_cls, *args, **kwargs):
+        return await getattr(super(target_class, self_or_cls), method_name)(*args, **kwargs)
+
+    return shim
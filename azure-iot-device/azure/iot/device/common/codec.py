@@ -0,0 +1,162 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains the codecs used to encode and decode payloads in the pipelines.
+
+All JSON sent or received by the pipelines (method requests and responses, twins and twin
+patches, blob upload requests and provisioning requests and responses) goes through the
+json_codec of the pipeline configuration, which is a JSONCodec unless another is given.
+A codec is any object with encode and decode methods and a content_type attribute, so an
+accelerated JSON library can be plugged in either by passing its functions to JSONCodec or
+by subclassing it.
+
+CBORCodec and MessagePackCodec can be used as the payload_codec of an IoTHub pipeline to
+encode and decode the data of messages. They require the optional cbor2 and msgpack packages.
+"""
+
+import collections
+import json
+import numbers
+import six
+
+__all__ = ["JSONCodec", "CBORCodec", "MessagePackCodec", "default_json_codec"]
+
+
+class JSONCodec(object):
+    """Encodes objects as JSON text and decodes them from it.
+
+    :param dumps: The function used to encode, taking the object to encode, such as
+        orjson.dumps. It may return either text or UTF-8 encoded bytes. It is not passed the
+        keyword arguments of json.dumps: the codec applies default functions and sorts keys
+        itself before calling it. Defaults to json.dumps.
+    :param loads: The function used to decode, with the signature of json.loads. Defaults to
+        json.loads.
+    """
+
+    content_type = "application/json"
+
+    def __init__(self, dumps=None, loads=None):
+        self._custom_dumps = dumps is not None
+        self._dumps = dumps or json.dumps
+        self._loads = loads or json.loads
+
+    def encode(self, obj, default=None, sort_keys=False):
+        """Encode an object as JSON.
+
+        :param obj: The object to encode.
+        :param default: A function returning an encodable version of objects which otherwise
+            cannot be encoded.
+        :param bool sort_keys: Whether the keys of dictionaries are sorted.
+        :returns: The JSON text.
+        :rtype: str
+        """
+        if self._custom_dumps:
+            if default is not None or sort_keys:
+                obj = _prepare(obj, default, sort_keys)
+            encoded = self._dumps(obj)
+        else:
+            kwargs = {}
+            if default is not None:
+                kwargs["default"] = default
+            if sort_keys:
+                kwargs["sort_keys"] = True
+            encoded = self._dumps(obj, **kwargs)
+        if six.PY3 and isinstance(encoded, bytes):
+            encoded = encoded.decode("utf-8")
+        return encoded
+
+    def decode(self, data):
+        """Decode an object from JSON.
+
+        :param data: The JSON text, or the UTF-8 encoded JSON text.
+        :type data: str or bytes
+        :returns: The decoded object.
+        """
+        if isinstance(data, (bytes, bytearray)):
+            data = bytes(data).decode("utf-8")
+        return self._loads(data)
+
+
+def _prepare(obj, default, sort_keys):
+    """Return an object with default applied to anything JSON cannot encode, and the keys of
+    dictionaries in order if sort_keys is set, for a dumps function without those options"""
+    if isinstance(obj, dict):
+        items = ((key, _prepare(value, default, sort_keys)) for key, value in obj.items())
+        if sort_keys:
+            return collections.OrderedDict(sorted(items))
+        return dict(items)
+    elif isinstance(obj, (list, tuple)):
+        return [_prepare(item, default, sort_keys) for item in obj]
+    elif (
+        obj is None
+        or isinstance(obj, (bool, numbers.Number))
+        or isinstance(obj, six.string_types)
+        or default is None
+    ):
+        return obj
+    else:
+        return _prepare(default(obj), default, sort_keys)
+
+
+class CBORCodec(object):
+    """Encodes objects as CBOR (RFC 7049) and decodes them from it. Requires the cbor2 package."""
+
+    content_type = "application/cbor"
+
+    def __init__(self):
+        try:
+            import cbor2
+        except ImportError:
+            raise ImportError("CBORCodec requires the cbor2 package")
+        self._cbor2 = cbor2
+
+    def encode(self, obj):
+        """Encode an object as CBOR.
+
+        :param obj: The object to encode.
+        :rtype: bytes
+        """
+        return self._cbor2.dumps(obj)
+
+    def decode(self, data):
+        """Decode an object from CBOR.
+
+        :param bytes data: The encoded object.
+        :returns: The decoded object.
+        """
+        return self._cbor2.loads(bytes(data))
+
+
+class MessagePackCodec(object):
+    """Encodes objects as MessagePack and decodes them from it. Requires the msgpack package."""
+
+    content_type = "application/x-msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ImportError:
+            raise ImportError("MessagePackCodec requires the msgpack package")
+        self._msgpack = msgpack
+
+    def encode(self, obj):
+        """Encode an object as MessagePack.
+
+        :param obj: The object to encode.
+        :rtype: bytes
+        """
+        return self._msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data):
+        """Decode an object from MessagePack.
+
+        :param bytes data: The encoded object.
+        :returns: The decoded object.
+        """
+        return self._msgpack.unpackb(bytes(data), raw=False)
+
+
+# Codec used when a pipeline configuration is not given one
+default_json_codec = JSONCodec()
@@ -0,0 +1,61 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import logging
+import six
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class FutureCallback(object):
+    """
+    A sync callback which completes a concurrent.futures.Future, rather than being waited upon.
+    """
+
+    def __init__(self, return_arg_name=None, convert_error=None):
+        """
+        Creates an instance of a FutureCallback.
+
+        :param str return_arg_name: The name of the callback argument holding the result of the
+            Future. If not provided, the result of the Future is None.
+        :param convert_error: A function which converts an error the callback is called with to
+            the exception the Future is completed with. If not provided, the Future is completed
+            with the error itself.
+        """
+        # LBYL because this mistake doesn't cause an exception until the callback
+        # which is much later and very difficult to trace back to here.
+        if return_arg_name and not isinstance(return_arg_name, six.string_types):
+            raise TypeError("internal error: return_arg_name must be a string")
+
+        self.return_arg_name = return_arg_name
+        self.convert_error = convert_error
+        self.future = Future()
+        # The operation is already running, and cannot be cancelled through the Future
+        self.future.set_running_or_notify_cancel()
+
+    def __call__(self, *args, **kwargs):
+        """
+        Calls the callback, completing the Future.
+        """
+        error = kwargs.get("error")
+        if error:
+            logger.error("Callback completed with error {}".format(error), exc_info=error)
+            if self.convert_error:
+                error = self.convert_error(error)
+            self.future.set_exception(error)
+        elif self.return_arg_name:
+            if self.return_arg_name in kwargs:
+                self.future.set_result(kwargs[self.return_arg_name])
+            else:
+                error = TypeError(
+                    "internal error: excepected argument with name '{}', did not get".format(
+                        self.return_arg_name
+                    )
+                )
+                self.future.set_exception(error)
+                raise error
+        else:
+            self.future.set_result(None)
@@ -0,0 +1,363 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains the metrics kept by the pipelines and clients.
+
+Each pipeline has a MetricsRegistry, available from a client as its metrics attribute, and
+every registry is also part of the process-wide process_metrics. Metrics are counters,
+gauges and histograms with fixed buckets:
+
+    op_latency_seconds{op}              Histogram of the time from an operation being run on
+                                        the pipeline to its completion
+    op_errors_total{op}                 Count of operations completed with an error
+    event_delivery_seconds{event}       Histogram of the time from an event reaching the top of
+                                        the pipeline to the client's handler returning, such
+                                        as a message being put in its inbox
+    publish_latency_seconds             Histogram of the time from an MQTT publish to its PUBACK
+    mqtt_pending_acks                   Gauge of MQTT publishes, subscribes and unsubscribes
+                                        waiting for their acknowledgement
+    connection_lock_queue_depth         Gauge of operations waiting for a connect, disconnect or
+                                        reauthorize to complete
+    connection_lock_wait_seconds        Histogram of the time operations waited for one
+    retry_waiting_ops                   Gauge of operations waiting to be retried
+    retries_total{op}                   Count of operations retried
+    pending_responses                   Gauge of requests, such as twin gets, waiting for their
+                                        response
+    inbox_depth{inbox}                  Gauge of received messages, method requests and twin
+                                        patches waiting in the client's inboxes
+
+Counters and histograms are updated without locking, from the pipeline thread, or for
+event_delivery_seconds from the callback threads, so an observation made on several callback
+threads at once may rarely be lost. Gauges are computed when they are collected, so they cost
+nothing until then.
+
+PrometheusCollector exports the metrics to the optional prometheus_client package.
+"""
+
+import bisect
+import collections
+import threading
+import weakref
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "MetricsRegistry",
+    "ProcessMetrics",
+    "PrometheusCollector",
+    "process_metrics",
+]
+
+# Upper bounds, in seconds, of the buckets of latency histograms
+DEFAULT_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+MetricSample = collections.namedtuple(
+    "MetricSample", ["name", "kind", "description", "labels", "value"]
+)
+
+
+class Counter(object):
+    """A count which only increases, such as a number of errors."""
+
+    kind = "counter"
+
+    def __init__(self, name, description=""):
+        self.name = name
+        self.description = description
+        self.value = 0
+
+    def inc(self, amount=1):
+        """Increase the count.
+
+        :param amount: The amount to increase the count by. Defaults to 1.
+        """
+        self.value += amount
+
+
+class Gauge(object):
+    """A value which is computed when it is read, such as the depth of a queue."""
+
+    kind = "gauge"
+
+    def __init__(self, name, function, description=""):
+        self.name = name
+        self.description = description
+        self._function = function
+
+    @property
+    def value(self):
+        return self._function()
+
+
+class HistogramValue(
+    collections.namedtuple("HistogramValue", ["buckets", "counts", "sum", "count"])
+):
+    """The observations of a Histogram. counts[i] is the number of observations no greater than
+    buckets[i], and count is the number of all observations."""
+
+    __slots__ = ()
+
+
+class Histogram(object):
+    """Counts observations, such as latencies, in buckets with fixed upper bounds.
+
+    :param buckets: The upper bounds of the buckets, in increasing order. Observations greater
+        than the last bound are only counted in the total.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name, description="", buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        # The last count is of observations greater than every bound
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, value):
+        """Count an observation.
+
+        :param float value: The observed value.
+        """
+        self._counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sum += value
+
+    @property
+    def value(self):
+        counts = []
+        total = 0
+        for count in self._counts:
+            total += count
+            counts.append(total)
+        return HistogramValue(
+            buckets=self.buckets, counts=tuple(counts[:-1]), sum=self._sum, count=total
+        )
+
+
+class MetricsRegistry(object):
+    """The metrics of a pipeline and its client.
+
+    Metrics are identified by their name and labels. Asking for a metric which already exists
+    returns it, rather than creating another.
+
+    :ivar dict labels: Labels added to every metric of the registry when collected, such as the
+        identity of the client.
+    """
+
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        self._metrics = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def counter(self, name, description="", labels=None):
+        """Return the counter with a name and labels, creating it if it does not exist.
+
+        :param str name: The name of the counter.
+        :param str description: What the counter counts.
+        :param dict labels: The labels of the counter.
+        :rtype: Counter
+        """
+        return self._get_or_create(Counter, name, labels, description)
+
+    def gauge(self, name, function, description="", labels=None):
+        """Add a gauge, replacing any gauge with the same name and labels.
+
+        :param str name: The name of the gauge.
+        :param function: A function with no arguments which returns the value of the gauge.
+        :param str description: What the gauge measures.
+        :param dict labels: The labels of the gauge.
+        :rtype: Gauge
+        """
+        gauge = Gauge(name, function, description)
+        with self._lock:
+            self._metrics[_key(name, labels)] = (gauge, dict(labels or {}))
+        return gauge
+
+    def histogram(self, name, description="", labels=None, buckets=DEFAULT_LATENCY_BUCKETS):
+        """Return the histogram with a name and labels, creating it if it does not exist.
+
+        :param str name: The name of the histogram.
+        :param str description: What the histogram measures.
+        :param dict labels: The labels of the histogram.
+        :param buckets: The upper bounds of the buckets of a new histogram, in increasing
+            order. Defaults to DEFAULT_LATENCY_BUCKETS, in seconds.
+        :rtype: Histogram
+        """
+        return self._get_or_create(Histogram, name, labels, description, buckets)
+
+    def collect(self):
+        """Return the current value of every metric.
+
+        :returns: A list of MetricSample, with the labels of the registry added to the labels
+            of each metric.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        samples = []
+        for metric, labels in metrics:
+            all_labels = dict(self.labels)
+            all_labels.update(labels)
+            samples.append(
+                MetricSample(
+                    name=metric.name,
+                    kind=metric.kind,
+                    description=metric.description,
+                    labels=all_labels,
+                    value=metric.value,
+                )
+            )
+        return samples
+
+    def snapshot(self):
+        """Return the current value of every metric, keyed by its name and labels.
+
+        :returns: A dict mapping names such as 'op_errors_total{op="GetTwinOperation"}' to the
+            values of counters and gauges, and to the HistogramValue of histograms. The labels
+            of the registry are not included.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return collections.OrderedDict(
+            (_format_name(metric.name, labels), metric.value) for metric, labels in metrics
+        )
+
+    def _get_or_create(self, metric_type, name, labels, *args):
+        key = _key(name, labels)
+        with self._lock:
+            try:
+                return self._metrics[key][0]
+            except KeyError:
+                metric = metric_type(name, *args)
+                self._metrics[key] = (metric, dict(labels or {}))
+                return metric
+
+
+class ProcessMetrics(object):
+    """The metrics of every pipeline in the process.
+
+    Registries are held weakly, so the metrics of a client are dropped once it is garbage
+    collected.
+    """
+
+    def __init__(self):
+        self._registries = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def add(self, registry):
+        """Add the metrics of a pipeline.
+
+        :param registry: The metrics of the pipeline.
+        :type registry: MetricsRegistry
+        """
+        with self._lock:
+            self._registries.add(registry)
+
+    def registries(self):
+        """Return the metrics of every pipeline.
+
+        :returns: A list of MetricsRegistry.
+        """
+        with self._lock:
+            return list(self._registries)
+
+    def collect(self):
+        """Return the current value of every metric of every pipeline.
+
+        :returns: A list of MetricSample.
+        """
+        samples = []
+        for registry in self.registries():
+            samples.extend(registry.collect())
+        return samples
+
+
+process_metrics = ProcessMetrics()
+
+
+class PrometheusCollector(object):
+    """Exports metrics to the prometheus_client package, which it requires.
+
+    Register it with a prometheus_client registry, e.g.
+    prometheus_client.REGISTRY.register(PrometheusCollector()).
+
+    :param source: The metrics to export: a MetricsRegistry, or a ProcessMetrics. Defaults to
+        process_metrics.
+    :param str prefix: Prefix added to the names of the metrics.
+    """
+
+    def __init__(self, source=None, prefix="azure_iot_device_"):
+        try:
+            from prometheus_client import core
+        except ImportError:
+            raise ImportError("PrometheusCollector requires the prometheus_client package")
+        self._core = core
+        self._source = source if source is not None else process_metrics
+        self._prefix = prefix
+
+    def collect(self):
+        """Yield the metrics as prometheus_client metric families"""
+        families = collections.OrderedDict()
+        for sample in self._source.collect():
+            label_names = sorted(sample.labels)
+            family = families.get(sample.name)
+            if family is None:
+                family = families[sample.name] = self._create_family(sample, label_names)
+            label_values = [str(sample.labels[name]) for name in label_names]
+            if sample.kind == "histogram":
+                buckets = [
+                    (_format_bound(bound), count)
+                    for bound, count in zip(sample.value.buckets, sample.value.counts)
+                ]
+                buckets.append(("+Inf", sample.value.count))
+                family.add_metric(label_values, buckets, sample.value.sum)
+            else:
+                family.add_metric(label_values, sample.value)
+        return iter(families.values())
+
+    def _create_family(self, sample, label_names):
+        family_types = {
+            "counter": self._core.CounterMetricFamily,
+            "gauge": self._core.GaugeMetricFamily,
+            "histogram": self._core.HistogramMetricFamily,
+        }
+        return family_types[sample.kind](
+            self._prefix + sample.name, sample.description, labels=label_names
+        )
+
+
+def _key(name, labels):
+    if not labels:
+        return (name,)
+    return (name,) + tuple(sorted(labels.items()))
+
+
+def _format_name(name, labels):
+    if not labels:
+        return name
+    return "{}{{{}}}".format(
+        name, ",".join('{}="{}"'.format(key, value) for key, value in sorted(labels.items()))
+    )
+
+
+def _format_bound(bound):
+    return repr(float(bound))
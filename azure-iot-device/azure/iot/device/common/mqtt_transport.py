@@ -13,8 +13,13 @@ import traceback
 import weakref
 import socket
 from . import transport_exceptions as exceptions
+from . import tracing
 
 logger = logging.getLogger(__name__)
+_publish_trace = tracing.get_tracer(logger, "mqtt.publish", logging.INFO)
+_puback_trace = tracing.get_tracer(logger, "mqtt.puback", logging.INFO)
+_message_trace = tracing.get_tracer(logger, "mqtt.message", logging.INFO)
+_operation_trace = tracing.get_tracer(logger, "mqtt.operation")
 
 # Mapping of Paho CONNACK rc codes to Error object classes
 # Used for connection callbacks
@@ -221,14 +226,16 @@ class MQTTTransport(object):
 
         def on_publish(client, userdata, mid):
             this = self_weakref()
-            logger.info("payload published for {}".format(mid))
+            if __debug__ and _puback_trace.enabled:
+                _puback_trace("payload published for %s", mid)
             # publish failures are returned from the publish() call.  This is just
             # a notification that a PUBACK was received, so there is no failure case here
             this._op_manager.complete_operation(mid)
 
         def on_message(client, userdata, mqtt_message):
             this = self_weakref()
-            logger.info("message received on {}".format(mqtt_message.topic))
+            if __debug__ and _message_trace.enabled:
+                _message_trace("message received on %s", mqtt_message.topic)
 
             if this.on_mqtt_message_received_handler:
                 try:
@@ -480,7 +487,8 @@ class MQTTTransport(object):
         :raises: ConnectionDroppedError if connection is dropped during execution.
         :raises: ProtocolClientError if there is some other client error.
         """
-        logger.info("publishing on {}".format(topic))
+        if __debug__ and _publish_trace.enabled:
+            _publish_trace("publishing on %s", topic)
         try:
             (rc, mid) = self._mqtt_client.publish(topic=topic, payload=payload, qos=qos)
         except ValueError:
@@ -491,12 +499,20 @@ class MQTTTransport(object):
             raise exceptions.ProtocolClientError(
                 message="Unexpected Paho failure during publish", cause=e
             )
-        logger.debug("_mqtt_client.publish returned rc={}".format(rc))
+        if __debug__ and _operation_trace.enabled:
+            _operation_trace("_mqtt_client.publish returned rc=%s", rc)
         if rc:
             # This could result in ConnectionDroppedError or ProtocolClientError
             raise _create_error_from_rc_code(rc)
         self._op_manager.establish_operation(mid, callback)
 
+    def pending_operation_count(self):
+        """
+        Return the number of publishes, subscribes and unsubscribes waiting for their
+        acknowledgement.
+        """
+        return self._op_manager.pending_operation_count()
+
 
 class OperationManager(object):
     """Tracks pending operations and thier associated callbacks until completion.
@@ -536,14 +552,16 @@ class OperationManager(object):
             else:
                 # Store the operation as pending, along with callback
                 self._pending_operation_callbacks[mid] = callback
-                logger.debug("Waiting for response on MID: {}".format(mid))
+                if __debug__ and _operation_trace.enabled:
+                    _operation_trace("Waiting for response on MID: %s", mid)
 
         # Now that the lock has been released, if the callback should be triggered,
         # go ahead and trigger it now.
         if trigger_callback:
-            logger.debug(
-                "Response for MID: {} was received early - triggering callback".format(mid)
-            )
+            if __debug__ and _operation_trace.enabled:
+                _operation_trace(
+                    "Response for MID: %s was received early - triggering callback", mid
+                )
             if callback:
                 try:
                     callback()
@@ -553,6 +571,10 @@ class OperationManager(object):
             else:
                 logger.exception("No callback for MID: {}".format(mid))
 
+    def pending_operation_count(self):
+        """Return the number of operations waiting for their completion."""
+        return len(self._pending_operation_callbacks)
+
     def complete_operation(self, mid):
         """Complete an operation identified by MID and trigger the associated completion callback.
 
@@ -583,9 +605,10 @@ class OperationManager(object):
         # Now that the lock has been released, if the callback should be triggered,
         # go ahead and trigger it now.
         if trigger_callback:
-            logger.debug(
-                "Response received for recognized MID: {} - triggering callback".format(mid)
-            )
+            if __debug__ and _operation_trace.enabled:
+                _operation_trace(
+                    "Response received for recognized MID: %s - triggering callback", mid
+                )
             if callback:
                 try:
                     callback()
@@ -5,6 +5,7 @@
 # --------------------------------------------------------------------------
 
 import logging
+from azure.iot.device.common import codec
 
 logger = logging.getLogger(__name__)
 
@@ -15,9 +16,11 @@ class BasePipelineConfig(object):
     config files.
     """
 
-    def __init__(self, websockets=False):
+    def __init__(self, websockets=False, json_codec=None):
         """Initializer for BasePipelineConfig
 
         :param bool websockets: Enabling/disabling websockets in MQTT. This feature is relevant if a firewall blocks port 8883 from use.
+        :param json_codec: The codec used to encode and decode all JSON sent and received by the pipeline. Defaults to a JSONCodec using the json module.
         """
         self.websockets = websockets
+        self.json_codec = json_codec or codec.default_json_codec
@@ -22,6 +22,8 @@ class PipelineEvent(object):
     :type name: str
     """
 
+    __slots__ = ()
+
     def __init__(self):
         """
         Initializer for PipelineEvent objects.
@@ -30,7 +32,10 @@ class PipelineEvent(object):
             raise TypeError(
                 "Cannot instantiate PipelineEvent object.  You need to use a derived class"
             )
-        self.name = self.__class__.__name__
+
+    @property
+    def name(self):
+        return self.__class__.__name__
 
 
 class ResponseEvent(PipelineEvent):
@@ -57,6 +62,8 @@ class ResponseEvent(PipelineEvent):
     :type retry_after: int
     """
 
+    __slots__ = ("request_id", "status_code", "response_body", "retry_after")
+
     def __init__(self, request_id, status_code, response_body, retry_after=None):
         super(ResponseEvent, self).__init__()
         self.request_id = request_id
@@ -70,7 +77,7 @@ class ConnectedEvent(PipelineEvent):
     A PipelineEvent object indicating a connection has been established.
     """
 
-    pass
+    __slots__ = ()
 
 
 class DisconnectedEvent(PipelineEvent):
@@ -78,4 +85,4 @@ class DisconnectedEvent(PipelineEvent):
     A PipelineEvent object indicating a connection has been dropped.
     """
 
-    pass
+    __slots__ = ()
@@ -8,9 +8,11 @@ import logging
 import traceback
 from . import pipeline_exceptions
 from . import pipeline_thread
-from azure.iot.device.common import handle_exceptions
+from . import pipeline_trace
+from azure.iot.device.common import handle_exceptions, tracing
 
 logger = logging.getLogger(__name__)
+_op_trace = tracing.get_tracer(logger, "pipeline.op")
 
 
 class PipelineOperation(object):
@@ -38,6 +40,16 @@ class PipelineOperation(object):
     :type error: Error
     """
 
+    # Operations are allocated for every message, so they have no __dict__
+    __slots__ = (
+        "callback_stack",
+        "needs_connection",
+        "completed",
+        "completing",
+        "error",
+        "trace_id",
+    )
+
     def __init__(self, callback):
         """
         Initializer for PipelineOperation objects.
@@ -50,15 +62,19 @@ class PipelineOperation(object):
             raise TypeError(
                 "Cannot instantiate PipelineOperation object.  You need to use a derived class"
             )
-        self.name = self.__class__.__name__
         self.callback_stack = []
         self.needs_connection = False
         self.completed = False  # Operation has been fully completed
         self.completing = False  # Operation is in the process of completing
         self.error = None  # Error associated with Operation completion
+        self.trace_id = None  # Id of the Operation in pipeline_trace records
 
         self.add_callback(callback)
 
+    @property
+    def name(self):
+        return self.__class__.__name__
+
     def add_callback(self, callback):
         """Adds a callback to the Operation that will be triggered upon Operation completion.
 
@@ -106,7 +122,8 @@ class PipelineOperation(object):
         if error:
             logger.error("{}: completing with error {}".format(self.name, error))
         else:
-            logger.debug("{}: completing without error".format(self.name))
+            if __debug__ and _op_trace.enabled:
+                _op_trace("%s: completing without error", self.name)
 
         if self.completed or self.completing:
             logger.error("{}: has already been completed!".format(self.name))
@@ -121,6 +138,7 @@ class PipelineOperation(object):
             self.completing = True
             self.error = error
 
+            trace_buffer = pipeline_trace.buffer
             while self.callback_stack:
                 if not self.completing:
                     logger.debug("{}: Completion halted!".format(self.name))
@@ -142,6 +160,8 @@ class PipelineOperation(object):
                     break
 
                 callback = self.callback_stack.pop()
+                if trace_buffer is not None:
+                    called_at = trace_buffer.now()
                 try:
                     callback(op=self, error=error)
                 except Exception as e:
@@ -152,11 +172,15 @@ class PipelineOperation(object):
                     # This could happen in a foreground or background thread, so err on the side of caution
                     # and send it to the background handler.
                     handle_exceptions.handle_background_exception(e)
+                if trace_buffer is not None:
+                    trace_buffer.callback_span(self, callback, called_at)
 
             if self.completing:
                 # Operation is now completed, no longer in the process of completing
                 self.completing = False
                 self.completed = True
+                if trace_buffer is not None:
+                    trace_buffer.op_completed(self)
 
     @pipeline_thread.runs_on_pipeline_thread
     def halt_completion(self):
@@ -198,24 +222,30 @@ class PipelineOperation(object):
 
         :returns: A new worker operation of the type specified in the worker_op_type parameter.
         """
-        logger.debug("{}: creating worker op of type {}".format(self.name, worker_op_type.__name__))
-
-        @pipeline_thread.runs_on_pipeline_thread
-        def on_worker_op_complete(op, error):
-            logger.debug("{}: Worker op ({}) has been completed".format(self.name, op.name))
-            self.complete(error=error)
+        if __debug__ and _op_trace.enabled:
+            _op_trace("%s: creating worker op of type %s", self.name, worker_op_type.__name__)
 
         if "callback" in kwargs:
             provided_callback = kwargs["callback"]
-            kwargs["callback"] = on_worker_op_complete
+            kwargs["callback"] = self._on_worker_op_complete
             worker_op = worker_op_type(**kwargs)
             worker_op.add_callback(provided_callback)
         else:
-            kwargs["callback"] = on_worker_op_complete
+            kwargs["callback"] = self._on_worker_op_complete
             worker_op = worker_op_type(**kwargs)
 
+        trace_buffer = pipeline_trace.buffer
+        if trace_buffer is not None:
+            trace_buffer.op_started(worker_op, parent=self)
         return worker_op
 
+    @pipeline_thread.runs_on_pipeline_thread
+    def _on_worker_op_complete(self, op, error):
+        # A bound method rather than a closure, so spawning a worker op allocates less
+        if __debug__ and _op_trace.enabled:
+            _op_trace("%s: Worker op (%s) has been completed", self.name, op.name)
+        self.complete(error=error)
+
 
 class ConnectOperation(PipelineOperation):
     """
@@ -226,6 +256,8 @@ class ConnectOperation(PipelineOperation):
     Even though this is an base operation, it will most likely be handled by a more specific stage (such as an IoTHub or MQTT stage).
     """
 
+    __slots__ = ("retry_timer",)
+
     def __init__(self, callback):
         self.retry_timer = None
         super(ConnectOperation, self).__init__(callback)
@@ -243,7 +275,7 @@ class ReauthorizeConnectionOperation(PipelineOperation):
     Even though this is an base operation, it will most likely be handled by a more specific stage (such as an IoTHub or MQTT stage).
     """
 
-    pass
+    __slots__ = ()
 
 
 class DisconnectOperation(PipelineOperation):
@@ -255,7 +287,7 @@ class DisconnectOperation(PipelineOperation):
     Even though this is an base operation, it will most likely be handled by a more specific stage (such as an IoTHub or MQTT stage).
     """
 
-    pass
+    __slots__ = ()
 
 
 class EnableFeatureOperation(PipelineOperation):
@@ -272,6 +304,8 @@ class EnableFeatureOperation(PipelineOperation):
     Even though this is an base operation, it will most likely be handled by a more specific stage (such as an IoTHub or MQTT stage).
     """
 
+    __slots__ = ("feature_name",)
+
     def __init__(self, feature_name, callback):
         """
         Initializer for EnableFeatureOperation objects.
@@ -300,6 +334,8 @@ class DisableFeatureOperation(PipelineOperation):
     Even though this is an base operation, it will most likely be handled by a more specific stage (such as an IoTHub or MQTT stage).
     """
 
+    __slots__ = ("feature_name",)
+
     def __init__(self, feature_name, callback):
         """
         Initializer for DisableFeatureOperation objects.
@@ -325,6 +361,8 @@ class UpdateSasTokenOperation(PipelineOperation):
     (such as IoTHub or MQTT stages).
     """
 
+    __slots__ = ("sas_token",)
+
     def __init__(self, sas_token, callback):
         """
         Initializer for UpdateSasTokenOperation objects.
@@ -360,6 +398,17 @@ class RequestAndResponseOperation(PipelineOperation):
     Example is the id of the operation as returned by the initial provisioning request.
     """
 
+    __slots__ = (
+        "request_type",
+        "method",
+        "resource_location",
+        "request_body",
+        "status_code",
+        "response_body",
+        "query_params",
+        "retry_after",
+    )
+
     def __init__(
         self, request_type, method, resource_location, request_body, callback, query_params=None
     ):
@@ -387,6 +436,7 @@ class RequestAndResponseOperation(PipelineOperation):
         self.status_code = None
         self.response_body = None
         self.query_params = query_params
+        self.retry_after = None
 
 
 class RequestOperation(PipelineOperation):
@@ -398,6 +448,15 @@ class RequestOperation(PipelineOperation):
     (such as IoTHub or MQTT stages).
     """
 
+    __slots__ = (
+        "method",
+        "resource_location",
+        "request_type",
+        "request_body",
+        "request_id",
+        "query_params",
+    )
+
     def __init__(
         self,
         request_type,
@@ -13,6 +13,8 @@ class SetHTTPConnectionArgsOperation(PipelineOperation):
     This operation is in the group of HTTP operations because its attributes are very specific to the HTTP protocol.
     """
 
+    __slots__ = ("hostname", "server_verification_cert", "client_cert", "sas_token")
+
     def __init__(
         self, hostname, callback, server_verification_cert=None, client_cert=None, sas_token=None
     ):
@@ -42,6 +44,17 @@ class HTTPRequestAndResponseOperation(PipelineOperation):
     This operation is in the group of HTTP operations because its attributes are very specific to the HTTP protocol.
     """
 
+    __slots__ = (
+        "method",
+        "path",
+        "headers",
+        "body",
+        "query_params",
+        "status_code",
+        "response_body",
+        "reason",
+    )
+
     def __init__(self, method, path, headers, body, query_params, callback):
         """
         Initializer for HTTPPublishOperation objects.
@@ -13,6 +13,15 @@ class SetMQTTConnectionArgsOperation(PipelineOperation):
     This operation is in the group of MQTT operations because its attributes are very specific to the MQTT protocol.
     """
 
+    __slots__ = (
+        "client_id",
+        "hostname",
+        "username",
+        "server_verification_cert",
+        "client_cert",
+        "sas_token",
+    )
+
     def __init__(
         self,
         client_id,
@@ -54,6 +63,8 @@ class MQTTPublishOperation(PipelineOperation):
     This operation is in the group of MQTT operations because its attributes are very specific to the MQTT protocol.
     """
 
+    __slots__ = ("topic", "payload", "retry_timer")
+
     def __init__(self, topic, payload, callback):
         """
         Initializer for MQTTPublishOperation objects.
@@ -78,6 +89,8 @@ class MQTTSubscribeOperation(PipelineOperation):
     This operation is in the group of MQTT operations because its attributes are very specific to the MQTT protocol.
     """
 
+    __slots__ = ("topic", "timeout_timer", "retry_timer")
+
     def __init__(self, topic, callback):
         """
         Initializer for MQTTSubscribeOperation objects.
@@ -101,6 +114,8 @@ class MQTTUnsubscribeOperation(PipelineOperation):
     This operation is in the group of MQTT operations because its attributes are very specific to the MQTT protocol.
     """
 
+    __slots__ = ("topic", "timeout_timer", "retry_timer")
+
     def __init__(self, topic, callback):
         """
         Initializer for MQTTUnsubscribeOperation objects.
@@ -6,6 +6,7 @@
 
 import logging
 import abc
+import functools
 import six
 import sys
 import time
@@ -16,11 +17,14 @@ import threading
 from . import pipeline_events_base
 from . import pipeline_ops_base, pipeline_ops_mqtt
 from . import pipeline_thread
+from . import pipeline_trace
 from . import pipeline_exceptions
-from azure.iot.device.common import handle_exceptions, transport_exceptions
+from azure.iot.device.common import handle_exceptions, transport_exceptions, tracing, metrics
 from azure.iot.device.common.callable_weak_method import CallableWeakMethod
 
 logger = logging.getLogger(__name__)
+_op_trace = tracing.get_tracer(logger, "pipeline.op")
+_event_trace = tracing.get_tracer(logger, "pipeline.event")
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -71,17 +75,51 @@ class PipelineStage(object):
       submit an operation to the pipeline starting at the root.  This type of behavior is uncommon but not
       unexpected.
     :type pipeline_root: PipelineStage
+    :cvar handled_op_types: The operation types which the stage acts on, as a tuple of classes.
+      Operations of other types are passed from the stage above straight to the next stage
+      which acts on them, without running through this stage. None (the default) means the
+      stage acts on every operation. Stages may compute this from their configuration, but it
+      is read once per operation type, the first time an operation of that type is sent down.
+    :type handled_op_types: tuple
     """
 
+    handled_op_types = None
+
     def __init__(self):
         """
         Initializer for PipelineStage objects.
         """
         self.name = self.__class__.__name__
-        self.next = None
+        # operation type -> the stage below this one which acts on that type of operation
+        self._op_routes = {}
         self.previous = None
+        self.next = None
         self.pipeline_root = None
 
+    @property
+    def next(self):
+        return self._next
+
+    @next.setter
+    def next(self, stage):
+        self._next = stage
+        # Routes from this stage, and from every stage above it, may pass through the new stage
+        above = self
+        while isinstance(above, PipelineStage):
+            above._op_routes.clear()
+            above = above.previous
+
+    def register_metrics(self, registry):
+        """
+        Add the metrics of this stage to the metrics of the pipeline.  This is called when the
+        stage is appended to the pipeline.  Stages which keep metrics override this to create
+        them, and should not update them if it has not been called.
+
+        :param registry: The metrics of the pipeline.
+        :type registry: :class:`azure.iot.device.common.metrics.MetricsRegistry`
+        """
+        pass
+
     @pipeline_thread.runs_on_pipeline_thread
     def run_op(self, op):
         """
@@ -97,7 +135,11 @@ class PipelineStage(object):
 
         :param PipelineOperation op: The operation to run.
         """
-        logger.debug("{}({}): running".format(self.name, op.name))
+        if __debug__ and _op_trace.enabled:
+            _op_trace("%s(%s): running", self.name, op.name)
+        trace_buffer = pipeline_trace.buffer
+        if trace_buffer is not None:
+            started_at = trace_buffer.now()
         try:
             self._run_op(op)
         except Exception as e:
@@ -105,6 +147,8 @@ class PipelineStage(object):
             # within ._run_op()
             logger.error(msg="Unexpected error in {}._run_op() call".format(self), exc_info=e)
             op.complete(error=e)
+        if trace_buffer is not None:
+            trace_buffer.span("stage", self.name, op, started_at)
 
     @pipeline_thread.runs_on_pipeline_thread
     def _run_op(self, op):
@@ -152,21 +196,42 @@ class PipelineStage(object):
     def send_op_down(self, op):
         """
         Helper function to continue a given operation by passing it to the next stage
-        in the pipeline.  If there is no next stage in the pipeline, this function
-        will fail the operation and call complete_op to return the failure back up the
-        pipeline.
+        in the pipeline which acts on operations of its type (see handled_op_types).  If there
+        is no next stage in the pipeline, this function will fail the operation and call
+        complete_op to return the failure back up the pipeline.
 
         :param PipelineOperation op: Operation which is being passed on
         """
-        if not self.next:
+        op_type = type(op)
+        try:
+            next_stage = self._op_routes[op_type]
+        except KeyError:
+            next_stage = self._op_routes[op_type] = self._find_next_stage(op_type)
+
+        if not next_stage:
             logger.error("{}({}): no next stage.  completing with error".format(self.name, op.name))
             error = pipeline_exceptions.PipelineError(
                 "{} not handled after {} stage with no next stage".format(op.name, self.name)
             )
             op.complete(error=error)
         else:
-            logger.debug("{}({}): passing to next stage.".format(self.name, op.name))
-            self.next.run_op(op)
+            if __debug__ and _op_trace.enabled:
+                _op_trace("%s(%s): passing to %s.", self.name, op.name, next_stage.name)
+            next_stage.run_op(op)
+
+    def _find_next_stage(self, op_type):
+        """
+        Return the first stage below this one which acts on operations of the given type, or
+        None if there is none.  The last stage is always returned if no other stage acts on them,
+        so that the operation is not silently dropped.
+        """
+        stage = self.next
+        while isinstance(stage, PipelineStage) and stage.next:
+            handled_op_types = stage.handled_op_types
+            if handled_op_types is None or issubclass(op_type, handled_op_types):
+                break
+            stage = stage.next
+        return stage
 
     @pipeline_thread.runs_on_pipeline_thread
     def send_event_up(self, event):
@@ -176,9 +241,10 @@ class PipelineStage(object):
         bottom) and move up the pipeline until they're handled or until they error out.
         """
         if self.previous:
-            logger.debug(
-                "{}({}): pushing event up to {}".format(self.name, event.name, self.previous.name)
-            )
+            if __debug__ and _event_trace.enabled:
+                _event_trace(
+                    "%s(%s): pushing event up to %s", self.name, event.name, self.previous.name
+                )
             self.previous.handle_pipeline_event(event)
         else:
             logger.error("{}({}): Error: unhandled event".format(self.name, event.name))
@@ -205,6 +271,9 @@ class PipelineRootStage(PipelineStage):
     :ivar on_disconnected_handler: Handler which can be set by users of the pipeline to
       receive events every time the underlying transport disconnects
     :type on_disconnected_handler: Function
+    :ivar metrics: The metrics of the pipeline, which are also part of the process-wide
+      metrics.
+    :type metrics: :class:`azure.iot.device.common.metrics.MetricsRegistry`
     """
 
     def __init__(self, pipeline_configuration):
@@ -214,14 +283,46 @@ class PipelineRootStage(PipelineStage):
         self.on_disconnected_handler = None
         self.connected = False
         self.pipeline_configuration = pipeline_configuration
+        self.metrics = metrics.MetricsRegistry()
+        metrics.process_metrics.add(self.metrics)
+        # operation type -> (latency histogram, error counter)
+        self._op_metrics = {}
+        # event type -> delivery histogram
+        self._event_metrics = {}
 
     def run_op(self, op):
+        trace_buffer = pipeline_trace.buffer
+        if trace_buffer is not None:
+            trace_buffer.op_started(op)
         # CT-TODO: make this more elegant
-        op.callback_stack[0] = pipeline_thread.invoke_on_callback_thread_nowait(
-            op.callback_stack[0]
+        op.callback_stack[0] = functools.partial(
+            self._on_op_complete,
+            pipeline_thread.invoke_on_callback_thread_nowait(op.callback_stack[0], client=self),
+            time.time(),
         )
         pipeline_thread.invoke_on_pipeline_thread(super(PipelineRootStage, self).run_op)(op)
 
+    @pipeline_thread.runs_on_pipeline_thread
+    def _on_op_complete(self, callback, submitted_at, op, error):
+        op_type = type(op)
+        try:
+            latency, errors = self._op_metrics[op_type]
+        except KeyError:
+            labels = {"op": op.name}
+            latency = self.metrics.histogram(
+                "op_latency_seconds",
+                "Time from an operation being run on the pipeline to its completion",
+                labels=labels,
+            )
+            errors = self.metrics.counter(
+                "op_errors_total", "Operations completed with an error", labels=labels
+            )
+            self._op_metrics[op_type] = (latency, errors)
+        latency.observe(time.time() - submitted_at)
+        if error:
+            errors.inc()
+        callback(op=op, error=error)
+
     def append_stage(self, new_stage):
         """
         Add the next stage to the end of the pipeline.  This is the function that callers
@@ -237,6 +338,7 @@ class PipelineRootStage(PipelineStage):
         old_tail.next = new_stage
         new_stage.previous = old_tail
         new_stage.pipeline_root = self
+        new_stage.register_metrics(self.metrics)
         return self
 
     @pipeline_thread.runs_on_pipeline_thread
@@ -255,7 +357,9 @@ class PipelineRootStage(PipelineStage):
             )
             self.connected = True
             if self.on_connected_handler:
-                pipeline_thread.invoke_on_callback_thread_nowait(self.on_connected_handler)()
+                pipeline_thread.invoke_on_callback_thread_nowait(
+                    self.on_connected_handler, client=self
+                )()
 
         elif isinstance(event, pipeline_events_base.DisconnectedEvent):
             logger.debug(
@@ -263,16 +367,36 @@ class PipelineRootStage(PipelineStage):
             )
             self.connected = False
             if self.on_disconnected_handler:
-                pipeline_thread.invoke_on_callback_thread_nowait(self.on_disconnected_handler)()
+                pipeline_thread.invoke_on_callback_thread_nowait(
+                    self.on_disconnected_handler, client=self
+                )()
 
         else:
             if self.on_pipeline_event_handler:
-                pipeline_thread.invoke_on_callback_thread_nowait(self.on_pipeline_event_handler)(
-                    event
-                )
+                # Each type of event is delivered to its own inbox, so only needs to be kept in
+                # order with events of the same type
+                pipeline_thread.invoke_on_callback_thread_nowait(
+                    self._deliver_event, client=self, lane=event.name
+                )(event, time.time())
             else:
                 logger.warning("incoming pipeline event with no handler.  dropping.")
 
+    def _deliver_event(self, event, received_at):
+        """
+        Call the on_pipeline_event_handler with an event, on the callback thread
+        """
+        self.on_pipeline_event_handler(event)
+        event_type = type(event)
+        try:
+            delivery = self._event_metrics[event_type]
+        except KeyError:
+            delivery = self._event_metrics[event_type] = self.metrics.histogram(
+                "event_delivery_seconds",
+                "Time from an event reaching the top of the pipeline to its handler returning",
+                labels={"event": event.name},
+            )
+        delivery.observe(time.time() - received_at)
+
 
 class AutoConnectStage(PipelineStage):
     """
@@ -342,6 +466,20 @@ class ConnectionLockStage(PipelineStage):
         super(ConnectionLockStage, self).__init__()
         self.queue = queue.Queue()
         self.blocked = False
+        # queued operation -> time it was queued
+        self._queued_at = {}
+        self._wait_time = None
+
+    def register_metrics(self, registry):
+        registry.gauge(
+            "connection_lock_queue_depth",
+            lambda: self.queue.qsize(),
+            "Operations waiting for a connect, disconnect or reauthorize to complete",
+        )
+        self._wait_time = registry.histogram(
+            "connection_lock_wait_seconds",
+            "Time operations waited for a connect, disconnect or reauthorize to complete",
+        )
 
     @pipeline_thread.runs_on_pipeline_thread
     def _run_op(self, op):
@@ -354,7 +492,11 @@ class ConnectionLockStage(PipelineStage):
                     self.name, op.name
                 )
             )
+            self._queued_at[op] = time.time()
             self.queue.put_nowait(op)
+            trace_buffer = pipeline_trace.buffer
+            if trace_buffer is not None:
+                trace_buffer.mark(op, "queued by ConnectionLockStage")
 
         elif isinstance(op, pipeline_ops_base.ConnectOperation) and self.pipeline_root.connected:
             logger.info(
@@ -426,6 +568,9 @@ class ConnectionLockStage(PipelineStage):
         self.queue = queue.Queue()
         while not old_queue.empty():
             op_to_release = old_queue.get_nowait()
+            queued_at = self._queued_at.pop(op_to_release, None)
+            if self._wait_time is not None and queued_at is not None:
+                self._wait_time.observe(time.time() - queued_at)
             if error:
                 # if we're unblocking the queue because something (like a connect operation) failed,
                 # then we fail all of the blocked operations with the same error.
@@ -450,10 +595,19 @@ class CoordinateRequestAndResponseStage(PipelineStage):
     an ResponseEvent event.  All other events are passed down unmodified.
     """
 
+    handled_op_types = (pipeline_ops_base.RequestAndResponseOperation,)
+
     def __init__(self):
         super(CoordinateRequestAndResponseStage, self).__init__()
         self.pending_responses = {}
 
+    def register_metrics(self, registry):
+        registry.gauge(
+            "pending_responses",
+            lambda: len(self.pending_responses),
+            "Requests waiting for their response",
+        )
+
     @pipeline_thread.runs_on_pipeline_thread
     def _run_op(self, op):
         if isinstance(op, pipeline_ops_base.RequestAndResponseOperation):
@@ -594,6 +748,10 @@ class OpTimeoutStage(PipelineStage):
             pipeline_ops_mqtt.MQTTUnsubscribeOperation: 10,
         }
 
+    @property
+    def handled_op_types(self):
+        return tuple(self.timeout_intervals)
+
     @pipeline_thread.runs_on_pipeline_thread
     def _run_op(self, op):
         if type(op) in self.timeout_intervals:
@@ -653,6 +811,19 @@ class RetryStage(PipelineStage):
             pipeline_ops_mqtt.MQTTPublishOperation: 20,
         }
         self.ops_waiting_to_retry = []
+        self._metrics = None
+
+    @property
+    def handled_op_types(self):
+        return tuple(self.retry_intervals)
+
+    def register_metrics(self, registry):
+        registry.gauge(
+            "retry_waiting_ops",
+            lambda: len(self.ops_waiting_to_retry),
+            "Operations waiting to be retried",
+        )
+        self._metrics = registry
 
     @pipeline_thread.runs_on_pipeline_thread
     def _run_op(self, op):
@@ -717,11 +888,19 @@ class RetryStage(PipelineStage):
                 )
             )
 
+            if self._metrics is not None:
+                self._metrics.counter(
+                    "retries_total", "Operations retried", labels={"op": op.name}
+                ).inc()
+
             # if we don't keep track of this op, it might get collected.
             op.halt_completion()
             self.ops_waiting_to_retry.append(op)
             op.retry_timer = threading.Timer(self.retry_intervals[type(op)], do_retry)
             op.retry_timer.start()
+            trace_buffer = pipeline_trace.buffer
+            if trace_buffer is not None:
+                trace_buffer.mark(op, "waiting to retry")
 
         else:
             if op.retry_timer:
@@ -739,6 +918,8 @@ transient_connect_errors = [
 
 
 class ReconnectStage(PipelineStage):
+    handled_op_types = (pipeline_ops_base.ConnectOperation, pipeline_ops_base.DisconnectOperation)
+
     def __init__(self):
         super(ReconnectStage, self).__init__()
         self.reconnect_timer = None
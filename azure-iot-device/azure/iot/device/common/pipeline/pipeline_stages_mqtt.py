@@ -4,8 +4,10 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import functools
 import logging
 import six
+import time
 import traceback
 from . import (
     pipeline_ops_base,
@@ -13,14 +15,17 @@ from . import (
     pipeline_ops_mqtt,
     pipeline_events_mqtt,
     pipeline_thread,
+    pipeline_trace,
     pipeline_exceptions,
     pipeline_events_base,
 )
 from azure.iot.device.common.mqtt_transport import MQTTTransport
-from azure.iot.device.common import handle_exceptions, transport_exceptions
+from azure.iot.device.common import handle_exceptions, transport_exceptions, tracing
 from azure.iot.device.common.callable_weak_method import CallableWeakMethod
 
 logger = logging.getLogger(__name__)
+_publish_trace = tracing.get_tracer(logger, "mqtt.publish", logging.INFO)
+_puback_trace = tracing.get_tracer(logger, "mqtt.puback")
 
 
 class MQTTTransportStage(PipelineStage):
@@ -40,6 +45,17 @@ class MQTTTransportStage(PipelineStage):
         self.transport = None
 
         self._pending_connection_op = None
+        self._publish_latency = None
+
+    def register_metrics(self, registry):
+        registry.gauge(
+            "mqtt_pending_acks",
+            lambda: self.transport.pending_operation_count() if self.transport else 0,
+            "MQTT publishes, subscribes and unsubscribes waiting for their acknowledgement",
+        )
+        self._publish_latency = registry.histogram(
+            "publish_latency_seconds", "Time from an MQTT publish to its PUBACK"
+        )
 
     @pipeline_thread.runs_on_pipeline_thread
     def _cancel_pending_connection_op(self):
@@ -147,14 +163,17 @@ class MQTTTransportStage(PipelineStage):
                 op.complete(error=e)
 
         elif isinstance(op, pipeline_ops_mqtt.MQTTPublishOperation):
-            logger.info("{}({}): publishing on {}".format(self.name, op.name, op.topic))
-
-            @pipeline_thread.invoke_on_pipeline_thread_nowait
-            def on_published():
-                logger.debug("{}({}): PUBACK received. completing op.".format(self.name, op.name))
-                op.complete()
-
-            self.transport.publish(topic=op.topic, payload=op.payload, callback=on_published)
+            if __debug__ and _publish_trace.enabled:
+                _publish_trace("%s(%s): publishing on %s", self.name, op.name, op.topic)
+            trace_buffer = pipeline_trace.buffer
+            if trace_buffer is not None:
+                trace_buffer.mark(op, "waiting for PUBACK")
+            # A partial of a method rather than a decorated closure, as there is one per message
+            self.transport.publish(
+                topic=op.topic,
+                payload=op.payload,
+                callback=functools.partial(self._on_published, op, time.time()),
+            )
 
         elif isinstance(op, pipeline_ops_mqtt.MQTTSubscribeOperation):
             logger.info("{}({}): subscribing to {}".format(self.name, op.name, op.topic))
@@ -183,6 +202,14 @@ class MQTTTransportStage(PipelineStage):
             # This will raise an error when executed.
             self.send_op_down(op)
 
+    @pipeline_thread.invoke_on_pipeline_thread_nowait
+    def _on_published(self, op, published_at):
+        if self._publish_latency is not None:
+            self._publish_latency.observe(time.time() - published_at)
+        if __debug__ and _puback_trace.enabled:
+            _puback_trace("%s(%s): PUBACK received. completing op.", self.name, op.name)
+        op.complete()
+
     @pipeline_thread.invoke_on_pipeline_thread_nowait
     def _on_mqtt_message_received(self, topic, payload):
         """
@@ -7,11 +7,13 @@ import functools
 import logging
 import threading
 import traceback
+import weakref
 from multiprocessing.pool import ThreadPool
 from concurrent.futures import ThreadPoolExecutor
-from azure.iot.device.common import handle_exceptions
+from azure.iot.device.common import handle_exceptions, tracing
 
 logger = logging.getLogger(__name__)
+_thread_trace = tracing.get_tracer(logger, "pipeline.thread")
 
 """
 This module contains decorators that are used to marshal code into pipeline and
@@ -31,7 +33,10 @@ The intention of these decorators is to ensure the following:
   as the the "callback thread".  This is not meant for callbacks into pipeline
   code.  Those callbacks should still execute on the pipeline thread.  The
   `invoke_on_callback_thread_nowait` decorator is used to ensure that callbacks
-  execute on the callback thread.
+  execute on the callback thread.  By default there is a single callback thread,
+  but the CallbackExecutor can be configured with more (see
+  `configure_callback_executor`), in which case callbacks for the same client and
+  lane still run in order on one of them.
 
 4. Decorators which cause thread switches are used only when necessary.  The
   pipeline thread is only entered in places where we know that external code is
@@ -75,20 +80,116 @@ These decorators use concurrent.futures.Future and the ThreadPoolExecutor becaus
 _executors = {}
 
 
-def _get_named_executor(thread_name):
+class CallbackExecutor(object):
+    """
+    Chooses the thread each callback into user code runs on.
+
+    Callbacks are invoked for a client (the root stage of its pipeline) and a lane within the
+    client, such as the type of event which is delivered to one of its inboxes.  Each client
+    and lane is assigned to one of a fixed number of single threaded workers, so callbacks
+    for the same client and lane run in the order they were invoked, while a slow callback
+    only delays the callbacks assigned to the same worker.  With isolate_clients, each client
+    has a worker of its own instead, which runs all of its callbacks in order, so a slow
+    callback never delays the callbacks of another client.
+
+    :ivar int workers: The number of workers shared by clients which are not isolated.
+    :ivar bool isolate_clients: Whether each client has a worker of its own.
+    """
+
+    def __init__(self, workers=1, isolate_clients=False):
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.isolate_clients = isolate_clients
+        self._shared_executors = [None] * workers
+        # client -> executor, dropped along with the client
+        self._client_executors = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get_executor(self, client=None, lane=None):
+        """
+        Return the single threaded executor which runs the callbacks of a client and lane.
+
+        :param client: The client the callback is for, or None for callbacks of no client.
+        :param lane: The lane within the client, or None.  Callbacks are only kept in order
+            with other callbacks of the same client and lane.
+        :rtype: :class:`concurrent.futures.ThreadPoolExecutor`
+        """
+        if self.isolate_clients and client is not None:
+            executor = self._client_executors.get(client)
+            if executor is None:
+                with self._lock:
+                    executor = self._client_executors.get(client)
+                    if executor is None:
+                        logger.debug("Creating callback executor for {}".format(client))
+                        executor = self._client_executors[client] = ThreadPoolExecutor(
+                            max_workers=1
+                        )
+            return executor
+
+        index = hash((client, lane)) % self.workers if self.workers > 1 else 0
+        executor = self._shared_executors[index]
+        if executor is None:
+            with self._lock:
+                executor = self._shared_executors[index]
+                if executor is None:
+                    logger.debug("Creating callback executor {}".format(index))
+                    executor = self._shared_executors[index] = ThreadPoolExecutor(max_workers=1)
+        return executor
+
+    def shutdown(self, wait=True):
+        """
+        Shut down every worker, once the callbacks already invoked have run.
+
+        :param bool wait: Whether to wait for the callbacks already invoked to run.
+        """
+        with self._lock:
+            executors = [e for e in self._shared_executors if e is not None]
+            executors.extend(self._client_executors.values())
+        for executor in executors:
+            executor.shutdown(wait=wait)
+
+
+_callback_executor = CallbackExecutor()
+
+
+def configure_callback_executor(workers=1, isolate_clients=False):
+    """
+    Configure the threads callbacks into user code run on, for every client in the process.
+
+    This should be called before any client is created.  Callbacks already invoked still run
+    on the threads they were invoked on.
+
+    :param int workers: The number of callback threads shared by clients.  Defaults to 1,
+        which runs every callback of every client in order.
+    :param bool isolate_clients: Give each client a callback thread of its own, which runs
+        all of its callbacks in order.  Defaults to False.
+
+    :raises: ValueError if workers is less than 1.
+    """
+    global _callback_executor
+    old_executor = _callback_executor
+    _callback_executor = CallbackExecutor(workers=workers, isolate_clients=isolate_clients)
+    old_executor.shutdown(wait=False)
+
+
+def _get_named_executor(thread_name, client=None, lane=None):
     """
     Get a ThreadPoolExecutor object with the given name.  If no such executor exists,
     this function will create on with a single worker and assign it to the provided
-    name.
+    name.  The callback executor is chosen by the CallbackExecutor, for the given client
+    and lane.
     """
     global _executors
+    if thread_name == "callback":
+        return _callback_executor.get_executor(client, lane)
     if thread_name not in _executors:
         logger.debug("Creating {} executor".format(thread_name))
         _executors[thread_name] = ThreadPoolExecutor(max_workers=1)
     return _executors[thread_name]
 
 
-def _invoke_on_executor_thread(func, thread_name, block=True):
+def _invoke_on_executor_thread(func, thread_name, block=True, client=None, lane=None):
     """
     Return wrapper to run the function on a given thread.  If block==False,
     the call returns immediately without waiting for the decorated function to complete.
@@ -105,7 +206,8 @@ def _invoke_on_executor_thread(func, thread_name, block=True):
 
     def wrapper(*args, **kwargs):
         if threading.current_thread().name is not thread_name:
-            logger.debug("Starting {} in {} thread".format(function_name, thread_name))
+            if __debug__ and _thread_trace.enabled:
+                _thread_trace("Starting %s in %s thread", function_name, thread_name)
 
             def thread_proc():
                 threading.current_thread().name = thread_name
@@ -126,13 +228,14 @@ def _invoke_on_executor_thread(func, thread_name, block=True):
                     raise
 
             # TODO: add a timeout here and throw exception on failure
-            future = _get_named_executor(thread_name).submit(thread_proc)
+            future = _get_named_executor(thread_name, client, lane).submit(thread_proc)
             if block:
                 return future.result()
             else:
                 return future
         else:
-            logger.debug("Already in {} thread for {}".format(thread_name, function_name))
+            if __debug__ and _thread_trace.enabled:
+                _thread_trace("Already in %s thread for %s", thread_name, function_name)
             return func(*args, **kwargs)
 
     # Silly hack:  On 2.7, we can't use @functools.wraps on callables don't have a __name__ attribute
@@ -159,11 +262,14 @@ def invoke_on_pipeline_thread_nowait(func):
     return _invoke_on_executor_thread(func=func, thread_name="pipeline", block=False)
 
 
-def invoke_on_callback_thread_nowait(func):
+def invoke_on_callback_thread_nowait(func, client=None, lane=None):
     """
-    Run the decorated function on the callback thread, but don't wait for it to complete
+    Run the decorated function on the callback thread, but don't wait for it to complete.
+    Calls for the same client and lane run in the order they were made.
     """
-    return _invoke_on_executor_thread(func=func, thread_name="callback", block=False)
+    return _invoke_on_executor_thread(
+        func=func, thread_name="callback", block=False, client=client, lane=lane
+    )
 
 
 def invoke_on_http_thread_nowait(func):
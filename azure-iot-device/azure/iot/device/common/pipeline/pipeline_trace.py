@@ -0,0 +1,218 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module records the lifecycle of pipeline operations, for finding where they wait.
+
+Recording is off by default. When started, every pipeline in the process records into a
+TraceBuffer of fixed size, which keeps the most recent records and overwrites the oldest:
+
+    buffer = pipeline_trace.start(capacity=16384)
+    ...
+    pipeline_trace.stop()
+    buffer.export_chrome_trace("trace.json")
+
+The exported file is in the Chrome trace event format, and can be opened in chrome://tracing
+or https://ui.perfetto.dev. For each operation it shows:
+
+    - a span from the operation being run on the pipeline, or spawned as a worker operation, to
+      its completion, with marks where it was queued by the ConnectionLockStage, halted for a
+      retry by the RetryStage, and published waiting for its PUBACK
+    - a span for each stage the operation ran through, nested in the stage above it
+    - a span for each callback run as the operation completed
+
+The time between the operation being run and the root stage's span starting is the time spent
+waiting for the pipeline thread.
+
+When recording is stopped the pipeline only checks that there is no buffer to record into.
+"""
+
+import itertools
+import json
+import os
+import six
+import time
+from six.moves import _thread
+
+__all__ = ["TraceBuffer", "start", "stop"]
+
+DEFAULT_CAPACITY = 16384
+
+# The buffer being recorded into, or None if recording is stopped
+buffer = None
+
+if hasattr(time, "perf_counter"):
+    _clock = time.perf_counter
+else:
+    # Python 2.7
+    _clock = time.time
+
+# Operations are given ids when they are first recorded. id() is not used, as an operation which
+# is freed has its id() reused by the next one allocated.
+_trace_ids = itertools.count(1)
+
+
+class TraceBuffer(object):
+    """Holds the most recent records of the lifecycle of pipeline operations.
+
+    Records are kept in a list of fixed size, which is written to round-robin, so recording
+    allocates only the record itself and does not lock. Records hold the name and id of an
+    operation rather than the operation, so they do not keep operations or their messages alive.
+    The id is unique in the process, and is given to the operation when it is first recorded.
+
+    :param int capacity: The number of records kept.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._records = [None] * capacity
+        # next() on an itertools.count is atomic, so records from several threads get their own
+        # slots
+        self._index = itertools.count()
+
+    now = staticmethod(_clock)
+
+    def span(self, category, name, op, started_at):
+        """Record a span of an operation which started at started_at, and ends now.
+
+        :param str category: The category of the span, "stage" or "callback".
+        :param str name: The name of the span, such as the name of the stage.
+        :param op: The operation.
+        :param float started_at: The time the span started, from now().
+        """
+        self._add("X", category, name, started_at, _clock() - started_at, op, None)
+
+    def callback_span(self, op, callback, started_at):
+        """Record a span of a callback of an operation which started at started_at, and ends now.
+
+        :param op: The operation.
+        :param callback: The callback.
+        :param float started_at: The time the callback was called, from now().
+        """
+        self.span("callback", _callback_name(callback), op, started_at)
+
+    def op_started(self, op, parent=None):
+        """Record the start of an operation, which is run on a pipeline, or spawned from parent.
+
+        :param op: The operation.
+        :param parent: The operation the operation was spawned from as a worker operation.
+        """
+        args = (
+            {"parent": _format_id(_trace_id(parent)), "parent_op": parent.name} if parent else None
+        )
+        self._add("b", "op", op.name, _clock(), None, op, args)
+
+    def op_completed(self, op):
+        """Record the completion of an operation.
+
+        :param op: The operation.
+        """
+        args = {"error": str(op.error)} if op.error else None
+        self._add("e", "op", op.name, _clock(), None, op, args)
+
+    def mark(self, op, name):
+        """Record a point in the lifecycle of an operation, such as it being queued.
+
+        :param op: The operation.
+        :param str name: What happened to the operation.
+        """
+        self._add("n", "op", name, _clock(), None, op, None)
+
+    def _add(self, phase, category, name, timestamp, duration, op, args):
+        self._records[next(self._index) % self.capacity] = (
+            phase,
+            category,
+            name,
+            timestamp,
+            duration,
+            op.name,
+            _trace_id(op),
+            args,
+            _thread.get_ident(),
+        )
+
+    def records(self):
+        """Return the records in the buffer, oldest first.
+
+        :returns: A list of tuples of (phase, category, name, timestamp, duration, operation
+            name, operation id, args, thread id), where phase is a Chrome trace event phase.
+        """
+        records = [record for record in list(self._records) if record is not None]
+        records.sort(key=lambda record: record[3])
+        return records
+
+    def to_chrome_trace(self):
+        """Return the records in the buffer in the Chrome trace event format.
+
+        :returns: A dict with a "traceEvents" list, which can be serialized as JSON.
+        """
+        pid = os.getpid()
+        events = []
+        for phase, category, name, timestamp, duration, op_name, op_id, args, tid in self.records():
+            event = {
+                "name": name,
+                "cat": category,
+                "ph": phase,
+                "ts": timestamp * 1e6,
+                "pid": pid,
+                "tid": tid,
+            }
+            if phase == "X":
+                event["dur"] = duration * 1e6
+                event["args"] = {"op": op_name, "id": _format_id(op_id)}
+            else:
+                # Spans and marks of one operation share its id
+                event["id"] = _format_id(op_id)
+                event["args"] = args or {}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, file):
+        """Write the records in the buffer to a file in the Chrome trace event format.
+
+        :param file: The path of the file, or a file object open for writing text.
+        """
+        if isinstance(file, six.string_types):
+            with open(file, "w") as f:
+                json.dump(self.to_chrome_trace(), f)
+        else:
+            json.dump(self.to_chrome_trace(), file)
+
+
+def start(capacity=DEFAULT_CAPACITY):
+    """Start recording the lifecycle of pipeline operations into a new TraceBuffer.
+
+    :param int capacity: The number of records kept.
+    :returns: The TraceBuffer being recorded into.
+    """
+    global buffer
+    buffer = TraceBuffer(capacity)
+    return buffer
+
+
+def stop():
+    """Stop recording the lifecycle of pipeline operations.
+
+    :returns: The TraceBuffer which was being recorded into, or None if recording was stopped.
+    """
+    global buffer
+    stopped, buffer = buffer, None
+    return stopped
+
+
+def _callback_name(callback):
+    callback = getattr(callback, "func", callback)  # functools.partial
+    return getattr(callback, "__name__", type(callback).__name__)
+
+
+def _trace_id(op):
+    if op.trace_id is None:
+        op.trace_id = next(_trace_ids)
+    return op.trace_id
+
+
+def _format_id(op_id):
+    return "0x{:x}".format(op_id)
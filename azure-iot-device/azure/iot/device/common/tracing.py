@@ -0,0 +1,108 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains the tracers used on the hot paths of the pipelines and transports.
+
+Code which runs for every message or every pipeline stage traces through a Tracer rather than
+logging directly, with the level guard written at the call site:
+
+    if __debug__ and _publish_trace.enabled:
+        _publish_trace("publishing on %s", topic)
+
+When the logger does not log at the level of the tracer nothing is formatted, and the
+arguments are not evaluated. When Python is run with -O, __debug__ is False and the traces are
+removed from the compiled code altogether.
+
+Each tracer belongs to a category, and every tracer in a category can be sampled with
+set_sampling, so that, for example, only 1 in 100 publishes is logged. The categories are:
+
+    mqtt.publish      Publishes (INFO)
+    mqtt.puback       PUBACKs received for publishes (INFO)
+    mqtt.message      Messages received (INFO)
+    mqtt.operation    MQTT packet ids waiting for and receiving their acknowledgement (DEBUG)
+    pipeline.op       Operations run, passed down and completed by the pipeline stages (DEBUG)
+    pipeline.event    Events passed up by the pipeline stages (DEBUG)
+    pipeline.thread   Calls into the pipeline and callback threads (DEBUG)
+"""
+
+import logging
+import threading
+import weakref
+
+__all__ = ["Tracer", "get_tracer", "set_sampling"]
+
+# category -> sample every N traces, for categories sampled with set_sampling
+_sampling = {}
+_tracers = weakref.WeakSet()
+_lock = threading.Lock()
+
+
+class Tracer(object):
+    """Writes the traces of one category to a logger.
+
+    :param logger: The logger traces are written to.
+    :param str category: The category of the traces.
+    :param int level: The level traces are written at.
+    :ivar int sample_every: Only 1 in this many traces is written.
+    """
+
+    def __init__(self, logger, category, level=logging.DEBUG):
+        self.logger = logger
+        self.category = category
+        self.level = level
+        self.sample_every = 1
+        self._count = 0
+
+    @property
+    def enabled(self):
+        """Whether the logger writes traces at the level of this tracer. The logging module
+        caches this for each logger, until the logging configuration is changed."""
+        return self.logger.isEnabledFor(self.level)
+
+    def __call__(self, msg, *args):
+        """Write a trace, with a message formatted with %-style args, unless it is not sampled.
+
+        The count used for sampling is not locked, so traces from several threads may be
+        sampled slightly more or less often than configured.
+        """
+        if self.sample_every > 1:
+            self._count += 1
+            if self._count < self.sample_every:
+                return
+            self._count = 0
+        self.logger.log(self.level, msg, *args)
+
+
+def get_tracer(logger, category, level=logging.DEBUG):
+    """Return a new tracer, sampled as configured for its category.
+
+    :param logger: The logger traces are written to.
+    :param str category: The category of the traces.
+    :param int level: The level traces are written at. Defaults to DEBUG.
+    :rtype: Tracer
+    """
+    tracer = Tracer(logger, category, level)
+    with _lock:
+        tracer.sample_every = _sampling.get(category, 1)
+        _tracers.add(tracer)
+    return tracer
+
+
+def set_sampling(category, every):
+    """Write only 1 in every so many traces of a category, from tracers created before or after.
+
+    :param str category: The category of the traces.
+    :param int every: Write 1 in this many traces. 1 writes every trace.
+
+    :raises: ValueError if every is less than 1.
+    """
+    if every < 1:
+        raise ValueError("every must be at least 1")
+    with _lock:
+        _sampling[category] = every
+        for tracer in _tracers:
+            if tracer.category == category:
+                tracer.sample_every = every
+                tracer._count = 0
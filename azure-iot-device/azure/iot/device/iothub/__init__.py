@@ -4,7 +4,39 @@ This library provides functionality for communicating with the Azure IoT Hub
 as a Device or Module.
 """
 
-from .sync_clients import IoTHubDeviceClient, IoTHubModuleClient
-from .models import Message, MethodRequest, MethodResponse
+import importlib
+import sys
+
+# Public names, and the module each is imported from once first used, so that the models can be
+# imported without the clients and their transports
+_lazy_names = {
+    "IoTHubDeviceClient": ".sync_clients",
+    "IoTHubModuleClient": ".sync_clients",
+    "Message": ".models",
+    "MethodRequest": ".models",
+    "MethodResponse": ".models",
+}
 
 __all__ = ["IoTHubDeviceClient", "IoTHubModuleClient", "Message", "MethodRequest", "MethodResponse"]
+
+if sys.version_info >= (3, 7):
+    from azure.iot.device import _import_submodule
+
+    def __getattr__(name):
+        if name in _lazy_names:
+            value = getattr(importlib.import_module(_lazy_names[name], __name__), name)
+        else:
+            value = _import_submodule(__name__, name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        import pkgutil
+
+        submodules = set(module.name for module in pkgutil.iter_modules(__path__))
+        return sorted(set(globals()) | set(_lazy_names) | submodules)
+
+else:
+    # Module __getattr__ (PEP 562) is not supported, so everything is imported up front
+    from .sync_clients import IoTHubDeviceClient, IoTHubModuleClient
+    from .models import Message, MethodRequest, MethodResponse
@@ -9,6 +9,8 @@
 import six
 import abc
 import logging
+import math
+import numbers
 import os
 import io
 from . import auth
@@ -30,6 +32,22 @@ logger = logging.getLogger(__name__)
 # SymmetricKeyAuthenticationProvider was intended to be part of an Edge scenario or not.
 
 
+def _validate_telemetry_readings(readings):
+    """Raise a ValueError if a channel of the readings has no readings, or a reading which is not
+    finite, as the statistics of its window could not be sent as JSON.
+    """
+    for channel, values in readings.items():
+        if isinstance(values, numbers.Number):
+            values = (values,)
+        elif len(values) == 0:
+            raise ValueError("No readings given for telemetry channel '{}'".format(channel))
+        for value in values:
+            if isinstance(value, numbers.Real) and (math.isinf(value) or math.isnan(value)):
+                raise ValueError(
+                    "Reading {} for telemetry channel '{}' is not finite".format(value, channel)
+                )
+
+
 @six.add_metaclass(abc.ABCMeta)
 class AbstractIoTHubClient(object):
     """ A superclass representing a generic IoTHub client.
@@ -58,6 +76,14 @@ class AbstractIoTHubClient(object):
             protocol gateway.
         :param bool websockets: Configuration Option. Default is False. Set to true if using MQTT over websockets.
         :param str product_info: Configuration Option. Default is empty string. The string contains arbitrary product info which is appended to the user agent string.
+        :param float telemetry_window_length: Configuration Option. Default is 1.0. The length in seconds of the windows that readings added with add_telemetry_readings are aggregated over before being sent.
+        :param str message_packing: Configuration Option. Default is None. Set to 'json' or 'binary' to pack small messages sent with send_message or send_message_to_output into fewer messages, carrying the format in the 'iothub-message-packing' custom property. Messages are only held to be packed while other messages are being sent, so a caller sending one message at a time is not delayed, but nothing is packed either; send with send_message_nowait, from several threads or with several coroutines to have messages packed.
+        :param int message_packing_max_size: Configuration Option. Default is 262144 (256 KB). The maximum size in bytes of a packed message, including its properties.
+        :param float message_packing_max_latency: Configuration Option. Default is 0.1. The longest time in seconds that a message waits to be packed, if the messages being sent have not been sent before then.
+        :param str message_compression: Configuration Option. Default is None. Set to 'gzip' or 'deflate' to compress outgoing message payloads, naming the format in the 'iothub-content-encoding' custom property. Incoming messages with the property are decompressed.
+        :param int message_compression_threshold: Configuration Option. Default is 1024. The size in bytes from which message payloads are compressed.
+        :param json_codec: Configuration Option. Default is a JSONCodec using the json module. The codec used for all JSON sent and received by the client, such as twins and method payloads. See :mod:`azure.iot.device.common.codec`.
+        :param payload_codec: Configuration Option. Default is None. A codec, such as a CBORCodec or MessagePackCodec, used to encode message data which is not a string or bytes, and to decode received messages with its content type.
 
         :raises: ValueError if given an invalid connection_string.
 
@@ -114,6 +140,16 @@ class AbstractIoTHubClient(object):
         """
         return self._iothub_pipeline.connected
 
+    @property
+    def metrics(self):
+        """
+        Read-only property with the metrics of the client, such as operation latencies and
+        inbox depths. See :mod:`azure.iot.device.common.metrics`.
+
+        :rtype: :class:`azure.iot.device.common.metrics.MetricsRegistry`
+        """
+        return self._iothub_pipeline.metrics
+
 
 @six.add_metaclass(abc.ABCMeta)
 class AbstractIoTHubDeviceClient(AbstractIoTHubClient):
@@ -133,6 +169,14 @@ class AbstractIoTHubDeviceClient(AbstractIoTHubClient):
 
         :param bool websockets: Configuration Option. Default is False. Set to true if using MQTT over websockets.
         :param str product_info: Configuration Option. Default is empty string. The string contains arbitrary product info which is appended to the user agent string.
+        :param float telemetry_window_length: Configuration Option. Default is 1.0. The length in seconds of the windows that readings added with add_telemetry_readings are aggregated over before being sent.
+        :param str message_packing: Configuration Option. Default is None. Set to 'json' or 'binary' to pack small messages sent with send_message or send_message_to_output into fewer messages, carrying the format in the 'iothub-message-packing' custom property. Messages are only held to be packed while other messages are being sent, so a caller sending one message at a time is not delayed, but nothing is packed either; send with send_message_nowait, from several threads or with several coroutines to have messages packed.
+        :param int message_packing_max_size: Configuration Option. Default is 262144 (256 KB). The maximum size in bytes of a packed message, including its properties.
+        :param float message_packing_max_latency: Configuration Option. Default is 0.1. The longest time in seconds that a message waits to be packed, if the messages being sent have not been sent before then.
+        :param str message_compression: Configuration Option. Default is None. Set to 'gzip' or 'deflate' to compress outgoing message payloads, naming the format in the 'iothub-content-encoding' custom property. Incoming messages with the property are decompressed.
+        :param int message_compression_threshold: Configuration Option. Default is 1024. The size in bytes from which message payloads are compressed.
+        :param json_codec: Configuration Option. Default is a JSONCodec using the json module. The codec used for all JSON sent and received by the client, such as twins and method payloads. See :mod:`azure.iot.device.common.codec`.
+        :param payload_codec: Configuration Option. Default is None. A codec, such as a CBORCodec or MessagePackCodec, used to encode message data which is not a string or bytes, and to decode received messages with its content type.
 
         :returns: An instance of an IoTHub client that uses an X509 certificate for authentication.
         """
@@ -159,6 +203,14 @@ class AbstractIoTHubDeviceClient(AbstractIoTHubClient):
 
         :param bool websockets: Configuration Option. Default is False. Set to true if using MQTT over websockets.
         :param str product_info: Configuration Option. Default is empty string. The string contains arbitrary product info which is appended to the user agent string.
+        :param float telemetry_window_length: Configuration Option. Default is 1.0. The length in seconds of the windows that readings added with add_telemetry_readings are aggregated over before being sent.
+        :param str message_packing: Configuration Option. Default is None. Set to 'json' or 'binary' to pack small messages sent with send_message or send_message_to_output into fewer messages, carrying the format in the 'iothub-message-packing' custom property. Messages are only held to be packed while other messages are being sent, so a caller sending one message at a time is not delayed, but nothing is packed either; send with send_message_nowait, from several threads or with several coroutines to have messages packed.
+        :param int message_packing_max_size: Configuration Option. Default is 262144 (256 KB). The maximum size in bytes of a packed message, including its properties.
+        :param float message_packing_max_latency: Configuration Option. Default is 0.1. The longest time in seconds that a message waits to be packed, if the messages being sent have not been sent before then.
+        :param str message_compression: Configuration Option. Default is None. Set to 'gzip' or 'deflate' to compress outgoing message payloads, naming the format in the 'iothub-content-encoding' custom property. Incoming messages with the property are decompressed.
+        :param int message_compression_threshold: Configuration Option. Default is 1024. The size in bytes from which message payloads are compressed.
+        :param json_codec: Configuration Option. Default is a JSONCodec using the json module. The codec used for all JSON sent and received by the client, such as twins and method payloads. See :mod:`azure.iot.device.common.codec`.
+        :param payload_codec: Configuration Option. Default is None. A codec, such as a CBORCodec or MessagePackCodec, used to encode message data which is not a string or bytes, and to decode received messages with its content type.
         :return: An instance of an IoTHub client that uses a symmetric key for authentication.
         """
 
@@ -199,6 +251,14 @@ class AbstractIoTHubModuleClient(AbstractIoTHubClient):
 
         :param bool websockets: Configuration Option. Default is False. Set to true if using MQTT over websockets.
         :param str product_info: Configuration Option. Default is empty string. The string contains arbitrary product info which is appended to the user agent string.
+        :param float telemetry_window_length: Configuration Option. Default is 1.0. The length in seconds of the windows that readings added with add_telemetry_readings are aggregated over before being sent.
+        :param str message_packing: Configuration Option. Default is None. Set to 'json' or 'binary' to pack small messages sent with send_message or send_message_to_output into fewer messages, carrying the format in the 'iothub-message-packing' custom property. Messages are only held to be packed while other messages are being sent, so a caller sending one message at a time is not delayed, but nothing is packed either; send with send_message_nowait, from several threads or with several coroutines to have messages packed.
+        :param int message_packing_max_size: Configuration Option. Default is 262144 (256 KB). The maximum size in bytes of a packed message, including its properties.
+        :param float message_packing_max_latency: Configuration Option. Default is 0.1. The longest time in seconds that a message waits to be packed, if the messages being sent have not been sent before then.
+        :param str message_compression: Configuration Option. Default is None. Set to 'gzip' or 'deflate' to compress outgoing message payloads, naming the format in the 'iothub-content-encoding' custom property. Incoming messages with the property are decompressed.
+        :param int message_compression_threshold: Configuration Option. Default is 1024. The size in bytes from which message payloads are compressed.
+        :param json_codec: Configuration Option. Default is a JSONCodec using the json module. The codec used for all JSON sent and received by the client, such as twins and method payloads. See :mod:`azure.iot.device.common.codec`.
+        :param payload_codec: Configuration Option. Default is None. A codec, such as a CBORCodec or MessagePackCodec, used to encode message data which is not a string or bytes, and to decode received messages with its content type.
 
         :raises: OSError if the IoT Edge container is not configured correctly.
         :raises: ValueError if debug variables are invalid
@@ -292,6 +352,14 @@ class AbstractIoTHubModuleClient(AbstractIoTHubClient):
 
         :param bool websockets: Configuration Option. Default is False. Set to true if using MQTT over websockets.
         :param str product_info: Configuration Option. Default is empty string. The string contains arbitrary product info which is appended to the user agent string.
+        :param float telemetry_window_length: Configuration Option. Default is 1.0. The length in seconds of the windows that readings added with add_telemetry_readings are aggregated over before being sent.
+        :param str message_packing: Configuration Option. Default is None. Set to 'json' or 'binary' to pack small messages sent with send_message or send_message_to_output into fewer messages, carrying the format in the 'iothub-message-packing' custom property. Messages are only held to be packed while other messages are being sent, so a caller sending one message at a time is not delayed, but nothing is packed either; send with send_message_nowait, from several threads or with several coroutines to have messages packed.
+        :param int message_packing_max_size: Configuration Option. Default is 262144 (256 KB). The maximum size in bytes of a packed message, including its properties.
+        :param float message_packing_max_latency: Configuration Option. Default is 0.1. The longest time in seconds that a message waits to be packed, if the messages being sent have not been sent before then.
+        :param str message_compression: Configuration Option. Default is None. Set to 'gzip' or 'deflate' to compress outgoing message payloads, naming the format in the 'iothub-content-encoding' custom property. Incoming messages with the property are decompressed.
+        :param int message_compression_threshold: Configuration Option. Default is 1024. The size in bytes from which message payloads are compressed.
+        :param json_codec: Configuration Option. Default is a JSONCodec using the json module. The codec used for all JSON sent and received by the client, such as twins and method payloads. See :mod:`azure.iot.device.common.codec`.
+        :param payload_codec: Configuration Option. Default is None. A codec, such as a CBORCodec or MessagePackCodec, used to encode message data which is not a string or bytes, and to decode received messages with its content type.
 
         :returns: An instance of an IoTHub client that uses an X509 certificate for authentication.
         """
@@ -13,11 +13,13 @@ from azure.iot.device.iothub.abstract_clients import (
     AbstractIoTHubClient,
     AbstractIoTHubDeviceClient,
     AbstractIoTHubModuleClient,
+    _validate_telemetry_readings,
 )
 from azure.iot.device.iothub.models import Message
 from azure.iot.device.iothub.pipeline import constant
 from azure.iot.device.iothub.pipeline import exceptions as pipeline_exceptions
 from azure.iot.device import exceptions
+from azure.iot.device import patch
 from azure.iot.device.iothub.inbox_manager import InboxManager
 from .async_inbox import AsyncClientInbox
 
@@ -61,6 +63,7 @@ class GenericIoTHubClient(AbstractIoTHubClient):
         # **kwargs.
         super().__init__(**kwargs)
         self._inbox_manager = InboxManager(inbox_type=AsyncClientInbox)
+        self._inbox_manager.register_metrics(self._iothub_pipeline.metrics)
         self._iothub_pipeline.on_connected = self._on_connected
         self._iothub_pipeline.on_disconnected = self._on_disconnected
         self._iothub_pipeline.on_method_request_received = self._inbox_manager.route_method_request
@@ -146,6 +149,37 @@ class GenericIoTHubClient(AbstractIoTHubClient):
 
         logger.info("Successfully sent message to Hub")
 
+    async def add_telemetry_readings(self, readings):
+        """Adds numeric readings to the telemetry aggregated by the client.
+
+        Rather than being sent individually, readings are aggregated per channel over windows
+        of time, set by the telemetry_window_length parameter when creating the client (1 second
+        by default). At the end of each window a single message is sent for each channel that
+        received readings, holding their count, min, max, mean and stddev (standard deviation)
+        as JSON. The message has the custom property 'iothub-telemetry-aggregation' set to
+        'window'. A window that is still open when the client disconnects is sent first.
+
+        Readings are buffered without waiting for the window to be sent, so failures to send
+        an aggregated message are not reported here.
+
+        :param dict readings: The readings, mapping each channel name to a number, or to a list
+            of numbers to add several readings at once.
+
+        :raises: ValueError if a channel is given an empty list of readings, or a reading which
+            is not finite (NaN or infinity).
+        :raises: :class:`azure.iot.device.exceptions.ClientError` if there is an unexpected failure
+            during execution.
+        """
+        _validate_telemetry_readings(readings)
+
+        add_telemetry_readings_async = async_adapter.emulate_async(
+            self._iothub_pipeline.add_telemetry_readings
+        )
+
+        callback = async_adapter.AwaitableCallback()
+        await add_telemetry_readings_async(readings, callback=callback)
+        await handle_result(callback)
+
     async def receive_method_request(self, method_name=None):
         """Receive a method request via the Azure IoT Hub or Azure IoT Edge Hub.
 
@@ -466,3 +500,10 @@ class IoTHubModuleClient(GenericIoTHubClient, AbstractIoTHubModuleClient):
         method_response = await handle_result(callback)
         logger.info("Successfully invoked method")
         return method_response
+
+
+# Add shim implementations for all the inherited methods of the clients.
+# This is necessary to generate accurate online docs.
+# It SHOULD not impact the functionality of the methods themselves in any way.
+patch.add_shims_for_inherited_methods(IoTHubDeviceClient)
+patch.add_shims_for_inherited_methods(IoTHubModuleClient)
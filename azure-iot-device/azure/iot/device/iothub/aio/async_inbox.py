@@ -53,6 +53,13 @@ class AsyncClientInbox(AbstractInbox):
         """
         return self._queue.async_q.empty()
 
+    def qsize(self):
+        """Returns the number of items in the inbox
+
+        :returns: The number of items in the inbox
+        """
+        return self._queue.sync_q.qsize()
+
     def clear(self):
         """Remove all items from the inbox.
         """
@@ -8,18 +8,31 @@ import os
 import base64
 import json
 import six.moves.urllib as urllib
-import requests
-import requests_unixsocket
 import logging
 from .base_renewable_token_authentication_provider import BaseRenewableTokenAuthenticationProvider
 from azure.iot.device import constant
 from azure.iot.device.common.chainable_exception import ChainableException
 
-requests_unixsocket.monkeypatch()
-
 logger = logging.getLogger(__name__)
 
 
+_requests_patched = False
+
+
+def _patch_requests():
+    """Add support for unix domain sockets to requests.
+
+    This is deferred until an HSM is created, since requests is slow to import and
+    requests_unixsocket patches it for the whole process, which only IoT Edge modules need.
+    """
+    global _requests_patched
+    if not _requests_patched:
+        import requests_unixsocket
+
+        requests_unixsocket.monkeypatch()
+        _requests_patched = True
+
+
 class IoTEdgeError(ChainableException):
     pass
 
@@ -100,6 +113,7 @@ class IoTEdgeHsm(object):
         self.api_version = api_version
         self.module_generation_id = module_generation_id
         self.workload_uri = _format_socket_uri(workload_uri)
+        _patch_requests()
 
     # TODO: Is this really the right name? It returns a certificate FROM the trust bundle,
     # not the trust bundle itself
@@ -113,6 +127,8 @@ class IoTEdgeHsm(object):
 
         :raises: IoTEdgeError if unable to retrieve the certificate.
         """
+        import requests
+
         r = requests.get(
             self.workload_uri + "trust-bundle",
             params={"api-version": self.api_version},
@@ -159,6 +175,8 @@ class IoTEdgeHsm(object):
         )
         sign_request = {"keyId": "primary", "algo": "HMACSHA256", "data": encoded_data_str}
 
+        import requests
+
         r = requests.post(  # TODO: can we use json field instead of data?
             url=path,
             params={"api-version": self.api_version},
@@ -5,6 +5,7 @@
 # --------------------------------------------------------------------------
 """This module contains a manager for inboxes."""
 
+import functools
 import logging
 
 logger = logging.getLogger(__name__)
@@ -84,6 +85,33 @@ class InboxManager(object):
         """
         return self.twin_patch_inbox
 
+    def register_metrics(self, registry):
+        """Add gauges of the number of items waiting in each kind of Inbox to a client's metrics.
+
+        :param registry: The metrics of the client.
+        :type registry: :class:`azure.iot.device.common.metrics.MetricsRegistry`
+        """
+        for kind in ("c2d_message", "input_message", "method_request", "twin_patch"):
+            registry.gauge(
+                "inbox_depth",
+                functools.partial(self._inbox_depth, kind),
+                "Items waiting in the client's inboxes",
+                labels={"inbox": kind},
+            )
+
+    def _inbox_depth(self, kind):
+        """Return the number of items waiting in the Inboxes of a kind"""
+        if kind == "c2d_message":
+            inboxes = [self.c2d_message_inbox]
+        elif kind == "input_message":
+            inboxes = list(self.input_message_inboxes.values())
+        elif kind == "method_request":
+            inboxes = [self.generic_method_request_inbox]
+            inboxes.extend(self.named_method_request_inboxes.values())
+        else:
+            inboxes = [self.twin_patch_inbox]
+        return sum(inbox.qsize() for inbox in inboxes)
+
     def clear_all_method_requests(self):
         """Delete all method requests currently in inboxes.
         """
@@ -5,6 +5,7 @@
 # --------------------------------------------------------------------------
 """This module contains a class representing messages that are sent or received.
 """
+import threading
 from azure.iot.device import constant
 
 
@@ -28,6 +29,25 @@ class Message(object):
     :ivar output_name: Name of the output that the is being sent to.
     """
 
+    # Messages are allocated for every send and receive, so they have no __dict__
+    __slots__ = (
+        "data",
+        "custom_properties",
+        "lock_token",
+        "message_id",
+        "sequence_number",
+        "to",
+        "expiry_time_utc",
+        "enqueued_time",
+        "correlation_id",
+        "user_id",
+        "ack",
+        "content_encoding",
+        "content_type",
+        "output_name",
+        "_iothub_interface_id",
+    )
+
     def __init__(
         self,
         data,
@@ -75,3 +95,75 @@ class Message(object):
 
     def __str__(self):
         return str(self.data)
+
+
+# Attributes of a received message which are carried on the topic it was received on
+_TOPIC_ATTRIBUTES = frozenset(
+    [
+        "message_id",
+        "correlation_id",
+        "user_id",
+        "to",
+        "content_type",
+        "content_encoding",
+        "custom_properties",
+    ]
+)
+# Held while the properties of a received message are decoded, so that a thread using one while
+# another thread decodes them waits for the decoded value
+_decode_lock = threading.Lock()
+
+
+class _ReceivedMessage(Message):
+    """A message received from IoTHub whose properties are decoded from the raw topic it was
+    received on the first time one of them is used, rather than when it is received.
+
+    Attributes which are assigned before the properties are decoded keep the assigned value. The
+    message can be used from several threads while its properties are being decoded.
+
+    :param data: The raw payload of the message.
+    :param str topic: The topic the message was received on.
+    :param decode_properties: A function taking the topic and the message, and setting the
+        properties carried on the topic on the message.
+    """
+
+    __slots__ = ("_topic", "_decode_properties")
+
+    def __init__(self, data, topic, decode_properties):
+        # Message.__init__ is not called, as it would set the properties carried on the topic
+        self.data = data
+        self.lock_token = None
+        self.sequence_number = None
+        self.expiry_time_utc = None
+        self.enqueued_time = None
+        self.ack = None
+        self.output_name = None
+        self._iothub_interface_id = None
+        self._topic = topic
+        self._decode_properties = decode_properties
+
+    def __getattr__(self, name):
+        # Only called for attributes which have not been set
+        if name in _TOPIC_ATTRIBUTES:
+            with _decode_lock:
+                if self._decode_properties is not None:
+                    self._decode()
+            try:
+                # Unlike getattr, this does not fall back to __getattr__ for unset attributes
+                return object.__getattribute__(self, name)
+            except AttributeError:
+                pass
+        raise AttributeError("'{}' object has no attribute '{}'".format(type(self).__name__, name))
+
+    def _decode(self):
+        # The properties are decoded onto a Message, for the defaults of properties which are not
+        # on the topic, so that only decoded values are set on this message
+        decoded = Message(None)
+        self._decode_properties(self._topic, decoded)
+        for name in _TOPIC_ATTRIBUTES:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                setattr(self, name, getattr(decoded, name))
+        # Cleared last, so that the properties are decoded again if decoding fails
+        self._decode_properties = None
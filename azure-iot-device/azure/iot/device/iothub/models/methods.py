@@ -15,6 +15,8 @@ class MethodRequest(object):
     :ivar dict payload: The JSON payload being sent with the request.
     """
 
+    __slots__ = ("_request_id", "_name", "_payload")
+
     def __init__(self, request_id, name, payload):
         """Initializer for a MethodRequest.
 
@@ -39,6 +41,34 @@ class MethodRequest(object):
         return self._payload
 
 
+class _ReceivedMethodRequest(MethodRequest):
+    """A method request received from IoTHub whose payload is decoded from the raw payload
+    the first time it is used, rather than when it is received.
+
+    An error decoding the payload is raised from the payload property.
+
+    :param str request_id: The request id.
+    :param str name: The name of the method to be invoked.
+    :param bytes raw_payload: The encoded payload.
+    :param decode_payload: A function taking the encoded payload and returning the payload.
+    """
+
+    __slots__ = ("_raw_payload", "_decode_payload")
+
+    def __init__(self, request_id, name, raw_payload, decode_payload):
+        super(_ReceivedMethodRequest, self).__init__(request_id, name, None)
+        self._raw_payload = raw_payload
+        self._decode_payload = decode_payload
+
+    @property
+    def payload(self):
+        if self._decode_payload is not None:
+            self._payload = self._decode_payload(self._raw_payload)
+            self._decode_payload = None
+            self._raw_payload = None
+        return self._payload
+
+
 class MethodResponse(object):
     """Represents a response to a direct method.
 
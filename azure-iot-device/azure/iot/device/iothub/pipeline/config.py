@@ -9,6 +9,15 @@ from azure.iot.device.common.pipeline.config import BasePipelineConfig
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_TELEMETRY_WINDOW_LENGTH = 1.0
+
+# The largest device-to-cloud message the IoTHub accepts, including its properties
+MAX_MESSAGE_SIZE = 256 * 1024
+MESSAGE_PACKING_FORMATS = ("json", "binary")
+DEFAULT_MESSAGE_PACKING_MAX_LATENCY = 0.1
+MESSAGE_COMPRESSION_FORMATS = ("gzip", "deflate")
+DEFAULT_MESSAGE_COMPRESSION_THRESHOLD = 1024
+
 
 class IoTHubPipelineConfig(BasePipelineConfig):
     """A base class for storing all configurations/options shared across the Azure IoT Python Device Client Library.
@@ -16,15 +25,63 @@ class IoTHubPipelineConfig(BasePipelineConfig):
     config files.
     """
 
-    def __init__(self, product_info="", **kwargs):
+    def __init__(
+        self,
+        product_info="",
+        telemetry_window_length=DEFAULT_TELEMETRY_WINDOW_LENGTH,
+        message_packing=None,
+        message_packing_max_size=MAX_MESSAGE_SIZE,
+        message_packing_max_latency=DEFAULT_MESSAGE_PACKING_MAX_LATENCY,
+        message_compression=None,
+        message_compression_threshold=DEFAULT_MESSAGE_COMPRESSION_THRESHOLD,
+        payload_codec=None,
+        **kwargs
+    ):
         """Initializer for IoTHubPipelineConfig which passes all unrecognized keyword-args down to BasePipelineConfig
         to be evaluated. This stacked options setting is to allow for unique configuration options to exist between the
         IoTHub Client and the Provisioning Client, while maintaining a base configuration class with shared config options.
 
         :param str product_info: A custom identification string for the type of device connecting to Azure IoT Hub.
+        :param float telemetry_window_length: The length, in seconds, of the windows that telemetry readings are aggregated over.
+        :param str message_packing: The format ('json' or 'binary') that small messages are packed together in before being sent, or None to send each message on its own. Messages are only held to be packed while other messages are being sent.
+        :param int message_packing_max_size: The maximum size, in bytes, of a packed message including its properties.
+        :param float message_packing_max_latency: The longest time, in seconds, that a message waits to be packed before being sent.
+        :param str message_compression: The format ('gzip' or 'deflate') that outgoing messages are compressed with, or None to send them uncompressed.
+        :param int message_compression_threshold: The size, in bytes, from which outgoing message payloads are compressed.
+        :param payload_codec: The codec used to encode the data of outgoing messages which is not a string or bytes, and to decode the data of incoming messages with its content type, or None.
         """
         super(IoTHubPipelineConfig, self).__init__(**kwargs)
         self.product_info = product_info
+        if telemetry_window_length <= 0:
+            raise ValueError("telemetry_window_length must be greater than 0")
+        self.telemetry_window_length = telemetry_window_length
+        if message_packing is not None and message_packing not in MESSAGE_PACKING_FORMATS:
+            raise ValueError(
+                "message_packing must be one of {} or None".format(MESSAGE_PACKING_FORMATS)
+            )
+        if not 0 < message_packing_max_size <= MAX_MESSAGE_SIZE:
+            raise ValueError(
+                "message_packing_max_size must be greater than 0 and at most {}".format(
+                    MAX_MESSAGE_SIZE
+                )
+            )
+        if message_packing_max_latency <= 0:
+            raise ValueError("message_packing_max_latency must be greater than 0")
+        self.message_packing = message_packing
+        self.message_packing_max_size = message_packing_max_size
+        self.message_packing_max_latency = message_packing_max_latency
+        if (
+            message_compression is not None
+            and message_compression not in MESSAGE_COMPRESSION_FORMATS
+        ):
+            raise ValueError(
+                "message_compression must be one of {} or None".format(MESSAGE_COMPRESSION_FORMATS)
+            )
+        if message_compression_threshold < 0:
+            raise ValueError("message_compression_threshold must not be negative")
+        self.message_compression = message_compression
+        self.message_compression_threshold = message_compression_threshold
+        self.payload_codec = payload_codec
 
         # Now, the parameters below are not exposed to the user via kwargs. They need to be set by manipulating the IoTHubPipelineConfig object.
         # They are not in the BasePipelineConfig because these do not apply to the provisioning client.
@@ -12,3 +12,13 @@ INPUT_MSG = "input"
 METHODS = "methods"
 TWIN = "twin"
 TWIN_PATCHES = "twin_patches"
+
+# Custom property set on messages holding aggregated telemetry
+TELEMETRY_AGGREGATION_PROPERTY = "iothub-telemetry-aggregation"
+TELEMETRY_AGGREGATION_WINDOW = "window"
+
+# Custom property set on messages holding several packed messages, naming the packing format
+MESSAGE_PACKING_PROPERTY = "iothub-message-packing"
+
+# Custom property set on messages with compressed payloads, naming the compression format
+CONTENT_ENCODING_PROPERTY = "iothub-content-encoding"
@@ -55,6 +55,10 @@ class IoTHubPipeline(object):
             .append_stage(pipeline_stages_iothub.UseAuthProviderStage())
             .append_stage(pipeline_stages_iothub.TwinRequestResponseStage())
             .append_stage(pipeline_stages_base.CoordinateRequestAndResponseStage())
+            .append_stage(pipeline_stages_iothub.TelemetryAggregationStage())
+            .append_stage(pipeline_stages_iothub.PayloadCodecStage())
+            .append_stage(pipeline_stages_iothub.MessagePackingStage())
+            .append_stage(pipeline_stages_iothub.MessageCompressionStage())
             .append_stage(pipeline_stages_iothub_mqtt.IoTHubMQTTTranslationStage())
             .append_stage(pipeline_stages_base.ReconnectStage())
             .append_stage(pipeline_stages_base.AutoConnectStage())
@@ -100,6 +104,11 @@ class IoTHubPipeline(object):
             if self.on_disconnected:
                 self.on_disconnected()
 
+        client_id = auth_provider.device_id
+        if auth_provider.module_id:
+            client_id = "{}/{}".format(client_id, auth_provider.module_id)
+        self._pipeline.metrics.labels["client"] = client_id
+
         self._pipeline.on_pipeline_event_handler = _on_pipeline_event
         self._pipeline.on_connected_handler = _on_connected
         self._pipeline.on_disconnected_handler = _on_disconnected
@@ -180,6 +189,23 @@ class IoTHubPipeline(object):
             pipeline_ops_iothub.SendD2CMessageOperation(message=message, callback=on_complete)
         )
 
+    def add_telemetry_readings(self, readings, callback):
+        """
+        Add numeric telemetry readings to be aggregated and sent at the end of the current window.
+
+        :param dict readings: The readings, mapping channel names to a number or a list of numbers.
+        :param callback: callback which is called when the readings have been added.
+        """
+
+        def on_complete(op, error):
+            callback(error=error)
+
+        self._pipeline.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings=readings, callback=on_complete
+            )
+        )
+
     def send_output_event(self, message, callback):
         """
         Send an output message to the service.
@@ -332,3 +358,10 @@ class IoTHubPipeline(object):
         Read-only property to indicate if the transport is connected or not.
         """
         return self._pipeline.connected
+
+    @property
+    def metrics(self):
+        """
+        Read-only property with the metrics of the pipeline.
+        """
+        return self._pipeline.metrics
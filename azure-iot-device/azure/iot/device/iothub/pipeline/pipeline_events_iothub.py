@@ -11,6 +11,8 @@ class C2DMessageEvent(PipelineEvent):
     created by some converter stage based on a protocol-specific event
     """
 
+    __slots__ = ("message",)
+
     def __init__(self, message):
         """
         Initializer for C2DMessageEvent objects.
@@ -27,6 +29,8 @@ class InputMessageEvent(PipelineEvent):
     created by some converter stage based on a protocol-specific event
     """
 
+    __slots__ = ("input_name", "message")
+
     def __init__(self, input_name, message):
         """
         Initializer for InputMessageEvent objects.
@@ -46,6 +50,8 @@ class MethodRequestEvent(PipelineEvent):
     This object is probably created by some converter stage based on a protocol-specific event.
     """
 
+    __slots__ = ("method_request",)
+
     def __init__(self, method_request):
         super(MethodRequestEvent, self).__init__()
         self.method_request = method_request
@@ -57,6 +63,8 @@ class TwinDesiredPropertiesPatchEvent(PipelineEvent):
     object is probably created by some converter stage based on a protocol-specific event.
     """
 
+    __slots__ = ("patch",)
+
     def __init__(self, patch):
         super(TwinDesiredPropertiesPatchEvent, self).__init__()
         self.patch = patch
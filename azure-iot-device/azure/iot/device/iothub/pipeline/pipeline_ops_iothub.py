@@ -18,6 +18,8 @@ class SetX509AuthProviderOperation(PipelineOperation):
     very IoTHub-specific
     """
 
+    __slots__ = ("auth_provider",)
+
     def __init__(self, auth_provider, callback):
         """
         Initializer for SetAuthProviderOperation objects.
@@ -42,6 +44,8 @@ class SetAuthProviderOperation(PipelineOperation):
     very IoTHub-specific
     """
 
+    __slots__ = ("auth_provider",)
+
     def __init__(self, auth_provider, callback):
         """
         Initializer for SetAuthProviderOperation objects.
@@ -65,6 +69,16 @@ class SetIoTHubConnectionArgsOperation(PipelineOperation):
     IoTHub connections and would not apply to other types of client connections (such as a DPS client).
     """
 
+    __slots__ = (
+        "device_id",
+        "module_id",
+        "hostname",
+        "gateway_hostname",
+        "server_verification_cert",
+        "client_cert",
+        "sas_token",
+    )
+
     def __init__(
         self,
         device_id,
@@ -111,6 +125,8 @@ class SendD2CMessageOperation(PipelineOperation):
     This operation is in the group of IoTHub operations because it is very specific to the IoTHub client
     """
 
+    __slots__ = ("message",)
+
     def __init__(self, message, callback):
         """
         Initializer for SendD2CMessageOperation objects.
@@ -124,6 +140,29 @@ class SendD2CMessageOperation(PipelineOperation):
         self.message = message
 
 
+class AddTelemetryReadingsOperation(PipelineOperation):
+    """
+    A PipelineOperation object which contains numeric telemetry readings to be aggregated into
+    windowed statistics before being sent to an IoTHub or EdgeHub server.
+
+    This operation is in the group of IoTHub operations because it is very specific to the IoTHub client
+    """
+
+    __slots__ = ("readings",)
+
+    def __init__(self, readings, callback):
+        """
+        Initializer for AddTelemetryReadingsOperation objects.
+
+        :param dict readings: The readings, mapping channel names to a number or a list of numbers
+        :param Function callback: The function that gets called when this operation is complete or has failed.
+         The callback function must accept A PipelineOperation object which indicates the specific operation which
+         has completed or failed.
+        """
+        super(AddTelemetryReadingsOperation, self).__init__(callback=callback)
+        self.readings = readings
+
+
 class SendOutputEventOperation(PipelineOperation):
     """
     A PipelineOperation object which contains arguments used to send an output message to an EdgeHub server.
@@ -131,6 +170,8 @@ class SendOutputEventOperation(PipelineOperation):
     This operation is in the group of IoTHub operations because it is very specific to the IoTHub client
     """
 
+    __slots__ = ("message",)
+
     def __init__(self, message, callback):
         """
         Initializer for SendOutputEventOperation objects.
@@ -152,6 +193,8 @@ class SendMethodResponseOperation(PipelineOperation):
     This operation is in the group of IoTHub operations because it is very specific to the IoTHub client.
     """
 
+    __slots__ = ("method_response",)
+
     def __init__(self, method_response, callback):
         """
         Initializer for SendMethodResponseOperation objects.
@@ -176,6 +219,8 @@ class GetTwinOperation(PipelineOperation):
     :type twin: Twin
     """
 
+    __slots__ = ("twin",)
+
     def __init__(self, callback):
         """
         Initializer for GetTwinOperation objects.
@@ -190,6 +235,8 @@ class PatchTwinReportedPropertiesOperation(PipelineOperation):
     IoT Hub or Azure IoT Edge Hub service.
     """
 
+    __slots__ = ("patch",)
+
     def __init__(self, patch, callback):
         """
         Initializer for PatchTwinReportedPropertiesOperation object
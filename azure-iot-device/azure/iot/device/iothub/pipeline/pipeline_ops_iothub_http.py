@@ -13,6 +13,8 @@ class MethodInvokeOperation(PipelineOperation):
     This operation is in the group of EdgeHub operations because it is very specific to the EdgeHub client.
     """
 
+    __slots__ = ("target_device_id", "target_module_id", "method_params", "method_response")
+
     def __init__(self, target_device_id, target_module_id, method_params, callback):
         """
         Initializer for MethodInvokeOperation objects.
@@ -37,6 +39,8 @@ class GetStorageInfoOperation(PipelineOperation):
     A PipleineOperation object which contains arguments used to get the storage information from IoT Hub.
     """
 
+    __slots__ = ("blob_name", "storage_info")
+
     def __init__(self, blob_name, callback):
         """
         Initializer for GetStorageInfo objects.
@@ -59,6 +63,8 @@ class NotifyBlobUploadStatusOperation(PipelineOperation):
     A PipleineOperation object which contains arguments used to get the storage information from IoT Hub.
     """
 
+    __slots__ = ("correlation_id", "is_success", "request_status_code", "status_description")
+
     def __init__(self, correlation_id, is_success, status_code, status_description, callback):
         """
         Initializer for GetStorageInfo objects.
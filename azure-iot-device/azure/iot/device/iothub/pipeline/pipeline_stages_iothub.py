@@ -4,19 +4,36 @@
 # license information.
 # --------------------------------------------------------------------------
 
-import json
+import array
+import copy
+import datetime
 import logging
+import math
+import numbers
+import operator
+import struct
+import threading
+import time
+import weakref
+import zlib
+import six
 from azure.iot.device.common.pipeline import pipeline_ops_base, PipelineStage, pipeline_thread
 from azure.iot.device import exceptions
 from azure.iot.device.common import handle_exceptions
 from azure.iot.device.common.callable_weak_method import CallableWeakMethod
+from azure.iot.device.iothub.models import Message
 from . import pipeline_ops_iothub
-from . import constant
+from . import config, constant, mqtt_topic_iothub, pipeline_events_iothub
 
 logger = logging.getLogger(__name__)
 
 
 class UseAuthProviderStage(PipelineStage):
+    handled_op_types = (
+        pipeline_ops_iothub.SetAuthProviderOperation,
+        pipeline_ops_iothub.SetX509AuthProviderOperation,
+    )
+
     def __init__(self):
         super(UseAuthProviderStage, self).__init__()
         self.auth_provider = None
@@ -105,6 +122,11 @@ class TwinRequestResponseStage(PipelineStage):
     protocol-specific receive event into an ResponseEvent event.
     """
 
+    handled_op_types = (
+        pipeline_ops_iothub.GetTwinOperation,
+        pipeline_ops_iothub.PatchTwinReportedPropertiesOperation,
+    )
+
     @pipeline_thread.runs_on_pipeline_thread
     def _run_op(self, op):
         def map_twin_error(error, twin_op):
@@ -128,7 +150,11 @@ class TwinRequestResponseStage(PipelineStage):
                 logger.debug("{}({}): Got response for GetTwinOperation".format(self.name, op.name))
                 error = map_twin_error(error=error, twin_op=op)
                 if not error:
-                    op_waiting_for_response.twin = json.loads(op.response_body.decode("utf-8"))
+                    op_waiting_for_response.twin = (
+                        self.pipeline_root.pipeline_configuration.json_codec.decode(
+                            op.response_body
+                        )
+                    )
                 op_waiting_for_response.complete(error=error)
 
             self.send_op_down(
@@ -165,10 +191,630 @@ class TwinRequestResponseStage(PipelineStage):
                     request_type=constant.TWIN,
                     method="PATCH",
                     resource_location="/properties/reported/",
-                    request_body=json.dumps(op.patch),
+                    request_body=self.pipeline_root.pipeline_configuration.json_codec.encode(
+                        op.patch
+                    ),
                     callback=on_twin_response,
                 )
             )
 
         else:
             super(TwinRequestResponseStage, self)._run_op(op)
+
+
+class _TelemetryChannel(object):
+    """
+    The readings of one telemetry channel in the current window.
+
+    Readings are written into a preallocated array. When the array fills up, or the window
+    closes, the statistics of the whole array are folded into running statistics at once. The
+    mean and sum of squared deviations of each array are combined with those of the earlier
+    readings (Chan et al.), so the variance stays precise for readings of large magnitude.
+    """
+
+    __slots__ = ["buffer", "length", "count", "mean", "squared_deviations", "minimum", "maximum"]
+
+    def __init__(self, capacity):
+        self.buffer = array.array("d", [0.0]) * capacity
+        self.length = 0
+        self.count = 0
+        self.mean = 0.0
+        self.squared_deviations = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+
+    def add(self, values):
+        if isinstance(values, numbers.Number):
+            values = (values,)
+        values = array.array("d", values)
+        capacity = len(self.buffer)
+        start = 0
+        while start < len(values):
+            end = min(len(values), start + capacity - self.length)
+            self.buffer[self.length : self.length + end - start] = values[start:end]
+            self.length += end - start
+            start = end
+            if self.length == capacity:
+                self.fold()
+
+    def fold(self):
+        if not self.length:
+            return
+        values = self.buffer[: self.length]
+        batch_mean = math.fsum(values) / self.length
+        deviations = [value - batch_mean for value in values]
+        batch_squared_deviations = math.fsum(map(operator.mul, deviations, deviations))
+
+        count = self.count + self.length
+        delta = batch_mean - self.mean
+        self.mean += delta * self.length / count
+        self.squared_deviations += (
+            batch_squared_deviations + delta * delta * self.count * self.length / count
+        )
+        self.count = count
+        self.minimum = min(self.minimum, min(values))
+        self.maximum = max(self.maximum, max(values))
+        self.length = 0
+
+    def statistics(self):
+        self.fold()
+        return {
+            "count": self.count,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.mean,
+            "stddev": math.sqrt(self.squared_deviations / self.count),
+        }
+
+
+def _format_time(timestamp):
+    return datetime.datetime.utcfromtimestamp(timestamp).isoformat() + "Z"
+
+
+class TelemetryAggregationStage(PipelineStage):
+    """
+    PipelineStage which aggregates numeric telemetry readings over windows of time. Rather than
+    sending a message per reading, a single message is sent per window and channel, holding the
+    count, min, max, mean and standard deviation of the readings.
+
+    Windows are aligned to multiples of the telemetry_window_length in the pipeline
+    configuration. Any window still open is sent before the pipeline disconnects.
+
+    All other operations are passed down.
+    """
+
+    handled_op_types = (
+        pipeline_ops_iothub.AddTelemetryReadingsOperation,
+        pipeline_ops_base.DisconnectOperation,
+    )
+
+    # Number of readings buffered per channel before they are folded into the window statistics
+    channel_capacity = 1024
+
+    def __init__(self):
+        super(TelemetryAggregationStage, self).__init__()
+        self.channels = {}
+        self.window_start = None
+        self.window_end = None
+        self.window_timer = None
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _run_op(self, op):
+        if isinstance(op, pipeline_ops_iothub.AddTelemetryReadingsOperation):
+            now = time.time()
+            if self.window_end is not None and now >= self.window_end:
+                # The timer has expired, but has not yet run
+                self._send_window()
+            if self.window_start is None:
+                self._open_window(now)
+            for channel, values in op.readings.items():
+                if channel not in self.channels:
+                    self.channels[channel] = _TelemetryChannel(self.channel_capacity)
+                self.channels[channel].add(values)
+            op.complete()
+
+        elif isinstance(op, pipeline_ops_base.DisconnectOperation):
+            logger.debug("{}({}): sending open telemetry window".format(self.name, op.name))
+            self._send_window()
+            self.send_op_down(op)
+
+        else:
+            super(TelemetryAggregationStage, self)._run_op(op)
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _open_window(self, now):
+        window_length = self.pipeline_root.pipeline_configuration.telemetry_window_length
+        self.window_start = now - math.fmod(now, window_length)
+        self.window_end = self.window_start + window_length
+
+        self_weakref = weakref.ref(self)
+
+        @pipeline_thread.invoke_on_pipeline_thread_nowait
+        def on_window_timer_expired():
+            this = self_weakref()
+            if this:
+                this.window_timer = None
+                this._send_window()
+
+        self.window_timer = threading.Timer(self.window_end - now, on_window_timer_expired)
+        self.window_timer.daemon = True
+        self.window_timer.start()
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _send_window(self):
+        if self.window_timer:
+            self.window_timer.cancel()
+            self.window_timer = None
+        if self.window_start is None:
+            return
+
+        window = {
+            "windowStart": _format_time(self.window_start),
+            "windowEnd": _format_time(self.window_end),
+        }
+        channels = self.channels
+        self.channels = {}
+        self.window_start = None
+        self.window_end = None
+
+        @pipeline_thread.runs_on_pipeline_thread
+        def on_send_complete(op, error):
+            if error:
+                logger.error(
+                    "{}({}): failed to send aggregated telemetry: {}".format(
+                        self.name, op.name, error
+                    )
+                )
+                handle_exceptions.handle_background_exception(error)
+
+        custom_properties = {
+            constant.TELEMETRY_AGGREGATION_PROPERTY: constant.TELEMETRY_AGGREGATION_WINDOW
+        }
+        for channel_name, channel in channels.items():
+            channel.fold()
+            if not channel.count:
+                # The channel was added with an empty list of readings
+                continue
+            body = {"channel": channel_name}
+            body.update(window)
+            body.update(channel.statistics())
+            message = Message(self.pipeline_root.pipeline_configuration.json_codec.encode(body))
+            message.custom_properties.update(custom_properties)
+            logger.debug(
+                "{}: sending aggregated telemetry for channel {}".format(self.name, channel_name)
+            )
+            self.send_op_down(
+                pipeline_ops_iothub.SendD2CMessageOperation(
+                    message=message, callback=on_send_complete
+                )
+            )
+
+
+class PayloadCodecStage(PipelineStage):
+    """
+    PipelineStage which encodes the data of outgoing messages, and decodes the data of incoming
+    messages, with the payload_codec in the pipeline configuration.
+
+    Outgoing messages with data which is not a string or bytes are sent with the data encoded
+    and the content type of the codec. Incoming C2D and input messages with the content type of
+    the codec have their data decoded before being passed up; if decoding fails the message is
+    passed up as it is and the error reported as a background exception.
+
+    Nothing is done if payload_codec is not set. All other operations and events are passed on.
+    """
+
+    @property
+    def handled_op_types(self):
+        if self.pipeline_root.pipeline_configuration.payload_codec is None:
+            return ()
+        return (
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+        )
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _run_op(self, op):
+        payload_codec = self.pipeline_root.pipeline_configuration.payload_codec
+        if (
+            payload_codec is not None
+            and (
+                isinstance(op, pipeline_ops_iothub.SendD2CMessageOperation)
+                or isinstance(op, pipeline_ops_iothub.SendOutputEventOperation)
+            )
+            and not isinstance(op.message.data, (bytes, bytearray, six.text_type))
+        ):
+            # The caller's message is not changed, as it may be sent again
+            message = copy.copy(op.message)
+            message.data = payload_codec.encode(op.message.data)
+            message.content_type = payload_codec.content_type
+            op.message = message
+            self.send_op_down(op)
+        else:
+            super(PayloadCodecStage, self)._run_op(op)
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _handle_pipeline_event(self, event):
+        payload_codec = self.pipeline_root.pipeline_configuration.payload_codec
+        if (
+            payload_codec is not None
+            and (
+                isinstance(event, pipeline_events_iothub.C2DMessageEvent)
+                or isinstance(event, pipeline_events_iothub.InputMessageEvent)
+            )
+            and event.message.content_type == payload_codec.content_type
+        ):
+            try:
+                event.message.data = payload_codec.decode(event.message.data)
+            except Exception as e:
+                logger.error("{}: failed to decode message payload: {}".format(self.name, e))
+                handle_exceptions.handle_background_exception(e)
+        self.send_event_up(event)
+
+
+# Longest topic a message can be published on, as device and module ids are at most 128 characters
+_MAX_TELEMETRY_TOPIC_BASE = mqtt_topic_iothub.get_telemetry_topic_for_publish("d" * 128, "m" * 128)
+# Fixed header and topic length of an MQTT PUBLISH packet, which count towards the message size
+_MQTT_PUBLISH_OVERHEAD = 7
+# Length prefix of each payload in a binary packed message (unsigned 32-bit, big endian)
+_BINARY_LENGTH_PREFIX = struct.Struct(">I")
+_JSON_CONTENT_TYPE = "application/json"
+
+
+def _is_utf8(encoding):
+    return encoding is not None and encoding.lower().replace("-", "").replace("_", "") == "utf8"
+
+
+def _encode_payload(message, packing, json_codec):
+    """Return a message payload as bytes to be packed, or None if it cannot be packed"""
+    data = message.data
+    if isinstance(data, six.text_type):
+        # Text sent on its own is UTF-8 encoded, whatever the content encoding of the message,
+        # so it is only packed if that is its content encoding
+        if not _is_utf8(message.content_encoding):
+            return None
+        payload = data.encode("utf-8")
+    elif isinstance(data, (bytes, bytearray)):
+        payload = bytes(data)
+    elif packing == "json":
+        return json_codec.encode(data).encode("utf-8")
+    else:
+        return None
+    if packing == "json":
+        # Text and bytes are packed as they are, so each must be a JSON document
+        try:
+            json_codec.decode(payload)
+        except Exception:
+            return None
+    return payload
+
+
+class _PackedBatch(object):
+    """Payloads of messages with the same destination, waiting to be packed into one message"""
+
+    __slots__ = ["op_type", "message", "ops", "payloads", "size", "limit"]
+
+    def __init__(self, op_type, message, packing, max_size):
+        self.op_type = op_type
+        # The operations of the packed messages, completed when the packed message is sent
+        self.ops = []
+        self.message = Message(
+            None,
+            content_encoding=message.content_encoding,
+            content_type=message.content_type,
+            output_name=message.output_name,
+        )
+        self.message.custom_properties[constant.MESSAGE_PACKING_PROPERTY] = packing
+        self.payloads = []
+        self.size = 0
+        topic = mqtt_topic_iothub.encode_properties(self.message, _MAX_TELEMETRY_TOPIC_BASE)
+        self.limit = max_size - len(topic.encode("utf-8")) - _MQTT_PUBLISH_OVERHEAD
+        if packing == "json":
+            # Each payload is counted with the comma after it, and the brackets of the array
+            # take the place of the last comma
+            self.limit -= 1
+
+
+class MessagePackingStage(PipelineStage):
+    """
+    PipelineStage which packs small outgoing messages together, so that fewer messages are sent
+    to the IoTHub. A message is only held to be packed while other messages sent down by the stage
+    have not yet been sent; otherwise it is sent down at once, so a caller sending one message at
+    a time is not delayed. Messages are packed until the packed message would exceed the
+    message_packing_max_size in the pipeline configuration, including the properties encoded in
+    its topic, until the messages being sent have been sent, or until the oldest has waited for
+    message_packing_max_latency seconds.
+
+    With 'json' packing, the payloads are sent as the items of a JSON array, so only messages
+    with the application/json content type and UTF-8 content encoding are packed. Payloads that
+    are not strings or bytes are encoded with the json_codec, and strings and bytes are only
+    packed if the json_codec can decode them. With 'binary' packing, each payload is preceded by
+    its length as a 4-byte unsigned big-endian integer. Strings are only packed if the content
+    encoding of their message is UTF-8, as that is how they are sent on their own. Packed
+    messages carry the format in the iothub-message-packing custom property.
+
+    Only messages without a message id, correlation id, user id, expiry time or custom
+    properties are packed, and only with messages of the same type, output, content type and
+    content encoding; any other message is sent on its own, after the messages before it.
+
+    A single message waiting to be packed is sent on its own. Operations for packed messages are
+    completed when the packed message has been sent, with the error sending it if there is one. Messages waiting to be packed are sent before the
+    pipeline disconnects.
+
+    All other operations are passed down.
+    """
+
+    def __init__(self):
+        super(MessagePackingStage, self).__init__()
+        self.batch = None
+        self.batch_timer = None
+        # Number of messages sent down by the stage which have not yet been sent
+        self.in_flight = 0
+
+    @property
+    def handled_op_types(self):
+        if not self.pipeline_root.pipeline_configuration.message_packing:
+            return ()
+        return (
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+            pipeline_ops_base.DisconnectOperation,
+        )
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _run_op(self, op):
+        packing = self.pipeline_root.pipeline_configuration.message_packing
+        if packing and (
+            isinstance(op, pipeline_ops_iothub.SendD2CMessageOperation)
+            or isinstance(op, pipeline_ops_iothub.SendOutputEventOperation)
+        ):
+            payload = self._packable_payload(op.message, packing)
+            if payload is not None and self.batch is None and not self.in_flight:
+                # Nothing is being sent that more messages could be packed while waiting for
+                self._send_unpacked(op)
+            elif payload is None or not self._add_to_batch(op, payload, packing):
+                self._send_batch()
+                self._send_unpacked(op)
+
+        elif isinstance(op, pipeline_ops_base.DisconnectOperation):
+            self._send_batch()
+            self.send_op_down(op)
+
+        else:
+            super(MessagePackingStage, self)._run_op(op)
+
+    def _packable_payload(self, message, packing):
+        if (
+            message.message_id
+            or message.correlation_id
+            or message.user_id
+            or message.to
+            or message.expiry_time_utc
+            or message.iothub_interface_id
+            or message.custom_properties
+        ):
+            return None
+        if packing == "json" and (
+            message.content_type != _JSON_CONTENT_TYPE or not _is_utf8(message.content_encoding)
+        ):
+            return None
+        return _encode_payload(
+            message, packing, self.pipeline_root.pipeline_configuration.json_codec
+        )
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _add_to_batch(self, op, payload, packing):
+        """Add a payload to the batch, sending the batch first if the payload does not fit.
+        Returns False if the payload is too large to be packed at all."""
+        message = op.message
+        batch = self.batch
+        if batch is not None and (
+            type(op) is not batch.op_type
+            or message.output_name != batch.message.output_name
+            or message.content_type != batch.message.content_type
+            or message.content_encoding != batch.message.content_encoding
+        ):
+            self._send_batch()
+            batch = None
+
+        # Both formats add a fixed number of bytes per payload, a comma or a length prefix
+        size = len(payload) + (1 if packing == "json" else _BINARY_LENGTH_PREFIX.size)
+        if batch is not None and batch.size + size > batch.limit:
+            self._send_batch()
+            batch = None
+        if batch is None:
+            batch = _PackedBatch(
+                type(op),
+                message,
+                packing,
+                self.pipeline_root.pipeline_configuration.message_packing_max_size,
+            )
+            if size > batch.limit:
+                return False
+            self.batch = batch
+            self._start_batch_timer()
+
+        batch.ops.append(op)
+        batch.payloads.append(payload)
+        batch.size += size
+        return True
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _send_unpacked(self, op):
+        self.in_flight += 1
+        op.add_callback(self._on_send_complete)
+        self.send_op_down(op)
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _on_send_complete(self, op, error):
+        self.in_flight -= 1
+        if not self.in_flight and self.batch is not None:
+            # There is nothing left to wait for before sending the messages waiting to be packed
+            self._send_batch()
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _start_batch_timer(self):
+        self_weakref = weakref.ref(self)
+
+        @pipeline_thread.invoke_on_pipeline_thread_nowait
+        def on_batch_timer_expired():
+            this = self_weakref()
+            if this:
+                this.batch_timer = None
+                this._send_batch()
+
+        self.batch_timer = threading.Timer(
+            self.pipeline_root.pipeline_configuration.message_packing_max_latency,
+            on_batch_timer_expired,
+        )
+        self.batch_timer.daemon = True
+        self.batch_timer.start()
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _send_batch(self):
+        if self.batch_timer:
+            self.batch_timer.cancel()
+            self.batch_timer = None
+        batch = self.batch
+        if batch is None:
+            return
+        self.batch = None
+        if len(batch.ops) == 1:
+            # Packing a single message would only add the packing property to it
+            self._send_unpacked(batch.ops[0])
+            return
+
+        message = batch.message
+        if message.custom_properties[constant.MESSAGE_PACKING_PROPERTY] == "json":
+            message.data = b"[" + b",".join(batch.payloads) + b"]"
+        else:
+            message.data = b"".join(
+                _BINARY_LENGTH_PREFIX.pack(len(payload)) + payload for payload in batch.payloads
+            )
+
+        @pipeline_thread.runs_on_pipeline_thread
+        def on_send_complete(op, error):
+            if error:
+                logger.error(
+                    "{}({}): failed to send packed message: {}".format(self.name, op.name, error)
+                )
+            for packed_op in batch.ops:
+                packed_op.complete(error=error)
+            self._on_send_complete(op, error)
+
+        logger.debug("{}: sending {} packed messages".format(self.name, len(batch.payloads)))
+        self.in_flight += 1
+        self.send_op_down(batch.op_type(message=message, callback=on_send_complete))
+
+
+# Header of a gzip member without a file name or modification time, compressed with deflate
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+_GZIP_TRAILER = struct.Struct("<II")
+# Window size which makes zlib detect and accept either a zlib or a gzip header
+_ZLIB_OR_GZIP_WBITS = 32 + zlib.MAX_WBITS
+
+
+def _compress(payload, compression):
+    """Compress a payload in the zlib format for 'deflate', or the gzip format for 'gzip'"""
+    compressed = zlib.compress(payload)
+    if compression == "deflate":
+        return compressed
+    # Rewrap the deflate data from the zlib format (2 byte header, 4 byte checksum) as gzip
+    return (
+        _GZIP_HEADER
+        + compressed[2:-4]
+        + _GZIP_TRAILER.pack(zlib.crc32(payload) & 0xFFFFFFFF, len(payload) & 0xFFFFFFFF)
+    )
+
+
+class MessageCompressionStage(PipelineStage):
+    """
+    PipelineStage which compresses the payloads of outgoing messages, and decompresses the
+    payloads of incoming messages.
+
+    Outgoing messages with a payload of at least message_compression_threshold bytes are
+    compressed in the message_compression format of the pipeline configuration, which is named
+    in the iothub-content-encoding custom property. A message is sent uncompressed if
+    compressing does not make it smaller, or if it already has the property. 'deflate' is the
+    zlib format, as in HTTP. The content_encoding of the message is left alone, as it names the
+    character set of the uncompressed payload.
+
+    Incoming C2D and input messages with the iothub-content-encoding property set to 'gzip'
+    or 'deflate' are decompressed, and the property removed, before being passed up.
+
+    Payloads are compressed and decompressed with the one-shot zlib functions, so no compressor
+    objects are created per message. Nothing is done if message_compression is not set.
+
+    All other operations and events are passed on.
+    """
+
+    @property
+    def handled_op_types(self):
+        if not self.pipeline_root.pipeline_configuration.message_compression:
+            return ()
+        return (
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+        )
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _run_op(self, op):
+        compression = self.pipeline_root.pipeline_configuration.message_compression
+        if compression and (
+            isinstance(op, pipeline_ops_iothub.SendD2CMessageOperation)
+            or isinstance(op, pipeline_ops_iothub.SendOutputEventOperation)
+        ):
+            op.message = self._compress_message(op.message, compression)
+            self.send_op_down(op)
+        else:
+            super(MessageCompressionStage, self)._run_op(op)
+
+    def _compress_message(self, message, compression):
+        """Return a compressed copy of a message, or the message itself if it is not compressed"""
+        if constant.CONTENT_ENCODING_PROPERTY in message.custom_properties:
+            return message
+        data = message.data
+        if isinstance(data, six.text_type):
+            data = data.encode("utf-8")
+        elif isinstance(data, bytearray):
+            data = bytes(data)
+        elif not isinstance(data, bytes):
+            return message
+        if len(data) < self.pipeline_root.pipeline_configuration.message_compression_threshold:
+            return message
+
+        compressed = _compress(data, compression)
+        if len(compressed) >= len(data):
+            return message
+        logger.debug(
+            "{}: compressed message payload from {} to {} bytes".format(
+                self.name, len(data), len(compressed)
+            )
+        )
+        # The caller's message is not changed, as it may be sent again
+        compressed_message = copy.copy(message)
+        compressed_message.data = compressed
+        compressed_message.custom_properties = dict(message.custom_properties)
+        compressed_message.custom_properties[constant.CONTENT_ENCODING_PROPERTY] = compression
+        return compressed_message
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _handle_pipeline_event(self, event):
+        if self.pipeline_root.pipeline_configuration.message_compression and (
+            isinstance(event, pipeline_events_iothub.C2DMessageEvent)
+            or isinstance(event, pipeline_events_iothub.InputMessageEvent)
+        ):
+            self._decompress_message(event.message)
+        self.send_event_up(event)
+
+    def _decompress_message(self, message):
+        compression = message.custom_properties.get(constant.CONTENT_ENCODING_PROPERTY)
+        if compression not in config.MESSAGE_COMPRESSION_FORMATS:
+            return
+        try:
+            message.data = zlib.decompress(message.data, _ZLIB_OR_GZIP_WBITS)
+        except zlib.error as e:
+            # The message is passed up as it is, still carrying the property
+            logger.error("{}: failed to decompress message payload: {}".format(self.name, e))
+            handle_exceptions.handle_background_exception(e)
+        else:
+            del message.custom_properties[constant.CONTENT_ENCODING_PROPERTY]
@@ -5,7 +5,6 @@
 # --------------------------------------------------------------------------
 
 import logging
-import json
 import six.moves.urllib as urllib
 from azure.iot.device.common.pipeline import (
     pipeline_events_base,
@@ -81,7 +80,7 @@ class IoTHubHTTPTranslationStage(PipelineStage):
             )
             #  if the target is a module.
 
-            body = json.dumps(op.method_params)
+            body = self.pipeline_root.pipeline_configuration.json_codec.encode(op.method_params)
             path = http_path_iothub.get_method_invoke_path(op.target_device_id, op.target_module_id)
             # Note we do not add the sas Authorization header here. Instead we add it later on in the stage above
             # the transport layer, since that stage stores the updated SAS and also X509 certs if that is what is
@@ -108,8 +107,10 @@ class IoTHubHTTPTranslationStage(PipelineStage):
                 )
                 error = map_http_error(error=error, http_op=op)
                 if not error:
-                    op_waiting_for_response.method_response = json.loads(
-                        op.response_body.decode("utf-8")
+                    op_waiting_for_response.method_response = (
+                        self.pipeline_root.pipeline_configuration.json_codec.decode(
+                            op.response_body
+                        )
                     )
                 op_waiting_for_response.complete(error=error)
 
@@ -132,7 +133,9 @@ class IoTHubHTTPTranslationStage(PipelineStage):
                 apiVersion=pkg_constant.IOTHUB_API_VERSION
             )
             path = http_path_iothub.get_storage_info_for_blob_path(self.device_id)
-            body = json.dumps({"blobName": op.blob_name})
+            body = self.pipeline_root.pipeline_configuration.json_codec.encode(
+                {"blobName": op.blob_name}
+            )
             user_agent = urllib.parse.quote_plus(
                 pkg_constant.USER_AGENT
                 + str(self.pipeline_root.pipeline_configuration.product_info)
@@ -153,8 +156,10 @@ class IoTHubHTTPTranslationStage(PipelineStage):
                 )
                 error = map_http_error(error=error, http_op=op)
                 if not error:
-                    op_waiting_for_response.storage_info = json.loads(
-                        op.response_body.decode("utf-8")
+                    op_waiting_for_response.storage_info = (
+                        self.pipeline_root.pipeline_configuration.json_codec.decode(
+                            op.response_body
+                        )
                     )
                 op_waiting_for_response.complete(error=error)
 
@@ -177,7 +182,7 @@ class IoTHubHTTPTranslationStage(PipelineStage):
                 apiVersion=pkg_constant.IOTHUB_API_VERSION
             )
             path = http_path_iothub.get_notify_blob_upload_status_path(self.device_id)
-            body = json.dumps(
+            body = self.pipeline_root.pipeline_configuration.json_codec.encode(
                 {
                     "correlationId": op.correlation_id,
                     "isSuccess": op.is_success,
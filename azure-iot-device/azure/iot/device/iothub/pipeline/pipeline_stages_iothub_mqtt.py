@@ -5,7 +5,6 @@
 # --------------------------------------------------------------------------
 
 import logging
-import json
 import six.moves.urllib as urllib
 from azure.iot.device.common.pipeline import (
     pipeline_events_base,
@@ -15,7 +14,8 @@ from azure.iot.device.common.pipeline import (
     PipelineStage,
     pipeline_thread,
 )
-from azure.iot.device.iothub.models import Message, MethodRequest
+from azure.iot.device.iothub.models.message import _ReceivedMessage
+from azure.iot.device.iothub.models.methods import _ReceivedMethodRequest
 from . import pipeline_ops_iothub, pipeline_events_iothub, mqtt_topic_iothub
 from . import constant as pipeline_constant
 from . import exceptions as pipeline_exceptions
@@ -30,6 +30,17 @@ class IoTHubMQTTTranslationStage(PipelineStage):
     converts mqtt pipeline events into Iot and IoTHub pipeline events.
     """
 
+    handled_op_types = (
+        pipeline_ops_iothub.SetIoTHubConnectionArgsOperation,
+        pipeline_ops_base.UpdateSasTokenOperation,
+        pipeline_ops_iothub.SendD2CMessageOperation,
+        pipeline_ops_iothub.SendOutputEventOperation,
+        pipeline_ops_iothub.SendMethodResponseOperation,
+        pipeline_ops_base.EnableFeatureOperation,
+        pipeline_ops_base.DisableFeatureOperation,
+        pipeline_ops_base.RequestOperation,
+    )
+
     def __init__(self):
         super(IoTHubMQTTTranslationStage, self).__init__()
         self.feature_to_topic = {}
@@ -146,7 +157,9 @@ class IoTHubMQTTTranslationStage(PipelineStage):
             topic = mqtt_topic_iothub.get_method_topic_for_publish(
                 op.method_response.request_id, str(op.method_response.status)
             )
-            payload = json.dumps(op.method_response.payload)
+            payload = self.pipeline_root.pipeline_configuration.json_codec.encode(
+                op.method_response.payload
+            )
             worker_op = op.spawn_worker_op(
                 worker_op_type=pipeline_ops_mqtt.MQTTPublishOperation, topic=topic, payload=payload
             )
@@ -217,28 +230,34 @@ class IoTHubMQTTTranslationStage(PipelineStage):
         """
         Pipeline Event handler function to convert incoming MQTT messages into the appropriate IoTHub
         events, based on the topic of the message
+
+        The properties of messages and the payloads of method requests are decoded when they are
+        first used, rather than here on the pipeline thread.
         """
         if isinstance(event, pipeline_events_mqtt.IncomingMQTTMessageEvent):
             topic = event.topic
 
             if mqtt_topic_iothub.is_c2d_topic(topic, self.device_id):
-                message = Message(event.payload)
-                mqtt_topic_iothub.extract_properties_from_topic(topic, message)
+                message = _ReceivedMessage(
+                    event.payload, topic, mqtt_topic_iothub.extract_properties_from_topic
+                )
                 self.send_event_up(pipeline_events_iothub.C2DMessageEvent(message))
 
             elif mqtt_topic_iothub.is_input_topic(topic, self.device_id, self.module_id):
-                message = Message(event.payload)
-                mqtt_topic_iothub.extract_properties_from_topic(topic, message)
+                message = _ReceivedMessage(
+                    event.payload, topic, mqtt_topic_iothub.extract_properties_from_topic
+                )
                 input_name = mqtt_topic_iothub.get_input_name_from_topic(topic)
                 self.send_event_up(pipeline_events_iothub.InputMessageEvent(input_name, message))
 
             elif mqtt_topic_iothub.is_method_topic(topic):
                 request_id = mqtt_topic_iothub.get_method_request_id_from_topic(topic)
                 method_name = mqtt_topic_iothub.get_method_name_from_topic(topic)
-                method_received = MethodRequest(
+                method_received = _ReceivedMethodRequest(
                     request_id=request_id,
                     name=method_name,
-                    payload=json.loads(event.payload.decode("utf-8")),
+                    raw_payload=event.payload,
+                    decode_payload=self.pipeline_root.pipeline_configuration.json_codec.decode,
                 )
                 self.send_event_up(pipeline_events_iothub.MethodRequestEvent(method_received))
 
@@ -254,7 +273,9 @@ class IoTHubMQTTTranslationStage(PipelineStage):
             elif mqtt_topic_iothub.is_twin_desired_property_patch_topic(topic):
                 self.send_event_up(
                     pipeline_events_iothub.TwinDesiredPropertiesPatchEvent(
-                        patch=json.loads(event.payload.decode("utf-8"))
+                        patch=self.pipeline_root.pipeline_configuration.json_codec.decode(
+                            event.payload
+                        )
                     )
                 )
 
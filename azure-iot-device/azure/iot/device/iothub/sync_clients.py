@@ -8,10 +8,12 @@ Azure IoTHub Device SDK for Python.
 """
 
 import logging
+import sys
 from .abstract_clients import (
     AbstractIoTHubClient,
     AbstractIoTHubDeviceClient,
     AbstractIoTHubModuleClient,
+    _validate_telemetry_readings,
 )
 from .models import Message
 from .inbox_manager import InboxManager
@@ -19,25 +21,33 @@ from .sync_inbox import SyncClientInbox, InboxEmpty
 from .pipeline import constant as pipeline_constant
 from .pipeline import exceptions as pipeline_exceptions
 from azure.iot.device import exceptions
+from azure.iot.device import patch
 from azure.iot.device.common.evented_callback import EventedCallback
+from azure.iot.device.common.future_callback import FutureCallback
 from azure.iot.device.common.callable_weak_method import CallableWeakMethod
 
 logger = logging.getLogger(__name__)
 
 
+def convert_error(e):
+    """Return the exception raised to the user for an error from the pipeline"""
+    if isinstance(e, pipeline_exceptions.ConnectionDroppedError):
+        return exceptions.ConnectionDroppedError(message="Lost connection to IoTHub", cause=e)
+    elif isinstance(e, pipeline_exceptions.ConnectionFailedError):
+        return exceptions.ConnectionFailedError(message="Could not connect to IoTHub", cause=e)
+    elif isinstance(e, pipeline_exceptions.UnauthorizedError):
+        return exceptions.CredentialError(message="Credentials invalid, could not connect", cause=e)
+    elif isinstance(e, pipeline_exceptions.ProtocolClientError):
+        return exceptions.ClientError(message="Error in the IoTHub client", cause=e)
+    else:
+        return exceptions.ClientError(message="Unexpected failure", cause=e)
+
+
 def handle_result(callback):
     try:
         return callback.wait_for_completion()
-    except pipeline_exceptions.ConnectionDroppedError as e:
-        raise exceptions.ConnectionDroppedError(message="Lost connection to IoTHub", cause=e)
-    except pipeline_exceptions.ConnectionFailedError as e:
-        raise exceptions.ConnectionFailedError(message="Could not connect to IoTHub", cause=e)
-    except pipeline_exceptions.UnauthorizedError as e:
-        raise exceptions.CredentialError(message="Credentials invalid, could not connect", cause=e)
-    except pipeline_exceptions.ProtocolClientError as e:
-        raise exceptions.ClientError(message="Error in the IoTHub client", cause=e)
     except Exception as e:
-        raise exceptions.ClientError(message="Unexpected failure", cause=e)
+        raise convert_error(e)
 
 
 class GenericIoTHubClient(AbstractIoTHubClient):
@@ -62,6 +72,7 @@ class GenericIoTHubClient(AbstractIoTHubClient):
         # **kwargs.
         super(GenericIoTHubClient, self).__init__(**kwargs)
         self._inbox_manager = InboxManager(inbox_type=SyncClientInbox)
+        self._inbox_manager.register_metrics(self._iothub_pipeline.metrics)
         self._iothub_pipeline.on_connected = CallableWeakMethod(self, "_on_connected")
         self._iothub_pipeline.on_disconnected = CallableWeakMethod(self, "_on_disconnected")
         self._iothub_pipeline.on_method_request_received = CallableWeakMethod(
@@ -157,6 +168,55 @@ class GenericIoTHubClient(AbstractIoTHubClient):
 
         logger.info("Successfully sent message to Hub")
 
+    def send_message_nowait(self, message):
+        """Sends a message to the default events endpoint on the Azure IoT Hub or Azure IoT Edge Hub
+        instance, without waiting for it to be sent.
+
+        Unlike send_message, this function returns as soon as the message has been passed to
+        the client's pipeline, so one thread can have many messages being sent at once.
+
+        :param message: The actual message to send. Anything passed that is not an instance of the
+            Message class will be converted to Message object.
+        :type message: :class:`azure.iot.device.Message` or str
+
+        :returns: A Future, whose result is None once the service has acknowledged receipt of the
+            message, or whose exception is the error send_message would raise.
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        if not isinstance(message, Message):
+            message = Message(message)
+
+        callback = FutureCallback(convert_error=convert_error)
+        self._iothub_pipeline.send_message(message, callback=callback)
+        return callback.future
+
+    def add_telemetry_readings(self, readings):
+        """Adds numeric readings to the telemetry aggregated by the client.
+
+        Rather than being sent individually, readings are aggregated per channel over windows
+        of time, set by the telemetry_window_length parameter when creating the client (1 second
+        by default). At the end of each window a single message is sent for each channel that
+        received readings, holding their count, min, max, mean and stddev (standard deviation)
+        as JSON. The message has the custom property 'iothub-telemetry-aggregation' set to
+        'window'. A window that is still open when the client disconnects is sent first.
+
+        Readings are buffered without waiting for the window to be sent, so failures to send
+        an aggregated message are not reported here.
+
+        :param dict readings: The readings, mapping each channel name to a number, or to a list
+            of numbers to add several readings at once.
+
+        :raises: ValueError if a channel is given an empty list of readings, or a reading which
+            is not finite (NaN or infinity).
+        :raises: :class:`azure.iot.device.exceptions.ClientError` if there is an unexpected failure
+            during execution.
+        """
+        _validate_telemetry_readings(readings)
+
+        callback = EventedCallback()
+        self._iothub_pipeline.add_telemetry_readings(readings, callback=callback)
+        handle_result(callback)
+
     def receive_method_request(self, method_name=None, block=True, timeout=None):
         """Receive a method request via the Azure IoT Hub or Azure IoT Edge Hub.
 
@@ -211,6 +271,24 @@ class GenericIoTHubClient(AbstractIoTHubClient):
 
         logger.info("Successfully sent method response to Hub")
 
+    def send_method_response_nowait(self, method_response):
+        """Send a response to a method request via the Azure IoT Hub or Azure IoT Edge Hub,
+        without waiting for it to be sent.
+
+        Unlike send_method_response, this function returns as soon as the response has been
+        passed to the client's pipeline.
+
+        :param method_response: The MethodResponse to send.
+        :type method_response: :class:`azure.iot.device.MethodResponse`
+
+        :returns: A Future, whose result is None once the service has acknowledged receipt of the
+            response, or whose exception is the error send_method_response would raise.
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        callback = FutureCallback(convert_error=convert_error)
+        self._iothub_pipeline.send_method_response(method_response, callback=callback)
+        return callback.future
+
     def _enable_feature(self, feature_name):
         """Enable an Azure IoT Hub feature.
 
@@ -290,6 +368,31 @@ class GenericIoTHubClient(AbstractIoTHubClient):
 
         logger.info("Successfully patched twin")
 
+    def patch_twin_reported_properties_nowait(self, reported_properties_patch):
+        """
+        Update reported properties with the Azure IoT Hub or Azure IoT Edge Hub service, without
+        waiting for the patch to be acknowledged.
+
+        Unlike patch_twin_reported_properties, this function returns as soon as the patch has
+        been passed to the client's pipeline. The first time the twin is used, this function
+        still waits for the client to subscribe to twin responses.
+
+        :param reported_properties_patch: Twin Reported Properties patch as a JSON dict
+        :type reported_properties_patch: dict
+
+        :returns: A Future, whose result is None once the service has acknowledged the patch, or
+            whose exception is the error patch_twin_reported_properties would raise.
+        :rtype: :class:`concurrent.futures.Future`
+        """
+        if not self._iothub_pipeline.feature_enabled[pipeline_constant.TWIN]:
+            self._enable_feature(pipeline_constant.TWIN)
+
+        callback = FutureCallback(convert_error=convert_error)
+        self._iothub_pipeline.patch_twin_reported_properties(
+            patch=reported_properties_patch, callback=callback
+        )
+        return callback.future
+
     def receive_twin_desired_properties_patch(self, block=True, timeout=None):
         """
         Receive a desired property patch via the Azure IoT Hub or Azure IoT Edge Hub.
@@ -503,3 +606,11 @@ class IoTHubModuleClient(GenericIoTHubClient, AbstractIoTHubModuleClient):
         invoke_method_response = handle_result(callback)
         logger.info("Successfully invoked method")
         return invoke_method_response
+
+
+if sys.version_info > (3, 5):  # This only works for python 3.5+ at present
+    # Add shim implementations for all the inherited methods of the clients.
+    # This is necessary to generate accurate online docs.
+    # It SHOULD not impact the functionality of the methods themselves in any way.
+    patch.add_shims_for_inherited_methods(IoTHubDeviceClient)
+    patch.add_shims_for_inherited_methods(IoTHubModuleClient)
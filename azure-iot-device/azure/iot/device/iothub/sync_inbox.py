@@ -54,6 +54,14 @@ class AbstractInbox:
         """
         pass
 
+    @abstractmethod
+    def qsize(self):
+        """Returns the number of items in the inbox
+
+        :returns: The number of items in the inbox
+        """
+        pass
+
     @abstractmethod
     def clear(self):
         """Remove all items from the inbox.
@@ -110,6 +118,13 @@ class SyncClientInbox(AbstractInbox):
         """
         return self._queue.empty()
 
+    def qsize(self):
+        """Returns the number of items in the inbox
+
+        :returns: The number of items in the inbox
+        """
+        return self._queue.qsize()
+
     def clear(self):
         """Remove all items from the inbox.
         """
@@ -4,7 +4,36 @@ This library provides functionality that enables zero-touch, just-in-time provis
 human intervention, enabling customers to provision millions of devices in a secure and scalable manner.
 
 """
-from .provisioning_device_client import ProvisioningDeviceClient
-from .models import RegistrationResult
+import importlib
+import sys
+
+# Public names, and the module each is imported from once first used, so that the models can be
+# imported without the client and its transport
+_lazy_names = {
+    "ProvisioningDeviceClient": ".provisioning_device_client",
+    "RegistrationResult": ".models",
+}
 
 __all__ = ["ProvisioningDeviceClient", "RegistrationResult"]
+
+if sys.version_info >= (3, 7):
+    from azure.iot.device import _import_submodule
+
+    def __getattr__(name):
+        if name in _lazy_names:
+            value = getattr(importlib.import_module(_lazy_names[name], __name__), name)
+        else:
+            value = _import_submodule(__name__, name)
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        import pkgutil
+
+        submodules = set(module.name for module in pkgutil.iter_modules(__path__))
+        return sorted(set(globals()) | set(_lazy_names) | submodules)
+
+else:
+    # Module __getattr__ (PEP 562) is not supported, so everything is imported up front
+    from .provisioning_device_client import ProvisioningDeviceClient
+    from .models import RegistrationResult
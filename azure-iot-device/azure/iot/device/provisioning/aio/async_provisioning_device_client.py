@@ -19,6 +19,7 @@ from azure.iot.device.provisioning.abstract_provisioning_device_client import (
 )
 from azure.iot.device.provisioning.pipeline import exceptions as pipeline_exceptions
 from azure.iot.device import exceptions
+from azure.iot.device import patch
 from azure.iot.device.provisioning.pipeline import constant as dps_constant
 
 logger = logging.getLogger(__name__)
@@ -91,3 +92,9 @@ class ProvisioningDeviceClient(AbstractProvisioningDeviceClient):
         await handle_result(subscription_complete)
 
         logger.info("Successfully subscribed to Device Provisioning Service to receive responses")
+
+
+# Add shim implementations for all the inherited methods of the client.
+# This is necessary to generate accurate online docs.
+# It SHOULD not impact the functionality of the methods themselves in any way.
+patch.add_shims_for_inherited_methods(ProvisioningDeviceClient)
@@ -16,6 +16,8 @@ class SetSymmetricKeySecurityClientOperation(PipelineOperation):
     very provisioning-specific
     """
 
+    __slots__ = ("security_client",)
+
     def __init__(self, security_client, callback):
         """
         Initializer for SetSecurityClient.
@@ -41,6 +43,8 @@ class SetX509SecurityClientOperation(PipelineOperation):
     (such as a Provisioning client).
     """
 
+    __slots__ = ("security_client",)
+
     def __init__(self, security_client, callback):
         """
         Initializer for SetSecurityClient.
@@ -66,6 +70,8 @@ class SetProvisioningClientConnectionArgsOperation(PipelineOperation):
     (such as a Provisioning client).
     """
 
+    __slots__ = ("provisioning_host", "registration_id", "id_scope", "client_cert", "sas_token")
+
     def __init__(
         self,
         provisioning_host,
@@ -99,6 +105,15 @@ class RegisterOperation(PipelineOperation):
     This operation is in the group of DPS operations because it is very specific to the DPS client.
     """
 
+    __slots__ = (
+        "request_payload",
+        "registration_id",
+        "registration_result",
+        "retry_after_timer",
+        "polling_timer",
+        "provisioning_timeout_timer",
+    )
+
     def __init__(self, request_payload, registration_id, callback, registration_result=None):
         """
         Initializer for RegisterOperation objects.
@@ -126,6 +141,15 @@ class PollStatusOperation(PipelineOperation):
     This operation is in the group of DPS operations because it is very specific to the DPS client.
     """
 
+    __slots__ = (
+        "operation_id",
+        "request_payload",
+        "registration_result",
+        "retry_after_timer",
+        "polling_timer",
+        "provisioning_timeout_timer",
+    )
+
     def __init__(self, operation_id, request_payload, callback, registration_result=None):
         """
         Initializer for PollStatusOperation objects.
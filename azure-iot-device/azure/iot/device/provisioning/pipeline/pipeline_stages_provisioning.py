@@ -4,6 +4,7 @@
 # license information.
 # --------------------------------------------------------------------------
 
+from azure.iot.device.common import codec
 from azure.iot.device.common.pipeline import pipeline_ops_base, pipeline_thread
 from azure.iot.device.common.pipeline.pipeline_stages_base import PipelineStage
 from . import pipeline_ops_provisioning
@@ -15,7 +16,6 @@ from azure.iot.device.provisioning.models.registration_result import (
 )
 import logging
 import weakref
-import json
 from threading import Timer
 import time
 from .mqtt_topic import get_optional_element
@@ -79,9 +79,10 @@ class CommonProvisioningStage(PipelineStage):
             op.provisioning_timeout_timer.cancel()
             op.provisioning_timeout_timer = None
 
-    @staticmethod
-    def _decode_response(provisioning_op):
-        return json.loads(provisioning_op.response_body.decode("utf-8"))
+    def _decode_response(self, provisioning_op):
+        return self.pipeline_root.pipeline_configuration.json_codec.decode(
+            provisioning_op.response_body
+        )
 
     @staticmethod
     def _get_registration_status(decoded_response):
@@ -484,7 +485,9 @@ class RegistrationStage(CommonProvisioningStage):
                     request_type=constant.REGISTER,
                     method="PUT",
                     resource_location="/",
-                    request_body=registration_payload.get_json_string(),
+                    request_body=registration_payload.get_json_string(
+                        self.pipeline_root.pipeline_configuration.json_codec
+                    ),
                     callback=on_registration_response,
                 )
             )
@@ -504,5 +507,5 @@ class DeviceRegistrationPayload(object):
         self.registrationId = registration_id
         self.payload = custom_payload
 
-    def get_json_string(self):
-        return json.dumps(self, default=lambda o: o.__dict__, sort_keys=True)
+    def get_json_string(self, json_codec=codec.default_json_codec):
+        return json_codec.encode(self, default=lambda o: o.__dict__, sort_keys=True)
@@ -49,6 +49,8 @@ class ProvisioningPipeline(object):
             .append_stage(pipeline_stages_mqtt.MQTTTransportStage())
         )
 
+        self._pipeline.metrics.labels["client"] = self._registration_id
+
         def _on_pipeline_event(event):
             logger.warning("Dropping unknown pipeline event {}".format(event.name))
 
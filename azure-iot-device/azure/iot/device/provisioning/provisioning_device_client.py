@@ -9,12 +9,14 @@ Device SDK. This client uses Symmetric Key and X509 authentication to register d
 IoT Hub via the Device Provisioning Service.
 """
 import logging
+import sys
 from azure.iot.device.common.evented_callback import EventedCallback
 from .abstract_provisioning_device_client import AbstractProvisioningDeviceClient
 from .abstract_provisioning_device_client import log_on_register_complete
 from azure.iot.device.provisioning.pipeline import constant as dps_constant
 from .pipeline import exceptions as pipeline_exceptions
 from azure.iot.device import exceptions
+from azure.iot.device import patch
 
 
 logger = logging.getLogger(__name__)
@@ -94,3 +96,10 @@ class ProvisioningDeviceClient(AbstractProvisioningDeviceClient):
         handle_result(subscription_complete)
 
         logger.info("Successfully subscribed to Device Provisioning Service to receive responses")
+
+
+if sys.version_info > (3, 5):  # This only works for python 3.5+ at present
+    # Add shim implementations for all the inherited methods of the client.
+    # This is necessary to generate accurate online docs.
+    # It SHOULD not impact the functionality of the methods themselves in any way.
+    patch.add_shims_for_inherited_methods(ProvisioningDeviceClient)
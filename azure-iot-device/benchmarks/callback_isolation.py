@@ -0,0 +1,78 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Measure how long a slow handler in one client delays the callbacks of other clients.
+
+One client's handler takes --slow-ms for each event, while the handlers of --clients other
+clients return immediately. Events are delivered to every client at once, through the callback
+executor, and the time from each fast client's event being delivered to its handler running is
+reported, for each callback executor configuration.
+
+Usage:
+    python callback_isolation.py [--events N] [--clients N] [--slow-ms MS]
+"""
+
+import argparse
+import time
+from azure.iot.device.common.pipeline import pipeline_thread
+
+
+class FakeClient(object):
+    pass
+
+
+def measure(events, clients, slow_ms):
+    slow_client = FakeClient()
+    fast_clients = [FakeClient() for _ in range(clients)]
+    delays = []
+
+    def slow_handler(delivered_at):
+        time.sleep(slow_ms / 1000.0)
+
+    def fast_handler(delivered_at):
+        delays.append(time.time() - delivered_at)
+
+    futures = []
+    for _ in range(events):
+        now = time.time()
+        futures.append(
+            pipeline_thread.invoke_on_callback_thread_nowait(
+                slow_handler, client=slow_client, lane="C2DMessageEvent"
+            )(now)
+        )
+        for client in fast_clients:
+            futures.append(
+                pipeline_thread.invoke_on_callback_thread_nowait(
+                    fast_handler, client=client, lane="C2DMessageEvent"
+                )(now)
+            )
+        time.sleep(slow_ms / 1000.0)
+    for future in futures:
+        future.result()
+    delays.sort()
+    return delays[len(delays) // 2], delays[int(len(delays) * 0.99)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=50, help="events delivered to each client")
+    parser.add_argument("--clients", type=int, default=3, help="clients with fast handlers")
+    parser.add_argument("--slow-ms", type=float, default=20, help="time taken by the slow handler")
+    args = parser.parse_args()
+
+    for name, workers, isolate_clients in [
+        ("1 worker (default)", 1, False),
+        ("4 workers", 4, False),
+        ("isolated clients", 1, True),
+    ]:
+        pipeline_thread.configure_callback_executor(
+            workers=workers, isolate_clients=isolate_clients
+        )
+        p50, p99 = measure(args.events, args.clients, args.slow_ms)
+        print("{:<20} p50 {:>8.2f} ms   p99 {:>8.2f} ms".format(name, p50 * 1000, p99 * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Compare the speed and encoded size of the codecs which can be given to the pipelines.
+
+Each codec encodes and decodes a twin shaped payload, as received by get_twin. Accelerated
+JSON libraries (orjson, ujson) and the binary codecs (cbor2, msgpack) are only measured if
+they are installed.
+
+Usage:
+    python codec_throughput.py [--iterations N] [--properties N]
+"""
+
+import argparse
+import importlib
+import time
+from azure.iot.device.common import codec
+
+
+def make_twin(properties):
+    reported = {"property{}".format(i): {"value": i * 1.5, "unit": "C"} for i in range(properties)}
+    return {
+        "desired": {"telemetryInterval": 30, "$version": 12},
+        "reported": dict(reported, **{"$version": 34}),
+    }
+
+
+def available_codecs():
+    codecs = [("json", codec.JSONCodec())]
+    for name in ("orjson", "ujson"):
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            continue
+        codecs.append((name, codec.JSONCodec(dumps=module.dumps, loads=module.loads)))
+    for name, codec_class in (("cbor2", codec.CBORCodec), ("msgpack", codec.MessagePackCodec)):
+        try:
+            codecs.append((name, codec_class()))
+        except ImportError:
+            continue
+    return codecs
+
+
+def measure(payload_codec, payload, iterations):
+    encode = payload_codec.encode
+    decode = payload_codec.decode
+
+    start = time.time()
+    for _ in range(iterations):
+        encoded = encode(payload)
+    encode_rate = iterations / (time.time() - start)
+
+    start = time.time()
+    for _ in range(iterations):
+        decode(encoded)
+    decode_rate = iterations / (time.time() - start)
+
+    if not isinstance(encoded, bytes):
+        encoded = encoded.encode("utf-8")
+    return encode_rate, decode_rate, len(encoded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000, help="encodes and decodes")
+    parser.add_argument("--properties", type=int, default=50, help="reported properties")
+    args = parser.parse_args()
+
+    payload = make_twin(args.properties)
+    print("Twin with {} reported properties".format(args.properties))
+    print("{:<10} {:>12} {:>12} {:>8}".format("codec", "encodes/sec", "decodes/sec", "bytes"))
+    for name, payload_codec in available_codecs():
+        encode_rate, decode_rate, size = measure(payload_codec, payload, args.iterations)
+        print("{:<10} {:>12.0f} {:>12.0f} {:>8}".format(name, encode_rate, decode_rate, size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Measure the time taken to import azure.iot.device, and to import the clients from it.
+
+Each import is run in a fresh interpreter, and the median of --runs runs is reported. Importing
+the package alone should take a small fraction of the time taken to import the clients, which
+pull in their transports, paho, requests and janus.
+
+Usage:
+    python import_time.py [--runs N]
+"""
+
+import argparse
+import subprocess
+import sys
+
+import_probe = """
+import time
+start = time.perf_counter()
+{statement}
+print(time.perf_counter() - start)
+"""
+
+statements = [
+    ("import azure.iot.device", "import azure.iot.device"),
+    (
+        "import the models",
+        "from azure.iot.device import Message, MethodResponse, RegistrationResult, X509",
+    ),
+    (
+        "import the clients",
+        "from azure.iot.device import IoTHubDeviceClient, ProvisioningDeviceClient",
+    ),
+]
+
+
+def measure(statement, runs):
+    times = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, "-c", import_probe.format(statement=statement)]
+        )
+        times.append(float(output))
+    times.sort()
+    return times[len(times) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=11, help="number of runs of each import")
+    args = parser.parse_args()
+
+    package_time = None
+    for name, statement in statements:
+        elapsed = measure(statement, args.runs)
+        if package_time is None:
+            package_time = elapsed
+        print(
+            "{:<25} {:>8.1f} ms ({:.0f}x the package)".format(
+                name, elapsed * 1000, elapsed / package_time
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
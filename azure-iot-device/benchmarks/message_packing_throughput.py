@@ -0,0 +1,171 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Compare sending small telemetry messages one by one with packing them into fewer messages.
+
+Messages are sent through the packing and MQTT translation stages of the IoTHub pipeline, to
+a stand-in for the MQTT transport which acknowledges each publish a round trip time after it is
+made and counts the bytes it would have sent. As messages are only held to be packed while
+others are being sent, nothing is packed if the round trip time is 0. The results reflect
+client-side overhead and the number and size of the messages the IoTHub receives.
+
+Usage:
+    python message_packing_throughput.py [--messages N] [--payload-size N] [--rtt MS]
+"""
+
+import argparse
+import json
+import threading
+import time
+import six.moves.queue as queue
+from azure.iot.device import Message
+from azure.iot.device.common.pipeline import (
+    pipeline_ops_base,
+    pipeline_ops_mqtt,
+    pipeline_stages_base,
+    PipelineStage,
+    pipeline_thread,
+)
+from azure.iot.device.iothub.pipeline import (
+    config,
+    pipeline_ops_iothub,
+    pipeline_stages_iothub,
+    pipeline_stages_iothub_mqtt,
+)
+
+# The IoTHub meters device-to-cloud messages in blocks of 4 KB
+BILLING_BLOCK_SIZE = 4 * 1024
+# MQTT fixed header, topic length and packet id of a QoS 1 PUBLISH, and its PUBACK
+MQTT_PUBLISH_OVERHEAD = 2 + 2 + 2 + 4
+
+
+class PublishCounter(PipelineStage):
+    """Completes every operation, counting the publishes and the bytes they would send. Publishes
+    are completed rtt seconds after they are made"""
+
+    def __init__(self, rtt):
+        super(PublishCounter, self).__init__()
+        self.publishes = 0
+        self.wire_bytes = 0
+        self.billed_messages = 0
+        self.rtt = rtt
+        self.unacknowledged = queue.Queue()
+        acknowledger = threading.Thread(target=self.acknowledge)
+        acknowledger.daemon = True
+        acknowledger.start()
+
+    def acknowledge(self):
+        while True:
+            due, op = self.unacknowledged.get()
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            pipeline_thread.invoke_on_pipeline_thread_nowait(op.complete)()
+
+    @pipeline_thread.runs_on_pipeline_thread
+    def _run_op(self, op):
+        if isinstance(op, pipeline_ops_mqtt.MQTTPublishOperation):
+            payload = op.payload
+            if not isinstance(payload, bytes):
+                payload = payload.encode("utf-8")
+            size = len(op.topic.encode("utf-8")) + len(payload)
+            self.publishes += 1
+            self.wire_bytes += size + MQTT_PUBLISH_OVERHEAD
+            self.billed_messages += -(-size // BILLING_BLOCK_SIZE)
+            self.unacknowledged.put((time.time() + self.rtt, op))
+        else:
+            op.complete()
+
+
+def make_pipeline(packing, rtt):
+    counter = PublishCounter(rtt)
+    pipeline = (
+        pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig(message_packing=packing)
+        )
+        .append_stage(pipeline_stages_iothub.MessagePackingStage())
+        .append_stage(pipeline_stages_iothub_mqtt.IoTHubMQTTTranslationStage())
+        .append_stage(counter)
+    )
+    pipeline.run_op(
+        pipeline_ops_iothub.SetIoTHubConnectionArgsOperation(
+            device_id="benchmark-device",
+            hostname="benchmark.azure-devices.net",
+            callback=lambda op, error: None,
+        )
+    )
+    return pipeline, counter
+
+
+def make_payload(i, payload_size):
+    reading = {"deviceTime": "2020-01-01T00:00:00.000Z", "sequence": i, "temperature": 21.5}
+    padding = payload_size - len(json.dumps(dict(reading, pad="")))
+    reading["pad"] = "x" * max(padding, 0)
+    return json.dumps(reading)
+
+
+def measure(packing, payloads, rtt):
+    pipeline, counter = make_pipeline(packing, rtt)
+    done = threading.Event()
+    remaining = [len(payloads)]
+
+    def on_complete(op, error):
+        remaining[0] -= 1
+        if not remaining[0]:
+            done.set()
+
+    start = time.time()
+    for payload in payloads:
+        pipeline.run_op(
+            pipeline_ops_iothub.SendD2CMessageOperation(
+                message=Message(payload), callback=on_complete
+            )
+        )
+    # Disconnecting sends the messages still waiting to be packed
+    pipeline.run_op(pipeline_ops_base.DisconnectOperation(callback=lambda op, error: None))
+    done.wait()
+    elapsed = time.time() - start
+    return len(payloads) / elapsed, counter
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000, help="number of messages sent")
+    parser.add_argument("--payload-size", type=int, default=120, help="bytes per message")
+    parser.add_argument(
+        "--rtt", type=float, default=20.0, help="milliseconds from a publish to its PUBACK"
+    )
+    args = parser.parse_args()
+
+    payloads = [make_payload(i, args.payload_size) for i in range(args.messages)]
+    results = [
+        (name, measure(packing, payloads, args.rtt / 1000.0))
+        for name, packing in (
+            ("unpacked", None),
+            ("json", "json"),
+            ("binary", "binary"),
+        )
+    ]
+
+    print(
+        "{} messages of {} bytes, {:.0f} ms round trip".format(
+            args.messages, args.payload_size, args.rtt
+        )
+    )
+    print(
+        "{:<10} {:>10} {:>10} {:>14} {:>10}".format(
+            "packing", "msgs/sec", "publishes", "wire bytes", "billed"
+        )
+    )
+    for name, (rate, counter) in results:
+        print(
+            "{:<10} {:>10.0f} {:>10} {:>14} {:>10}".format(
+                name, rate, counter.publishes, counter.wire_bytes, counter.billed_messages
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Measure the operations per second the full IoTHub device pipeline can run.
+
+Operations are run through every stage of the MQTT pipeline built by IoTHubPipeline, to a
+stand-in for the MQTT transport which connects and acknowledges every publish immediately.
+The results reflect the time spent passing operations down the pipeline and completing them
+back up, not network latency.
+
+With --trace, the lifecycle of every operation is recorded with pipeline_trace, and the records
+kept are written to a file in the Chrome trace event format.
+
+Usage:
+    python pipeline_op_throughput.py [--ops N] [--repeat N] [--trace FILE]
+"""
+
+import argparse
+import threading
+import time
+from azure.iot.device import Message, MethodResponse
+from azure.iot.device.common.pipeline import (
+    pipeline_stages_base,
+    pipeline_stages_mqtt,
+    pipeline_trace,
+)
+from azure.iot.device.iothub.pipeline import (
+    config,
+    pipeline_ops_iothub,
+    pipeline_stages_iothub,
+    pipeline_stages_iothub_mqtt,
+)
+
+
+class ImmediateTransport(object):
+    """Stand-in for MQTTTransport which connects and acknowledges publishes immediately"""
+
+    def __init__(self, transport):
+        self.on_mqtt_connected_handler = transport.on_mqtt_connected_handler
+        self.on_mqtt_disconnected_handler = transport.on_mqtt_disconnected_handler
+
+    def connect(self, password=None):
+        self.on_mqtt_connected_handler()
+
+    def disconnect(self):
+        self.on_mqtt_disconnected_handler()
+
+    def publish(self, topic, payload, callback):
+        callback()
+
+
+def make_pipeline():
+    transport_stage = pipeline_stages_mqtt.MQTTTransportStage()
+    # The stages of IoTHubPipeline
+    pipeline = (
+        pipeline_stages_base.PipelineRootStage(pipeline_configuration=config.IoTHubPipelineConfig())
+        .append_stage(pipeline_stages_iothub.UseAuthProviderStage())
+        .append_stage(pipeline_stages_iothub.TwinRequestResponseStage())
+        .append_stage(pipeline_stages_base.CoordinateRequestAndResponseStage())
+        .append_stage(pipeline_stages_iothub.TelemetryAggregationStage())
+        .append_stage(pipeline_stages_iothub.PayloadCodecStage())
+        .append_stage(pipeline_stages_iothub.MessagePackingStage())
+        .append_stage(pipeline_stages_iothub.MessageCompressionStage())
+        .append_stage(pipeline_stages_iothub_mqtt.IoTHubMQTTTranslationStage())
+        .append_stage(pipeline_stages_base.ReconnectStage())
+        .append_stage(pipeline_stages_base.AutoConnectStage())
+        .append_stage(pipeline_stages_base.ConnectionLockStage())
+        .append_stage(pipeline_stages_base.RetryStage())
+        .append_stage(pipeline_stages_base.OpTimeoutStage())
+        .append_stage(transport_stage)
+    )
+    done = threading.Event()
+    pipeline.run_op(
+        pipeline_ops_iothub.SetIoTHubConnectionArgsOperation(
+            device_id="benchmark-device",
+            hostname="benchmark.azure-devices.net",
+            callback=lambda op, error: done.set(),
+        )
+    )
+    done.wait()
+    transport_stage.transport = ImmediateTransport(transport_stage.transport)
+    return pipeline
+
+
+def run(pipeline, make_op, count):
+    """Run count operations, returning the operations completed per second"""
+    done = threading.Event()
+    remaining = [count]
+
+    def on_complete(op, error):
+        remaining[0] -= 1
+        if not remaining[0]:
+            done.set()
+
+    start = time.time()
+    for _ in range(count):
+        pipeline.run_op(make_op(on_complete))
+    done.wait()
+    return count / (time.time() - start)
+
+
+def send_message_op(callback):
+    return pipeline_ops_iothub.SendD2CMessageOperation(
+        message=Message(b"x" * 120), callback=callback
+    )
+
+
+def send_method_response_op(callback):
+    return pipeline_ops_iothub.SendMethodResponseOperation(
+        method_response=MethodResponse(request_id="1", status=200, payload=None), callback=callback
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=20000, help="operations run per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements, the best is reported")
+    parser.add_argument("--trace", metavar="FILE", help="record operations and write them to FILE")
+    args = parser.parse_args()
+
+    if args.trace:
+        trace_buffer = pipeline_trace.start()
+    pipeline = make_pipeline()
+    # Warm up, connecting the pipeline
+    run(pipeline, send_message_op, 100)
+
+    for name, make_op in [
+        ("SendD2CMessageOperation", send_message_op),
+        ("SendMethodResponseOperation", send_method_response_op),
+    ]:
+        rate = max(run(pipeline, make_op, args.ops) for _ in range(args.repeat))
+        print("{:<28} {:>8.0f} ops/sec".format(name, rate))
+
+    if args.trace:
+        pipeline_trace.stop()
+        trace_buffer.export_chrome_trace(args.trace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Measure the memory and objects allocated for each message sent with send_message.
+
+Messages are sent through the telemetry stages of the IoTHub pipeline and the MQTT transport
+stage, to a stand-in for the MQTT transport which holds every publish until all of the messages
+have been sent. The bytes (as traced by tracemalloc) and garbage collected objects still
+allocated at that point are divided by the number of messages, giving the cost of each message
+waiting for its PUBACK. The time taken to send and complete the messages is also reported.
+
+Requires Python 3.4 or later, for tracemalloc.
+
+Usage:
+    python send_message_allocations.py [--messages N] [--payload-size N]
+"""
+
+import argparse
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from azure.iot.device import Message
+from azure.iot.device.common.pipeline import (
+    pipeline_stages_base,
+    pipeline_stages_mqtt,
+)
+from azure.iot.device.iothub.pipeline import (
+    config,
+    pipeline_ops_iothub,
+    pipeline_stages_iothub,
+    pipeline_stages_iothub_mqtt,
+)
+
+
+class HeldPublishTransport(object):
+    """Stand-in for MQTTTransport which acknowledges publishes only when released"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def publish(self, topic, payload, callback):
+        self.callbacks.append(callback)
+
+    def release(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+def sizeof(obj):
+    """Size of an object, including its __dict__ if it has one"""
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def make_pipeline():
+    transport_stage = pipeline_stages_mqtt.MQTTTransportStage()
+    pipeline = (
+        pipeline_stages_base.PipelineRootStage(pipeline_configuration=config.IoTHubPipelineConfig())
+        .append_stage(pipeline_stages_iothub.PayloadCodecStage())
+        .append_stage(pipeline_stages_iothub.MessagePackingStage())
+        .append_stage(pipeline_stages_iothub.MessageCompressionStage())
+        .append_stage(pipeline_stages_iothub_mqtt.IoTHubMQTTTranslationStage())
+        .append_stage(transport_stage)
+    )
+    pipeline.run_op(
+        pipeline_ops_iothub.SetIoTHubConnectionArgsOperation(
+            device_id="benchmark-device",
+            hostname="benchmark.azure-devices.net",
+            callback=lambda op, error: None,
+        )
+    )
+    # Replaces the transport created for the connection args
+    transport_stage.transport = HeldPublishTransport()
+    return pipeline, transport_stage.transport
+
+
+def send(pipeline, payloads, on_complete):
+    for payload in payloads:
+        pipeline.run_op(
+            pipeline_ops_iothub.SendD2CMessageOperation(
+                message=Message(payload), callback=on_complete
+            )
+        )
+
+
+def measure(payloads):
+    pipeline, transport = make_pipeline()
+    done = threading.Event()
+    remaining = [len(payloads)]
+
+    def on_complete(op, error):
+        remaining[0] -= 1
+        if not remaining[0]:
+            done.set()
+
+    # Warm up, so that caches and the pipeline thread are not counted
+    remaining[0] += 100
+    send(pipeline, payloads[:100], on_complete)
+    transport.release()
+
+    gc.collect()
+    gc.disable()
+    objects_before = len(gc.get_objects())
+    tracemalloc.start()
+    start = time.time()
+    send(pipeline, payloads, on_complete)
+    traced_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    objects = len(gc.get_objects()) - objects_before
+    gc.enable()
+
+    transport.release()
+    done.wait()
+    elapsed = time.time() - start
+    return traced_bytes / len(payloads), objects / len(payloads), len(payloads) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000, help="number of messages sent")
+    parser.add_argument("--payload-size", type=int, default=120, help="bytes per message")
+    args = parser.parse_args()
+
+    payloads = [b"x" * args.payload_size for _ in range(args.messages)]
+    bytes_per_message, objects_per_message, rate = measure(payloads)
+
+    print("{} messages of {} bytes".format(args.messages, args.payload_size))
+    print("bytes/message    {:>8.0f}".format(bytes_per_message))
+    print("objects/message  {:>8.1f}".format(objects_per_message))
+    print("msgs/sec         {:>8.0f}  (with tracemalloc)".format(rate))
+    print(
+        "sizeof Message {}, SendD2CMessageOperation {}".format(
+            sizeof(Message(b"")),
+            sizeof(
+                pipeline_ops_iothub.SendD2CMessageOperation(
+                    message=None, callback=lambda op, error: None
+                )
+            ),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
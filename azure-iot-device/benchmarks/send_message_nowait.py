@@ -0,0 +1,134 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Measure messages/sec sent by one thread with send_message and with send_message_nowait.
+
+Messages are sent by an IoTHubDeviceClient, through its pipeline and MQTTTransport, to a
+stand-in for the Paho client which acknowledges each publish a round trip time after it is
+made. send_message waits for each acknowledgement before the next message is sent, while
+send_message_nowait keeps up to --in-flight messages waiting for their acknowledgement.
+
+Usage:
+    python send_message_nowait.py [--messages N] [--rtt MS] [--in-flight N]
+"""
+
+import argparse
+import base64
+import collections
+import threading
+import time
+import six.moves.queue as queue
+from azure.iot.device import IoTHubDeviceClient
+from azure.iot.device.common.pipeline import pipeline_stages_mqtt
+
+CONNECTION_STRING = (
+    "HostName=benchmark.azure-devices.net;DeviceId=benchmark-device;SharedAccessKey="
+    + base64.b64encode(b"benchmark-shared-access-key").decode()
+)
+
+
+class FakePahoClient(object):
+    """Stand-in for the Paho client which connects immediately, and acknowledges each publish
+    rtt seconds after it is made"""
+
+    def __init__(self, client, rtt):
+        self.on_connect = client.on_connect
+        self.on_publish = client.on_publish
+        self.rtt = rtt
+        self.mid = 0
+        self.lock = threading.Lock()
+        self.unacknowledged = queue.Queue()
+        acknowledger = threading.Thread(target=self.acknowledge)
+        acknowledger.daemon = True
+        acknowledger.start()
+
+    def username_pw_set(self, username, password):
+        pass
+
+    def connect(self, host, port, keepalive):
+        self.on_connect(self, None, {}, 0)
+        return 0
+
+    def loop_start(self):
+        pass
+
+    def publish(self, topic, payload, qos):
+        with self.lock:
+            self.mid += 1
+            mid = self.mid
+        self.unacknowledged.put((time.time() + self.rtt, mid))
+        return 0, mid
+
+    def acknowledge(self):
+        while True:
+            due, mid = self.unacknowledged.get()
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+            self.on_publish(self, None, mid)
+
+
+def make_client(rtt):
+    client = IoTHubDeviceClient.create_from_connection_string(CONNECTION_STRING)
+    stage = client._iothub_pipeline._pipeline
+    while not isinstance(stage, pipeline_stages_mqtt.MQTTTransportStage):
+        stage = stage.next
+    transport = stage.transport
+    transport._mqtt_client = FakePahoClient(transport._mqtt_client, rtt)
+    client.connect()
+    return client
+
+
+def send_blocking(client, count):
+    for _ in range(count):
+        client.send_message(b"x" * 120)
+
+
+def send_nowait(client, count, in_flight):
+    futures = collections.deque()
+    for _ in range(count):
+        if len(futures) == in_flight:
+            futures.popleft().result()
+        futures.append(client.send_message_nowait(b"x" * 120))
+    for future in futures:
+        future.result()
+
+
+def measure(send, client, count, *args):
+    start = time.time()
+    send(client, count, *args)
+    return count / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500, help="number of messages sent")
+    parser.add_argument(
+        "--rtt", type=float, default=20.0, help="milliseconds from a publish to its PUBACK"
+    )
+    parser.add_argument(
+        "--in-flight", type=int, default=200, help="messages sent with send_message_nowait at once"
+    )
+    args = parser.parse_args()
+
+    client = make_client(args.rtt / 1000.0)
+    # Warm up
+    send_nowait(client, 50, args.in_flight)
+
+    print("{} messages, {:.0f} ms round trip".format(args.messages, args.rtt))
+    print(
+        "send_message          {:>8.0f} msgs/sec".format(
+            measure(send_blocking, client, args.messages)
+        )
+    )
+    print(
+        "send_message_nowait   {:>8.0f} msgs/sec ({} in flight)".format(
+            measure(send_nowait, client, args.messages * 10, args.in_flight), args.in_flight
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Measure the CPU time used for each message sent with send_message, at a given log level.
+
+Messages are sent through every stage of the IoTHub pipeline and the MQTTTransport, to a
+stand-in for the Paho client which acknowledges each publish when the next one is made. The
+process CPU time (of every thread) is divided by the number of messages, so the time spent
+formatting and writing log records is included. Records are written to a null handler.
+
+Run with python -O to measure the pipeline with the hot path traces compiled out.
+
+Requires Python 3.3 or later, for time.process_time.
+
+Usage:
+    python tracing_overhead.py [--messages N] [--level LEVEL]
+"""
+
+import argparse
+import logging
+import threading
+import time
+from azure.iot.device import Message
+from azure.iot.device.common.pipeline import pipeline_stages_base, pipeline_stages_mqtt
+from azure.iot.device.iothub.pipeline import (
+    config,
+    pipeline_ops_iothub,
+    pipeline_stages_iothub,
+    pipeline_stages_iothub_mqtt,
+)
+
+
+class FakePahoClient(object):
+    """Stand-in for the Paho client which connects immediately, and acknowledges each publish
+    when the next is made, after MQTTTransport has started waiting for the acknowledgement"""
+
+    def __init__(self, client):
+        self.on_connect = client.on_connect
+        self.on_publish = client.on_publish
+        self.mid = 0
+        self.unacknowledged = []
+
+    def username_pw_set(self, username, password):
+        pass
+
+    def connect(self, host, port, keepalive):
+        self.on_connect(self, None, {}, 0)
+        return 0
+
+    def loop_start(self):
+        pass
+
+    def publish(self, topic, payload, qos):
+        self.acknowledge()
+        self.mid += 1
+        self.unacknowledged.append(self.mid)
+        return 0, self.mid
+
+    def acknowledge(self):
+        mids, self.unacknowledged = self.unacknowledged, []
+        for mid in mids:
+            self.on_publish(self, None, mid)
+
+
+def make_pipeline():
+    transport_stage = pipeline_stages_mqtt.MQTTTransportStage()
+    # The stages of IoTHubPipeline
+    pipeline = (
+        pipeline_stages_base.PipelineRootStage(pipeline_configuration=config.IoTHubPipelineConfig())
+        .append_stage(pipeline_stages_iothub.UseAuthProviderStage())
+        .append_stage(pipeline_stages_iothub.TwinRequestResponseStage())
+        .append_stage(pipeline_stages_base.CoordinateRequestAndResponseStage())
+        .append_stage(pipeline_stages_iothub.TelemetryAggregationStage())
+        .append_stage(pipeline_stages_iothub.PayloadCodecStage())
+        .append_stage(pipeline_stages_iothub.MessagePackingStage())
+        .append_stage(pipeline_stages_iothub.MessageCompressionStage())
+        .append_stage(pipeline_stages_iothub_mqtt.IoTHubMQTTTranslationStage())
+        .append_stage(pipeline_stages_base.ReconnectStage())
+        .append_stage(pipeline_stages_base.AutoConnectStage())
+        .append_stage(pipeline_stages_base.ConnectionLockStage())
+        .append_stage(pipeline_stages_base.RetryStage())
+        .append_stage(pipeline_stages_base.OpTimeoutStage())
+        .append_stage(transport_stage)
+    )
+    done = threading.Event()
+    pipeline.run_op(
+        pipeline_ops_iothub.SetIoTHubConnectionArgsOperation(
+            device_id="benchmark-device",
+            hostname="benchmark.azure-devices.net",
+            callback=lambda op, error: done.set(),
+        )
+    )
+    done.wait()
+    transport = transport_stage.transport
+    transport._mqtt_client = FakePahoClient(transport._mqtt_client)
+    return pipeline, transport._mqtt_client
+
+
+def send(pipeline, client, count):
+    done = threading.Event()
+    remaining = [count]
+
+    def on_complete(op, error):
+        remaining[0] -= 1
+        if not remaining[0]:
+            done.set()
+
+    for _ in range(count):
+        pipeline.run_op(
+            pipeline_ops_iothub.SendD2CMessageOperation(
+                message=Message(b"x" * 120), callback=on_complete
+            )
+        )
+    # Acknowledges the last publish, once it has been made
+    while not done.wait(0.01):
+        client.acknowledge()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000, help="number of messages sent")
+    parser.add_argument("--level", default="WARNING", help="level of the azure.iot.device logger")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("azure.iot.device")
+    logger.setLevel(args.level)
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    pipeline, client = make_pipeline()
+    # Warm up, connecting the pipeline
+    send(pipeline, client, 100)
+
+    start_cpu = time.process_time()
+    start = time.time()
+    send(pipeline, client, args.messages)
+    cpu = time.process_time() - start_cpu
+    elapsed = time.time() - start
+
+    print("{} messages, logging at {}".format(args.messages, args.level))
+    print("CPU us/message  {:>8.1f}".format(cpu / args.messages * 1e6))
+    print("msgs/sec        {:>8.0f}".format(args.messages / elapsed))
+
+
+if __name__ == "__main__":
+    main()
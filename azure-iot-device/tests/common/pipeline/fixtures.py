@@ -32,7 +32,7 @@ class ArbitraryOperation(pipeline_ops_base.PipelineOperation):
 @pytest.fixture
 def arbitrary_op(mocker):
     op = ArbitraryOperation(callback=mocker.MagicMock())
-    mocker.spy(op, "complete")
+    helpers.spy_op_method(mocker, op, "complete")
     return op
 
 
@@ -81,6 +81,39 @@ class StageHandlePipelineEventTestBase(object):
         assert e_info.value is arbitrary_base_exception
 
 
+class _OpMethodMock(object):
+    """Descriptor returning a mock for one operation, and the real method for all others"""
+
+    def __init__(self, method, op, mock):
+        self.method = method
+        self.op = op
+        self.mock = mock
+
+    def __get__(self, instance, owner):
+        if instance is self.op:
+            return self.mock
+        return self.method.__get__(instance, owner)
+
+
+def mock_op_method(mocker, op, method_name, **kwargs):
+    """Replace a method of a single operation with a MagicMock created with the given kwargs.
+
+    Operations have __slots__, so a mock cannot be set on the instance. Instead the method is
+    patched on the class of the operation for the duration of the test.
+    """
+    cls = type(op)
+    # The raw attribute, so that mocks on several operations of the same class can be chained
+    method = next(c.__dict__[method_name] for c in cls.__mro__ if method_name in c.__dict__)
+    mock = mocker.MagicMock(**kwargs)
+    mocker.patch.object(cls, method_name, _OpMethodMock(method, op, mock))
+    return mock
+
+
+def spy_op_method(mocker, op, method_name):
+    """Spy on a method of a single operation, like mocker.spy(op, method_name)"""
+    return mock_op_method(mocker, op, method_name, side_effect=getattr(op, method_name))
+
+
 ############################################
 # EVERYTHING BELOW THIS POINT IS DEPRECATED#
 ############################################
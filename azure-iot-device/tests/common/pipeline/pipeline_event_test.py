@@ -115,6 +115,11 @@ def add_instantiation_test(
                 else:
                     assert getattr(instance, key) == all_defaults[key]
 
+        @pytest.mark.it("Stores its attributes in __slots__ rather than a __dict__")
+        def test_slots(self):
+            instance = cls(*args)
+            assert not hasattr(instance, "__dict__")
+
     # Adding this object to the namespace of the module that was passed in (using a name that starts with "Test")
     # will cause pytest to pick it up.
     setattr(module, "Test{}Instantiation".format(cls.__name__), LocalTestObject)
@@ -9,7 +9,8 @@ import threading
 
 from azure.iot.device.common.pipeline.pipeline_ops_base import PipelineOperation
 from azure.iot.device.common import handle_exceptions
-from azure.iot.device.common.pipeline import pipeline_exceptions
+from azure.iot.device.common.pipeline import pipeline_exceptions, pipeline_trace
+from tests.common.pipeline.helpers import spy_op_method
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -42,7 +43,7 @@ def add_operation_tests(
         @pytest.fixture
         def op(self, cls_type, init_kwargs, mocker):
             op = cls_type(**init_kwargs)
-            mocker.spy(op, "complete")
+            spy_op_method(mocker, op, "complete")
             return op
 
     @pytest.mark.describe("{} - Instantiation".format(op_class_under_test.__name__))
@@ -52,6 +53,11 @@ def add_operation_tests(
             op = cls_type(**init_kwargs)
             assert op.name == op.__class__.__name__
 
+        @pytest.mark.it("Stores its attributes in __slots__ rather than a __dict__")
+        def test_slots(self, cls_type, init_kwargs):
+            op = cls_type(**init_kwargs)
+            assert not hasattr(op, "__dict__")
+
         @pytest.mark.it("Initializes 'completed' attribute as False")
         def test_completed(self, cls_type, init_kwargs):
             op = cls_type(**init_kwargs)
@@ -173,6 +179,23 @@ def add_operation_tests(
             worker_op = op.spawn_worker_op(worker_op_type, **worker_op_kwargs)
             assert isinstance(worker_op, worker_op_type)
 
+        @pytest.mark.it(
+            "Records the start of the worker operation, spawned from the operation, if pipeline traces are being recorded"
+        )
+        def test_trace(self, mocker, op, worker_op_type, worker_op_kwargs):
+            trace_buffer = pipeline_trace.TraceBuffer()
+            mocker.patch.object(pipeline_trace, "buffer", trace_buffer)
+
+            worker_op = op.spawn_worker_op(worker_op_type, **worker_op_kwargs)
+
+            events = trace_buffer.to_chrome_trace()["traceEvents"]
+            assert len(events) == 1
+            assert events[0]["ph"] == "b"
+            assert events[0]["name"] == worker_op.name
+            assert events[0]["args"]["parent_op"] == op.name
+            assert events[0]["args"]["parent"] == "0x{:x}".format(op.trace_id)
+            assert events[0]["id"] == "0x{:x}".format(worker_op.trace_id)
+
         @pytest.mark.it(
             "Instantiates the returned worker operation using the provided **kwargs parameters (not including 'callback')"
         )
@@ -644,6 +667,25 @@ def add_operation_tests(
                 is pipeline_exceptions.OperationError
             )
 
+        @pytest.mark.it(
+            "Records a span for each callback, and the completion of the operation, if pipeline traces are being recorded"
+        )
+        def test_trace(self, mocker, cls_type, init_kwargs, error):
+            trace_buffer = pipeline_trace.TraceBuffer()
+            mocker.patch.object(pipeline_trace, "buffer", trace_buffer)
+            init_kwargs["callback"] = mocker.MagicMock()
+            op = cls_type(**init_kwargs)
+            op.add_callback(mocker.MagicMock())
+
+            op.complete(error=error)
+
+            records = trace_buffer.records()
+            assert [(r[0], r[1], r[5]) for r in records] == [
+                ("X", "callback", op.name),
+                ("X", "callback", op.name),
+                ("e", "op", op.name),
+            ]
+
         @pytest.mark.it(
             "Completes the operation successfully (no error) by default if no error is specified"
         )
@@ -13,13 +13,15 @@ import threading
 import random
 import uuid
 from six.moves import queue
-from azure.iot.device.common import transport_exceptions, handle_exceptions
+from azure.iot.device.common import transport_exceptions, handle_exceptions, metrics
 from azure.iot.device.common.pipeline import (
     pipeline_stages_base,
     pipeline_ops_base,
     pipeline_ops_mqtt,
     pipeline_events_base,
     pipeline_exceptions,
+    pipeline_thread,
+    pipeline_trace,
 )
 from .helpers import StageRunOpTestBase, StageHandlePipelineEventTestBase
 from .fixtures import ArbitraryOperation
@@ -38,11 +40,150 @@ def mock_timer(mocker):
     return mocker.patch.object(threading, "Timer")
 
 
+@pytest.fixture
+def trace_buffer(mocker):
+    trace_buffer = pipeline_trace.TraceBuffer()
+    mocker.patch.object(pipeline_trace, "buffer", trace_buffer)
+    return trace_buffer
+
+
 # Not a fixture, but useful for sharing
 def fake_callback(*args, **kwargs):
     pass
 
 
+##################
+# PIPELINE STAGE #
+##################
+
+
+class OtherOperation(ArbitraryOperation):
+    pass
+
+
+class RecordingStage(pipeline_stages_base.PipelineStage):
+    """Stage which records the operations it runs before passing them down"""
+
+    def __init__(self, handled_op_types=None):
+        super(RecordingStage, self).__init__()
+        self.handled_op_types = handled_op_types
+        self.ops = []
+
+    def _run_op(self, op):
+        self.ops.append(op)
+        self.send_op_down(op)
+
+
+class CompletingStage(RecordingStage):
+    """Stage which records and completes the operations it runs"""
+
+    def _run_op(self, op):
+        self.ops.append(op)
+        op.complete()
+
+
+def link(*stages):
+    for above, below in zip(stages, stages[1:]):
+        above.next = below
+        below.previous = above
+    return stages
+
+
+@pytest.mark.describe("PipelineStage - .send_op_down()")
+class TestPipelineStageSendOpDownRouting(object):
+    @pytest.mark.it("Skips stages which do not act on operations of the op's type")
+    def test_skips_stages(self, arbitrary_op):
+        top, skipped, middle, bottom = link(
+            RecordingStage(),
+            RecordingStage(handled_op_types=(OtherOperation,)),
+            RecordingStage(handled_op_types=(ArbitraryOperation,)),
+            CompletingStage(handled_op_types=()),
+        )
+        top.run_op(arbitrary_op)
+
+        assert skipped.ops == []
+        assert middle.ops == [arbitrary_op]
+        assert bottom.ops == [arbitrary_op]
+        assert arbitrary_op.completed
+
+    @pytest.mark.it("Runs the op on stages which act on a base class of its type")
+    def test_subclass(self, mocker):
+        op = OtherOperation(callback=mocker.MagicMock())
+        top, middle, bottom = link(
+            RecordingStage(),
+            RecordingStage(handled_op_types=(ArbitraryOperation,)),
+            CompletingStage(),
+        )
+        top.run_op(op)
+
+        assert middle.ops == [op]
+
+    @pytest.mark.it("Runs the op on stages which do not declare the operations they act on")
+    def test_undeclared(self, arbitrary_op):
+        top, middle, bottom = link(RecordingStage(), RecordingStage(), CompletingStage())
+        top.run_op(arbitrary_op)
+
+        assert middle.ops == [arbitrary_op]
+
+    @pytest.mark.it("Always runs the op on the last stage")
+    def test_last_stage(self, arbitrary_op):
+        top, bottom = link(RecordingStage(), CompletingStage(handled_op_types=()))
+        top.run_op(arbitrary_op)
+
+        assert bottom.ops == [arbitrary_op]
+
+    @pytest.mark.it("Reads the handled_op_types of each stage once per operation type")
+    def test_cached(self, mocker):
+        class CountingStage(RecordingStage):
+            reads = 0
+
+            @property
+            def handled_op_types(self):
+                CountingStage.reads += 1
+                return ()
+
+            @handled_op_types.setter
+            def handled_op_types(self, value):
+                pass
+
+        top, skipped, bottom = link(RecordingStage(), CountingStage(), CompletingStage())
+        for _ in range(3):
+            top.run_op(ArbitraryOperation(callback=mocker.MagicMock()))
+        top.run_op(OtherOperation(callback=mocker.MagicMock()))
+
+        assert CountingStage.reads == 2
+        assert len(bottom.ops) == 4
+
+    @pytest.mark.it(
+        "Recomputes the routes of the stage and of the stages above it when a stage is linked"
+    )
+    def test_relink(self, arbitrary_op, mocker):
+        top, middle, bottom = link(
+            RecordingStage(), RecordingStage(handled_op_types=()), CompletingStage()
+        )
+        top.run_op(ArbitraryOperation(callback=mocker.MagicMock()))
+        inserted = RecordingStage()
+        link(middle, inserted, bottom)
+
+        top.run_op(arbitrary_op)
+
+        assert inserted.ops == [arbitrary_op]
+
+
+@pytest.mark.describe("PipelineStage - .run_op() -- Called while recording pipeline traces")
+class TestPipelineStageRunOpTrace(object):
+    @pytest.mark.it("Records a span for each stage the op runs on, ending after the stages below")
+    def test_stage_spans(self, trace_buffer, arbitrary_op):
+        top, bottom = link(RecordingStage(), CompletingStage())
+        top.run_op(arbitrary_op)
+
+        spans = [r for r in trace_buffer.records() if r[0] == "X" and r[1] == "stage"]
+        assert [span[2] for span in spans] == ["RecordingStage", "CompletingStage"]
+        top_span, bottom_span = spans
+        assert top_span[3] <= bottom_span[3]
+        assert top_span[3] + top_span[4] >= bottom_span[3] + bottom_span[4]
+
+
 #######################
 # PIPELINE ROOT STAGE #
 #######################
@@ -93,6 +234,14 @@ class PipelineRootStageInstantiationTests(PipelineRootStageTestConfig):
         stage = pipeline_stages_base.PipelineRootStage(**init_kwargs)
         assert stage.pipeline_configuration is init_kwargs["pipeline_configuration"]
 
+    @pytest.mark.it(
+        "Initializes 'metrics' as a MetricsRegistry that is part of the process metrics"
+    )
+    def test_metrics(self, init_kwargs):
+        stage = pipeline_stages_base.PipelineRootStage(**init_kwargs)
+        assert isinstance(stage.metrics, metrics.MetricsRegistry)
+        assert stage.metrics in metrics.process_metrics.registries()
+
 
 pipeline_stage_test.add_base_pipeline_stage_tests(
     test_module=this_module,
@@ -131,6 +280,14 @@ class TestPipelineRootStageAppendStage(PipelineRootStageTestConfig):
             assert new_stage.pipeline_root is root
             prev_tail = new_stage
 
+    @pytest.mark.it("Registers the metrics of the provided stage with the pipeline's metrics")
+    def test_registers_metrics(self, mocker, stage):
+        new_stage = pipeline_stages_base.PipelineStage()
+        mocker.spy(new_stage, "register_metrics")
+        stage.append_stage(new_stage)
+        assert new_stage.register_metrics.call_count == 1
+        assert new_stage.register_metrics.call_args == mocker.call(stage.metrics)
+
 
 # NOTE 1: Because the Root stage overrides the parent implementation, we must test it here
 # (even though it's the same test).
@@ -148,6 +305,38 @@ class TestPipelineRootStageRunOp(PipelineRootStageTestConfig):
         assert stage.send_op_down.call_count == 1
         assert stage.send_op_down.call_args == mocker.call(op)
 
+    @pytest.mark.it("Records the start of the operation, if pipeline traces are being recorded")
+    def test_trace(self, stage, op, trace_buffer):
+        stage.run_op(op)
+
+        records = trace_buffer.records()
+        assert records[0][:3] == ("b", "op", op.name)
+        assert records[0][6] == op.trace_id
+
+    @pytest.mark.it(
+        "Records the time from the operation being run to its completion in the pipeline metrics"
+    )
+    def test_op_latency(self, mocker, stage, op):
+        mocker.patch.object(pipeline_stages_base.time, "time", side_effect=[10.0, 10.5])
+        stage.run_op(op)
+        op.complete()
+
+        latency = stage.metrics.snapshot()['op_latency_seconds{op="ArbitraryOperation"}']
+        assert latency.count == 1
+        assert latency.sum == 0.5
+
+    @pytest.mark.it("Counts the operation in the pipeline metrics if it completes with an error")
+    @pytest.mark.parametrize(
+        "error, expected_count",
+        [pytest.param(None, 0, id="Success"), pytest.param(Exception(), 1, id="Error")],
+    )
+    def test_op_errors(self, stage, op, error, expected_count):
+        stage.run_op(op)
+        op.complete(error=error)
+
+        errors = stage.metrics.snapshot()['op_errors_total{op="ArbitraryOperation"}']
+        assert errors == expected_count
+
 
 @pytest.mark.describe("PipelineRootStage - .handle_pipeline_event() -- Called with ConnectedEvent")
 class TestPipelineRootStageHandlePipelineEventWithConnectedEvent(
@@ -218,6 +407,29 @@ class TestPipelineRootStageHandlePipelineEventWithArbitraryEvent(
         assert mock_handler.call_count == 1
         assert mock_handler.call_args == mocker.call(event)
 
+    @pytest.mark.it(
+        "Invokes the handler on the callback thread for the pipeline, in the lane of the event's type"
+    )
+    def test_callback_lane(self, mocker, stage, event):
+        mocker.spy(pipeline_thread, "invoke_on_callback_thread_nowait")
+        stage.on_pipeline_event_handler = mocker.MagicMock()
+        stage.handle_pipeline_event(event)
+        time.sleep(0.1)  # CT-TODO/BK-TODO: get rid of this
+        assert pipeline_thread.invoke_on_callback_thread_nowait.call_args[1] == {
+            "client": stage,
+            "lane": event.name,
+        }
+
+    @pytest.mark.it(
+        "Records the time from the event being handled to the handler returning in the pipeline metrics"
+    )
+    def test_event_delivery(self, mocker, stage, event):
+        stage.on_pipeline_event_handler = mocker.MagicMock()
+        stage.handle_pipeline_event(event)
+        time.sleep(0.1)  # CT-TODO/BK-TODO: get rid of this
+        delivery = stage.metrics.snapshot()['event_delivery_seconds{event="%s"}' % event.name]
+        assert delivery.count == 1
+
 
 ######################
 # AUTO CONNECT STAGE #
@@ -632,6 +844,23 @@ class TestConnectionLockStageRunOpWhileBlocked(ConnectionLockStageTestConfig, St
         assert stage.queue.qsize() == 1
         assert stage.queue.get(block=False) is op
 
+    @pytest.mark.it("Marks the operation as queued, if pipeline traces are being recorded")
+    def test_trace(self, stage, op, trace_buffer):
+        stage.run_op(op)
+
+        marks = [r for r in trace_buffer.records() if r[0] == "n"]
+        assert [(mark[2], mark[6]) for mark in marks] == [
+            ("queued by ConnectionLockStage", op.trace_id)
+        ]
+
+    @pytest.mark.it("Reports the number of queued operations in the pipeline metrics")
+    def test_queue_depth_metric(self, stage, op):
+        registry = stage.pipeline_root.metrics
+        stage.register_metrics(registry)
+        stage.run_op(op)
+
+        assert registry.snapshot()["connection_lock_queue_depth"] == 1
+
         # Operation was not passed down
         assert stage.send_op_down.call_count == 0
 
@@ -767,6 +996,16 @@ class TestConnectionLockStageBlockingOpCompletedNoError(
         # the .run_op() calls, this could end up having items, but that case is covered by a different test
         assert stage.queue.qsize() == 0
 
+    @pytest.mark.it("Records the time each pending operation waited in the pipeline metrics")
+    def test_wait_time(self, blocked_stage, pending_ops, blocking_op):
+        stage = blocked_stage
+        stage.register_metrics(stage.pipeline_root.metrics)
+
+        blocking_op.complete()
+
+        wait_time = stage.pipeline_root.metrics.snapshot()["connection_lock_wait_seconds"]
+        assert wait_time.count == len(pending_ops)
+
     @pytest.mark.it("Unblocks the ConnectionLockStage prior to re-running any pending operations")
     def test_unblocks_before_rerun(self, mocker, blocked_stage, blocking_op, pending_ops):
         stage = blocked_stage
@@ -1502,6 +1741,29 @@ class TestRetryStageRetryableOperationCompletedWithRetryableError(RetryStageTest
         # Once the timer is completed, the op is no longer listed as waiting for retry
         assert op not in stage.ops_waiting_to_retry
 
+    @pytest.mark.it(
+        "Marks the operation as waiting to retry, if pipeline traces are being recorded"
+    )
+    def test_trace(self, stage, op, error, mock_timer, trace_buffer):
+        stage.run_op(op)
+        op.complete(error=error)
+
+        marks = [r for r in trace_buffer.records() if r[0] == "n"]
+        assert [(mark[2], mark[6]) for mark in marks] == [("waiting to retry", op.trace_id)]
+
+    @pytest.mark.it(
+        "Counts the retry, and the operations waiting to retry, in the pipeline metrics"
+    )
+    def test_metrics(self, stage, op, error, mock_timer):
+        registry = stage.pipeline_root.metrics
+        stage.register_metrics(registry)
+        stage.run_op(op)
+        op.complete(error=error)
+
+        snapshot = registry.snapshot()
+        assert snapshot['retries_total{op="%s"}' % op.name] == 1
+        assert snapshot["retry_waiting_ops"] == 1
+
     @pytest.mark.it("Re-runs the operation after the retry timer expires")
     def test_reruns(self, mocker, stage, op, error, mock_timer):
         stage.run_op(op)
@@ -16,6 +16,7 @@ from azure.iot.device.common.pipeline import (
     pipeline_events_mqtt,
     pipeline_stages_mqtt,
     pipeline_exceptions,
+    pipeline_trace,
     config,
 )
 from tests.common.pipeline.helpers import StageRunOpTestBase
@@ -477,6 +478,30 @@ class TestMQTTTransportStageRunOpCalledWithMQTTPublishOperation(
         assert op.completed
         assert op.error is None
 
+    @pytest.mark.it(
+        "Marks the operation as waiting for its PUBACK, if pipeline traces are being recorded"
+    )
+    def test_trace(self, mocker, stage, op):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        mocker.patch.object(pipeline_trace, "buffer", trace_buffer)
+        stage.run_op(op)
+
+        marks = [r for r in trace_buffer.records() if r[0] == "n"]
+        assert [(mark[2], mark[6]) for mark in marks] == [("waiting for PUBACK", op.trace_id)]
+
+    @pytest.mark.it(
+        "Records the time from the MQTT publish to its completion in the pipeline metrics"
+    )
+    def test_publish_latency(self, mocker, stage, op):
+        stage.register_metrics(stage.pipeline_root.metrics)
+        mocker.patch.object(pipeline_stages_mqtt.time, "time", side_effect=[10.0, 10.25])
+        stage.run_op(op)
+        stage.transport.publish.call_args[1]["callback"]()
+
+        latency = stage.pipeline_root.metrics.snapshot()["publish_latency_seconds"]
+        assert latency.count == 1
+        assert latency.sum == 0.25
+
 
 @pytest.mark.describe("MQTTTransportStage - .run_op() -- called with MQTTSubscribeOperation")
 class TestMQTTTransportStageRunOpCalledWithMQTTSubscribeOperation(
@@ -563,6 +588,27 @@ class TestMQTTTransportStageRunOpCalledWithArbitraryOperation(
         assert stage.send_op_down.call_args == mocker.call(op)
 
 
+@pytest.mark.describe("MQTTTransportStage - .register_metrics()")
+class TestMQTTTransportStageRegisterMetrics(MQTTTransportStageTestConfigComplex):
+    @pytest.mark.it(
+        "Adds a gauge of the operations the MQTTTransport is waiting to be acknowledged"
+    )
+    def test_pending_acks(self, stage):
+        registry = stage.pipeline_root.metrics
+        stage.register_metrics(registry)
+        stage.transport.pending_operation_count.return_value = 3
+
+        assert registry.snapshot()["mqtt_pending_acks"] == 3
+
+    @pytest.mark.it("Reports no pending acknowledgements if there is no MQTTTransport")
+    def test_no_transport(self, stage):
+        registry = stage.pipeline_root.metrics
+        stage.register_metrics(registry)
+        stage.transport = None
+
+        assert registry.snapshot()["mqtt_pending_acks"] == 0
+
+
 @pytest.mark.describe("MQTTTransportStage - OCCURANCE: MQTT message received")
 class TestMQTTTransportStageProtocolClientEvents(MQTTTransportStageTestConfigComplex):
     @pytest.mark.it("Sends an IncomingMQTTMessageEvent event up the pipeline")
@@ -0,0 +1,148 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import gc
+import logging
+import pytest
+import threading
+from azure.iot.device.common.pipeline import pipeline_thread
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+class FakeClient(object):
+    pass
+
+
+@pytest.fixture(autouse=True)
+def restore_callback_executor():
+    yield
+    pipeline_thread.configure_callback_executor()
+
+
+@pytest.mark.describe("CallbackExecutor - Instantiation")
+class TestCallbackExecutorInstantiation(object):
+    @pytest.mark.it("Defaults to a single worker, shared by all clients")
+    def test_defaults(self):
+        executor = pipeline_thread.CallbackExecutor()
+        assert executor.workers == 1
+        assert executor.isolate_clients is False
+
+    @pytest.mark.it("Raises a ValueError if workers is less than 1")
+    def test_bad_workers(self):
+        with pytest.raises(ValueError):
+            pipeline_thread.CallbackExecutor(workers=0)
+
+
+@pytest.mark.describe("CallbackExecutor - .get_executor()")
+class TestCallbackExecutorGetExecutor(object):
+    @pytest.mark.it("Returns the same executor for every client and lane, with a single worker")
+    def test_single_worker(self):
+        executor = pipeline_thread.CallbackExecutor()
+        assert (
+            executor.get_executor()
+            is executor.get_executor(FakeClient())
+            is executor.get_executor(FakeClient(), "C2DMessageEvent")
+        )
+
+    @pytest.mark.it("Returns the same executor each time for a client and lane")
+    def test_same_lane(self):
+        executor = pipeline_thread.CallbackExecutor(workers=4)
+        client = FakeClient()
+        assert executor.get_executor(client, "lane") is executor.get_executor(client, "lane")
+
+    @pytest.mark.it("Spreads clients and lanes over the workers")
+    def test_spreads(self):
+        executor = pipeline_thread.CallbackExecutor(workers=4)
+        clients = [FakeClient() for _ in range(50)]
+        executors = set(executor.get_executor(client, "lane") for client in clients)
+        assert len(executors) == 4
+
+    @pytest.mark.it(
+        "Returns an executor of the client's own for every lane of a client, if isolating clients"
+    )
+    def test_isolated(self):
+        executor = pipeline_thread.CallbackExecutor(isolate_clients=True)
+        client1 = FakeClient()
+        client2 = FakeClient()
+        assert executor.get_executor(client1) is executor.get_executor(client1, "lane")
+        assert executor.get_executor(client1) is not executor.get_executor(client2)
+        assert executor.get_executor(client1) is not executor.get_executor()
+
+    @pytest.mark.it("Drops the executor of an isolated client once the client is collected")
+    def test_isolated_dropped(self):
+        executor = pipeline_thread.CallbackExecutor(isolate_clients=True)
+        executor.get_executor(FakeClient())
+        gc.collect()
+        assert len(executor._client_executors) == 0
+
+
+@pytest.mark.describe("CallbackExecutor - .shutdown()")
+class TestCallbackExecutorShutdown(object):
+    @pytest.mark.it("Shuts down every executor it has created")
+    def test_shutdown(self, mocker):
+        executor = pipeline_thread.CallbackExecutor(workers=2, isolate_clients=True)
+        client = FakeClient()
+        executors = [executor.get_executor(), executor.get_executor(client)]
+        for e in executors:
+            mocker.spy(e, "shutdown")
+
+        executor.shutdown(wait=False)
+
+        for e in executors:
+            assert e.shutdown.call_args == mocker.call(wait=False)
+
+
+@pytest.mark.describe("pipeline_thread - .configure_callback_executor()")
+class TestConfigureCallbackExecutor(object):
+    @pytest.mark.it("Replaces the CallbackExecutor, shutting the old one down without waiting")
+    def test_replaces(self, mocker):
+        old_executor = pipeline_thread._callback_executor
+        mocker.spy(old_executor, "shutdown")
+
+        pipeline_thread.configure_callback_executor(workers=3, isolate_clients=True)
+
+        assert pipeline_thread._callback_executor is not old_executor
+        assert pipeline_thread._callback_executor.workers == 3
+        assert pipeline_thread._callback_executor.isolate_clients is True
+        assert old_executor.shutdown.call_args == mocker.call(wait=False)
+
+
+@pytest.mark.describe("pipeline_thread - .invoke_on_callback_thread_nowait()")
+class TestInvokeOnCallbackThreadNowait(object):
+    @pytest.mark.it("Runs calls for the same client and lane in the order they were made")
+    @pytest.mark.parametrize("isolate_clients", [False, True])
+    def test_ordered(self, isolate_clients):
+        pipeline_thread.configure_callback_executor(workers=4, isolate_clients=isolate_clients)
+        client = FakeClient()
+        calls = []
+
+        futures = [
+            pipeline_thread.invoke_on_callback_thread_nowait(
+                calls.append, client=client, lane="lane"
+            )(i)
+            for i in range(100)
+        ]
+        for future in futures:
+            future.result()
+
+        assert calls == list(range(100))
+
+    @pytest.mark.it("Runs the calls of an isolated client while another client's call is blocked")
+    def test_isolated(self):
+        pipeline_thread.configure_callback_executor(isolate_clients=True)
+        unblock = threading.Event()
+        blocked = pipeline_thread.invoke_on_callback_thread_nowait(
+            unblock.wait, client=FakeClient()
+        )(5)
+
+        other = pipeline_thread.invoke_on_callback_thread_nowait(
+            lambda: "done", client=FakeClient()
+        )()
+
+        assert other.result(timeout=1) == "done"
+        assert not blocked.done()
+        unblock.set()
+        assert blocked.result(timeout=1) is True
@@ -0,0 +1,162 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+import functools
+import json
+import logging
+import pytest
+import six
+from azure.iot.device.common.pipeline import pipeline_trace
+from .fixtures import ArbitraryOperation
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+@pytest.fixture
+def op(mocker):
+    return ArbitraryOperation(callback=mocker.MagicMock())
+
+
+@pytest.fixture(autouse=True)
+def stop_recording():
+    yield
+    pipeline_trace.stop()
+
+
+@pytest.mark.describe("pipeline_trace - .start() and .stop()")
+class TestStartStop(object):
+    @pytest.mark.it("Is not recording by default")
+    def test_default(self):
+        assert pipeline_trace.buffer is None
+
+    @pytest.mark.it("Starts recording into a new TraceBuffer with the provided capacity")
+    def test_start(self):
+        trace_buffer = pipeline_trace.start(capacity=10)
+        assert pipeline_trace.buffer is trace_buffer
+        assert trace_buffer.capacity == 10
+
+    @pytest.mark.it("Stops recording, returning the TraceBuffer which was being recorded into")
+    def test_stop(self):
+        trace_buffer = pipeline_trace.start()
+        assert pipeline_trace.stop() is trace_buffer
+        assert pipeline_trace.buffer is None
+
+
+@pytest.mark.describe("TraceBuffer")
+class TestTraceBuffer(object):
+    @pytest.mark.it("Raises a ValueError if the capacity is less than 1")
+    def test_bad_capacity(self):
+        with pytest.raises(ValueError):
+            pipeline_trace.TraceBuffer(capacity=0)
+
+    @pytest.mark.it("Keeps only the most recent records, up to its capacity, oldest first")
+    def test_ring(self, op):
+        trace_buffer = pipeline_trace.TraceBuffer(capacity=3)
+        for i in range(5):
+            trace_buffer.mark(op, "mark {}".format(i))
+
+        assert [record[2] for record in trace_buffer.records()] == ["mark 2", "mark 3", "mark 4"]
+
+    @pytest.mark.it("Does not keep operations alive")
+    def test_no_reference(self, op):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.op_started(op)
+
+        record = trace_buffer.records()[0]
+        assert op not in record
+        assert record[5:7] == (op.name, op.trace_id)
+
+    @pytest.mark.it(
+        "Gives each operation an id unique in the process, even when the id() of an operation "
+        "which was freed is reused"
+    )
+    def test_unique_ids(self, mocker):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        for _ in range(10):
+            trace_buffer.op_started(ArbitraryOperation(callback=mocker.MagicMock()))
+        other_buffer = pipeline_trace.TraceBuffer()
+        other_buffer.op_started(ArbitraryOperation(callback=mocker.MagicMock()))
+
+        op_ids = [record[6] for record in trace_buffer.records() + other_buffer.records()]
+        assert len(set(op_ids)) == 11
+
+    @pytest.mark.it("Keeps the id of an operation for all of its records")
+    def test_same_id(self, op):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.op_started(op)
+        trace_buffer.mark(op, "mark")
+        trace_buffer.span("stage", "stage", op, trace_buffer.now())
+        trace_buffer.op_completed(op)
+
+        assert set(record[6] for record in trace_buffer.records()) == set([op.trace_id])
+
+    @pytest.mark.it("Names callback spans after the callback, or the function of a partial")
+    def test_callback_name(self, op):
+        def on_complete(op, error):
+            pass
+
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.callback_span(op, on_complete, trace_buffer.now())
+        trace_buffer.callback_span(op, functools.partial(on_complete, op), trace_buffer.now())
+
+        assert [record[2] for record in trace_buffer.records()] == ["on_complete", "on_complete"]
+
+
+@pytest.mark.describe("TraceBuffer - .to_chrome_trace()")
+class TestTraceBufferToChromeTrace(object):
+    @pytest.mark.it("Converts spans to complete events, with durations in microseconds")
+    def test_span(self, mocker, op):
+        mocker.patch.object(pipeline_trace, "_clock", return_value=1.5)
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.span("stage", "SomeStage", op, 1.0)
+
+        event = trace_buffer.to_chrome_trace()["traceEvents"][0]
+        assert event["ph"] == "X"
+        assert event["cat"] == "stage"
+        assert event["name"] == "SomeStage"
+        assert event["ts"] == 1e6
+        assert event["dur"] == 0.5e6
+        assert event["args"] == {"op": op.name, "id": "0x{:x}".format(op.trace_id)}
+
+    @pytest.mark.it(
+        "Converts the start, marks and completion of an operation to async events with its id"
+    )
+    def test_async(self, op):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.op_started(op)
+        trace_buffer.mark(op, "waiting for PUBACK")
+        op.error = Exception("fake error")
+        trace_buffer.op_completed(op)
+
+        events = trace_buffer.to_chrome_trace()["traceEvents"]
+        assert [(e["ph"], e["name"]) for e in events] == [
+            ("b", op.name),
+            ("n", "waiting for PUBACK"),
+            ("e", op.name),
+        ]
+        assert set(e["id"] for e in events) == set(["0x{:x}".format(op.trace_id)])
+        assert events[2]["args"] == {"error": "fake error"}
+
+
+@pytest.mark.describe("TraceBuffer - .export_chrome_trace()")
+class TestTraceBufferExportChromeTrace(object):
+    @pytest.mark.it("Writes the Chrome trace as JSON to a file object")
+    def test_file_object(self, op):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.op_started(op)
+        f = six.StringIO()
+        trace_buffer.export_chrome_trace(f)
+
+        assert json.loads(f.getvalue()) == trace_buffer.to_chrome_trace()
+
+    @pytest.mark.it("Writes the Chrome trace as JSON to a path")
+    def test_path(self, tmpdir, op):
+        trace_buffer = pipeline_trace.TraceBuffer()
+        trace_buffer.op_started(op)
+        path = str(tmpdir.join("trace.json"))
+        trace_buffer.export_chrome_trace(path)
+
+        with open(path) as f:
+            assert json.load(f) == trace_buffer.to_chrome_trace()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import json
+import pytest
+import logging
+from azure.iot.device.common import codec
+
+logging.basicConfig(level=logging.DEBUG)
+
+fake_object = {"temperature": 21.5, "tags": ["a", "b"], "nested": {"z": 1, "a": None}}
+
+
+@pytest.mark.describe("JSONCodec - .encode()")
+class TestJSONCodecEncode(object):
+    @pytest.mark.it("Encodes an object as JSON text")
+    def test_encode(self):
+        encoded = codec.JSONCodec().encode(fake_object)
+        assert encoded == json.dumps(fake_object)
+
+    @pytest.mark.it("Passes default and sort_keys to the dumps function")
+    def test_default_and_sort_keys(self):
+        class Payload(object):
+            def __init__(self):
+                self.b = 1
+                self.a = 2
+
+        encoded = codec.JSONCodec().encode(Payload(), default=lambda o: o.__dict__, sort_keys=True)
+        assert encoded == '{"a": 2, "b": 1}'
+
+    @pytest.mark.it("Uses the given dumps function, decoding bytes it returns as UTF-8")
+    def test_custom_dumps(self, mocker):
+        dumps = mocker.MagicMock(return_value=b'{"a": "\xc3\xa9"}')
+        encoded = codec.JSONCodec(dumps=dumps).encode({"a": "é"})
+        assert dumps.call_args == mocker.call({"a": "é"})
+        assert encoded == '{"a": "é"}'
+
+    @pytest.mark.it(
+        "Applies default and sorts keys itself for the given dumps function, passing it only the "
+        "object"
+    )
+    def test_custom_dumps_default_and_sort_keys(self):
+        class Payload(object):
+            def __init__(self):
+                self.b = {"z": 1, "y": [2]}
+                self.a = None
+
+        # Like orjson.dumps, which takes no sort_keys argument
+        def dumps(obj, default=None):
+            return json.dumps(obj).encode("utf-8")
+
+        encoded = codec.JSONCodec(dumps=dumps).encode(
+            Payload(), default=lambda o: o.__dict__, sort_keys=True
+        )
+        assert encoded == '{"a": null, "b": {"y": [2], "z": 1}}'
+
+
+@pytest.mark.describe("JSONCodec - .decode()")
+class TestJSONCodecDecode(object):
+    @pytest.mark.it("Decodes an object from JSON text or UTF-8 encoded bytes")
+    @pytest.mark.parametrize(
+        "data",
+        [
+            pytest.param(json.dumps(fake_object), id="Text"),
+            pytest.param(json.dumps(fake_object).encode("utf-8"), id="Bytes"),
+            pytest.param(bytearray(json.dumps(fake_object).encode("utf-8")), id="Bytearray"),
+        ],
+    )
+    def test_decode(self, data):
+        assert codec.JSONCodec().decode(data) == fake_object
+
+    @pytest.mark.it("Uses the given loads function")
+    def test_custom_loads(self, mocker):
+        loads = mocker.MagicMock()
+        decoded = codec.JSONCodec(loads=loads).decode(b"{}")
+        assert loads.call_args == mocker.call("{}")
+        assert decoded is loads.return_value
+
+    @pytest.mark.it("Raises a ValueError if the data is not JSON")
+    def test_not_json(self):
+        with pytest.raises(ValueError):
+            codec.JSONCodec().decode(b"not json")
+
+
+@pytest.mark.describe("CBORCodec")
+class TestCBORCodec(object):
+    @pytest.mark.it("Encodes and decodes objects as CBOR")
+    def test_round_trip(self):
+        pytest.importorskip("cbor2")
+        cbor_codec = codec.CBORCodec()
+        encoded = cbor_codec.encode(fake_object)
+        assert isinstance(encoded, bytes)
+        assert cbor_codec.decode(encoded) == fake_object
+        assert cbor_codec.content_type == "application/cbor"
+
+    @pytest.mark.it("Raises an ImportError if cbor2 is not installed")
+    def test_not_installed(self, mocker):
+        mocker.patch.dict("sys.modules", {"cbor2": None})
+        with pytest.raises(ImportError):
+            codec.CBORCodec()
+
+
+@pytest.mark.describe("MessagePackCodec")
+class TestMessagePackCodec(object):
+    @pytest.mark.it("Encodes and decodes objects as MessagePack")
+    def test_round_trip(self):
+        pytest.importorskip("msgpack")
+        msgpack_codec = codec.MessagePackCodec()
+        encoded = msgpack_codec.encode(fake_object)
+        assert isinstance(encoded, bytes)
+        assert msgpack_codec.decode(encoded) == fake_object
+        assert msgpack_codec.content_type == "application/x-msgpack"
+
+    @pytest.mark.it("Raises an ImportError if msgpack is not installed")
+    def test_not_installed(self, mocker):
+        mocker.patch.dict("sys.modules", {"msgpack": None})
+        with pytest.raises(ImportError):
+            codec.MessagePackCodec()
@@ -0,0 +1,83 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import logging
+from concurrent.futures import Future
+from azure.iot.device.common.future_callback import FutureCallback
+
+logging.basicConfig(level=logging.INFO)
+
+
+@pytest.mark.describe("FutureCallback")
+class TestFutureCallback(object):
+    @pytest.mark.it("Can be instantiated with no args")
+    def test_instantiates_without_return_arg_name(self):
+        callback = FutureCallback()
+        assert isinstance(callback, FutureCallback)
+
+    @pytest.mark.it("Raises a TypeError if return_arg_name is not a string")
+    def test_type_error_on_bad_return_arg_name(self):
+        with pytest.raises(TypeError):
+            FutureCallback(return_arg_name=1)
+
+    @pytest.mark.it("Creates a running Future, which cannot be cancelled")
+    def test_future_running(self):
+        callback = FutureCallback()
+        assert isinstance(callback.future, Future)
+        assert callback.future.running()
+        assert not callback.future.cancel()
+
+    @pytest.mark.it(
+        "Completes the Future with a result of None when a call is invoked on the instance "
+        "(without return_arg_name)"
+    )
+    def test_calling_object_completes_future(self):
+        callback = FutureCallback()
+        assert not callback.future.done()
+        callback()
+        assert callback.future.done()
+        assert callback.future.result(timeout=0) is None
+
+    @pytest.mark.it(
+        "Completes the Future with the return argument when a call is invoked on the instance "
+        "(with return_arg_name)"
+    )
+    def test_calling_object_completes_future_with_return_arg_name(self, fake_return_arg_value):
+        callback = FutureCallback(return_arg_name="arg_name")
+        callback(arg_name=fake_return_arg_value)
+        assert callback.future.result(timeout=0) == fake_return_arg_value
+
+    @pytest.mark.it(
+        "Raises a TypeError, and completes the Future with it, when a call is invoked on the "
+        "instance without the correct return argument (with return_arg_name)"
+    )
+    def test_calling_object_raises_exception_if_return_arg_is_missing(self):
+        callback = FutureCallback(return_arg_name="arg_name")
+        with pytest.raises(TypeError) as e_info:
+            callback()
+        assert callback.future.exception(timeout=0) is e_info.value
+
+    @pytest.mark.it(
+        "Completes the Future with the error when an error parameter is passed to the call"
+    )
+    @pytest.mark.parametrize("return_arg_name", [None, "arg_name"])
+    def test_completes_future_with_error(self, arbitrary_exception, return_arg_name):
+        callback = FutureCallback(return_arg_name=return_arg_name)
+        callback(error=arbitrary_exception)
+        assert callback.future.exception(timeout=0) is arbitrary_exception
+
+    @pytest.mark.it(
+        "Completes the Future with the converted error when an error parameter is passed to "
+        "the call (with convert_error)"
+    )
+    def test_completes_future_with_converted_error(self, mocker, arbitrary_exception):
+        converted_exception = ValueError("converted")
+        convert_error = mocker.MagicMock(return_value=converted_exception)
+        callback = FutureCallback(convert_error=convert_error)
+        callback(error=arbitrary_exception)
+        assert convert_error.call_args == mocker.call(arbitrary_exception)
+        assert callback.future.exception(timeout=0) is converted_exception
@@ -0,0 +1,172 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import gc
+import pytest
+import logging
+import sys
+from azure.iot.device.common import metrics
+
+logging.basicConfig(level=logging.DEBUG)
+
+
+@pytest.fixture
+def registry():
+    return metrics.MetricsRegistry(labels={"client": "fake_device_id"})
+
+
+@pytest.mark.describe("Counter")
+class TestCounter(object):
+    @pytest.mark.it("Starts at 0")
+    def test_starts_at_zero(self):
+        counter = metrics.Counter("fake_counter")
+        assert counter.value == 0
+
+    @pytest.mark.it("Increases by 1, or by the provided amount, when incremented")
+    def test_inc(self):
+        counter = metrics.Counter("fake_counter")
+        counter.inc()
+        counter.inc(5)
+        assert counter.value == 6
+
+
+@pytest.mark.describe("Gauge")
+class TestGauge(object):
+    @pytest.mark.it("Calls its function each time its value is read")
+    def test_value(self, mocker):
+        function = mocker.MagicMock(side_effect=[1, 2])
+        gauge = metrics.Gauge("fake_gauge", function)
+        assert function.call_count == 0
+        assert gauge.value == 1
+        assert gauge.value == 2
+
+
+@pytest.mark.describe("Histogram")
+class TestHistogram(object):
+    @pytest.mark.it("Counts each observation in every bucket with an upper bound no less than it")
+    def test_buckets(self):
+        histogram = metrics.Histogram("fake_histogram", buckets=(1, 2, 5))
+        for value in (0.5, 1, 1.5, 4, 10):
+            histogram.observe(value)
+
+        value = histogram.value
+        assert value.buckets == (1, 2, 5)
+        assert value.counts == (2, 3, 4)
+        assert value.count == 5
+        assert value.sum == 17.0
+
+    @pytest.mark.it("Uses the default latency buckets if no buckets are provided")
+    def test_default_buckets(self):
+        histogram = metrics.Histogram("fake_histogram")
+        assert histogram.value.buckets == metrics.DEFAULT_LATENCY_BUCKETS
+        assert histogram.value.counts == (0,) * len(metrics.DEFAULT_LATENCY_BUCKETS)
+
+
+@pytest.mark.describe("MetricsRegistry")
+class TestMetricsRegistry(object):
+    @pytest.mark.it("Returns the existing counter or histogram with the same name and labels")
+    @pytest.mark.parametrize("method", ["counter", "histogram"])
+    def test_get_existing(self, registry, method):
+        create = getattr(registry, method)
+        metric = create("fake_metric", labels={"op": "fake_op"})
+        assert create("fake_metric", labels={"op": "fake_op"}) is metric
+        assert create("fake_metric", labels={"op": "other_op"}) is not metric
+        assert create("fake_metric") is not metric
+
+    @pytest.mark.it("Replaces an existing gauge with the same name and labels")
+    def test_replaces_gauge(self, registry):
+        registry.gauge("fake_gauge", lambda: 1)
+        registry.gauge("fake_gauge", lambda: 2)
+        assert registry.snapshot() == {"fake_gauge": 2}
+
+    @pytest.mark.it(
+        "Collects a sample of every metric, including the labels of the registry in its labels"
+    )
+    def test_collect(self, registry):
+        registry.counter("fake_counter", "fake description", labels={"op": "fake_op"}).inc()
+        registry.gauge("fake_gauge", lambda: 7)
+
+        samples = registry.collect()
+        assert samples == [
+            metrics.MetricSample(
+                name="fake_counter",
+                kind="counter",
+                description="fake description",
+                labels={"client": "fake_device_id", "op": "fake_op"},
+                value=1,
+            ),
+            metrics.MetricSample(
+                name="fake_gauge",
+                kind="gauge",
+                description="",
+                labels={"client": "fake_device_id"},
+                value=7,
+            ),
+        ]
+
+    @pytest.mark.it("Takes a snapshot of every metric, keyed by its name and its own labels")
+    def test_snapshot(self, registry):
+        registry.counter("fake_counter", labels={"op": "fake_op", "b": "1"}).inc(3)
+        registry.histogram("fake_histogram", buckets=(1,)).observe(0.5)
+
+        snapshot = registry.snapshot()
+        assert list(snapshot.keys()) == ['fake_counter{b="1",op="fake_op"}', "fake_histogram"]
+        assert snapshot['fake_counter{b="1",op="fake_op"}'] == 3
+        assert snapshot["fake_histogram"] == metrics.HistogramValue(
+            buckets=(1,), counts=(1,), sum=0.5, count=1
+        )
+
+
+@pytest.mark.describe("ProcessMetrics")
+class TestProcessMetrics(object):
+    @pytest.mark.it("Collects the samples of every added registry")
+    def test_collect(self):
+        process_metrics = metrics.ProcessMetrics()
+        registry1 = metrics.MetricsRegistry(labels={"client": "device1"})
+        registry2 = metrics.MetricsRegistry(labels={"client": "device2"})
+        registry1.gauge("fake_gauge", lambda: 1)
+        registry2.gauge("fake_gauge", lambda: 2)
+        process_metrics.add(registry1)
+        process_metrics.add(registry2)
+
+        samples = process_metrics.collect()
+        assert sorted((s.labels["client"], s.value) for s in samples) == [
+            ("device1", 1),
+            ("device2", 2),
+        ]
+
+    @pytest.mark.it("Does not keep registries alive")
+    def test_weak(self):
+        process_metrics = metrics.ProcessMetrics()
+        process_metrics.add(metrics.MetricsRegistry())
+        gc.collect()
+        assert process_metrics.registries() == []
+
+
+@pytest.mark.describe("PrometheusCollector")
+class TestPrometheusCollector(object):
+    @pytest.mark.it("Raises an ImportError if prometheus_client is not installed")
+    def test_requires_prometheus_client(self, mocker):
+        mocker.patch.dict(sys.modules, {"prometheus_client": None})
+        with pytest.raises(ImportError):
+            metrics.PrometheusCollector()
+
+    @pytest.mark.it("Exports every metric as a prometheus_client metric family")
+    def test_collect(self, registry):
+        pytest.importorskip("prometheus_client")
+        registry.counter("fake_counter", labels={"op": "fake_op"}).inc(2)
+        registry.gauge("fake_gauge", lambda: 3)
+        registry.histogram("fake_histogram", buckets=(1,)).observe(0.5)
+
+        families = {f.name: f for f in metrics.PrometheusCollector(registry, prefix="").collect()}
+        assert families["fake_counter"].type == "counter"
+        assert families["fake_counter"].samples[0].value == 2
+        assert families["fake_counter"].samples[0].labels == {
+            "client": "fake_device_id",
+            "op": "fake_op",
+        }
+        assert families["fake_gauge"].samples[0].value == 3
+        assert families["fake_histogram"].type == "histogram"
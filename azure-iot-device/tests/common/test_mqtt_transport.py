@@ -1953,6 +1953,19 @@ class TestOperationManagerEstablishOperation(object):
         assert mocker.call.cb() not in calls_during_lock
 
 
+@pytest.mark.describe("OperationManager - .pending_operation_count()")
+class TestOperationManagerPendingOperationCount(object):
+    @pytest.mark.it("Returns the number of operations waiting for completion")
+    def test_count(self, mocker):
+        manager = OperationManager()
+        assert manager.pending_operation_count() == 0
+        manager.establish_operation(1, mocker.MagicMock())
+        manager.establish_operation(2, mocker.MagicMock())
+        assert manager.pending_operation_count() == 2
+        manager.complete_operation(1)
+        assert manager.pending_operation_count() == 1
+
+
 @pytest.mark.describe("OperationManager - .complete_operation()")
 class TestOperationManagerCompleteOperation(object):
     @pytest.mark.it("Resolves a operation tracking when MID corresponds to a pending operation")
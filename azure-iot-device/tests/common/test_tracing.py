@@ -0,0 +1,97 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import logging
+from azure.iot.device.common import tracing
+
+logging.basicConfig(level=logging.DEBUG)
+
+fake_category = "test.category"
+
+
+@pytest.fixture
+def logger(mocker):
+    logger = mocker.MagicMock()
+    logger.isEnabledFor.return_value = True
+    return logger
+
+
+@pytest.fixture(autouse=True)
+def reset_sampling():
+    yield
+    tracing._sampling.pop(fake_category, None)
+
+
+@pytest.mark.describe("Tracer - .enabled")
+class TestTracerEnabled(object):
+    @pytest.mark.it("Is True if the logger is enabled for the level of the tracer")
+    @pytest.mark.parametrize("enabled", [True, False])
+    def test_enabled(self, logger, enabled):
+        logger.isEnabledFor.return_value = enabled
+        tracer = tracing.get_tracer(logger, fake_category, logging.INFO)
+
+        assert tracer.enabled is enabled
+        assert logger.isEnabledFor.call_args[0] == (logging.INFO,)
+
+
+@pytest.mark.describe("Tracer - .__call__()")
+class TestTracerCall(object):
+    @pytest.mark.it("Logs the message with its args, at the level of the tracer")
+    def test_logs(self, mocker, logger):
+        tracer = tracing.get_tracer(logger, fake_category, logging.INFO)
+        tracer("publishing on %s", "topic")
+
+        assert logger.log.call_args == mocker.call(logging.INFO, "publishing on %s", "topic")
+
+    @pytest.mark.it("Defaults to the DEBUG level")
+    def test_default_level(self, logger):
+        tracer = tracing.get_tracer(logger, fake_category)
+        tracer("message")
+
+        assert logger.log.call_args[0][0] == logging.DEBUG
+
+    @pytest.mark.it("Logs only 1 in every sample_every traces")
+    def test_sampled(self, logger):
+        tracer = tracing.get_tracer(logger, fake_category)
+        tracer.sample_every = 3
+        for i in range(7):
+            tracer("trace %s", i)
+
+        assert [c[0][2] for c in logger.log.call_args_list] == [2, 5]
+
+
+@pytest.mark.describe("tracing - .set_sampling()")
+class TestSetSampling(object):
+    @pytest.mark.it("Samples the existing tracers of the category")
+    def test_existing(self, logger):
+        tracer = tracing.get_tracer(logger, fake_category)
+        other = tracing.get_tracer(logger, "other.category")
+        tracing.set_sampling(fake_category, 10)
+
+        assert tracer.sample_every == 10
+        assert other.sample_every == 1
+
+    @pytest.mark.it("Samples tracers of the category created later")
+    def test_later(self, logger):
+        tracing.set_sampling(fake_category, 10)
+        tracer = tracing.get_tracer(logger, fake_category)
+
+        assert tracer.sample_every == 10
+
+    @pytest.mark.it("Logs every trace when set to 1")
+    def test_every(self, logger):
+        tracer = tracing.get_tracer(logger, fake_category)
+        tracing.set_sampling(fake_category, 10)
+        tracing.set_sampling(fake_category, 1)
+        tracer("message")
+
+        assert logger.log.call_count == 1
+
+    @pytest.mark.it("Raises a ValueError if every is less than 1")
+    def test_bad_every(self):
+        with pytest.raises(ValueError):
+            tracing.set_sampling(fake_category, 0)
@@ -497,6 +497,62 @@ class SharedClientSendD2CMessageTests(object):
         assert sent_message.data == message_input
 
 
+class SharedClientAddTelemetryReadingsTests(object):
+    @pytest.mark.it("Begins an 'add_telemetry_readings' pipeline operation")
+    async def test_calls_pipeline_add_telemetry_readings(self, client, iothub_pipeline):
+        readings = {"temperature": [20.5, 21.0]}
+        await client.add_telemetry_readings(readings)
+        assert iothub_pipeline.add_telemetry_readings.call_count == 1
+        assert iothub_pipeline.add_telemetry_readings.call_args[0][0] is readings
+
+    @pytest.mark.it(
+        "Waits for the completion of the 'add_telemetry_readings' pipeline operation before returning"
+    )
+    async def test_waits_for_pipeline_op_completion(self, mocker, client, iothub_pipeline):
+        cb_mock = mocker.patch.object(async_adapter, "AwaitableCallback").return_value
+        cb_mock.completion.return_value = await create_completed_future(None)
+
+        await client.add_telemetry_readings({"temperature": 20.5})
+
+        # Assert callback is sent to pipeline
+        assert iothub_pipeline.add_telemetry_readings.call_args[1]["callback"] is cb_mock
+        # Assert callback completion is waited upon
+        assert cb_mock.completion.call_count == 1
+
+    @pytest.mark.it(
+        "Raises a client error if the `add_telemetry_readings` pipeline operation calls back with an error"
+    )
+    async def test_raises_error_on_pipeline_op_error(self, mocker, client, iothub_pipeline):
+        my_pipeline_error = TypeError()
+
+        def fail_add_telemetry_readings(readings, callback):
+            callback(error=my_pipeline_error)
+
+        iothub_pipeline.add_telemetry_readings = mocker.MagicMock(
+            side_effect=fail_add_telemetry_readings
+        )
+        with pytest.raises(client_exceptions.ClientError) as e_info:
+            await client.add_telemetry_readings({"temperature": "hot"})
+        assert e_info.value.__cause__ is my_pipeline_error
+
+    @pytest.mark.it(
+        "Raises a ValueError, without beginning a pipeline operation, if a channel has no readings or a reading which is not finite"
+    )
+    @pytest.mark.parametrize(
+        "readings",
+        [
+            pytest.param({"temperature": 20.5, "humidity": []}, id="Empty list"),
+            pytest.param({"temperature": float("nan")}, id="NaN"),
+            pytest.param({"temperature": [20.5, float("inf")]}, id="Infinity"),
+            pytest.param({"temperature": float("-inf")}, id="Negative infinity"),
+        ],
+    )
+    async def test_invalid_readings(self, client, iothub_pipeline, readings):
+        with pytest.raises(ValueError):
+            await client.add_telemetry_readings(readings)
+        assert iothub_pipeline.add_telemetry_readings.call_count == 0
+
+
 class SharedClientReceiveMethodRequestTests(object):
     @pytest.mark.it("Implicitly enables methods feature if not already enabled")
     @pytest.mark.parametrize(
@@ -906,6 +962,21 @@ class SharedClientPROPERTYConnectedTests(object):
         assert not client.connected
 
 
+class SharedClientPROPERTYMetricsTests(object):
+    @pytest.mark.it("Cannot be changed")
+    async def test_read_only(self, client):
+        with pytest.raises(AttributeError):
+            client.metrics = None
+
+    @pytest.mark.it("Is the metrics of the pipeline")
+    async def test_pipeline_metrics(self, client, iothub_pipeline):
+        assert client.metrics is iothub_pipeline.metrics
+
+    @pytest.mark.it("Includes the depths of the client's inboxes")
+    async def test_inbox_depths(self, client):
+        assert 'inbox_depth{inbox="c2d_message"}' in client.metrics.snapshot()
+
+
 ################
 # DEVICE TESTS #
 ################
@@ -1294,6 +1365,11 @@ class TestIoTHubDeviceClientSendD2CMessage(
     pass
 
 
+@pytest.mark.describe("IoTHubDeviceClient (Asynchronous) - .add_telemetry_readings()")
+class TestIoTHubDeviceClientAddTelemetryReadings(IoTHubDeviceClientTestsConfig, SharedClientAddTelemetryReadingsTests):
+    pass
+
+
 @pytest.mark.describe("IoTHubDeviceClient (Asynchronous) - .receive_message()")
 class TestIoTHubDeviceClientReceiveC2DMessage(IoTHubDeviceClientTestsConfig):
     @pytest.mark.it("Implicitly enables C2D messaging feature if not already enabled")
@@ -1519,6 +1595,13 @@ class TestIoTHubDeviceClientPROPERTYConnected(
     pass
 
 
+@pytest.mark.describe("IoTHubDeviceClient (Asynchronous) - PROPERTY .metrics")
+class TestIoTHubDeviceClientPROPERTYMetrics(
+    IoTHubDeviceClientTestsConfig, SharedClientPROPERTYMetricsTests
+):
+    pass
+
+
 ################
 # MODULE TESTS #
 ################
@@ -2173,6 +2256,11 @@ class TestIoTHubNModuleClientSendD2CMessage(
     pass
 
 
+@pytest.mark.describe("IoTHubModuleClient (Asynchronous) - .add_telemetry_readings()")
+class TestIoTHubModuleClientAddTelemetryReadings(IoTHubModuleClientTestsConfig, SharedClientAddTelemetryReadingsTests):
+    pass
+
+
 @pytest.mark.describe("IoTHubModuleClient (Asynchronous) - .send_message_to_output()")
 class TestIoTHubModuleClientSendToOutput(IoTHubModuleClientTestsConfig):
     @pytest.mark.it("Begins a 'send_output_event' pipeline operation")
@@ -2427,3 +2515,10 @@ class TestIoTHubModuleClientPROPERTYConnected(
     IoTHubModuleClientTestsConfig, SharedClientPROPERTYConnectedTests
 ):
     pass
+
+
+@pytest.mark.describe("IoTHubModule (Asynchronous) - PROPERTY .metrics")
+class TestIoTHubModuleClientPROPERTYMetrics(
+    IoTHubModuleClientTestsConfig, SharedClientPROPERTYMetricsTests
+):
+    pass
@@ -108,6 +108,17 @@ class TestAsyncClientInboxGet(object):
         await asyncio.gather(wait_for_item(), insert_item())
 
 
+@pytest.mark.describe("AsyncClientInbox - .qsize()")
+class TestAsyncClientInboxQsize(object):
+    @pytest.mark.it("Returns the number of items in the inbox")
+    def test_returns_number_of_items(self, mocker):
+        inbox = AsyncClientInbox()
+        assert inbox.qsize() == 0
+        inbox._put(mocker.MagicMock())
+        inbox._put(mocker.MagicMock())
+        assert inbox.qsize() == 2
+
+
 @pytest.mark.describe("AsyncClientInbox - .clear()")
 class TestAsyncClientInboxClear(object):
     @pytest.mark.it("Clears all items from the inbox")
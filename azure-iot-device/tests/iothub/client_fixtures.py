@@ -8,6 +8,7 @@ import pytest
 from azure.iot.device.iothub.pipeline import constant
 from azure.iot.device.iothub.models import Message, MethodResponse, MethodRequest
 from azure.iot.device.common.models.x509 import X509
+from azure.iot.device.common import metrics
 from azure.iot.device.iothub.auth import (
     SymmetricKeyAuthenticationProvider,
     SharedAccessSignatureAuthenticationProvider,
@@ -176,6 +177,7 @@ def edge_local_debug_environment():
 class FakeIoTHubPipeline:
     def __init__(self):
         self.feature_enabled = {}  # This just has to be here for the spec
+        self.metrics = metrics.MetricsRegistry()
 
     def connect(self, callback):
         callback()
@@ -195,6 +197,9 @@ class FakeIoTHubPipeline:
     def send_output_event(self, event, callback):
         callback()
 
+    def add_telemetry_readings(self, readings, callback):
+        callback()
+
     def send_method_response(self, method_response, callback):
         callback()
 
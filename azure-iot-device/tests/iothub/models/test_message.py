@@ -6,7 +6,9 @@
 
 import pytest
 import logging
+import threading
 from azure.iot.device.iothub.models import Message
+from azure.iot.device.iothub.models.message import _ReceivedMessage
 from azure.iot.device import constant
 
 logging.basicConfig(level=logging.DEBUG)
@@ -62,3 +64,116 @@ class TestMessage(object):
     def test_str_rep(self, data):
         msg = Message(data)
         assert str(msg) == str(data)
+
+    @pytest.mark.it("Stores its attributes in __slots__ rather than a __dict__")
+    def test_slots(self):
+        msg = Message(self.data_str)
+        assert not hasattr(msg, "__dict__")
+        with pytest.raises(AttributeError):
+            msg.not_an_attribute = 1
+
+
+fake_topic = "devices/fake_device/messages/devicebound/%24.mid=fake_id&fake_key=fake_value"
+
+
+def fake_decode_properties(topic, message):
+    assert topic == fake_topic
+    message.message_id = "fake_id"
+    message.custom_properties["fake_key"] = "fake_value"
+
+
+@pytest.mark.describe("_ReceivedMessage")
+class TestReceivedMessage(object):
+    @pytest.mark.it("Is a Message with the raw data")
+    def test_message(self):
+        msg = _ReceivedMessage(b"fake_data", fake_topic, fake_decode_properties)
+        assert isinstance(msg, Message)
+        assert msg.data == b"fake_data"
+        assert msg.lock_token is None
+        assert msg.iothub_interface_id is None
+
+    @pytest.mark.it("Decodes the properties from the topic the first time one is used")
+    def test_decodes_once(self, mocker):
+        decode = mocker.MagicMock(side_effect=fake_decode_properties)
+        msg = _ReceivedMessage(b"fake_data", fake_topic, decode)
+        assert decode.call_count == 0
+
+        assert msg.message_id == "fake_id"
+        assert msg.custom_properties == {"fake_key": "fake_value"}
+        assert msg.content_type == "application/json"
+        assert msg.content_encoding == "utf-8"
+        assert msg.correlation_id is None
+        assert decode.call_count == 1
+
+    @pytest.mark.it("Does not decode the properties when other attributes are used")
+    def test_other_attributes(self, mocker):
+        decode = mocker.MagicMock(side_effect=fake_decode_properties)
+        msg = _ReceivedMessage(b"fake_data", fake_topic, decode)
+        msg.data
+        msg.ack
+        str(msg)
+        assert decode.call_count == 0
+
+    @pytest.mark.it("Keeps properties assigned before they are decoded")
+    def test_assigned(self):
+        msg = _ReceivedMessage(b"fake_data", fake_topic, fake_decode_properties)
+        msg.message_id = "assigned_id"
+        assert msg.message_id == "assigned_id"
+        assert msg.custom_properties == {"fake_key": "fake_value"}
+
+    @pytest.mark.it(
+        "Returns the decoded value of a property used while another thread is decoding the properties"
+    )
+    def test_used_during_decode(self):
+        decoding = threading.Event()
+        resume = threading.Event()
+
+        def decode(topic, message):
+            decoding.set()
+            resume.wait(5)
+            fake_decode_properties(topic, message)
+
+        msg = _ReceivedMessage(b"fake_data", fake_topic, decode)
+        results = {}
+
+        def use(name):
+            try:
+                results[name] = getattr(msg, name)
+            except Exception as e:
+                results[name] = e
+
+        decoder = threading.Thread(target=use, args=("content_type",))
+        decoder.start()
+        assert decoding.wait(5)
+        # The decoder thread is part way through decoding the properties
+        reader = threading.Thread(target=use, args=("message_id",))
+        reader.start()
+        resume.set()
+        decoder.join(5)
+        reader.join(5)
+
+        assert results == {"content_type": "application/json", "message_id": "fake_id"}
+
+    @pytest.mark.it("Decodes the properties again the next time one is used if decoding fails")
+    def test_decode_fails(self, arbitrary_exception):
+        failures = [arbitrary_exception]
+
+        def decode(topic, message):
+            message.content_type = "text/plain"
+            if failures:
+                raise failures.pop()
+            fake_decode_properties(topic, message)
+
+        msg = _ReceivedMessage(b"fake_data", fake_topic, decode)
+        with pytest.raises(type(arbitrary_exception)):
+            msg.message_id
+
+        assert msg.message_id == "fake_id"
+        assert msg.content_type == "text/plain"
+        assert msg.custom_properties == {"fake_key": "fake_value"}
+
+    @pytest.mark.it("Raises AttributeError for unknown attributes")
+    def test_unknown(self):
+        msg = _ReceivedMessage(b"fake_data", fake_topic, fake_decode_properties)
+        with pytest.raises(AttributeError):
+            msg.not_an_attribute
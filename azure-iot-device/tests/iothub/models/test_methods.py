@@ -7,6 +7,7 @@
 import pytest
 import logging
 from azure.iot.device.iothub.models import MethodRequest, MethodResponse
+from azure.iot.device.iothub.models.methods import _ReceivedMethodRequest
 
 logging.basicConfig(level=logging.DEBUG)
 
@@ -49,6 +50,33 @@ class TestMethodRequest(object):
         assert m_req.payload == dummy_payload
 
 
+@pytest.mark.describe("_ReceivedMethodRequest")
+class TestReceivedMethodRequest(object):
+    @pytest.mark.it("Is a MethodRequest with the request id and name")
+    def test_method_request(self, mocker):
+        m_req = _ReceivedMethodRequest(dummy_rid, dummy_name, b"{}", mocker.MagicMock())
+        assert isinstance(m_req, MethodRequest)
+        assert m_req.request_id == dummy_rid
+        assert m_req.name == dummy_name
+
+    @pytest.mark.it("Decodes the raw payload the first time the payload is used")
+    def test_decodes_once(self, mocker):
+        decode = mocker.MagicMock(return_value=dummy_payload)
+        m_req = _ReceivedMethodRequest(dummy_rid, dummy_name, b"fake_raw_payload", decode)
+        assert decode.call_count == 0
+
+        assert m_req.payload == dummy_payload
+        assert m_req.payload == dummy_payload
+        assert decode.call_args_list == [mocker.call(b"fake_raw_payload")]
+
+    @pytest.mark.it("Raises errors decoding the payload from the payload attribute")
+    def test_decode_error(self, mocker):
+        decode = mocker.MagicMock(side_effect=ValueError)
+        m_req = _ReceivedMethodRequest(dummy_rid, dummy_name, b"not json", decode)
+        with pytest.raises(ValueError):
+            m_req.payload
+
+
 @pytest.mark.describe("MethodResponse - Instantiation")
 class TestMethodResponseInstantiation(object):
     @pytest.mark.it("Instantiates with an editable 'request_id' attribute")
@@ -112,6 +112,10 @@ class TestIoTHubPipelineInstantiation(object):
             pipeline_stages_iothub.UseAuthProviderStage,
             pipeline_stages_iothub.TwinRequestResponseStage,
             pipeline_stages_base.CoordinateRequestAndResponseStage,
+            pipeline_stages_iothub.TelemetryAggregationStage,
+            pipeline_stages_iothub.PayloadCodecStage,
+            pipeline_stages_iothub.MessagePackingStage,
+            pipeline_stages_iothub.MessageCompressionStage,
             pipeline_stages_iothub_mqtt.IoTHubMQTTTranslationStage,
             pipeline_stages_base.ReconnectStage,
             pipeline_stages_base.AutoConnectStage,
@@ -334,6 +338,40 @@ class TestIoTHubPipelineSendD2CMessage(object):
         assert cb.call_args == mocker.call(error=arbitrary_exception)
 
 
+@pytest.mark.describe("IoTHubPipeline - .add_telemetry_readings()")
+class TestIoTHubPipelineAddTelemetryReadings(object):
+    @pytest.fixture
+    def readings(self):
+        return {"temperature": 21.5, "vibration": [0.1, 0.2]}
+
+    @pytest.mark.it(
+        "Runs an AddTelemetryReadingsOperation with the provided readings on the pipeline"
+    )
+    def test_runs_op(self, pipeline, readings, mocker):
+        pipeline.add_telemetry_readings(readings, callback=mocker.MagicMock())
+        op = pipeline._pipeline.run_op.call_args[0][0]
+
+        assert pipeline._pipeline.run_op.call_count == 1
+        assert isinstance(op, pipeline_ops_iothub.AddTelemetryReadingsOperation)
+        assert op.readings is readings
+
+    @pytest.mark.it(
+        "Calls the callback with the error, if any, upon completion of the AddTelemetryReadingsOperation"
+    )
+    @pytest.mark.parametrize("succeeds", [True, False], ids=["Success", "Failure"])
+    def test_op_complete(self, mocker, pipeline, readings, arbitrary_exception, succeeds):
+        cb = mocker.MagicMock()
+        error = None if succeeds else arbitrary_exception
+        pipeline.add_telemetry_readings(readings, callback=cb)
+        assert cb.call_count == 0
+
+        op = pipeline._pipeline.run_op.call_args[0][0]
+        op.complete(error=error)
+
+        assert cb.call_count == 1
+        assert cb.call_args == mocker.call(error=error)
+
+
 @pytest.mark.describe("IoTHubPipeline - .send_output_event()")
 class TestIoTHubPipelineSendOutputEvent(object):
     @pytest.fixture
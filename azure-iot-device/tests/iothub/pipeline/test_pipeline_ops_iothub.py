@@ -207,6 +207,32 @@ pipeline_ops_test.add_operation_tests(
 )
 
 
+class AddTelemetryReadingsOperationTestConfig(object):
+    @pytest.fixture
+    def cls_type(self):
+        return pipeline_ops_iothub.AddTelemetryReadingsOperation
+
+    @pytest.fixture
+    def init_kwargs(self, mocker):
+        kwargs = {"readings": {"temperature": 21.5}, "callback": mocker.MagicMock()}
+        return kwargs
+
+
+class AddTelemetryReadingsOperationInstantiationTests(AddTelemetryReadingsOperationTestConfig):
+    @pytest.mark.it("Initializes 'readings' attribute with the provided 'readings' parameter")
+    def test_readings(self, cls_type, init_kwargs):
+        op = cls_type(**init_kwargs)
+        assert op.readings is init_kwargs["readings"]
+
+
+pipeline_ops_test.add_operation_tests(
+    test_module=this_module,
+    op_class_under_test=pipeline_ops_iothub.AddTelemetryReadingsOperation,
+    op_test_config_class=AddTelemetryReadingsOperationTestConfig,
+    extended_op_instantiation_test_class=AddTelemetryReadingsOperationInstantiationTests,
+)
+
+
 class SendOutputEventOperationTestConfig(object):
     @pytest.fixture
     def cls_type(self):
@@ -1,19 +1,29 @@
+# -*- coding: utf-8 -*-
 # -------------------------------------------------------------------------
 # Copyright (c) Microsoft Corporation. All rights reserved.
 # Licensed under the MIT License. See License.txt in the project root for
 # license information.
 # --------------------------------------------------------------------------
 import functools
+import gzip
+import io
 import json
 import logging
+import math
+import os
 import pytest
+import struct
 import sys
 import threading
+import time
+import zlib
 from concurrent.futures import Future
 from azure.iot.device.exceptions import ServiceError
 from azure.iot.device.common import handle_exceptions
-from azure.iot.device.common.pipeline import pipeline_ops_base
-from azure.iot.device.iothub.pipeline import pipeline_stages_iothub, pipeline_ops_iothub
+from azure.iot.device.common.pipeline import pipeline_ops_base, pipeline_stages_base
+from azure.iot.device.iothub.models import Message
+from azure.iot.device.iothub.pipeline import pipeline_stages_iothub, pipeline_ops_iothub, config
+from azure.iot.device.iothub.pipeline import pipeline_events_iothub
 from azure.iot.device.iothub.pipeline.exceptions import PipelineError
 from azure.iot.device.iothub.auth.authentication_provider import AuthenticationProvider
 from tests.common.pipeline.helpers import StageRunOpTestBase, StageHandlePipelineEventTestBase
@@ -395,6 +405,9 @@ class TwinRequestResponseStageTestConfig(object):
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
         return stage
@@ -494,6 +507,9 @@ class TestTwinRequestResponseStageWhenRequestAndResponseCreatedFromGetTwinOperat
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs, get_twin_op):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
 
@@ -638,6 +654,9 @@ class TestTwinRequestResponseStageWhenRequestAndResponseCreatedFromPatchTwinRepo
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs, patch_twin_reported_properties_op):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
 
@@ -732,3 +751,1123 @@ class TestTwinRequestResponseStageWhenRequestAndResponseCreatedFromPatchTwinRepo
         assert request_and_response_op.error is None
         assert patch_twin_reported_properties_op.completed
         assert patch_twin_reported_properties_op.error is None
+
+
+###############################
+# TELEMETRY AGGREGATION STAGE #
+###############################
+
+
+class TelemetryAggregationStageTestConfig(object):
+    @pytest.fixture
+    def cls_type(self):
+        return pipeline_stages_iothub.TelemetryAggregationStage
+
+    @pytest.fixture
+    def init_kwargs(self):
+        return {}
+
+    @pytest.fixture
+    def stage(self, mocker, cls_type, init_kwargs):
+        stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig(telemetry_window_length=10)
+        )
+        stage.send_op_down = mocker.MagicMock()
+        stage.send_event_up = mocker.MagicMock()
+        return stage
+
+    @pytest.fixture
+    def mock_timer(self, mocker):
+        return mocker.patch.object(threading, "Timer")
+
+    @pytest.fixture
+    def mock_time(self, mocker):
+        return mocker.patch.object(time, "time", return_value=1003.0)
+
+
+class TelemetryAggregationStageInstantiationTests(TelemetryAggregationStageTestConfig):
+    @pytest.mark.it("Initializes with no open window")
+    def test_window(self, init_kwargs):
+        stage = pipeline_stages_iothub.TelemetryAggregationStage(**init_kwargs)
+        assert stage.channels == {}
+        assert stage.window_start is None
+        assert stage.window_timer is None
+
+
+pipeline_stage_test.add_base_pipeline_stage_tests(
+    test_module=this_module,
+    stage_class_under_test=pipeline_stages_iothub.TelemetryAggregationStage,
+    stage_test_config_class=TelemetryAggregationStageTestConfig,
+    extended_stage_instantiation_test_class=TelemetryAggregationStageInstantiationTests,
+)
+
+
+def sent_telemetry(stage):
+    """Return the bodies of the aggregated messages sent down by the stage, by channel"""
+    sent = {}
+    for call in stage.send_op_down.call_args_list:
+        op = call[0][0]
+        assert isinstance(op, pipeline_ops_iothub.SendD2CMessageOperation)
+        assert op.message.custom_properties == {"iothub-telemetry-aggregation": "window"}
+        body = json.loads(op.message.data)
+        sent[body["channel"]] = body
+    return sent
+
+
+@pytest.mark.describe(
+    "TelemetryAggregationStage - .run_op() -- Called with AddTelemetryReadingsOperation"
+)
+class TestTelemetryAggregationStageRunOpWithAddTelemetryReadingsOperation(
+    StageRunOpTestBase, TelemetryAggregationStageTestConfig
+):
+    @pytest.fixture
+    def op(self, mocker):
+        return pipeline_ops_iothub.AddTelemetryReadingsOperation(
+            readings={"temperature": [20.0, 22.0], "humidity": 40}, callback=mocker.MagicMock()
+        )
+
+    @pytest.mark.it("Completes the operation without sending anything down")
+    def test_completes(self, mocker, stage, op, mock_timer, mock_time):
+        stage.run_op(op)
+
+        assert op.completed
+        assert op.error is None
+        assert stage.send_op_down.call_count == 0
+
+    @pytest.mark.it("Opens a window aligned to the window length, with a timer for its end")
+    def test_opens_window(self, mocker, stage, op, mock_timer, mock_time):
+        stage.run_op(op)
+
+        assert stage.window_start == 1000.0
+        assert stage.window_end == 1010.0
+        assert mock_timer.call_count == 1
+        assert mock_timer.call_args[0][0] == 7.0
+        assert mock_timer.return_value.start.call_count == 1
+
+    @pytest.mark.it(
+        "Sends a message per channel with the statistics of the window when the timer expires"
+    )
+    def test_timer_expires(self, mocker, stage, op, mock_timer, mock_time):
+        stage.run_op(op)
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"temperature": 24.0}, callback=mocker.MagicMock()
+            )
+        )
+        on_timer_expired = mock_timer.call_args[0][1]
+        on_timer_expired()
+
+        sent = sent_telemetry(stage)
+        assert sent["temperature"] == {
+            "channel": "temperature",
+            "windowStart": "1970-01-01T00:16:40Z",
+            "windowEnd": "1970-01-01T00:16:50Z",
+            "count": 3,
+            "min": 20.0,
+            "max": 24.0,
+            "mean": 22.0,
+            "stddev": pytest.approx(math.sqrt(8.0 / 3)),
+        }
+        assert sent["humidity"]["count"] == 1
+        assert sent["humidity"]["stddev"] == 0.0
+        assert stage.channels == {}
+        assert stage.window_start is None
+
+    @pytest.mark.it("Sends the previous window first if its timer has not yet run")
+    def test_late_timer(self, mocker, stage, op, mock_timer, mock_time):
+        stage.run_op(op)
+        mock_time.return_value = 1010.5
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"temperature": 30.0}, callback=mocker.MagicMock()
+            )
+        )
+
+        assert sent_telemetry(stage)["temperature"]["count"] == 2
+        assert mock_timer.return_value.cancel.call_count == 1
+        assert stage.window_start == 1010.0
+        assert stage.channels["temperature"].statistics()["mean"] == 30.0
+
+    @pytest.mark.it("Computes the statistics of more readings than fit in a channel's buffer")
+    def test_buffer_full(self, mocker, stage, mock_timer, mock_time):
+        stage.channel_capacity = 4
+        values = [float(i) for i in range(10)]
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"counter": values[:3]}, callback=mocker.MagicMock()
+            )
+        )
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"counter": values[3:]}, callback=mocker.MagicMock()
+            )
+        )
+        mock_timer.call_args[0][1]()
+
+        sent = sent_telemetry(stage)["counter"]
+        assert sent["count"] == 10
+        assert sent["min"] == 0.0
+        assert sent["max"] == 9.0
+        assert sent["mean"] == 4.5
+        assert sent["stddev"] == pytest.approx(math.sqrt(8.25))
+
+    @pytest.mark.it("Computes the standard deviation precisely for readings of large magnitude")
+    def test_large_magnitude(self, mocker, stage, mock_timer, mock_time):
+        stage.channel_capacity = 4
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"counter": [1e9, 1e9 + 1] * 5}, callback=mocker.MagicMock()
+            )
+        )
+        mock_timer.call_args[0][1]()
+
+        sent = sent_telemetry(stage)["counter"]
+        assert sent["mean"] == 1e9 + 0.5
+        assert sent["stddev"] == pytest.approx(0.5)
+
+    @pytest.mark.it("Does not send a message for a channel which was given no readings")
+    def test_empty_channel(self, mocker, stage, mock_timer, mock_time):
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"temperature": 21.0, "humidity": []}, callback=mocker.MagicMock()
+            )
+        )
+        mock_timer.call_args[0][1]()
+
+        sent = sent_telemetry(stage)
+        assert list(sent) == ["temperature"]
+        assert sent["temperature"]["count"] == 1
+
+    @pytest.mark.it("Completes the operation with an error if a reading is not a number")
+    def test_not_a_number(self, mocker, stage, mock_timer, mock_time):
+        op = pipeline_ops_iothub.AddTelemetryReadingsOperation(
+            readings={"temperature": "hot"}, callback=mocker.MagicMock()
+        )
+        stage.run_op(op)
+
+        assert op.completed
+        assert isinstance(op.error, TypeError)
+
+
+@pytest.mark.describe("TelemetryAggregationStage - .run_op() -- Called with DisconnectOperation")
+class TestTelemetryAggregationStageRunOpWithDisconnectOperation(
+    StageRunOpTestBase, TelemetryAggregationStageTestConfig
+):
+    @pytest.fixture
+    def op(self, mocker):
+        return pipeline_ops_base.DisconnectOperation(callback=mocker.MagicMock())
+
+    @pytest.mark.it("Sends the open window down before the operation")
+    def test_sends_window(self, mocker, stage, op, mock_timer, mock_time):
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"temperature": 21.0}, callback=mocker.MagicMock()
+            )
+        )
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_count == 2
+        assert isinstance(
+            stage.send_op_down.call_args_list[0][0][0], pipeline_ops_iothub.SendD2CMessageOperation
+        )
+        assert stage.send_op_down.call_args_list[1] == mocker.call(op)
+        assert mock_timer.return_value.cancel.call_count == 1
+
+    @pytest.mark.it("Sends the open window down before the operation if a channel has no readings")
+    def test_sends_window_with_empty_channel(self, mocker, stage, op, mock_timer, mock_time):
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"humidity": []}, callback=mocker.MagicMock()
+            )
+        )
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args_list == [mocker.call(op)]
+        assert stage.window_start is None
+
+    @pytest.mark.it("Sends the operation down if there is no open window")
+    def test_no_window(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args_list == [mocker.call(op)]
+
+
+@pytest.mark.describe(
+    "TelemetryAggregationStage - OCCURANCE: SendD2CMessageOperation with aggregated telemetry fails"
+)
+class TestTelemetryAggregationStageWhenSendFails(TelemetryAggregationStageTestConfig):
+    @pytest.mark.it("Reports the error as a background exception")
+    def test_send_fails(
+        self,
+        mocker,
+        stage,
+        mock_timer,
+        mock_time,
+        arbitrary_exception,
+        mock_handle_background_exception,
+    ):
+        stage.run_op(
+            pipeline_ops_iothub.AddTelemetryReadingsOperation(
+                readings={"temperature": 21.0}, callback=mocker.MagicMock()
+            )
+        )
+        mock_timer.call_args[0][1]()
+        send_op = stage.send_op_down.call_args[0][0]
+        send_op.complete(error=arbitrary_exception)
+
+        assert mock_handle_background_exception.call_count == 1
+        assert mock_handle_background_exception.call_args == mocker.call(arbitrary_exception)
+
+
+@pytest.mark.describe(
+    "TelemetryAggregationStage - .run_op() -- Called with arbitrary other operation"
+)
+class TestTelemetryAggregationStageRunOpWithArbitraryOperation(
+    StageRunOpTestBase, TelemetryAggregationStageTestConfig
+):
+    @pytest.fixture
+    def op(self, arbitrary_op):
+        return arbitrary_op
+
+    @pytest.mark.it("Sends the operation down the pipeline")
+    def test_sends_op_down(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_count == 1
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+
+#########################
+# MESSAGE PACKING STAGE #
+#########################
+
+
+class MessagePackingStageTestConfig(object):
+    @pytest.fixture
+    def cls_type(self):
+        return pipeline_stages_iothub.MessagePackingStage
+
+    @pytest.fixture
+    def init_kwargs(self):
+        return {}
+
+    @pytest.fixture
+    def packing(self):
+        return "json"
+
+    @pytest.fixture
+    def stage(self, mocker, cls_type, init_kwargs, packing):
+        stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig(message_packing=packing)
+        )
+        stage.send_op_down = mocker.MagicMock()
+        stage.send_event_up = mocker.MagicMock()
+        return stage
+
+    @pytest.fixture
+    def mock_timer(self, mocker):
+        return mocker.patch.object(threading, "Timer")
+
+    @pytest.fixture
+    def sending(self, mocker, stage, fake_pipeline_thread):
+        """An operation for a message sent down by the stage which has not yet been sent, so that
+        messages are held to be packed"""
+        op = pipeline_ops_iothub.SendD2CMessageOperation(
+            message=Message("0", message_id="sending"), callback=mocker.MagicMock()
+        )
+        stage.run_op(op)
+        stage.send_op_down.reset_mock()
+        return op
+
+
+class MessagePackingStageInstantiationTests(MessagePackingStageTestConfig):
+    @pytest.mark.it("Initializes with no messages waiting to be packed or being sent")
+    def test_batch(self, init_kwargs):
+        stage = pipeline_stages_iothub.MessagePackingStage(**init_kwargs)
+        assert stage.batch is None
+        assert stage.batch_timer is None
+        assert stage.in_flight == 0
+
+
+pipeline_stage_test.add_base_pipeline_stage_tests(
+    test_module=this_module,
+    stage_class_under_test=pipeline_stages_iothub.MessagePackingStage,
+    stage_test_config_class=MessagePackingStageTestConfig,
+    extended_stage_instantiation_test_class=MessagePackingStageInstantiationTests,
+)
+
+
+@pytest.mark.describe("MessagePackingStage - .handled_op_types")
+class TestMessagePackingStageHandledOpTypes(MessagePackingStageTestConfig):
+    @pytest.mark.it(
+        "Includes SendD2CMessageOperation and SendOutputEventOperation if message_packing is set"
+    )
+    def test_configured(self, stage):
+        assert issubclass(pipeline_ops_iothub.SendD2CMessageOperation, stage.handled_op_types)
+        assert issubclass(pipeline_ops_iothub.SendOutputEventOperation, stage.handled_op_types)
+
+    @pytest.mark.it("Is empty if message_packing is not set")
+    @pytest.mark.parametrize("packing", [None])
+    def test_not_configured(self, stage):
+        assert stage.handled_op_types == ()
+
+
+def send_messages(mocker, stage, messages, op_type=pipeline_ops_iothub.SendD2CMessageOperation):
+    ops = [op_type(message=message, callback=mocker.MagicMock()) for message in messages]
+    for op in ops:
+        stage.run_op(op)
+    return ops
+
+
+def unpack_binary(data):
+    payloads = []
+    while data:
+        (length,) = struct.unpack(">I", data[:4])
+        payloads.append(data[4 : 4 + length])
+        data = data[4 + length :]
+    return payloads
+
+
+@pytest.mark.describe(
+    "MessagePackingStage - .run_op() -- Called with SendD2CMessageOperation or SendOutputEventOperation while no message is being sent"
+)
+class TestMessagePackingStageRunOpWithSendMessageOperationWhenIdle(
+    StageRunOpTestBase, MessagePackingStageTestConfig
+):
+    @pytest.fixture(
+        params=[
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+        ]
+    )
+    def op_type(self, request):
+        return request.param
+
+    @pytest.fixture
+    def op(self, mocker, op_type):
+        return op_type(message=Message('{"temperature": 21.5}'), callback=mocker.MagicMock())
+
+    @pytest.mark.it("Sends the operation down at once, without packing it")
+    def test_sends_op(self, mocker, stage, op, mock_timer):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert stage.batch is None
+        assert mock_timer.call_count == 0
+        assert not op.completed
+
+    @pytest.mark.it("Does not delay a caller sending one message at a time")
+    def test_sequential(self, mocker, stage, op_type, mock_timer):
+        for i in range(3):
+            callback = mocker.MagicMock()
+            op = op_type(message=Message(str(i)), callback=callback)
+            stage.run_op(op)
+            assert stage.send_op_down.call_args == mocker.call(op)
+
+            op.complete()
+            assert callback.call_count == 1
+            assert stage.in_flight == 0
+
+        assert stage.send_op_down.call_count == 3
+        assert mock_timer.call_count == 0
+
+
+@pytest.mark.describe(
+    "MessagePackingStage - .run_op() -- Called with SendD2CMessageOperation or SendOutputEventOperation while a message is being sent"
+)
+class TestMessagePackingStageRunOpWithSendMessageOperation(
+    StageRunOpTestBase, MessagePackingStageTestConfig
+):
+    @pytest.fixture(
+        params=[
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+        ]
+    )
+    def op_type(self, request):
+        return request.param
+
+    @pytest.fixture
+    def op(self, mocker, op_type):
+        return op_type(message=Message('{"temperature": 21.5}'), callback=mocker.MagicMock())
+
+    @pytest.fixture(autouse=True)
+    def message_being_sent(self, sending):
+        pass
+
+    @pytest.mark.it("Does not complete the operation or send anything down until the timer expires")
+    def test_waits(self, stage, op, mock_timer):
+        stage.run_op(op)
+
+        assert not op.completed
+        assert stage.send_op_down.call_count == 0
+
+    @pytest.mark.it("Starts a timer for the maximum latency when the first message is packed")
+    def test_timer(self, mocker, stage, op, mock_timer):
+        stage.run_op(op)
+        send_messages(mocker, stage, [Message("{}")], type(op))
+
+        assert mock_timer.call_count == 1
+        assert mock_timer.call_args[0][0] == 0.1
+        assert mock_timer.return_value.start.call_count == 1
+
+    @pytest.mark.it(
+        "Sends the payloads down as a JSON array in a single message when the timer expires"
+    )
+    def test_json(self, mocker, stage, op_type, mock_timer):
+        send_messages(
+            mocker,
+            stage,
+            [Message('{"temperature": 21.5}'), Message(b"[1, 2]"), Message({"humidity": 40})],
+            op_type,
+        )
+        mock_timer.call_args[0][1]()
+
+        assert stage.send_op_down.call_count == 1
+        sent = stage.send_op_down.call_args[0][0]
+        assert type(sent) is op_type
+        assert json.loads(sent.message.data.decode("utf-8")) == [
+            {"temperature": 21.5},
+            [1, 2],
+            {"humidity": 40},
+        ]
+        assert sent.message.custom_properties == {"iothub-message-packing": "json"}
+        assert sent.message.content_type == "application/json"
+        assert stage.batch is None
+
+    @pytest.mark.it("Sends the payloads down length-prefixed with 'binary' packing")
+    @pytest.mark.parametrize("packing", ["binary"])
+    def test_binary(self, mocker, stage, op_type, mock_timer):
+        send_messages(mocker, stage, [Message(b"\x00\x01"), Message("café")], op_type)
+        mock_timer.call_args[0][1]()
+
+        sent = stage.send_op_down.call_args[0][0]
+        assert unpack_binary(sent.message.data) == [b"\x00\x01", "café".encode("utf-8")]
+        assert sent.message.custom_properties == {"iothub-message-packing": "binary"}
+
+    @pytest.mark.it("Sends a single message waiting to be packed down on its own")
+    def test_single(self, mocker, stage, op, mock_timer):
+        stage.run_op(op)
+        mock_timer.call_args[0][1]()
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert stage.batch is None
+        assert not op.completed
+
+    @pytest.mark.it(
+        "Packs messages for different outputs or content encodings separately, in order"
+    )
+    @pytest.mark.parametrize("packing", ["binary"])
+    def test_separate(self, mocker, stage, mock_timer):
+        messages = [
+            Message(b"1", output_name="a"),
+            Message(b"2", output_name="a"),
+            Message(b"3", output_name="b"),
+            Message(b"4", output_name="b"),
+            Message(b"5", output_name="b", content_encoding="utf-16"),
+            Message(b"6", output_name="b", content_encoding="utf-16"),
+        ]
+        send_messages(mocker, stage, messages, pipeline_ops_iothub.SendOutputEventOperation)
+        stage.run_op(pipeline_ops_base.DisconnectOperation(callback=mocker.MagicMock()))
+
+        sent = [call[0][0].message for call in stage.send_op_down.call_args_list[:3]]
+        assert [unpack_binary(message.data) for message in sent] == [
+            [b"1", b"2"],
+            [b"3", b"4"],
+            [b"5", b"6"],
+        ]
+        assert [message.output_name for message in sent] == ["a", "b", "b"]
+        assert sent[2].content_encoding == "utf-16"
+
+    @pytest.mark.it(
+        "Sends a message without the application/json content type down on its own with 'json' packing"
+    )
+    def test_json_content_type(self, mocker, stage, op):
+        op.message.content_type = "text/plain"
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+    @pytest.mark.it(
+        "Sends a message with a string or bytes payload which is not JSON down on its own with "
+        "'json' packing"
+    )
+    @pytest.mark.parametrize("data", ["hello", b"hello", b"\xff"])
+    def test_json_invalid(self, mocker, stage, op, mock_timer, data):
+        send_messages(mocker, stage, [Message("1"), Message("2")], type(op))
+        op.message.data = data
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_count == 2
+        assert stage.send_op_down.call_args_list[0][0][0].message.data == b"[1,2]"
+        assert stage.send_op_down.call_args_list[1] == mocker.call(op)
+
+    @pytest.mark.it(
+        "Sends a message without UTF-8 content encoding down on its own with 'json' packing"
+    )
+    def test_json_content_encoding(self, mocker, stage, op):
+        op.message.content_encoding = "utf-16"
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+    @pytest.mark.it(
+        "Sends a message with a string payload without UTF-8 content encoding down on its own "
+        "with 'binary' packing"
+    )
+    @pytest.mark.parametrize("packing", ["binary"])
+    def test_binary_string_content_encoding(self, mocker, stage, op):
+        op.message.content_encoding = "utf-32"
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+    @pytest.mark.it(
+        "Sends a message with properties down on its own, after the messages packed before it"
+    )
+    @pytest.mark.parametrize(
+        "attribute,value",
+        [
+            pytest.param("message_id", "id", id="message_id"),
+            pytest.param("correlation_id", "id", id="correlation_id"),
+            pytest.param("custom_properties", {"a": "b"}, id="custom_properties"),
+        ],
+    )
+    def test_properties(self, mocker, stage, op_type, mock_timer, attribute, value):
+        message = Message("3")
+        setattr(message, attribute, value)
+        ops = send_messages(mocker, stage, [Message("1"), Message("2"), message], op_type)
+
+        assert stage.send_op_down.call_count == 2
+        assert stage.send_op_down.call_args_list[0][0][0].message.data == b"[1,2]"
+        assert stage.send_op_down.call_args_list[1] == mocker.call(ops[2])
+        assert not ops[2].completed
+
+    @pytest.mark.it(
+        "Sends the packed message before it would exceed the maximum size including its topic"
+    )
+    def test_max_size(self, mocker, stage, op_type, mock_timer):
+        stage.pipeline_root.pipeline_configuration.message_packing_max_size = 2048
+        send_messages(
+            mocker, stage, [Message('"{}"'.format("x" * 98)) for _ in range(100)], op_type
+        )
+        mock_timer.call_args[0][1]()
+
+        sent = [call[0][0].message for call in stage.send_op_down.call_args_list]
+        assert sum(len(json.loads(message.data.decode("utf-8"))) for message in sent) == 100
+        topic_base = pipeline_stages_iothub.mqtt_topic_iothub.get_telemetry_topic_for_publish(
+            "d" * 128, "m" * 128
+        )
+        for message in sent:
+            topic = pipeline_stages_iothub.mqtt_topic_iothub.encode_properties(message, topic_base)
+            assert len(message.data) + len(topic) + 7 <= 2048
+        # Only the last packed message is not full
+        assert all(len(message.data) + len(topic) + 7 > 2048 - 101 for message in sent[:-1])
+
+    @pytest.mark.it("Sends a message that is too large to be packed down on its own")
+    def test_too_large(self, mocker, stage, op, mock_timer):
+        stage.pipeline_root.pipeline_configuration.message_packing_max_size = 1024
+        op.message.data = '"{}"'.format("x" * 1022)
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert stage.batch is None
+
+    @pytest.mark.it(
+        "Sends a payload which is not a string or bytes down on its own with 'binary' packing"
+    )
+    @pytest.mark.parametrize("packing", ["binary"])
+    def test_binary_not_bytes(self, mocker, stage, op, mock_timer):
+        op.message.data = 42
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+    @pytest.mark.it("Sends the operation down if message packing is disabled")
+    @pytest.mark.parametrize("packing", [None])
+    def test_disabled(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert not op.completed
+
+
+@pytest.mark.describe("MessagePackingStage - .run_op() -- Called with DisconnectOperation")
+class TestMessagePackingStageRunOpWithDisconnectOperation(
+    StageRunOpTestBase, MessagePackingStageTestConfig
+):
+    @pytest.fixture
+    def op(self, mocker):
+        return pipeline_ops_base.DisconnectOperation(callback=mocker.MagicMock())
+
+    @pytest.mark.it("Sends the messages waiting to be packed down before the operation")
+    def test_sends_batch(self, mocker, stage, op, mock_timer, sending):
+        send_messages(mocker, stage, [Message("1"), Message("2")])
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_count == 2
+        assert stage.send_op_down.call_args_list[0][0][0].message.data == b"[1,2]"
+        assert stage.send_op_down.call_args_list[1] == mocker.call(op)
+        assert mock_timer.return_value.cancel.call_count == 1
+
+    @pytest.mark.it("Sends the operation down if no messages are waiting to be packed")
+    def test_no_batch(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args_list == [mocker.call(op)]
+
+
+@pytest.mark.describe("MessagePackingStage - OCCURANCE: Packed message send completes")
+class TestMessagePackingStageWhenSendCompletes(MessagePackingStageTestConfig):
+    @pytest.mark.it("Completes the operations of the packed messages successfully")
+    def test_send_succeeds(self, mocker, stage, mock_timer, sending):
+        ops = send_messages(mocker, stage, [Message("1"), Message("2")])
+        mock_timer.call_args[0][1]()
+        assert not any(op.completed for op in ops)
+
+        stage.send_op_down.call_args[0][0].complete()
+
+        assert all(op.completed for op in ops)
+        assert all(op.error is None for op in ops)
+        assert all(op.callback_stack == [] for op in ops)
+
+    @pytest.mark.it("Completes the operations of the packed messages with the error if it fails")
+    def test_send_fails(
+        self,
+        mocker,
+        stage,
+        mock_timer,
+        sending,
+        arbitrary_exception,
+        mock_handle_background_exception,
+    ):
+        ops = send_messages(mocker, stage, [Message("1"), Message("2")])
+        mock_timer.call_args[0][1]()
+        stage.send_op_down.call_args[0][0].complete(error=arbitrary_exception)
+
+        assert all(op.completed for op in ops)
+        assert all(op.error is arbitrary_exception for op in ops)
+        assert mock_handle_background_exception.call_count == 0
+
+    @pytest.mark.it(
+        "Sends the messages waiting to be packed down without waiting for the timer once the messages being sent have been sent"
+    )
+    def test_sends_batch(self, mocker, stage, mock_timer, sending):
+        ops = send_messages(mocker, stage, [Message("1"), Message("2")])
+        assert stage.send_op_down.call_count == 0
+
+        sending.complete()
+
+        assert stage.send_op_down.call_count == 1
+        assert stage.send_op_down.call_args[0][0].message.data == b"[1,2]"
+        assert mock_timer.return_value.cancel.call_count == 1
+        assert stage.batch is None
+        assert not any(op.completed for op in ops)
+
+    @pytest.mark.it(
+        "Sends the next message down at once once all the messages being sent have been sent"
+    )
+    def test_idle(self, mocker, stage, mock_timer, sending):
+        send_messages(mocker, stage, [Message("1")])
+        sending.complete()
+        stage.send_op_down.call_args[0][0].complete()
+        assert stage.in_flight == 0
+
+        ops = send_messages(mocker, stage, [Message("2")])
+
+        assert stage.send_op_down.call_args == mocker.call(ops[0])
+
+
+@pytest.mark.describe("MessagePackingStage - .run_op() -- Called with arbitrary other operation")
+class TestMessagePackingStageRunOpWithArbitraryOperation(
+    StageRunOpTestBase, MessagePackingStageTestConfig
+):
+    @pytest.fixture
+    def op(self, arbitrary_op):
+        return arbitrary_op
+
+    @pytest.mark.it("Sends the operation down the pipeline")
+    def test_sends_op_down(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_count == 1
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+
+#############################
+# MESSAGE COMPRESSION STAGE #
+#############################
+
+compressible_payload = json.dumps([{"temperature": 21.5, "sequence": i} for i in range(100)])
+
+
+class MessageCompressionStageTestConfig(object):
+    @pytest.fixture
+    def cls_type(self):
+        return pipeline_stages_iothub.MessageCompressionStage
+
+    @pytest.fixture
+    def init_kwargs(self):
+        return {}
+
+    @pytest.fixture
+    def compression(self):
+        return "gzip"
+
+    @pytest.fixture
+    def stage(self, mocker, cls_type, init_kwargs, compression):
+        stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig(message_compression=compression)
+        )
+        stage.send_op_down = mocker.MagicMock()
+        stage.send_event_up = mocker.MagicMock()
+        return stage
+
+
+pipeline_stage_test.add_base_pipeline_stage_tests(
+    test_module=this_module,
+    stage_class_under_test=pipeline_stages_iothub.MessageCompressionStage,
+    stage_test_config_class=MessageCompressionStageTestConfig,
+)
+
+
+@pytest.mark.describe("MessageCompressionStage - .handled_op_types")
+class TestMessageCompressionStageHandledOpTypes(MessageCompressionStageTestConfig):
+    @pytest.mark.it(
+        "Includes SendD2CMessageOperation and SendOutputEventOperation if message_compression is set"
+    )
+    def test_configured(self, stage):
+        assert issubclass(pipeline_ops_iothub.SendD2CMessageOperation, stage.handled_op_types)
+        assert issubclass(pipeline_ops_iothub.SendOutputEventOperation, stage.handled_op_types)
+
+    @pytest.mark.it("Is empty if message_compression is not set")
+    @pytest.mark.parametrize("compression", [None])
+    def test_not_configured(self, stage):
+        assert stage.handled_op_types == ()
+
+
+@pytest.mark.describe(
+    "MessageCompressionStage - .run_op() -- Called with SendD2CMessageOperation or SendOutputEventOperation"
+)
+class TestMessageCompressionStageRunOpWithSendMessageOperation(
+    StageRunOpTestBase, MessageCompressionStageTestConfig
+):
+    @pytest.fixture(
+        params=[
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+        ]
+    )
+    def op(self, mocker, request):
+        return request.param(message=Message(compressible_payload), callback=mocker.MagicMock())
+
+    @pytest.mark.it("Sends the operation down with a gzip compressed copy of the message")
+    def test_gzip(self, mocker, stage, op):
+        original = op.message
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert op.message is not original
+        assert gzip.GzipFile(fileobj=io.BytesIO(op.message.data)).read() == (
+            compressible_payload.encode("utf-8")
+        )
+        assert op.message.custom_properties == {"iothub-content-encoding": "gzip"}
+        assert op.message.content_encoding == "utf-8"
+        assert original.data == compressible_payload
+        assert original.custom_properties == {}
+
+    @pytest.mark.it("Compresses the message in the zlib format with 'deflate' compression")
+    @pytest.mark.parametrize("compression", ["deflate"])
+    def test_deflate(self, stage, op):
+        op.message.data = compressible_payload.encode("utf-8")
+        stage.run_op(op)
+
+        assert zlib.decompress(op.message.data) == compressible_payload.encode("utf-8")
+        assert op.message.custom_properties == {"iothub-content-encoding": "deflate"}
+
+    @pytest.mark.it("Keeps the message's own custom properties")
+    def test_custom_properties(self, stage, op):
+        op.message.custom_properties["a"] = "b"
+        stage.run_op(op)
+
+        assert op.message.custom_properties == {"a": "b", "iothub-content-encoding": "gzip"}
+
+    @pytest.mark.it("Sends the operation down with the message unchanged if it is not compressed")
+    @pytest.mark.parametrize(
+        "data,custom_properties",
+        [
+            pytest.param("x" * 1023, {}, id="Below the threshold"),
+            pytest.param(compressible_payload, {"iothub-content-encoding": "br"}, id="Encoded"),
+            pytest.param(os.urandom(2048), {}, id="Incompressible"),
+            pytest.param(12345, {}, id="Not a string"),
+        ],
+    )
+    def test_not_compressed(self, mocker, stage, op, data, custom_properties):
+        message = op.message
+        message.data = data
+        message.custom_properties.update(custom_properties)
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert op.message is message
+        assert message.data is data
+
+    @pytest.mark.it("Sends the operation down unchanged if message compression is disabled")
+    @pytest.mark.parametrize("compression", [None])
+    def test_disabled(self, mocker, stage, op):
+        message = op.message
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert op.message is message
+
+
+@pytest.mark.describe(
+    "MessageCompressionStage - .run_op() -- Called with arbitrary other operation"
+)
+class TestMessageCompressionStageRunOpWithArbitraryOperation(
+    StageRunOpTestBase, MessageCompressionStageTestConfig
+):
+    @pytest.fixture
+    def op(self, arbitrary_op):
+        return arbitrary_op
+
+    @pytest.mark.it("Sends the operation down the pipeline")
+    def test_sends_op_down(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+
+@pytest.mark.describe(
+    "MessageCompressionStage - .handle_pipeline_event() -- Called with C2DMessageEvent or InputMessageEvent"
+)
+class TestMessageCompressionStageHandlePipelineEventWithMessageEvent(
+    StageHandlePipelineEventTestBase, MessageCompressionStageTestConfig
+):
+    @pytest.fixture(params=["C2D", "Input"])
+    def event(self, request):
+        message = Message(None)
+        if request.param == "C2D":
+            return pipeline_events_iothub.C2DMessageEvent(message)
+        else:
+            return pipeline_events_iothub.InputMessageEvent("input", message)
+
+    @pytest.mark.it(
+        "Decompresses a compressed payload and removes the property before passing it up"
+    )
+    @pytest.mark.parametrize("encoding", ["gzip", "deflate"])
+    def test_decompresses(self, mocker, stage, event, encoding):
+        event.message.data = pipeline_stages_iothub._compress(b"payload" * 100, encoding)
+        event.message.custom_properties = {"iothub-content-encoding": encoding, "a": "b"}
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == b"payload" * 100
+        assert event.message.custom_properties == {"a": "b"}
+
+    @pytest.mark.it("Passes up a message without the property unchanged")
+    def test_not_compressed(self, mocker, stage, event):
+        event.message.data = b"payload"
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == b"payload"
+
+    @pytest.mark.it(
+        "Passes up the message unchanged and reports a background exception if the payload cannot be decompressed"
+    )
+    def test_corrupt(self, mocker, stage, event, mock_handle_background_exception):
+        event.message.data = b"not gzip"
+        event.message.custom_properties = {"iothub-content-encoding": "gzip"}
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == b"not gzip"
+        assert event.message.custom_properties == {"iothub-content-encoding": "gzip"}
+        assert mock_handle_background_exception.call_count == 1
+        assert isinstance(mock_handle_background_exception.call_args[0][0], zlib.error)
+
+    @pytest.mark.it("Passes up the message unchanged if message compression is disabled")
+    @pytest.mark.parametrize("compression", [None])
+    def test_disabled(self, mocker, stage, event):
+        compressed = pipeline_stages_iothub._compress(b"payload", "gzip")
+        event.message.data = compressed
+        event.message.custom_properties = {"iothub-content-encoding": "gzip"}
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == compressed
+
+
+#######################
+# PAYLOAD CODEC STAGE #
+#######################
+
+
+class FakePayloadCodec(object):
+    content_type = "application/x-fake"
+
+    def encode(self, obj):
+        return b"encoded:" + json.dumps(obj).encode("utf-8")
+
+    def decode(self, data):
+        if not data.startswith(b"encoded:"):
+            raise ValueError("Not encoded")
+        return json.loads(data[len(b"encoded:") :].decode("utf-8"))
+
+
+class PayloadCodecStageTestConfig(object):
+    @pytest.fixture
+    def cls_type(self):
+        return pipeline_stages_iothub.PayloadCodecStage
+
+    @pytest.fixture
+    def init_kwargs(self):
+        return {}
+
+    @pytest.fixture
+    def payload_codec(self):
+        return FakePayloadCodec()
+
+    @pytest.fixture
+    def stage(self, mocker, cls_type, init_kwargs, payload_codec):
+        stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=config.IoTHubPipelineConfig(payload_codec=payload_codec)
+        )
+        stage.send_op_down = mocker.MagicMock()
+        stage.send_event_up = mocker.MagicMock()
+        return stage
+
+
+pipeline_stage_test.add_base_pipeline_stage_tests(
+    test_module=this_module,
+    stage_class_under_test=pipeline_stages_iothub.PayloadCodecStage,
+    stage_test_config_class=PayloadCodecStageTestConfig,
+)
+
+
+@pytest.mark.describe("PayloadCodecStage - .handled_op_types")
+class TestPayloadCodecStageHandledOpTypes(PayloadCodecStageTestConfig):
+    @pytest.mark.it(
+        "Includes SendD2CMessageOperation and SendOutputEventOperation if payload_codec is set"
+    )
+    def test_configured(self, stage):
+        assert issubclass(pipeline_ops_iothub.SendD2CMessageOperation, stage.handled_op_types)
+        assert issubclass(pipeline_ops_iothub.SendOutputEventOperation, stage.handled_op_types)
+
+    @pytest.mark.it("Is empty if payload_codec is not set")
+    @pytest.mark.parametrize("payload_codec", [None])
+    def test_not_configured(self, stage):
+        assert stage.handled_op_types == ()
+
+
+@pytest.mark.describe(
+    "PayloadCodecStage - .run_op() -- Called with SendD2CMessageOperation or SendOutputEventOperation"
+)
+class TestPayloadCodecStageRunOpWithSendMessageOperation(
+    StageRunOpTestBase, PayloadCodecStageTestConfig
+):
+    @pytest.fixture(
+        params=[
+            pipeline_ops_iothub.SendD2CMessageOperation,
+            pipeline_ops_iothub.SendOutputEventOperation,
+        ]
+    )
+    def op(self, mocker, request):
+        return request.param(message=Message({"temperature": 21.5}), callback=mocker.MagicMock())
+
+    @pytest.mark.it(
+        "Sends the operation down with a copy of the message, encoded and with the codec's content type"
+    )
+    def test_encodes(self, mocker, stage, op):
+        original = op.message
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert op.message is not original
+        assert op.message.data == b'encoded:{"temperature": 21.5}'
+        assert op.message.content_type == "application/x-fake"
+        assert original.data == {"temperature": 21.5}
+        assert original.content_type == "application/json"
+
+    @pytest.mark.it("Sends the operation down unchanged if the data is a string or bytes")
+    @pytest.mark.parametrize("data", ["text", b"bytes", bytearray(b"bytes")])
+    def test_string_or_bytes(self, mocker, stage, op, data):
+        message = op.message
+        message.data = data
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert op.message is message
+        assert message.data is data
+
+    @pytest.mark.it("Sends the operation down unchanged if no payload codec is set")
+    @pytest.mark.parametrize("payload_codec", [None])
+    def test_no_codec(self, mocker, stage, op):
+        message = op.message
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+        assert op.message is message
+
+
+@pytest.mark.describe("PayloadCodecStage - .run_op() -- Called with arbitrary other operation")
+class TestPayloadCodecStageRunOpWithArbitraryOperation(
+    StageRunOpTestBase, PayloadCodecStageTestConfig
+):
+    @pytest.fixture
+    def op(self, arbitrary_op):
+        return arbitrary_op
+
+    @pytest.mark.it("Sends the operation down the pipeline")
+    def test_sends_op_down(self, mocker, stage, op):
+        stage.run_op(op)
+
+        assert stage.send_op_down.call_args == mocker.call(op)
+
+
+@pytest.mark.describe(
+    "PayloadCodecStage - .handle_pipeline_event() -- Called with C2DMessageEvent or InputMessageEvent"
+)
+class TestPayloadCodecStageHandlePipelineEventWithMessageEvent(
+    StageHandlePipelineEventTestBase, PayloadCodecStageTestConfig
+):
+    @pytest.fixture(params=["C2D", "Input"])
+    def event(self, request):
+        message = Message(b'encoded:{"a": 1}', content_type="application/x-fake")
+        if request.param == "C2D":
+            return pipeline_events_iothub.C2DMessageEvent(message)
+        else:
+            return pipeline_events_iothub.InputMessageEvent("input", message)
+
+    @pytest.mark.it("Decodes the data of a message with the codec's content type")
+    def test_decodes(self, mocker, stage, event):
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == {"a": 1}
+
+    @pytest.mark.it("Passes up a message with another content type unchanged")
+    def test_other_content_type(self, mocker, stage, event):
+        event.message.content_type = "application/json"
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == b'encoded:{"a": 1}'
+
+    @pytest.mark.it(
+        "Passes up the message unchanged and reports a background exception if the data cannot be decoded"
+    )
+    def test_decode_fails(self, mocker, stage, event, mock_handle_background_exception):
+        event.message.data = b"garbage"
+        stage.handle_pipeline_event(event)
+
+        assert stage.send_event_up.call_args == mocker.call(event)
+        assert event.message.data == b"garbage"
+        assert mock_handle_background_exception.call_count == 1
+        assert isinstance(mock_handle_background_exception.call_args[0][0], ValueError)
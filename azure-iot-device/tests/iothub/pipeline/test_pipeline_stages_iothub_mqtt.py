@@ -22,6 +22,7 @@ from azure.iot.device.iothub.pipeline import (
     pipeline_ops_iothub,
     pipeline_stages_iothub_mqtt,
     config,
+    mqtt_topic_iothub,
 )
 from azure.iot.device.iothub.pipeline.exceptions import OperationError, PipelineError
 from azure.iot.device.iothub.models.message import Message
@@ -32,6 +33,8 @@ from tests.common.pipeline.helpers import (
     all_common_ops,
     all_common_events,
     all_except,
+    mock_op_method,
+    spy_op_method,
     StageTestBase,
 )
 from tests.iothub.pipeline.helpers import all_iothub_ops, all_iothub_events
@@ -258,7 +261,6 @@ class IoTHubMQTTTranslationStageTestBase(StageTestBase):
     def stage_configured_for_device(
         self, stage, stage_base_configuration, set_connection_args_for_device, mocker
     ):
-        set_connection_args_for_device.callback = None
         stage.run_op(set_connection_args_for_device)
         mocker.resetall()
 
@@ -266,7 +268,6 @@ class IoTHubMQTTTranslationStageTestBase(StageTestBase):
     def stage_configured_for_module(
         self, stage, stage_base_configuration, set_connection_args_for_module, mocker
     ):
-        set_connection_args_for_module.callback = None
         stage.run_op(set_connection_args_for_module)
         mocker.resetall()
 
@@ -274,7 +275,6 @@ class IoTHubMQTTTranslationStageTestBase(StageTestBase):
     def stages_configured_for_both(
         self, request, stage, stage_base_configuration, set_connection_args, mocker
     ):
-        set_connection_args.callback = None
         if request.param == "module":
             set_connection_args.module_id = fake_module_id
         stage.run_op(set_connection_args)
@@ -289,7 +289,7 @@ class TestIoTHubMQTTConverterWithSetAuthProviderArgs(IoTHubMQTTTranslationStageT
         "Runs a pipeline_ops_mqtt.SetMQTTConnectionArgsOperation worker operation on the next stage"
     )
     def test_runs_set_connection_args(self, mocker, stage, set_connection_args):
-        set_connection_args.spawn_worker_op = mocker.MagicMock()
+        mock_op_method(mocker, set_connection_args, "spawn_worker_op")
         stage.run_op(set_connection_args)
         assert set_connection_args.spawn_worker_op.call_count == 1
         assert (
@@ -475,7 +475,7 @@ class TestIoTHubMQTTConverterWithUpdateSasTokenOperationConnected(
         op = pipeline_ops_base.UpdateSasTokenOperation(
             sas_token=fake_sas_token, callback=mocker.MagicMock()
         )
-        mocker.spy(op, "complete")
+        spy_op_method(mocker, op, "complete")
         return op
 
     @pytest.fixture(autouse=True)
@@ -608,7 +608,7 @@ class TestIoTHubMQTTConverterBasicOperations(IoTHubMQTTTranslationStageTestBase)
     @pytest.fixture
     def op(self, params, mocker):
         op = params["op_class"](**params["op_init_kwargs"])
-        mocker.spy(op, "spawn_worker_op")
+        spy_op_method(mocker, op, "spawn_worker_op")
         return op
 
     @pytest.mark.it("Runs a worker operation on the next stage")
@@ -981,7 +981,6 @@ class TestIoTHubMQTTConverterForPublishOps(IoTHubMQTTTranslationStageTestBase):
     @pytest.fixture
     def op(self, params, mocker):
         op = params["op_class"](**params["op_init_kwargs"])
-        op.callback = mocker.MagicMock()
         return op
 
     @pytest.mark.it("Uses the correct topic and encodes message properties string when publishing")
@@ -1076,7 +1075,7 @@ class TestIoTHubMQTTConverterWithEnableFeature(IoTHubMQTTTranslationStageTestBas
         op = op_parameters["op_class"](
             feature_name=invalid_feature_name, callback=mocker.MagicMock()
         )
-        mocker.spy(op, "complete")
+        spy_op_method(mocker, op, "complete")
         stage.run_op(op)
         assert op.complete.call_count == 1
         assert isinstance(op.complete.call_args[1]["error"], KeyError)
@@ -1085,7 +1084,7 @@ class TestIoTHubMQTTConverterWithEnableFeature(IoTHubMQTTTranslationStageTestBas
 
 @pytest.fixture
 def add_pipeline_root(stage, mocker):
-    root = pipeline_stages_base.PipelineRootStage(mocker.MagicMock())
+    root = pipeline_stages_base.PipelineRootStage(config.IoTHubPipelineConfig())
     mocker.spy(root, "handle_pipeline_event")
     stage.previous = root
     stage.pipeline_root = root
@@ -1148,6 +1147,22 @@ class TestIoTHubMQTTConverterHandlePipelineEventC2D(IoTHubMQTTTranslationStageTe
         new_event = stage.previous.handle_pipeline_event.call_args[0][0]
         assert new_event.message.content_type == fake_content_type
 
+    @pytest.mark.it("Leaves the message properties to be decoded from the topic when first used")
+    def test_decodes_c2d_message_properties_lazily(
+        self, mocker, stage, stage_configured_for_device, add_pipeline_root
+    ):
+        extract = mocker.spy(mqtt_topic_iothub, "extract_properties_from_topic")
+        event = pipeline_events_mqtt.IncomingMQTTMessageEvent(
+            topic=fake_c2d_topic_with_content_type, payload=fake_mqtt_payload
+        )
+        stage.handle_pipeline_event(event)
+        new_event = stage.previous.handle_pipeline_event.call_args[0][0]
+        assert extract.call_count == 0
+        assert new_event.message.data == fake_mqtt_payload
+
+        assert new_event.message.content_type == fake_content_type
+        assert extract.call_count == 1
+
     @pytest.mark.it("Passes up c2d messages destined for another device")
     def test_if_topic_is_c2d_for_another_device(
         self, mocker, stage, stage_configured_for_device, add_pipeline_root
@@ -1204,8 +1219,8 @@ class TestIotHubMQTTConverterWithSendIotRequest(IoTHubMQTTTranslationStageTestBa
             request_id=fake_request_id,
             callback=mocker.MagicMock(),
         )
-        mocker.spy(op, "complete")
-        mocker.spy(op, "spawn_worker_op")
+        spy_op_method(mocker, op, "complete")
+        spy_op_method(mocker, op, "spawn_worker_op")
         return op
 
     @pytest.mark.it("calls the op callback with an OperationError if request_type is not 'twin'")
@@ -1365,6 +1380,19 @@ class TestIoTHubMQTTConverterHandlePipelineEventMethodRequets(IoTHubMQTTTranslat
             fake_method_request_payload.decode("utf-8")
         )
 
+    @pytest.mark.it("Leaves the payload to be decoded when it is first used")
+    def test_decodes_method_request_payload_lazily(
+        self, mocker, stage, stages_configured_for_both, add_pipeline_root, method_request_event
+    ):
+        json_codec = stage.pipeline_root.pipeline_configuration.json_codec
+        decode = mocker.spy(json_codec, "decode")
+        stage.handle_pipeline_event(method_request_event)
+        new_event = stage.previous.handle_pipeline_event.call_args[0][0]
+        assert decode.call_count == 0
+
+        new_event.method_request.payload
+        assert decode.call_args == mocker.call(fake_method_request_payload)
+
 
 @pytest.mark.describe(
     "IotHubMQTTConverter - .handle_pipeline_event() -- called with twin response topic"
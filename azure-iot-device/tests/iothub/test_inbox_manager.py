@@ -9,6 +9,7 @@ import logging
 import sys
 import six
 import abc
+from azure.iot.device.common import metrics
 from azure.iot.device.iothub.inbox_manager import InboxManager
 from azure.iot.device.iothub.models import Message, MethodRequest
 
@@ -173,6 +174,41 @@ class TestInboxManagerGetMethodRequestInbox(object):
         assert method_inbox in manager.named_method_request_inboxes.values()
 
 
+@pytest.mark.describe("InboxManager - .register_metrics()")
+class TestInboxManagerRegisterMetrics(object):
+    @pytest.fixture
+    def registry(self, manager):
+        registry = metrics.MetricsRegistry()
+        manager.register_metrics(registry)
+        return registry
+
+    @pytest.mark.it("Adds a gauge of the items waiting in each kind of inbox, all initially 0")
+    def test_gauges(self, registry):
+        assert registry.snapshot() == {
+            'inbox_depth{inbox="c2d_message"}': 0,
+            'inbox_depth{inbox="input_message"}': 0,
+            'inbox_depth{inbox="method_request"}': 0,
+            'inbox_depth{inbox="twin_patch"}': 0,
+        }
+
+    @pytest.mark.it("Counts the items in every inbox of a kind, including inboxes added later")
+    def test_counts_all_inboxes_of_kind(self, manager, registry, message):
+        manager.get_input_message_inbox("input1")
+        manager.get_input_message_inbox("input2")
+        manager.get_method_request_inbox("some_method")
+        manager.route_input_message("input1", message)
+        manager.route_input_message("input2", message)
+        manager.route_method_request(MethodRequest("id1", "some_method", "payload"))
+        manager.route_method_request(MethodRequest("id2", "other_method", "payload"))
+        manager.route_c2d_message(message)
+
+        snapshot = registry.snapshot()
+        assert snapshot['inbox_depth{inbox="c2d_message"}'] == 1
+        assert snapshot['inbox_depth{inbox="input_message"}'] == 2
+        assert snapshot['inbox_depth{inbox="method_request"}'] == 2
+        assert snapshot['inbox_depth{inbox="twin_patch"}'] == 0
+
+
 @pytest.mark.describe("InboxManager - .clear_all_method_requests()")
 class TestInboxManagerClearAllMethodRequests(object):
     @pytest.mark.it("Clears the generic method request inbox")
@@ -11,6 +11,7 @@ import time
 import os
 import io
 import six
+from concurrent.futures import Future
 from azure.iot.device.iothub import IoTHubDeviceClient, IoTHubModuleClient
 from azure.iot.device import exceptions as client_exceptions
 from azure.iot.device.iothub.pipeline import IoTHubPipeline, constant, config
@@ -493,6 +494,141 @@ class SharedClientSendD2CMessageTests(WaitsForEventCompletion):
         assert sent_message.data == message_input
 
 
+class SharedClientSendD2CMessageNowaitTests(object):
+    @pytest.mark.it("Begins a 'send_message' IoTHubPipeline operation")
+    def test_calls_pipeline_send_message(self, client, iothub_pipeline, message):
+        client.send_message_nowait(message)
+        assert iothub_pipeline.send_message.call_count == 1
+        assert iothub_pipeline.send_message.call_args[0][0] is message
+
+    @pytest.mark.it(
+        "Returns a Future, which is completed with a result of None when the 'send_message' "
+        "pipeline operation completes"
+    )
+    def test_returns_future(self, client_manual_cb, iothub_pipeline_manual_cb, message):
+        future = client_manual_cb.send_message_nowait(message)
+        assert isinstance(future, Future)
+        assert not future.done()
+
+        callback = iothub_pipeline_manual_cb.send_message.call_args[1]["callback"]
+        callback()
+        assert future.result(timeout=0) is None
+
+    @pytest.mark.it(
+        "Completes the Future with a client error if the `send_message` pipeline operation calls "
+        "back with a pipeline error"
+    )
+    @pytest.mark.parametrize(
+        "pipeline_error,client_error",
+        [
+            pytest.param(
+                pipeline_exceptions.ConnectionDroppedError,
+                client_exceptions.ConnectionDroppedError,
+                id="ConnectionDroppedError->ConnectionDroppedError",
+            ),
+            pytest.param(
+                pipeline_exceptions.ConnectionFailedError,
+                client_exceptions.ConnectionFailedError,
+                id="ConnectionFailedError->ConnectionFailedError",
+            ),
+            pytest.param(
+                pipeline_exceptions.UnauthorizedError,
+                client_exceptions.CredentialError,
+                id="UnauthorizedError->CredentialError",
+            ),
+            pytest.param(
+                pipeline_exceptions.ProtocolClientError,
+                client_exceptions.ClientError,
+                id="ProtocolClientError->ClientError",
+            ),
+            pytest.param(Exception, client_exceptions.ClientError, id="Exception->ClientError"),
+        ],
+    )
+    def test_future_error_on_pipeline_op_error(
+        self, client_manual_cb, iothub_pipeline_manual_cb, message, pipeline_error, client_error
+    ):
+        my_pipeline_error = pipeline_error()
+        future = client_manual_cb.send_message_nowait(message)
+
+        callback = iothub_pipeline_manual_cb.send_message.call_args[1]["callback"]
+        callback(error=my_pipeline_error)
+        assert isinstance(future.exception(timeout=0), client_error)
+        assert future.exception(timeout=0).__cause__ is my_pipeline_error
+
+    @pytest.mark.it(
+        "Wraps 'message' input parameter in a Message object if it is not a Message object"
+    )
+    @pytest.mark.parametrize(
+        "message_input",
+        [
+            pytest.param("message", id="String input"),
+            pytest.param(222, id="Integer input"),
+            pytest.param(None, id="None input"),
+        ],
+    )
+    def test_wraps_data_in_message_and_calls_pipeline_send_message(
+        self, client, iothub_pipeline, message_input
+    ):
+        client.send_message_nowait(message_input)
+        assert iothub_pipeline.send_message.call_count == 1
+        sent_message = iothub_pipeline.send_message.call_args[0][0]
+        assert isinstance(sent_message, Message)
+        assert sent_message.data == message_input
+
+
+class SharedClientAddTelemetryReadingsTests(WaitsForEventCompletion):
+    @pytest.mark.it("Begins an 'add_telemetry_readings' IoTHubPipeline operation")
+    def test_calls_pipeline_add_telemetry_readings(self, client, iothub_pipeline):
+        readings = {"temperature": [20.5, 21.0]}
+        client.add_telemetry_readings(readings)
+        assert iothub_pipeline.add_telemetry_readings.call_count == 1
+        assert iothub_pipeline.add_telemetry_readings.call_args[0][0] is readings
+
+    @pytest.mark.it(
+        "Waits for the completion of the 'add_telemetry_readings' pipeline operation before returning"
+    )
+    def test_waits_for_pipeline_op_completion(
+        self, mocker, client_manual_cb, iothub_pipeline_manual_cb
+    ):
+        self.add_event_completion_checks(
+            mocker=mocker, pipeline_function=iothub_pipeline_manual_cb.add_telemetry_readings
+        )
+        client_manual_cb.add_telemetry_readings({"temperature": 20.5})
+
+    @pytest.mark.it(
+        "Raises a client error if the `add_telemetry_readings` pipeline operation calls back with an error"
+    )
+    def test_raises_error_on_pipeline_op_error(
+        self, mocker, client_manual_cb, iothub_pipeline_manual_cb
+    ):
+        my_pipeline_error = TypeError()
+        self.add_event_completion_checks(
+            mocker=mocker,
+            pipeline_function=iothub_pipeline_manual_cb.add_telemetry_readings,
+            kwargs={"error": my_pipeline_error},
+        )
+        with pytest.raises(client_exceptions.ClientError) as e_info:
+            client_manual_cb.add_telemetry_readings({"temperature": "hot"})
+        assert e_info.value.__cause__ is my_pipeline_error
+
+    @pytest.mark.it(
+        "Raises a ValueError, without beginning a pipeline operation, if a channel has no readings or a reading which is not finite"
+    )
+    @pytest.mark.parametrize(
+        "readings",
+        [
+            pytest.param({"temperature": 20.5, "humidity": []}, id="Empty list"),
+            pytest.param({"temperature": float("nan")}, id="NaN"),
+            pytest.param({"temperature": [20.5, float("inf")]}, id="Infinity"),
+            pytest.param({"temperature": float("-inf")}, id="Negative infinity"),
+        ],
+    )
+    def test_invalid_readings(self, client, iothub_pipeline, readings):
+        with pytest.raises(ValueError):
+            client.add_telemetry_readings(readings)
+        assert iothub_pipeline.add_telemetry_readings.call_count == 0
+
+
 class SharedClientReceiveMethodRequestTests(object):
     @pytest.mark.it("Implicitly enables methods feature if not already enabled")
     @pytest.mark.parametrize(
@@ -721,6 +857,73 @@ class SharedClientSendMethodResponseTests(WaitsForEventCompletion):
         assert e_info.value.__cause__ is my_pipeline_error
 
 
+class SharedClientSendMethodResponseNowaitTests(object):
+    @pytest.mark.it("Begins a 'send_method_response' pipeline operation")
+    def test_send_method_response_calls_pipeline(self, client, iothub_pipeline, method_response):
+        client.send_method_response_nowait(method_response)
+        assert iothub_pipeline.send_method_response.call_count == 1
+        assert iothub_pipeline.send_method_response.call_args[0][0] is method_response
+
+    @pytest.mark.it(
+        "Returns a Future, which is completed with a result of None when the "
+        "'send_method_response' pipeline operation completes"
+    )
+    def test_returns_future(self, client_manual_cb, iothub_pipeline_manual_cb, method_response):
+        future = client_manual_cb.send_method_response_nowait(method_response)
+        assert isinstance(future, Future)
+        assert not future.done()
+
+        callback = iothub_pipeline_manual_cb.send_method_response.call_args[1]["callback"]
+        callback()
+        assert future.result(timeout=0) is None
+
+    @pytest.mark.it(
+        "Completes the Future with a client error if the `send_method_response` pipeline "
+        "operation calls back with a pipeline error"
+    )
+    @pytest.mark.parametrize(
+        "pipeline_error,client_error",
+        [
+            pytest.param(
+                pipeline_exceptions.ConnectionDroppedError,
+                client_exceptions.ConnectionDroppedError,
+                id="ConnectionDroppedError->ConnectionDroppedError",
+            ),
+            pytest.param(
+                pipeline_exceptions.ConnectionFailedError,
+                client_exceptions.ConnectionFailedError,
+                id="ConnectionFailedError->ConnectionFailedError",
+            ),
+            pytest.param(
+                pipeline_exceptions.UnauthorizedError,
+                client_exceptions.CredentialError,
+                id="UnauthorizedError->CredentialError",
+            ),
+            pytest.param(
+                pipeline_exceptions.ProtocolClientError,
+                client_exceptions.ClientError,
+                id="ProtocolClientError->ClientError",
+            ),
+            pytest.param(Exception, client_exceptions.ClientError, id="Exception->ClientError"),
+        ],
+    )
+    def test_future_error_on_pipeline_op_error(
+        self,
+        client_manual_cb,
+        iothub_pipeline_manual_cb,
+        method_response,
+        pipeline_error,
+        client_error,
+    ):
+        my_pipeline_error = pipeline_error()
+        future = client_manual_cb.send_method_response_nowait(method_response)
+
+        callback = iothub_pipeline_manual_cb.send_method_response.call_args[1]["callback"]
+        callback(error=my_pipeline_error)
+        assert isinstance(future.exception(timeout=0), client_error)
+        assert future.exception(timeout=0).__cause__ is my_pipeline_error
+
+
 class SharedClientGetTwinTests(WaitsForEventCompletion):
     @pytest.fixture
     def patch_get_twin_to_return_fake_twin(self, fake_twin, mocker, iothub_pipeline):
@@ -921,6 +1124,97 @@ class SharedClientPatchTwinReportedPropertiesTests(WaitsForEventCompletion):
         assert e_info.value.__cause__ is my_pipeline_error
 
 
+class SharedClientPatchTwinReportedPropertiesNowaitTests(object):
+    @pytest.mark.it("Implicitly enables twin messaging feature if not already enabled")
+    def test_enables_twin_only_if_not_already_enabled(
+        self, client, iothub_pipeline, twin_patch_reported
+    ):
+        # Verify twin enabled if not enabled
+        iothub_pipeline.feature_enabled.__getitem__.return_value = (
+            False
+        )  # twin will appear disabled
+        client.patch_twin_reported_properties_nowait(twin_patch_reported)
+        assert iothub_pipeline.enable_feature.call_count == 1
+        assert iothub_pipeline.enable_feature.call_args[0][0] == constant.TWIN
+
+        iothub_pipeline.enable_feature.reset_mock()
+
+        # Verify twin not enabled if already enabled
+        iothub_pipeline.feature_enabled.__getitem__.return_value = True  # twin will appear enabled
+        client.patch_twin_reported_properties_nowait(twin_patch_reported)
+        assert iothub_pipeline.enable_feature.call_count == 0
+
+    @pytest.mark.it("Begins a 'patch_twin_reported_properties' pipeline operation")
+    def test_patch_twin_reported_properties_calls_pipeline(
+        self, client, iothub_pipeline, twin_patch_reported
+    ):
+        client.patch_twin_reported_properties_nowait(twin_patch_reported)
+        assert iothub_pipeline.patch_twin_reported_properties.call_count == 1
+        assert (
+            iothub_pipeline.patch_twin_reported_properties.call_args[1]["patch"]
+            is twin_patch_reported
+        )
+
+    @pytest.mark.it(
+        "Returns a Future, which is completed with a result of None when the "
+        "'patch_twin_reported_properties' pipeline operation completes"
+    )
+    def test_returns_future(self, client_manual_cb, iothub_pipeline_manual_cb, twin_patch_reported):
+        future = client_manual_cb.patch_twin_reported_properties_nowait(twin_patch_reported)
+        assert isinstance(future, Future)
+        assert not future.done()
+
+        callback = iothub_pipeline_manual_cb.patch_twin_reported_properties.call_args[1]["callback"]
+        callback()
+        assert future.result(timeout=0) is None
+
+    @pytest.mark.it(
+        "Completes the Future with a client error if the `patch_twin_reported_properties` "
+        "pipeline operation calls back with a pipeline error"
+    )
+    @pytest.mark.parametrize(
+        "pipeline_error,client_error",
+        [
+            pytest.param(
+                pipeline_exceptions.ConnectionDroppedError,
+                client_exceptions.ConnectionDroppedError,
+                id="ConnectionDroppedError->ConnectionDroppedError",
+            ),
+            pytest.param(
+                pipeline_exceptions.ConnectionFailedError,
+                client_exceptions.ConnectionFailedError,
+                id="ConnectionFailedError->ConnectionFailedError",
+            ),
+            pytest.param(
+                pipeline_exceptions.UnauthorizedError,
+                client_exceptions.CredentialError,
+                id="UnauthorizedError->CredentialError",
+            ),
+            pytest.param(
+                pipeline_exceptions.ProtocolClientError,
+                client_exceptions.ClientError,
+                id="ProtocolClientError->ClientError",
+            ),
+            pytest.param(Exception, client_exceptions.ClientError, id="Exception->ClientError"),
+        ],
+    )
+    def test_future_error_on_pipeline_op_error(
+        self,
+        client_manual_cb,
+        iothub_pipeline_manual_cb,
+        twin_patch_reported,
+        pipeline_error,
+        client_error,
+    ):
+        my_pipeline_error = pipeline_error()
+        future = client_manual_cb.patch_twin_reported_properties_nowait(twin_patch_reported)
+
+        callback = iothub_pipeline_manual_cb.patch_twin_reported_properties.call_args[1]["callback"]
+        callback(error=my_pipeline_error)
+        assert isinstance(future.exception(timeout=0), client_error)
+        assert future.exception(timeout=0).__cause__ is my_pipeline_error
+
+
 class SharedClientReceiveTwinDesiredPropertiesPatchTests(object):
     @pytest.mark.it(
         "Implicitly enables Twin desired properties patch feature if not already enabled"
@@ -1033,6 +1327,21 @@ class SharedClientPROPERTYConnectedTests(object):
         assert not client.connected
 
 
+class SharedClientPROPERTYMetricsTests(object):
+    @pytest.mark.it("Cannot be changed")
+    def test_read_only(self, client):
+        with pytest.raises(AttributeError):
+            client.metrics = None
+
+    @pytest.mark.it("Is the metrics of the pipeline")
+    def test_pipeline_metrics(self, client, iothub_pipeline):
+        assert client.metrics is iothub_pipeline.metrics
+
+    @pytest.mark.it("Includes the depths of the client's inboxes")
+    def test_inbox_depths(self, client):
+        assert 'inbox_depth{inbox="c2d_message"}' in client.metrics.snapshot()
+
+
 ################
 # DEVICE TESTS #
 ################
@@ -1421,6 +1730,20 @@ class TestIoTHubDeviceClientSendD2CMessage(
     pass
 
 
+@pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .send_message_nowait()")
+class TestIoTHubDeviceClientSendD2CMessageNowait(
+    IoTHubDeviceClientTestsConfig, SharedClientSendD2CMessageNowaitTests
+):
+    pass
+
+
+@pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .add_telemetry_readings()")
+class TestIoTHubDeviceClientAddTelemetryReadings(
+    IoTHubDeviceClientTestsConfig, SharedClientAddTelemetryReadingsTests
+):
+    pass
+
+
 @pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .receive_message()")
 class TestIoTHubDeviceClientReceiveC2DMessage(IoTHubDeviceClientTestsConfig):
     @pytest.mark.it("Implicitly enables C2D messaging feature if not already enabled")
@@ -1527,6 +1850,13 @@ class TestIoTHubDeviceClientSendMethodResponse(
     pass
 
 
+@pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .send_method_response_nowait()")
+class TestIoTHubDeviceClientSendMethodResponseNowait(
+    IoTHubDeviceClientTestsConfig, SharedClientSendMethodResponseNowaitTests
+):
+    pass
+
+
 @pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .get_twin()")
 class TestIoTHubDeviceClientGetTwin(IoTHubDeviceClientTestsConfig, SharedClientGetTwinTests):
     pass
@@ -1539,6 +1869,13 @@ class TestIoTHubDeviceClientPatchTwinReportedProperties(
     pass
 
 
+@pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .patch_twin_reported_properties_nowait()")
+class TestIoTHubDeviceClientPatchTwinReportedPropertiesNowait(
+    IoTHubDeviceClientTestsConfig, SharedClientPatchTwinReportedPropertiesNowaitTests
+):
+    pass
+
+
 @pytest.mark.describe("IoTHubDeviceClient (Synchronous) - .receive_twin_desired_properties_patch()")
 class TestIoTHubDeviceClientReceiveTwinDesiredPropertiesPatch(
     IoTHubDeviceClientTestsConfig, SharedClientReceiveTwinDesiredPropertiesPatchTests
@@ -1695,6 +2032,13 @@ class TestIoTHubDeviceClientPROPERTYConnected(
     pass
 
 
+@pytest.mark.describe("IoTHubDeviceClient (Synchronous) - PROPERTY .metrics")
+class TestIoTHubDeviceClientPROPERTYMetrics(
+    IoTHubDeviceClientTestsConfig, SharedClientPROPERTYMetricsTests
+):
+    pass
+
+
 ################
 # MODULE TESTS #
 ################
@@ -2367,6 +2711,20 @@ class TestIoTHubNModuleClientSendD2CMessage(
     pass
 
 
+@pytest.mark.describe("IoTHubModuleClient (Synchronous) - .send_message_nowait()")
+class TestIoTHubModuleClientSendD2CMessageNowait(
+    IoTHubModuleClientTestsConfig, SharedClientSendD2CMessageNowaitTests
+):
+    pass
+
+
+@pytest.mark.describe("IoTHubModuleClient (Synchronous) - .add_telemetry_readings()")
+class TestIoTHubModuleClientAddTelemetryReadings(
+    IoTHubModuleClientTestsConfig, SharedClientAddTelemetryReadingsTests
+):
+    pass
+
+
 @pytest.mark.describe("IoTHubModuleClient (Synchronous) - .send_message_to_output()")
 class TestIoTHubModuleClientSendToOutput(IoTHubModuleClientTestsConfig, WaitsForEventCompletion):
     @pytest.mark.it("Begins a 'send_output_event' pipeline operation")
@@ -2588,6 +2946,13 @@ class TestIoTHubModuleClientSendMethodResponse(
     pass
 
 
+@pytest.mark.describe("IoTHubModuleClient (Synchronous) - .send_method_response_nowait()")
+class TestIoTHubModuleClientSendMethodResponseNowait(
+    IoTHubModuleClientTestsConfig, SharedClientSendMethodResponseNowaitTests
+):
+    pass
+
+
 @pytest.mark.describe("IoTHubModuleClient (Synchronous) - .get_twin()")
 class TestIoTHubModuleClientGetTwin(IoTHubModuleClientTestsConfig, SharedClientGetTwinTests):
     pass
@@ -2600,6 +2965,13 @@ class TestIoTHubModuleClientPatchTwinReportedProperties(
     pass
 
 
+@pytest.mark.describe("IoTHubModuleClient (Synchronous) - .patch_twin_reported_properties_nowait()")
+class TestIoTHubModuleClientPatchTwinReportedPropertiesNowait(
+    IoTHubModuleClientTestsConfig, SharedClientPatchTwinReportedPropertiesNowaitTests
+):
+    pass
+
+
 @pytest.mark.describe("IoTHubModuleClient (Synchronous) - .receive_twin_desired_properties_patch()")
 class TestIoTHubModuleClientReceiveTwinDesiredPropertiesPatch(
     IoTHubModuleClientTestsConfig, SharedClientReceiveTwinDesiredPropertiesPatchTests
@@ -2684,6 +3056,13 @@ class TestIoTHubModuleClientPROPERTYConnected(
     pass
 
 
+@pytest.mark.describe("IoTHubModule (Synchronous) - PROPERTY .metrics")
+class TestIoTHubModuleClientPROPERTYMetrics(
+    IoTHubModuleClientTestsConfig, SharedClientPROPERTYMetricsTests
+):
+    pass
+
+
 ####################
 # HELPER FUNCTIONS #
 ####################
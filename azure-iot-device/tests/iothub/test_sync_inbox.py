@@ -117,6 +117,17 @@ class TestSyncClientInboxGet(object):
             inbox.get(block=False)
 
 
+@pytest.mark.describe("SyncClientInbox - .qsize()")
+class TestSyncClientInboxQsize(object):
+    @pytest.mark.it("Returns the number of items in the inbox")
+    def test_returns_number_of_items(self, mocker):
+        inbox = SyncClientInbox()
+        assert inbox.qsize() == 0
+        inbox._put(mocker.MagicMock())
+        inbox._put(mocker.MagicMock())
+        assert inbox.qsize() == 2
+
+
 @pytest.mark.describe("SyncClientInbox - .clear()")
 class TestSyncClientInboxClear(object):
     @pytest.mark.it("Clears all items from the inbox")
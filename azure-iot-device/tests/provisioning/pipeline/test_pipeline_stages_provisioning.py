@@ -14,7 +14,8 @@ from azure.iot.device.provisioning.pipeline import (
     pipeline_stages_provisioning,
     pipeline_ops_provisioning,
 )
-from azure.iot.device.common.pipeline import pipeline_ops_base
+from azure.iot.device.common.pipeline import pipeline_ops_base, pipeline_stages_base
+from azure.iot.device.common.pipeline.config import BasePipelineConfig
 
 from tests.common.pipeline.helpers import (
     assert_callback_succeeded,
@@ -22,6 +23,7 @@ from tests.common.pipeline.helpers import (
     all_common_ops,
     all_common_events,
     all_except,
+    spy_op_method,
     StageTestBase,
 )
 from azure.iot.device.common.pipeline import pipeline_events_base
@@ -188,6 +190,9 @@ class UseSecurityClientStageTestConfig(object):
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=BasePipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
         return stage
@@ -340,6 +345,9 @@ class RegistrationStageConfig(object):
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=BasePipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
         return stage
@@ -418,6 +426,9 @@ class TestRegistrationStageWithRegisterOperationCompleted(RegistrationStageConfi
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs, send_registration_op):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=BasePipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
         # Run the registration operation
@@ -597,7 +608,7 @@ class TestRegistrationStageWithRegisterOperationCompleted(RegistrationStageConfi
             "azure.iot.device.provisioning.pipeline.pipeline_stages_provisioning.Timer"
         )
 
-        mocker.spy(send_registration_op, "spawn_worker_op")
+        spy_op_method(mocker, send_registration_op, "spawn_worker_op")
         registration_result = create_registration_result(request_payload, "assigning")
 
         assert not send_registration_op.completed
@@ -632,6 +643,9 @@ class RetryStageConfig(object):
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=BasePipelineConfig()
+        )
         mocker.spy(stage, "run_op")
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
@@ -791,6 +805,9 @@ class PollingStageConfig(object):
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=BasePipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
         return stage
@@ -855,6 +872,9 @@ class TestPollingStatusStageWithPollStatusOperationCompleted(PollingStageConfig)
     @pytest.fixture
     def stage(self, mocker, cls_type, init_kwargs, send_query_op):
         stage = cls_type(**init_kwargs)
+        stage.pipeline_root = pipeline_stages_base.PipelineRootStage(
+            pipeline_configuration=BasePipelineConfig()
+        )
         stage.send_op_down = mocker.MagicMock()
         stage.send_event_up = mocker.MagicMock()
         # Run the registration operation
@@ -25,6 +25,7 @@ from tests.common.pipeline.helpers import (
     all_common_ops,
     all_common_events,
     all_except,
+    spy_op_method,
     StageTestBase,
 )
 from tests.provisioning.pipeline.helpers import all_provisioning_ops
@@ -93,7 +94,7 @@ def set_security_client_args(mocker):
         client_cert=fake_client_cert,
         callback=mocker.MagicMock(),
     )
-    mocker.spy(op, "complete")
+    spy_op_method(mocker, op, "complete")
     return op
 
 
@@ -235,7 +236,7 @@ basic_ops = [
 @pytest.fixture
 def op(params, mocker):
     op = params["op_class"](callback=mocker.MagicMock(), **params["op_init_kwargs"])
-    mocker.spy(op, "complete")
+    spy_op_method(mocker, op, "complete")
     return op
 
 
@@ -7,6 +7,7 @@
 import pytest
 import logging
 from azure.iot.device.common.models import X509
+from azure.iot.device.common.codec import JSONCodec
 from azure.iot.device.provisioning.security.sk_security_client import SymmetricKeySecurityClient
 from azure.iot.device.provisioning.security.x509_security_client import X509SecurityClient
 from azure.iot.device.provisioning.pipeline.provisioning_pipeline import ProvisioningPipeline
@@ -110,7 +111,7 @@ def input_security_client(params_security_clients):
 
 @pytest.fixture
 def pipeline_configuration(mocker):
-    return mocker.MagicMock()
+    return mocker.MagicMock(json_codec=JSONCodec())
 
 
 @pytest.fixture
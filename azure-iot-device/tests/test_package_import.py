@@ -0,0 +1,115 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import inspect
+import json
+import subprocess
+import sys
+import azure.iot.device
+from azure.iot.device.iothub.abstract_clients import AbstractIoTHubClient
+
+# Modules that should only be imported once a client is used
+heavy_modules = ["paho.mqtt.client", "requests", "janus", "azure.iot.device.iothub.sync_clients"]
+
+import_probe = """
+import json, sys
+{statement}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def run_import(statement):
+    """Run an import statement in a fresh interpreter, returning the modules it loaded"""
+    output = subprocess.check_output(
+        [sys.executable, "-c", import_probe.format(statement=statement)]
+    )
+    return set(json.loads(output.decode("utf-8")))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires Python 3.7+")
+@pytest.mark.describe("azure.iot.device - Import")
+class TestPackageImport(object):
+    @pytest.mark.it("Does not import the clients, transports or their dependencies")
+    def test_lazy(self):
+        modules = run_import("import azure.iot.device")
+        assert not modules.intersection(heavy_modules)
+
+    @pytest.mark.it("Imports the models without the clients")
+    def test_models(self):
+        modules = run_import(
+            "from azure.iot.device import Message, MethodResponse, RegistrationResult, X509"
+        )
+        assert not modules.intersection(heavy_modules)
+
+    @pytest.mark.it("Imports every public name on first use")
+    @pytest.mark.parametrize("name", azure.iot.device.__all__ + ["X509"])
+    def test_public_names(self, name):
+        modules = run_import("from azure.iot.device import {}".format(name))
+        assert "azure.iot.device" in modules
+
+    @pytest.mark.it("Imports submodules on first use as attributes of the package")
+    @pytest.mark.parametrize(
+        "attribute",
+        [
+            "azure.iot.device.aio",
+            "azure.iot.device.common",
+            "azure.iot.device.constant",
+            "azure.iot.device.exceptions",
+            "azure.iot.device.iothub",
+            "azure.iot.device.patch",
+            "azure.iot.device.provisioning",
+            "azure.iot.device.iothub.auth",
+            "azure.iot.device.iothub.models",
+            "azure.iot.device.iothub.pipeline",
+            "azure.iot.device.provisioning.models",
+            "azure.iot.device.provisioning.pipeline",
+        ],
+    )
+    def test_submodules(self, attribute):
+        modules = run_import("import azure.iot.device\nassert {}".format(attribute))
+        assert attribute in modules
+
+    @pytest.mark.it("Lists its submodules")
+    def test_dir(self):
+        assert "exceptions" in dir(azure.iot.device)
+        assert "pipeline" in dir(azure.iot.device.iothub)
+
+    @pytest.mark.it("Supports wildcard imports")
+    def test_wildcard(self):
+        namespace = {}
+        exec("from azure.iot.device import *", namespace)
+        assert set(azure.iot.device.__all__).issubset(namespace)
+
+    @pytest.mark.it("Raises AttributeError for unknown names")
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError):
+            azure.iot.device.NotAClient
+        with pytest.raises(AttributeError):
+            azure.iot.device.iothub.NotAClient
+
+
+@pytest.mark.skipif(sys.version_info < (3, 5), reason="Requires Python 3.5+")
+@pytest.mark.describe("Client classes - Inherited method shims")
+class TestShims(object):
+    @pytest.mark.it("Adds shims with the signature and docstring of the inherited method")
+    def test_shim(self):
+        from azure.iot.device import IoTHubDeviceClient
+
+        shim = IoTHubDeviceClient.__dict__["create_from_connection_string"].__func__
+        original = AbstractIoTHubClient.create_from_connection_string
+        assert shim.__doc__ == original.__doc__
+        assert shim.__qualname__ == "IoTHubDeviceClient.create_from_connection_string"
+        assert str(inspect.signature(IoTHubDeviceClient.create_from_connection_string)) == str(
+            inspect.signature(original)
+        )
+
+    @pytest.mark.it("Adds coroutine shims for inherited coroutine methods")
+    def test_async_shim(self):
+        from azure.iot.device.aio import IoTHubDeviceClient
+
+        assert "connect" in IoTHubDeviceClient.__dict__
+        assert inspect.iscoroutinefunction(IoTHubDeviceClient.connect)
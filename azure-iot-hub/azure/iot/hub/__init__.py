@@ -3,7 +3,53 @@
 This library provides service clients and associated models for communicating with Azure IoTHub Services.
 """
 
-from .iothub_registry_manager import IoTHubRegistryManager
-from .iothub_configuration_manager import IoTHubConfigurationManager
+import importlib
+import sys
 
-__all__ = ["IoTHubRegistryManager", "IoTHubConfigurationManager"]
+# Public names, and the module each is imported from. The managers, and through them msrest,
+# requests and the protocol models, are only imported once first used.
+_lazy_names = {
+    "IoTHubRegistryManager": ".iothub_registry_manager",
+    "IoTHubConfigurationManager": ".iothub_configuration_manager",
+    "IoTHubJobManager": ".iothub_job_manager",
+}
+
+__all__ = ["IoTHubRegistryManager", "IoTHubConfigurationManager", "IoTHubJobManager"]
+
+
+def _import_submodule(name):
+    """Import a submodule of the package for its module __getattr__, so that submodules such as
+    azure.iot.hub.protocol can be used as attributes, as they were when the package imported
+    everything up front.
+    """
+    try:
+        return importlib.import_module("." + name, __name__)
+    except ImportError as e:
+        if getattr(e, "name", None) != __name__ + "." + name:
+            # The submodule exists, but failed to import
+            raise
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info >= (3, 7):
+
+    def __getattr__(name):
+        if name in _lazy_names:
+            value = getattr(importlib.import_module(_lazy_names[name], __name__), name)
+        else:
+            value = _import_submodule(name)
+        # Cache the value, so this is only called once per name
+        globals()[name] = value
+        return value
+
+    def __dir__():
+        import pkgutil
+
+        submodules = set(module.name for module in pkgutil.iter_modules(__path__))
+        return sorted(set(globals()) | set(_lazy_names) | submodules)
+
+else:
+    # Module __getattr__ (PEP 562) is not supported, so everything is imported up front
+    from .iothub_registry_manager import IoTHubRegistryManager
+    from .iothub_configuration_manager import IoTHubConfigurationManager
+    from .iothub_job_manager import IoTHubJobManager
@@ -0,0 +1,10 @@
+"""Azure IoTHub Service Library - Asynchronous
+
+This library provides asynchronous service clients for communicating with Azure IoTHub Services.
+"""
+
+from .async_iothub_registry_manager import IoTHubRegistryManager
+from .async_iothub_configuration_manager import IoTHubConfigurationManager
+from .async_connection import ConcurrencyLimiter
+
+__all__ = ["IoTHubRegistryManager", "IoTHubConfigurationManager", "ConcurrencyLimiter"]
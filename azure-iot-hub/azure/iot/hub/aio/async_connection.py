@@ -0,0 +1,133 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains the pooled HTTP connection and concurrency limiting used by the
+asynchronous service clients.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import requests
+from msrest.exceptions import ClientRequestError, raise_with_traceback
+from msrest.pipeline import AsyncPipeline
+from msrest.pipeline.async_requests import (
+    AsyncPipelineRequestsHTTPSender,
+    AsyncRequestsCredentialsPolicy,
+)
+from msrest.pipeline.universal import RawDeserializer
+from msrest.universal_http.async_requests import (
+    AsyncRequestsHTTPSender,
+    AsyncRequestsClientResponse,
+)
+from ..protocol.aio import IotHubGatewayServiceAPIs as protocol_client
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+
+class ConcurrencyLimiter(object):
+    """An async context manager bounding the number of requests in flight at once.
+
+    The underlying semaphore is created on first use, so that the limiter is bound to the
+    event loop it is used on rather than the one (if any) current at construction.
+
+    :param int max_concurrency: The maximum number of concurrent holders of the limiter.
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self._semaphore = None
+
+    async def __aenter__(self):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        await self._semaphore.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._semaphore.release()
+
+
+class PooledRequestsHTTPSender(AsyncRequestsHTTPSender):
+    """An msrest async HTTP driver that sends requests from a dedicated thread pool over a
+    single shared requests Session, with a connection pool sized to match the thread pool.
+
+    The default msrest driver uses the event loop's default executor and a connection pool
+    of 10, which caps the number of requests that can actually be in flight.
+
+    :param config: The msrest Configuration of the service client.
+    :param int pool_size: The number of worker threads and pooled connections.
+    """
+
+    def __init__(self, config, pool_size=DEFAULT_MAX_CONCURRENCY):
+        self.pool_size = pool_size
+        self._shared_session = None
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=pool_size)
+        super(PooledRequestsHTTPSender, self).__init__(config)
+
+    @property
+    def session(self):
+        # Unlike the base class, the session is shared by all threads instead of thread-local
+        return self._shared_session
+
+    @session.setter
+    def session(self, value):
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.pool_size, pool_block=True
+        )
+        for protocol in self._protocols:
+            value.mount(protocol, adapter)
+        self._init_session(value)
+        self._shared_session = value
+
+    def close(self):
+        super(PooledRequestsHTTPSender, self).close()
+        self._executor.shutdown(wait=False)
+
+    async def send(self, request, **kwargs):
+        """Send the request on the thread pool.
+
+        :param ClientRequest request: The request object to be sent.
+        """
+        requests_kwargs = self._configure_send(request, **kwargs)
+        session = requests_kwargs.pop("session", self.session)
+        loop = asyncio.get_event_loop()
+        try:
+            response = await loop.run_in_executor(
+                self._executor,
+                functools.partial(session.request, request.method, request.url, **requests_kwargs),
+            )
+        except requests.RequestException as err:
+            raise_with_traceback(ClientRequestError, "Error occurred in request.", err)
+        return AsyncRequestsClientResponse(request, response)
+
+
+def create_protocol_client(auth, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Create an asynchronous protocol client that sends its requests using a
+    PooledRequestsHTTPSender.
+
+    :param auth: The msrest credentials to authenticate requests with.
+    :type auth: :class:`azure.iot.hub.auth.ConnectionStringAuthentication`
+    :param int max_concurrency: The size of the HTTP thread and connection pools.
+
+    :returns: The protocol client.
+    :rtype: :class:`azure.iot.hub.protocol.aio.IotHubGatewayServiceAPIs`
+    """
+    protocol = protocol_client(auth, "https://" + auth["HostName"])
+    config = protocol.config
+    # Same policies as the msrest default async pipeline, with a different sender
+    policies = [
+        config.user_agent_policy,
+        AsyncRequestsCredentialsPolicy(auth),
+        RawDeserializer(),
+        config.http_logger_policy,
+    ]
+    config.pipeline = AsyncPipeline(
+        policies,
+        AsyncPipelineRequestsHTTPSender(PooledRequestsHTTPSender(config, max_concurrency)),
+    )
+    return protocol
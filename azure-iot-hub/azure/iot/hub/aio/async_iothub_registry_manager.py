@@ -0,0 +1,714 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+"""This module contains the asynchronous IoTHubRegistryManager"""
+
+from ..auth import ConnectionStringAuthentication
+from ..iothub_registry_manager import QueryResult
+from .async_connection import ConcurrencyLimiter, create_protocol_client, DEFAULT_MAX_CONCURRENCY
+from ..protocol.models import (
+    Device,
+    Module,
+    SymmetricKey,
+    X509Thumbprint,
+    AuthenticationMechanism,
+    ServiceStatistics,
+    RegistryStatistics,
+    QuerySpecification,
+    Twin,
+    CloudToDeviceMethod,
+    CloudToDeviceMethodResult,
+)
+
+
+class IoTHubRegistryManager(object):
+    """A class to provide asynchronous convenience APIs for IoTHub Registry Manager operations,
+    based on top of the auto generated IotHub REST APIs
+    """
+
+    def __init__(self, connection_string, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+        """Initializer for an asynchronous Registry Manager Service client.
+
+        After a successful creation the class has been authenticated with IoTHub and
+        it is ready to call the member APIs to communicate with IoTHub.
+
+        :param str connection_string: The IoTHub connection string used to authenticate connection
+            with IoTHub.
+        :param int max_concurrency: The maximum number of requests this client will have in
+            flight at once. Further calls wait until an earlier one completes. This is also the
+            size of the HTTP connection pool.
+
+        :returns: Instance of the IoTHubRegistryManager object.
+        :rtype: :class:`azure.iot.hub.aio.IoTHubRegistryManager`
+        """
+
+        self.auth = ConnectionStringAuthentication(connection_string)
+        self.protocol = create_protocol_client(self.auth, max_concurrency)
+        self._limiter = ConcurrencyLimiter(max_concurrency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP connection pool used by the client.
+
+        The client cannot be used after it has been closed.
+        """
+        await self.protocol.__aexit__()
+
+    async def create_device_with_sas(self, device_id, primary_key, secondary_key, status):
+        """Creates a device identity on IoTHub using SAS authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str primary_key: Primary authentication key.
+        :param str secondary_key: Secondary authentication key.
+        :param str status: Initital state of the created device.
+            (Possible values: "enabled" or "disabled")
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: Device object containing the created device.
+        """
+        symmetric_key = SymmetricKey(primary_key=primary_key, secondary_key=secondary_key)
+
+        kwargs = {
+            "device_id": device_id,
+            "status": status,
+            "authentication": AuthenticationMechanism(type="sas", symmetric_key=symmetric_key),
+        }
+        device = Device(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_device(device_id, device)
+
+    async def create_device_with_x509(
+        self, device_id, primary_thumbprint, secondary_thumbprint, status
+    ):
+        """Creates a device identity on IoTHub using X509 authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str primary_thumbprint: Primary X509 thumbprint.
+        :param str secondary_thumbprint: Secondary X509 thumbprint.
+        :param str status: Initital state of the created device.
+            (Possible values: "enabled" or "disabled")
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: Device object containing the created device.
+        """
+        x509_thumbprint = X509Thumbprint(
+            primary_thumbprint=primary_thumbprint, secondary_thumbprint=secondary_thumbprint
+        )
+
+        kwargs = {
+            "device_id": device_id,
+            "status": status,
+            "authentication": AuthenticationMechanism(
+                type="selfSigned", x509_thumbprint=x509_thumbprint
+            ),
+        }
+        device = Device(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_device(device_id, device)
+
+    async def create_device_with_certificate_authority(self, device_id, status):
+        """Creates a device identity on IoTHub using certificate authority.
+
+        :param str device_id: The name (Id) of the device.
+        :param str status: Initial state of the created device.
+            (Possible values: "enabled" or "disabled").
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: Device object containing the created device.
+        """
+        kwargs = {
+            "device_id": device_id,
+            "status": status,
+            "authentication": AuthenticationMechanism(type="certificateAuthority"),
+        }
+        device = Device(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_device(device_id, device)
+
+    async def update_device_with_sas(self, device_id, etag, primary_key, secondary_key, status):
+        """Updates a device identity on IoTHub using SAS authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str etag: The etag (if_match) value to use for the update operation.
+        :param str primary_key: Primary authentication key.
+        :param str secondary_key: Secondary authentication key.
+        :param str status: Initital state of the created device.
+            (Possible values: "enabled" or "disabled").
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The updated Device object containing the created device.
+        """
+        symmetric_key = SymmetricKey(primary_key=primary_key, secondary_key=secondary_key)
+
+        kwargs = {
+            "device_id": device_id,
+            "status": status,
+            "etag": etag,
+            "authentication": AuthenticationMechanism(type="sas", symmetric_key=symmetric_key),
+        }
+        device = Device(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_device(
+                device_id, device, "*"
+            )
+
+    async def update_device_with_x509(
+        self, device_id, etag, primary_thumbprint, secondary_thumbprint, status
+    ):
+        """Updates a device identity on IoTHub using X509 authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str etag: The etag (if_match) value to use for the update operation.
+        :param str primary_thumbprint: Primary X509 thumbprint.
+        :param str secondary_thumbprint: Secondary X509 thumbprint.
+        :param str status: Initital state of the created device.
+            (Possible values: "enabled" or "disabled").
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The updated Device object containing the created device.
+        """
+        x509_thumbprint = X509Thumbprint(
+            primary_thumbprint=primary_thumbprint, secondary_thumbprint=secondary_thumbprint
+        )
+
+        kwargs = {
+            "device_id": device_id,
+            "status": status,
+            "etag": etag,
+            "authentication": AuthenticationMechanism(
+                type="selfSigned", x509_thumbprint=x509_thumbprint
+            ),
+        }
+        device = Device(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_device(device_id, device)
+
+    async def update_device_with_certificate_authority(self, device_id, etag, status):
+        """Updates a device identity on IoTHub using certificate authority.
+
+        :param str device_id: The name (Id) of the device.
+        :param str etag: The etag (if_match) value to use for the update operation.
+        :param str status: Initital state of the created device.
+            (Possible values: "enabled" or "disabled").
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The updated Device object containing the created device.
+        """
+        kwargs = {
+            "device_id": device_id,
+            "status": status,
+            "etag": etag,
+            "authentication": AuthenticationMechanism(type="certificateAuthority"),
+        }
+        device = Device(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_device(device_id, device)
+
+    async def get_device(self, device_id):
+        """Retrieves a device identity from IoTHub.
+
+        :param str device_id: The name (Id) of the device.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Device object containing the requested device.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.get_device(device_id)
+
+    async def delete_device(self, device_id, etag=None):
+        """Deletes a device identity from IoTHub.
+
+        :param str device_id: The name (Id) of the device.
+        :param str etag: The etag (if_match) value to use for the delete operation.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: None.
+        """
+        if etag is None:
+            etag = "*"
+
+        async with self._limiter:
+            await self.protocol.registry_manager.delete_device(device_id, etag)
+
+    async def create_module_with_sas(
+        self, device_id, module_id, managed_by, primary_key, secondary_key
+    ):
+        """Creates a module identity for a device on IoTHub using SAS authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str managed_by: The name of the manager device (edge).
+        :param str primary_key: Primary authentication key.
+        :param str secondary_key: Secondary authentication key.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: Module object containing the created module.
+        """
+        symmetric_key = SymmetricKey(primary_key=primary_key, secondary_key=secondary_key)
+
+        kwargs = {
+            "device_id": device_id,
+            "module_id": module_id,
+            "managed_by": managed_by,
+            "authentication": AuthenticationMechanism(type="sas", symmetric_key=symmetric_key),
+        }
+        module = Module(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_module(
+                device_id, module_id, module
+            )
+
+    async def create_module_with_x509(
+        self, device_id, module_id, managed_by, primary_thumbprint, secondary_thumbprint
+    ):
+        """Creates a module identity for a device on IoTHub using X509 authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str managed_by: The name of the manager device (edge).
+        :param str primary_thumbprint: Primary X509 thumbprint.
+        :param str secondary_thumbprint: Secondary X509 thumbprint.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: Module object containing the created module.
+        """
+        x509_thumbprint = X509Thumbprint(
+            primary_thumbprint=primary_thumbprint, secondary_thumbprint=secondary_thumbprint
+        )
+
+        kwargs = {
+            "device_id": device_id,
+            "module_id": module_id,
+            "managed_by": managed_by,
+            "authentication": AuthenticationMechanism(
+                type="selfSigned", x509_thumbprint=x509_thumbprint
+            ),
+        }
+        module = Module(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_module(
+                device_id, module_id, module
+            )
+
+    async def create_module_with_certificate_authority(self, device_id, module_id, managed_by):
+        """Creates a module identity for a device on IoTHub using certificate authority.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str managed_by: The name of the manager device (edge).
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: Module object containing the created module.
+        """
+        kwargs = {
+            "device_id": device_id,
+            "module_id": module_id,
+            "managed_by": managed_by,
+            "authentication": AuthenticationMechanism(type="certificateAuthority"),
+        }
+        module = Module(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_module(
+                device_id, module_id, module
+            )
+
+    async def update_module_with_sas(
+        self, device_id, module_id, managed_by, etag, primary_key, secondary_key
+    ):
+        """Updates a module identity for a device on IoTHub using SAS authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str managed_by: The name of the manager device (edge).
+        :param str etag: The etag (if_match) value to use for the update operation.
+        :param str primary_key: Primary authentication key.
+        :param str secondary_key: Secondary authentication key.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The updated Module object containing the created module.
+        """
+        symmetric_key = SymmetricKey(primary_key=primary_key, secondary_key=secondary_key)
+
+        kwargs = {
+            "device_id": device_id,
+            "module_id": module_id,
+            "managed_by": managed_by,
+            "etag": etag,
+            "authentication": AuthenticationMechanism(type="sas", symmetric_key=symmetric_key),
+        }
+        module = Module(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_module(
+                device_id, module_id, module, "*"
+            )
+
+    async def update_module_with_x509(
+        self, device_id, module_id, managed_by, etag, primary_thumbprint, secondary_thumbprint
+    ):
+        """Updates a module identity for a device on IoTHub using X509 authentication.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str managed_by: The name of the manager device (edge).
+        :param str etag: The etag (if_match) value to use for the update operation.
+        :param str primary_thumbprint: Primary X509 thumbprint.
+        :param str secondary_thumbprint: Secondary X509 thumbprint.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The updated Module object containing the created module.
+        """
+        x509_thumbprint = X509Thumbprint(
+            primary_thumbprint=primary_thumbprint, secondary_thumbprint=secondary_thumbprint
+        )
+
+        kwargs = {
+            "device_id": device_id,
+            "module_id": module_id,
+            "managed_by": managed_by,
+            "etag": etag,
+            "authentication": AuthenticationMechanism(
+                type="selfSigned", x509_thumbprint=x509_thumbprint
+            ),
+        }
+        module = Module(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_module(
+                device_id, module_id, module
+            )
+
+    async def update_module_with_certificate_authority(
+        self, device_id, module_id, managed_by, etag
+    ):
+        """Updates a module identity for a device on IoTHub using certificate authority.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str managed_by: The name of the manager device (edge).
+        :param str etag: The etag (if_match) value to use for the update operation.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The updated Module object containing the created module.
+        """
+        kwargs = {
+            "device_id": device_id,
+            "module_id": module_id,
+            "managed_by": managed_by,
+            "etag": etag,
+            "authentication": AuthenticationMechanism(type="certificateAuthority"),
+        }
+        module = Module(**kwargs)
+
+        async with self._limiter:
+            return await self.protocol.registry_manager.create_or_update_module(
+                device_id, module_id, module
+            )
+
+    async def get_module(self, device_id, module_id):
+        """Retrieves a module identity for a device from IoTHub.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Module object containing the requested module.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.get_module(device_id, module_id)
+
+    async def get_modules(self, device_id):
+        """Retrieves all module identities on a device.
+
+        :param str device_id: The name (Id) of the device.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The list[Module] containing all the modules on the device.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.get_modules_on_device(device_id)
+
+    async def delete_module(self, device_id, module_id, etag=None):
+        """Deletes a module identity for a device from IoTHub.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param str etag: The etag (if_match) value to use for the delete operation.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: None.
+        """
+        if etag is None:
+            etag = "*"
+
+        async with self._limiter:
+            await self.protocol.registry_manager.delete_module(device_id, module_id, etag)
+
+    async def get_service_statistics(self):
+        """Retrieves the IoTHub service statistics.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The ServiceStatistics object.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.get_service_statistics()
+
+    async def get_device_registry_statistics(self):
+        """Retrieves the IoTHub device registry statistics.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The RegistryStatistics object.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.get_device_statistics()
+
+    async def get_devices(self, max_number_of_devices=None):
+        """Get the identities of multiple devices from the IoTHub identity
+           registry. Not recommended. Use the IoTHub query language to retrieve
+           device twin and device identity information. See
+           https://docs.microsoft.com/en-us/rest/api/iothub/service/queryiothub
+           and
+           https://docs.microsoft.com/en-us/azure/iot-hub/iot-hub-devguide-query-language
+           for more information.
+
+        :param int max_number_of_devices: This parameter when specified, defines the maximum number
+           of device identities that are returned. Any value outside the range of
+           1-1000 is considered to be 1000
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: List of device info.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.get_devices(max_number_of_devices)
+
+    async def bulk_create_or_update_devices(self, devices):
+        """Create, update, or delete the identities of multiple devices from the
+           IoTHub identity registry.
+
+           Create, update, or delete the identities of multiple devices from the
+           IoTHub identity registry. A device identity can be specified only once
+           in the list. Different operations (create, update, delete) on different
+           devices are allowed. A maximum of 100 devices can be specified per
+           invocation. For large scale operations, consider using the import
+           feature using blob
+           storage(https://docs.microsoft.com/azure/iot-hub/iot-hub-devguide-identity-registry#import-and-export-device-identities).
+
+        :param list[ExportImportDevice] devices: The list of device objects to operate on.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The BulkRegistryOperationResult object.
+        """
+        async with self._limiter:
+            return await self.protocol.registry_manager.bulk_device_crud(devices)
+
+    async def query_iot_hub(
+        self, query_specification, continuation_token=None, max_item_count=None
+    ):
+        """Query an IoTHub to retrieve information regarding device twins using a
+           SQL-like language.
+           See https://docs.microsoft.com/azure/iot-hub/iot-hub-devguide-query-language
+           for more information. Pagination of results is supported. This returns
+           information about device twins only.
+
+        :param QuerySpecification query: The query specification.
+        :param str continuation_token: Continuation token for paging
+        :param str max_item_count: Maximum number of requested device twins
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The QueryResult object.
+        """
+        async with self._limiter:
+            raw_response = await self.protocol.registry_manager.query_iot_hub(
+                query_specification, continuation_token, max_item_count, None, True
+            )
+
+        queryResult = QueryResult()
+        if raw_response.headers:
+            queryResult.type = raw_response.headers["x-ms-item-type"]
+            queryResult.continuation_token = raw_response.headers["x-ms-continuation"]
+        queryResult.items = raw_response.output
+
+        return queryResult
+
+    async def get_twin(self, device_id):
+        """Gets a device twin.
+
+        :param str device_id: The name (Id) of the device.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Twin object.
+        """
+        async with self._limiter:
+            return await self.protocol.twin.get_device_twin(device_id)
+
+    async def replace_twin(self, device_id, device_twin):
+        """Replaces tags and desired properties of a device twin.
+
+        :param str device_id: The name (Id) of the device.
+        :param Twin device_twin: The twin info of the device.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Twin object.
+        """
+        async with self._limiter:
+            return await self.protocol.twin.replace_device_twin(device_id, device_twin)
+
+    async def update_twin(self, device_id, device_twin, etag):
+        """Updates tags and desired properties of a device twin.
+
+        :param str device_id: The name (Id) of the device.
+        :param Twin device_twin: The twin info of the device.
+        :param str etag: The etag (if_match) value to use for the update operation.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Twin object.
+        """
+        async with self._limiter:
+            return await self.protocol.twin.update_device_twin(device_id, device_twin, etag)
+
+    async def get_module_twin(self, device_id, module_id):
+        """Gets a module twin.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Twin object.
+        """
+        async with self._limiter:
+            return await self.protocol.twin.get_module_twin(device_id, module_id)
+
+    async def replace_module_twin(self, device_id, module_id, module_twin):
+        """Replaces tags and desired properties of a module twin.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param Twin module_twin: The twin info of the module.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Twin object.
+        """
+        async with self._limiter:
+            return await self.protocol.twin.replace_module_twin(device_id, module_id, module_twin)
+
+    async def update_module_twin(self, device_id, module_id, module_twin, etag):
+        """Updates tags and desired properties of a module twin.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param Twin module_twin: The twin info of the module.
+        :param str etag: The etag (if_match) value to use for the update operation.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The Twin object.
+        """
+        async with self._limiter:
+            return await self.protocol.twin.update_module_twin(
+                device_id, module_id, module_twin, etag
+            )
+
+    async def invoke_device_method(self, device_id, direct_method_request):
+        """Invoke a direct method on a device.
+
+        :param str device_id: The name (Id) of the device.
+        :param CloudToDeviceMethod direct_method_request: The method request.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The CloudToDeviceMethodResult object.
+        """
+        async with self._limiter:
+            return await self.protocol.device_method.invoke_device_method(
+                device_id, direct_method_request
+            )
+
+    async def invoke_device_module_method(self, device_id, module_id, direct_method_request):
+        """Invoke a direct method on a device.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module.
+        :param CloudToDeviceMethod direct_method_request: The method request.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The CloudToDeviceMethodResult object.
+        """
+        async with self._limiter:
+            return await self.protocol.device_method.invoke_module_method(
+                device_id, module_id, direct_method_request
+            )
@@ -7,6 +7,8 @@
 """Provides authentication classes for use with the msrest library
 """
 
+import threading
+import time
 from msrest.authentication import Authentication
 from .connection_string import ConnectionString
 from .connection_string import HOST_NAME, SHARED_ACCESS_KEY_NAME, SHARED_ACCESS_KEY
@@ -14,17 +16,42 @@ from .sastoken import SasToken
 
 __all__ = ["ConnectionStringAuthentication"]
 
+# Default lifespan of the SasToken applied to outgoing requests, in seconds
+DEFAULT_TOKEN_TTL = 3600
+# Number of seconds before expiry at which a cached SasToken will be replaced
+DEFAULT_TOKEN_REFRESH_MARGIN = 300
+
 
 class ConnectionStringAuthentication(ConnectionString, Authentication):
     """ConnectionString class that can be used with msrest to provide SasToken authentication
 
+    The SasToken is generated once and reused for every request until it comes within
+    token_refresh_margin seconds of expiry, at which point it is regenerated.
+
     :param connection_string: The connection string to generate SasToken with
+    :param int token_ttl: Time to live for generated SasTokens, in seconds
+    :param int token_refresh_margin: Number of seconds before expiry at which a cached
+        SasToken is refreshed
     """
 
-    def __init__(self, connection_string):
+    def __init__(
+        self,
+        connection_string,
+        token_ttl=DEFAULT_TOKEN_TTL,
+        token_refresh_margin=DEFAULT_TOKEN_REFRESH_MARGIN,
+    ):
         super(ConnectionStringAuthentication, self).__init__(
             connection_string
         )  # ConnectionString __init__
+        if token_refresh_margin >= token_ttl:
+            raise ValueError("token_refresh_margin must be less than token_ttl")
+        self.token_ttl = token_ttl
+        self.token_refresh_margin = token_refresh_margin
+        self._sastoken = None
+        # (token string, time after which it must be refreshed), replaced as a single unit
+        # so that readers never need to take the lock
+        self._cached_token = None
+        self._token_lock = threading.Lock()
 
     @classmethod
     def create_with_parsed_values(cls, host_name, shared_access_key_name, shared_access_key):
@@ -56,7 +83,36 @@ class ConnectionStringAuthentication(ConnectionString, Authentication):
         session = super(ConnectionStringAuthentication, self).signed_session(session)
 
         # Authorization header
-        sastoken = SasToken(self[HOST_NAME], self[SHARED_ACCESS_KEY], self[SHARED_ACCESS_KEY_NAME])
-        session.headers[self.header] = str(sastoken)
+        session.headers[self.header] = self.get_current_sastoken()
 
         return session
+
+    def get_current_sastoken(self):
+        """Return the string representation of a valid SasToken, generating a new one
+        only if there is no cached token or the cached one is about to expire.
+
+        :rtype: str
+        """
+        cached_token = self._cached_token
+        if cached_token is not None and time.time() < cached_token[1]:
+            return cached_token[0]
+
+        with self._token_lock:
+            # Another thread may have refreshed the token while this one waited on the lock
+            cached_token = self._cached_token
+            if cached_token is None or time.time() >= cached_token[1]:
+                if self._sastoken is None:
+                    self._sastoken = SasToken(
+                        self[HOST_NAME],
+                        self[SHARED_ACCESS_KEY],
+                        self[SHARED_ACCESS_KEY_NAME],
+                        ttl=self.token_ttl,
+                    )
+                else:
+                    self._sastoken.refresh()
+                cached_token = (
+                    str(self._sastoken),
+                    self._sastoken.expiry_time - self.token_refresh_margin,
+                )
+                self._cached_token = cached_token
+            return cached_token[0]
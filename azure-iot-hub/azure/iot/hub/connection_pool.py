@@ -0,0 +1,106 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains an HTTP connection pool that can be shared by the service managers."""
+
+from requests.adapters import HTTPAdapter
+from msrest.pipeline import Pipeline
+from msrest.pipeline.requests import (
+    PipelineRequestsHTTPSender,
+    RequestsCredentialsPolicy,
+    RequestsPatchSession,
+)
+from msrest.universal_http.requests import RequestsHTTPSender, ClientRetryPolicy
+
+__all__ = ["ConnectionPool"]
+
+DEFAULT_POOL_SIZE = 32
+# Number of distinct hosts (i.e. IoTHubs) to keep connection pools for
+DEFAULT_POOL_HOSTS = 10
+
+
+class ConnectionPool(object):
+    """A pool of HTTP connections that can be shared by any number of service managers,
+    including managers for different IoTHubs.
+
+    By default each manager closes its connection after every request, so that each request
+    pays for a new connection and TLS handshake. Managers given a ConnectionPool keep their
+    connections open and share them across all threads and managers, up to pool_size per
+    IoTHub.
+
+    :param int pool_size: Maximum number of connections kept open to each IoTHub.
+    :param bool keep_alive: Whether to keep connections open between requests. If False,
+        every request uses a new connection.
+    :param max_retries: The retry configuration applied to connection errors and retryable
+        HTTP status codes, as an int or a urllib3 Retry object. Defaults to the msrest
+        default policy.
+    :param bool pool_block: Whether a request should wait for a free connection when all
+        pool_size connections are in use, rather than opening a connection that is discarded
+        afterwards.
+    """
+
+    def __init__(
+        self, pool_size=DEFAULT_POOL_SIZE, keep_alive=True, max_retries=None, pool_block=False
+    ):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        if max_retries is None:
+            max_retries = ClientRetryPolicy()()
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.adapter = HTTPAdapter(
+            pool_connections=DEFAULT_POOL_HOSTS,
+            pool_maxsize=pool_size,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+
+    def attach(self, protocol):
+        """Make a protocol client send its requests over this pool.
+
+        :param protocol: The protocol client.
+        :type protocol: :class:`azure.iot.hub.protocol.IotHubGatewayServiceAPIs`
+        """
+        config = protocol.config
+        # Otherwise msrest closes the session, and with it the shared adapter's connections,
+        # after every request. Connection reuse is controlled by the pool's keep_alive instead.
+        config.keep_alive = True
+        # Same policies as the msrest default pipeline, with a different sender
+        policies = [
+            config.user_agent_policy,
+            RequestsPatchSession(),
+            RequestsCredentialsPolicy(config.credentials),
+            config.http_logger_policy,
+        ]
+        config.pipeline = Pipeline(
+            policies, PipelineRequestsHTTPSender(_PooledRequestsHTTPSender(config, self))
+        )
+        return protocol
+
+    def close(self):
+        """Close every connection in the pool"""
+        self.adapter.close()
+
+
+class _PooledRequestsHTTPSender(RequestsHTTPSender):
+    """An msrest HTTP driver whose (thread-local) sessions all use the adapter, and so the
+    connections, of a ConnectionPool.
+
+    Sessions are still per thread and per client, since the credentials policy sets the
+    Authorization header on the session itself.
+    """
+
+    def __init__(self, config, connection_pool):
+        self._connection_pool = connection_pool
+        super(_PooledRequestsHTTPSender, self).__init__(config)
+
+    def _init_session(self, session):
+        super(_PooledRequestsHTTPSender, self)._init_session(session)
+        # Mounted after the base class has configured the session's own adapters, so that
+        # the pool's retry configuration is left in place
+        for protocol in self._protocols:
+            session.mount(protocol, self._connection_pool.adapter)
+        if not self._connection_pool.keep_alive:
+            session.headers["Connection"] = "close"
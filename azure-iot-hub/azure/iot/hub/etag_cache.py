@@ -0,0 +1,141 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains a cache for revalidating IoTHub reads with conditional requests."""
+
+import collections
+import copy
+import threading
+import time
+from msrest.exceptions import HttpOperationError
+
+__all__ = ["ETagCache"]
+
+DEFAULT_MAX_SIZE = 1024
+DEFAULT_TTL = 300.0
+
+NOT_MODIFIED_STATUS_CODE = 304
+
+
+def _quote(etag):
+    """Return an etag as an HTTP entity tag, which must be quoted"""
+    if etag.startswith('"') or etag.startswith("W/"):
+        return etag
+    return '"{}"'.format(etag)
+
+
+class ETagCache(object):
+    """A bounded, least recently used cache of device identities, module identities and
+    twins, keyed by device and module id.
+
+    A cached read is sent with If-None-Match set to the cached etag; if the IoTHub responds
+    304 (Not Modified) a copy of the cached object is returned without transferring it again,
+    so changes a caller makes to the object it was given are not seen by later reads. Entries
+    older than ttl are discarded rather than revalidated. Writes made through a manager using
+    the cache invalidate the entries for the devices and modules they change.
+
+    A cache may be shared by several managers for the same IoTHub.
+
+    :param int max_size: Maximum number of cached objects.
+    :param float ttl: Maximum age of a cached object, in seconds.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE, ttl=DEFAULT_TTL):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        # device id -> keys of every cached entry for the device and its modules
+        self._device_keys = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def fetch(self, kind, device_id, module_id, get):
+        """Return an object from the IoTHub, revalidating a cached copy if there is one.
+
+        :param str kind: The kind of object, e.g. 'device' or 'twin'.
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module, or None.
+        :param get: A callable taking a dict of custom headers (or None) and returning the
+            object from the IoTHub.
+        """
+        key = (device_id, module_id, kind)
+        cached = self._get(key)
+        if cached is None:
+            self._count_miss()
+            value = get(None)
+        else:
+            try:
+                value = get({"If-None-Match": _quote(cached.etag)})
+            except HttpOperationError as e:
+                if e.response is None or e.response.status_code != NOT_MODIFIED_STATUS_CODE:
+                    raise
+                with self._lock:
+                    self.hits += 1
+                return copy.deepcopy(cached)
+            self._count_miss()
+        if getattr(value, "etag", None):
+            # The caller is given value, so the cache keeps its own copy
+            self._put(key, copy.deepcopy(value))
+        return value
+
+    def invalidate(self, device_id, module_id=None):
+        """Discard the cached objects for a module, or for a device and all of its modules.
+
+        :param str device_id: The name (Id) of the device.
+        :param str module_id: The name (Id) of the module, or None for the whole device.
+        """
+        with self._lock:
+            keys = self._device_keys.get(device_id)
+            if not keys:
+                return
+            for key in list(keys):
+                if module_id is None or key[1] == module_id:
+                    self._remove(key)
+
+    def clear(self):
+        """Discard every cached object"""
+        with self._lock:
+            self._entries.clear()
+            self._device_keys.clear()
+
+    def _count_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.time() - stored_at > self.ttl:
+                self._remove(key)
+                return None
+            # Re-inserting marks the entry as most recently used
+            self._entries[key] = entry
+            return value
+
+    def _put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (time.time(), value)
+            self._device_keys.setdefault(key[0], set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key):
+        """Remove an entry. The lock must be held."""
+        self._entries.pop(key, None)
+        keys = self._device_keys.get(key[0])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._device_keys[key[0]]
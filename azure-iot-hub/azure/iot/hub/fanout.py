@@ -0,0 +1,457 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains tools for running large numbers of IoTHub service operations
+concurrently, with bounded parallelism and retry of throttled (429) requests.
+"""
+
+import itertools
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from requests.exceptions import Timeout
+from msrest.exceptions import HttpOperationError, ClientRequestError
+
+__all__ = [
+    "ThrottlingRetryPolicy",
+    "Deadline",
+    "DeadlineExceededError",
+    "is_throttled",
+    "is_precondition_failed",
+    "chunked",
+    "run_bounded",
+    "MethodOutcome",
+    "MethodFanout",
+    "TwinUpdateOutcome",
+    "TwinUpdateFanout",
+]
+
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_INITIAL_BACKOFF = 1.0
+DEFAULT_MAX_BACKOFF = 60.0
+
+THROTTLED_STATUS_CODE = 429
+
+# Direct methods mostly wait on devices rather than the IoTHub, so more can be in flight
+DEFAULT_METHOD_MAX_WORKERS = 32
+# Defaults applied by the IoTHub when a CloudToDeviceMethod does not specify its timeouts
+DEFAULT_METHOD_RESPONSE_TIMEOUT = 30
+DEFAULT_METHOD_CONNECT_TIMEOUT = 0
+# Allowance for the round trip to the IoTHub on top of the method's own timeouts
+METHOD_DEADLINE_MARGIN = 10
+
+# IoTHub error codes reported for direct methods that could not reach the device
+DEVICE_NOT_ONLINE_ERROR_CODE = "404103"
+GATEWAY_TIMEOUT_STATUS_CODE = 504
+
+# Number of times a twin update rejected because the twin changed (412) is re-read and retried
+DEFAULT_MAX_CONFLICT_RETRIES = 3
+PRECONDITION_FAILED_STATUS_CODE = 412
+
+if hasattr(time, "monotonic"):
+    _monotonic = time.monotonic
+else:
+    # Python 2.7
+    _monotonic = time.time
+
+
+def is_throttled(error):
+    """Return True if the given error is the IoTHub rejecting a request due to throttling"""
+    response = getattr(error, "response", None)
+    return (
+        isinstance(error, HttpOperationError)
+        and response is not None
+        and response.status_code == THROTTLED_STATUS_CODE
+    )
+
+
+def is_precondition_failed(error):
+    """Return True if the given error is the IoTHub rejecting a request because the If-Match
+    etag no longer matches
+    """
+    response = getattr(error, "response", None)
+    return (
+        isinstance(error, HttpOperationError)
+        and response is not None
+        and response.status_code == PRECONDITION_FAILED_STATUS_CODE
+    )
+
+
+def _get_retry_after(error):
+    """Return the number of seconds the service asked the client to wait, if any"""
+    headers = getattr(error.response, "headers", None) or {}
+    retry_after = headers.get("Retry-After")
+    try:
+        return float(retry_after)
+    except (TypeError, ValueError):
+        return None
+
+
+class ThrottlingRetryPolicy(object):
+    """Retries operations rejected by the IoTHub with 429 (Too Many Requests), using
+    exponential backoff with jitter, or the service's Retry-After header when provided.
+
+    Any other error is raised immediately.
+
+    :param int max_retries: Maximum number of times to retry a throttled operation.
+    :param float initial_backoff: Backoff before the first retry, in seconds.
+    :param float max_backoff: Upper bound on any single backoff, in seconds.
+    """
+
+    def __init__(
+        self,
+        max_retries=DEFAULT_MAX_RETRIES,
+        initial_backoff=DEFAULT_INITIAL_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+    ):
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+    def get_backoff(self, attempt, error):
+        """Return the number of seconds to wait before retry number attempt (zero-based)
+
+        :param int attempt: The number of retries already made.
+        :param error: The throttling error that caused the retry.
+        """
+        retry_after = _get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        backoff = min(self.initial_backoff * (2 ** attempt), self.max_backoff)
+        # Jitter keeps many throttled workers from retrying in lockstep
+        return backoff * random.uniform(0.5, 1.0)
+
+    def call(self, fn, *args, **kwargs):
+        """Call fn with the given arguments, retrying if it is throttled.
+
+        :returns: The return value of fn.
+        :raises: The last error raised by fn, if it was not throttling or retries ran out.
+        """
+        attempt = 0
+        while True:
+            try:
+                return fn(*args, **kwargs)
+            except HttpOperationError as e:
+                if not is_throttled(e) or attempt >= self.max_retries:
+                    raise
+                time.sleep(self.get_backoff(attempt, e))
+                attempt += 1
+
+
+class DeadlineExceededError(Exception):
+    """Raised when an operation, including its retries, did not complete by its deadline"""
+
+    pass
+
+
+class Deadline(object):
+    """The time by which an operation, including any retries of it, must complete.
+
+    :param float seconds: The number of seconds from now the operation must complete in.
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self._expires_at = _monotonic() + seconds
+
+    def remaining(self):
+        """Return the number of seconds left before the deadline.
+
+        :raises: DeadlineExceededError if the deadline has passed.
+        """
+        remaining = self._expires_at - _monotonic()
+        if remaining <= 0:
+            raise DeadlineExceededError(
+                "Operation did not complete within {} seconds".format(self.seconds)
+            )
+        return remaining
+
+
+def chunked(iterable, size):
+    """Lazily split an iterable into lists of at most size items"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def run_bounded(fn, items, max_workers=DEFAULT_MAX_WORKERS):
+    """Call fn on every item on a pool of worker threads, yielding (item, future) pairs in
+    order of completion.
+
+    Items are pulled from the iterable only as workers become free, so no more than
+    max_workers items are in flight (or held in memory) at once regardless of the size of
+    the iterable. Closing the generator early cancels work that has not yet started.
+
+    :param fn: A callable taking a single item.
+    :param items: An iterable of items.
+    :param int max_workers: Maximum number of concurrent calls to fn.
+    """
+    items = iter(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        try:
+            for item in itertools.islice(items, max_workers):
+                pending[executor.submit(fn, item)] = item
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                # Keep the workers busy while the caller handles the completed items
+                for item in itertools.islice(items, len(done)):
+                    pending[executor.submit(fn, item)] = item
+                for future in done:
+                    yield pending.pop(future), future
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+class MethodOutcome(object):
+    """The outcome of invoking a direct method on a single device or module.
+
+    :ivar str device_id: The name (Id) of the device.
+    :ivar str module_id: The name (Id) of the module, or None for a device method.
+    :ivar str status: One of MethodOutcome.SUCCEEDED, TIMED_OUT, OFFLINE or FAILED.
+    :ivar result: The CloudToDeviceMethodResult, if the device responded.
+    :ivar error: The exception raised by the invocation, if it did not.
+    """
+
+    SUCCEEDED = "succeeded"
+    TIMED_OUT = "timed_out"
+    OFFLINE = "offline"
+    FAILED = "failed"
+
+    def __init__(self, device_id, module_id=None, status=SUCCEEDED, result=None, error=None):
+        self.device_id = device_id
+        self.module_id = module_id
+        self.status = status
+        self.result = result
+        self.error = error
+
+    @classmethod
+    def from_error(cls, device_id, module_id, error):
+        """Create a MethodOutcome classifying the error raised by an invocation"""
+        response = getattr(error, "response", None)
+        if isinstance(error, DeadlineExceededError):
+            status = cls.TIMED_OUT
+        elif isinstance(error, ClientRequestError) and isinstance(
+            getattr(error, "inner_exception", None), Timeout
+        ):
+            status = cls.TIMED_OUT
+        elif isinstance(error, HttpOperationError) and response is not None:
+            if response.status_code == GATEWAY_TIMEOUT_STATUS_CODE:
+                status = cls.TIMED_OUT
+            elif DEVICE_NOT_ONLINE_ERROR_CODE in (getattr(response, "text", None) or ""):
+                status = cls.OFFLINE
+            else:
+                status = cls.FAILED
+        else:
+            status = cls.FAILED
+        return cls(device_id, module_id, status=status, error=error)
+
+    def __repr__(self):
+        return "MethodOutcome(device_id={!r}, module_id={!r}, status={!r})".format(
+            self.device_id, self.module_id, self.status
+        )
+
+
+class MethodFanout(object):
+    """Invokes a direct method on many devices concurrently.
+
+    Iterating yields a MethodOutcome for each target as its invocation completes. The counts
+    of each kind of outcome are updated as results are yielded, and wait() drains any
+    remaining results.
+
+    :param invoke: A callable taking (device_id, module_id) and returning the
+        CloudToDeviceMethodResult.
+    :param targets: An iterable of device ids or (device_id, module_id) tuples.
+    :param int max_workers: Maximum number of concurrent invocations.
+    """
+
+    def __init__(self, invoke, targets, max_workers=DEFAULT_METHOD_MAX_WORKERS):
+        self.succeeded = 0
+        self.timed_out = 0
+        self.offline = 0
+        self.failed = 0
+        self._outcomes = run_bounded(self._invoke, targets, max_workers)
+        self._invoke_fn = invoke
+
+    @property
+    def total(self):
+        """The number of outcomes yielded so far"""
+        return self.succeeded + self.timed_out + self.offline + self.failed
+
+    def _invoke(self, target):
+        device_id, module_id = _split_target(target)
+        try:
+            result = self._invoke_fn(device_id, module_id)
+        except Exception as e:
+            return MethodOutcome.from_error(device_id, module_id, e)
+        return MethodOutcome(device_id, module_id, result=result)
+
+    def __iter__(self):
+        for _, future in self._outcomes:
+            outcome = future.result()
+            setattr(self, outcome.status, getattr(self, outcome.status) + 1)
+            yield outcome
+
+    def wait(self):
+        """Wait for every remaining invocation to complete, discarding their outcomes.
+
+        :returns: This MethodFanout, with its counts complete.
+        """
+        for _ in self:
+            pass
+        return self
+
+    def close(self):
+        """Stop invoking the method on targets that have not yet been started"""
+        self._outcomes.close()
+
+
+def _split_target(target):
+    """Return the (device_id, module_id) addressed by a device id or (device_id, module_id)"""
+    if isinstance(target, tuple):
+        return target
+    return target, None
+
+
+class TwinUpdateOutcome(object):
+    """The outcome of a read-modify-write update of a single device or module twin.
+
+    :ivar str device_id: The name (Id) of the device.
+    :ivar str module_id: The name (Id) of the module, or None for a device twin.
+    :ivar str status: One of TwinUpdateOutcome.UPDATED, SKIPPED, CONFLICT or FAILED.
+    :ivar twin: The updated Twin returned by the IoTHub, if the update was written.
+    :ivar error: The exception that stopped the update, if it did not succeed.
+    :ivar int attempts: The number of times the mutation was applied.
+    """
+
+    UPDATED = "updated"
+    SKIPPED = "skipped"
+    CONFLICT = "conflict"
+    FAILED = "failed"
+
+    def __init__(
+        self, device_id, module_id=None, status=UPDATED, twin=None, error=None, attempts=0
+    ):
+        self.device_id = device_id
+        self.module_id = module_id
+        self.status = status
+        self.twin = twin
+        self.error = error
+        self.attempts = attempts
+
+    def __repr__(self):
+        return "TwinUpdateOutcome(device_id={!r}, module_id={!r}, status={!r})".format(
+            self.device_id, self.module_id, self.status
+        )
+
+
+class TwinUpdateFanout(object):
+    """Applies a mutation to many twins concurrently, with optimistic concurrency.
+
+    Each twin is read, passed to the mutation, and the result written back conditionally on
+    the etag that was read. If the twin changed in the meantime (412 Precondition Failed) it is
+    re-read and the mutation reapplied, up to max_conflict_retries times.
+
+    Iterating yields a TwinUpdateOutcome for each target as its update completes. The counts
+    of each kind of outcome are updated as results are yielded, and wait() drains any
+    remaining results.
+
+    :param get_twin: A callable taking (device_id, module_id) and returning the Twin.
+    :param update_twin: A callable taking (device_id, module_id, patch, etag) and returning
+        the updated Twin.
+    :param mutate: A callable taking a Twin and returning the patch to write, or None to leave
+        the twin unchanged. It may be called more than once for the same device.
+    :param targets: An iterable of device ids, (device_id, module_id) tuples, or Twin objects.
+        Twins that are already in hand (e.g. from a query) are not read again unless their
+        update conflicts.
+    :param int max_workers: Maximum number of twins being updated at once.
+    :param int max_conflict_retries: Maximum number of times to retry a conflicting update.
+    """
+
+    def __init__(
+        self,
+        get_twin,
+        update_twin,
+        mutate,
+        targets,
+        max_workers=DEFAULT_MAX_WORKERS,
+        max_conflict_retries=DEFAULT_MAX_CONFLICT_RETRIES,
+    ):
+        self.updated = 0
+        self.skipped = 0
+        self.conflict = 0
+        self.failed = 0
+        self._get_twin = get_twin
+        self._update_twin = update_twin
+        self._mutate = mutate
+        self._max_conflict_retries = max_conflict_retries
+        self._outcomes = run_bounded(self._update, targets, max_workers)
+
+    @property
+    def total(self):
+        """The number of outcomes yielded so far"""
+        return self.updated + self.skipped + self.conflict + self.failed
+
+    def _update(self, target):
+        if hasattr(target, "device_id"):
+            device_id, module_id, twin = target.device_id, target.module_id, target
+        else:
+            (device_id, module_id), twin = _split_target(target), None
+
+        attempts = 0
+        try:
+            if twin is None:
+                twin = self._get_twin(device_id, module_id)
+            while True:
+                attempts += 1
+                patch = self._mutate(twin)
+                if patch is None:
+                    return TwinUpdateOutcome(
+                        device_id, module_id, TwinUpdateOutcome.SKIPPED, attempts=attempts
+                    )
+                try:
+                    updated = self._update_twin(device_id, module_id, patch, twin.etag)
+                except HttpOperationError as e:
+                    if not is_precondition_failed(e):
+                        raise
+                    if attempts > self._max_conflict_retries:
+                        return TwinUpdateOutcome(
+                            device_id,
+                            module_id,
+                            TwinUpdateOutcome.CONFLICT,
+                            error=e,
+                            attempts=attempts,
+                        )
+                    twin = self._get_twin(device_id, module_id)
+                    continue
+                return TwinUpdateOutcome(device_id, module_id, twin=updated, attempts=attempts)
+        except Exception as e:
+            return TwinUpdateOutcome(
+                device_id, module_id, TwinUpdateOutcome.FAILED, error=e, attempts=attempts
+            )
+
+    def __iter__(self):
+        for _, future in self._outcomes:
+            outcome = future.result()
+            setattr(self, outcome.status, getattr(self, outcome.status) + 1)
+            yield outcome
+
+    def wait(self):
+        """Wait for every remaining update to complete, discarding their outcomes.
+
+        :returns: This TwinUpdateFanout, with its counts complete.
+        """
+        for _ in self:
+            pass
+        return self
+
+    def close(self):
+        """Stop updating twins that have not yet been started"""
+        self._outcomes.close()
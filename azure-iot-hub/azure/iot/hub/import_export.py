@@ -0,0 +1,194 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains tools for working with the files used by IoTHub identity registry
+import and export jobs.
+
+Both formats hold one JSON-serialized device identity per line. Everything here works a line
+at a time, so registries of any size can be written or read without holding them in memory.
+See https://docs.microsoft.com/azure/iot-hub/iot-hub-bulk-identity-mgmt for more information.
+"""
+
+import json
+import time
+import six
+
+__all__ = [
+    "ExportedDevice",
+    "iter_import_lines",
+    "write_import_file",
+    "iter_exported_devices",
+    "wait_for_job",
+]
+
+TERMINAL_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+DEFAULT_MIN_POLL_INTERVAL = 2.0
+DEFAULT_MAX_POLL_INTERVAL = 60.0
+
+
+class ExportedDevice(object):
+    """A lightweight, read-only record of a device identity from an export job.
+
+    Nested values (authentication, tags, properties, capabilities) are left as the plain
+    dictionaries they were parsed from.
+    """
+
+    __slots__ = (
+        "id",
+        "module_id",
+        "e_tag",
+        "status",
+        "status_reason",
+        "authentication",
+        "twin_etag",
+        "tags",
+        "properties",
+        "capabilities",
+    )
+
+    _keys = (
+        ("id", "id"),
+        ("module_id", "moduleId"),
+        ("e_tag", "eTag"),
+        ("status", "status"),
+        ("status_reason", "statusReason"),
+        ("authentication", "authentication"),
+        ("twin_etag", "twinETag"),
+        ("tags", "tags"),
+        ("properties", "properties"),
+        ("capabilities", "capabilities"),
+    )
+
+    def __init__(self, **kwargs):
+        for attr, _ in self._keys:
+            setattr(self, attr, kwargs.get(attr))
+
+    @classmethod
+    def from_dict(cls, d):
+        """Create an ExportedDevice from a dictionary in the export file format"""
+        return cls(**dict((attr, d.get(key)) for attr, key in cls._keys))
+
+    def __repr__(self):
+        return "ExportedDevice(id={!r}, module_id={!r}, status={!r})".format(
+            self.id, self.module_id, self.status
+        )
+
+
+def iter_import_lines(devices):
+    """Lazily encode device identities as lines of an import file.
+
+    :param devices: The device identities to import.
+    :type devices: iterable[ExportImportDevice]
+
+    :returns: A generator of UTF-8 encoded lines, each terminated by a newline.
+    """
+    for device in devices:
+        yield (json.dumps(device.serialize()) + "\n").encode("utf-8")
+
+
+def write_import_file(devices, output):
+    """Stream device identities into an import file.
+
+    :param devices: The device identities to import.
+    :type devices: iterable[ExportImportDevice]
+    :param output: A writable binary stream (e.g. a blob upload stream), or the path of a
+        file to create.
+    :type output: str or file-like object
+
+    :returns: The number of device identities written.
+    """
+    if isinstance(output, six.string_types):
+        with open(output, "wb") as f:
+            return write_import_file(devices, f)
+
+    count = 0
+    for line in iter_import_lines(devices):
+        output.write(line)
+        count += 1
+    return count
+
+
+def iter_exported_devices(lines):
+    """Lazily parse the output of an export job.
+
+    :param lines: The contents of the exported devices blob, as an iterable of lines in
+        bytes or text (e.g. an open file), or the path of a local copy.
+    :type lines: str or iterable
+
+    :returns: A generator of ExportedDevice records.
+    """
+    if isinstance(lines, six.string_types):
+        with open(lines, "rb") as f:
+            for device in iter_exported_devices(f):
+                yield device
+        return
+
+    first = True
+    for line in lines:
+        if isinstance(line, six.binary_type):
+            line = line.decode("utf-8")
+        if first:
+            # Exported blobs may begin with a byte order mark
+            line = line.lstrip(u"\ufeff")
+            first = False
+        line = line.strip()
+        if line:
+            yield ExportedDevice.from_dict(json.loads(line))
+
+
+def wait_for_job(
+    get_job,
+    job_id,
+    timeout=None,
+    min_interval=DEFAULT_MIN_POLL_INTERVAL,
+    max_interval=DEFAULT_MAX_POLL_INTERVAL,
+    get_progress=None,
+):
+    """Poll a job until it reaches a terminal state or the timeout expires.
+
+    The polling interval adapts to the job: while the reported progress is advancing, the
+    next poll is scheduled for about half the estimated time remaining; while it is not,
+    the interval doubles. It always stays between min_interval and max_interval.
+
+    :param get_job: A callable taking the job id and returning its JobProperties.
+    :param str job_id: The id of the job.
+    :param float timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+    :param float min_interval: Shortest interval between polls, in seconds.
+    :param float max_interval: Longest interval between polls, in seconds.
+    :param get_progress: A callable taking the job and returning its percentage complete.
+        Defaults to reading its progress attribute.
+
+    :returns: The most recently retrieved JobProperties. If the timeout expired its status
+        will not be terminal.
+    """
+    start = time.time()
+    deadline = None if timeout is None else start + timeout
+    interval = min_interval
+    last_progress = None
+    last_progress_time = start
+
+    while True:
+        job = get_job(job_id)
+        if job.status in TERMINAL_JOB_STATUSES:
+            return job
+
+        now = time.time()
+        progress = (get_progress(job) if get_progress else job.progress) or 0
+        if last_progress is not None and progress > last_progress and now > last_progress_time:
+            rate = (progress - last_progress) / (now - last_progress_time)
+            interval = ((100 - progress) / rate) / 2
+        else:
+            interval = interval * 2
+        interval = max(min_interval, min(interval, max_interval))
+        if last_progress is None or progress != last_progress:
+            last_progress = progress
+            last_progress_time = now
+
+        if deadline is not None:
+            if now >= deadline:
+                return job
+            interval = min(interval, deadline - now)
+        time.sleep(interval)
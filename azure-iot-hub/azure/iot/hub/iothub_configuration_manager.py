@@ -14,7 +14,7 @@ class IoTHubConfigurationManager(object):
     based on top of the auto generated IotHub REST APIs
     """
 
-    def __init__(self, connection_string):
+    def __init__(self, connection_string, connection_pool=None):
         """Initializer for a Registry Manager Service client.
 
         After a successful creation the class has been authenticated with IoTHub and
@@ -22,6 +22,9 @@ class IoTHubConfigurationManager(object):
 
         :param str connection_string: The IoTHub connection string used to authenticate connection
             with IoTHub.
+        :param connection_pool: A pool of HTTP connections to send requests over, which may be
+            shared with other managers. By default the manager uses its own connections.
+        :type connection_pool: :class:`azure.iot.hub.connection_pool.ConnectionPool`
 
         :returns: Instance of the IoTHubRegistryManager object.
         :rtype: :class:`azure.iot.hub.IoTHubRegistryManager`
@@ -29,6 +32,8 @@ class IoTHubConfigurationManager(object):
 
         self.auth = ConnectionStringAuthentication(connection_string)
         self.protocol = protocol_client(self.auth, "https://" + self.auth["HostName"])
+        if connection_pool is not None:
+            connection_pool.attach(self.protocol)
 
     def get_configuration(self, configuration_id):
         """Retrieves the IoTHub configuration for a particular device.
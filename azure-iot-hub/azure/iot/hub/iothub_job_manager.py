@@ -0,0 +1,264 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import datetime
+import uuid
+from .auth import ConnectionStringAuthentication
+from . import import_export
+from .query import quote_string
+from .protocol.iot_hub_gateway_service_ap_is import IotHubGatewayServiceAPIs as protocol_client
+from .protocol.models import JobRequest, QuerySpecification
+
+
+class DeviceJobResult(object):
+    """The result of a scheduled job on a single device.
+
+    :ivar str device_id: The name (Id) of the device.
+    :ivar str module_id: The name (Id) of the module, if the job ran on a module.
+    :ivar str job_id: The id of the job.
+    :ivar str status: The status of the job on this device, e.g. 'completed' or 'failed'.
+    :ivar dict outcome: The outcome of the job on this device. For scheduleDeviceMethod jobs
+        this holds the deviceMethodResponse.
+    :ivar dict error: The error reported for this device, if any.
+    """
+
+    def __init__(self, **kwargs):
+        self.device_id = kwargs.get("device_id")
+        self.module_id = kwargs.get("module_id")
+        self.job_id = kwargs.get("job_id")
+        self.status = kwargs.get("status")
+        self.outcome = kwargs.get("outcome")
+        self.error = kwargs.get("error")
+
+    @classmethod
+    def from_dict(cls, d):
+        """Create a DeviceJobResult from a device job as returned by the IoTHub query API"""
+        return cls(
+            device_id=d.get("deviceId"),
+            module_id=d.get("moduleId"),
+            job_id=d.get("jobId"),
+            status=d.get("status"),
+            outcome=d.get("outcome"),
+            error=d.get("error"),
+        )
+
+
+def _get_job_progress(job):
+    """Return the percentage of devices a scheduled job has finished with"""
+    statistics = job.device_job_statistics
+    if not statistics or not statistics.device_count:
+        return 0
+    finished = (statistics.succeeded_count or 0) + (statistics.failed_count or 0)
+    return 100.0 * finished / statistics.device_count
+
+
+class IoTHubJobManager(object):
+    """A class to provide convenience APIs for IoTHub scheduled job operations,
+    based on top of the auto generated IotHub REST APIs.
+
+    Scheduled jobs update twins or invoke direct methods on every device matching a query
+    condition, with the IoTHub itself fanning the operation out to the devices.
+    See https://docs.microsoft.com/azure/iot-hub/iot-hub-devguide-jobs for more information.
+    """
+
+    def __init__(self, connection_string, connection_pool=None):
+        """Initializer for a Job Manager Service client.
+
+        After a successful creation the class has been authenticated with IoTHub and
+        it is ready to call the member APIs to communicate with IoTHub.
+
+        :param str connection_string: The IoTHub connection string used to authenticate connection
+            with IoTHub.
+        :param connection_pool: A pool of HTTP connections to send requests over, which may be
+            shared with other managers. By default the manager uses its own connections.
+        :type connection_pool: :class:`azure.iot.hub.connection_pool.ConnectionPool`
+
+        :returns: Instance of the IoTHubJobManager object.
+        :rtype: :class:`azure.iot.hub.IoTHubJobManager`
+        """
+
+        self.auth = ConnectionStringAuthentication(connection_string)
+        self.protocol = protocol_client(self.auth, "https://" + self.auth["HostName"])
+        if connection_pool is not None:
+            connection_pool.attach(self.protocol)
+
+    def create_scheduled_job(self, job_id, job_request):
+        """Creates a scheduled job on an IoTHub.
+
+        :param str job_id: The id of the job.
+        :param JobRequest job_request: The job to create.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobResponse object.
+        """
+        return self.protocol.job_client.create_job(job_id, job_request)
+
+    def get_scheduled_job(self, job_id):
+        """Retrieves the details of a scheduled job on an IoTHub.
+
+        :param str job_id: The id of the job.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobResponse object.
+        """
+        return self.protocol.job_client.get_job(job_id)
+
+    def cancel_scheduled_job(self, job_id):
+        """Cancels a scheduled job on an IoTHub.
+
+        :param str job_id: The id of the job.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobResponse object.
+        """
+        return self.protocol.job_client.cancel_job(job_id)
+
+    def query_scheduled_jobs(self, job_type=None, job_status=None):
+        """Retrieves the scheduled jobs on an IoTHub.
+
+        :param str job_type: Only return jobs of this type, e.g. 'scheduleUpdateTwin'.
+        :param str job_status: Only return jobs with this status, e.g. 'running'.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The QueryResult object.
+        """
+        return self.protocol.job_client.query_jobs(job_type, job_status)
+
+    def schedule_twin_update(
+        self,
+        query_condition,
+        twin,
+        job_id=None,
+        start_time=None,
+        max_execution_time_in_seconds=None,
+    ):
+        """Schedules a job updating the twin of every device matching a query condition.
+
+        :param str query_condition: The condition selecting the devices, e.g.
+            "tags.building = '43'".
+        :param Twin twin: The tags and desired properties to apply.
+        :param str job_id: The id of the job. A unique id is generated if not provided.
+        :param datetime start_time: When the job should start. Defaults to immediately.
+        :param int max_execution_time_in_seconds: How long the job may run for.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobResponse object.
+        """
+        job_request = JobRequest(
+            job_id=job_id or str(uuid.uuid4()),
+            type="scheduleUpdateTwin",
+            update_twin=twin,
+            query_condition=query_condition,
+            start_time=start_time or datetime.datetime.utcnow(),
+            max_execution_time_in_seconds=max_execution_time_in_seconds,
+        )
+        return self.create_scheduled_job(job_request.job_id, job_request)
+
+    def schedule_device_method(
+        self,
+        query_condition,
+        direct_method_request,
+        job_id=None,
+        start_time=None,
+        max_execution_time_in_seconds=None,
+    ):
+        """Schedules a job invoking a direct method on every device matching a query condition.
+
+        :param str query_condition: The condition selecting the devices, e.g.
+            "tags.building = '43'".
+        :param CloudToDeviceMethod direct_method_request: The method request.
+        :param str job_id: The id of the job. A unique id is generated if not provided.
+        :param datetime start_time: When the job should start. Defaults to immediately.
+        :param int max_execution_time_in_seconds: How long the job may run for.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobResponse object.
+        """
+        job_request = JobRequest(
+            job_id=job_id or str(uuid.uuid4()),
+            type="scheduleDeviceMethod",
+            cloud_to_device_method=direct_method_request,
+            query_condition=query_condition,
+            start_time=start_time or datetime.datetime.utcnow(),
+            max_execution_time_in_seconds=max_execution_time_in_seconds,
+        )
+        return self.create_scheduled_job(job_request.job_id, job_request)
+
+    def wait_for_scheduled_job(
+        self,
+        job_id,
+        timeout=None,
+        min_interval=import_export.DEFAULT_MIN_POLL_INTERVAL,
+        max_interval=import_export.DEFAULT_MAX_POLL_INTERVAL,
+    ):
+        """Poll a scheduled job until it is completed, failed or cancelled.
+
+           The polling interval backs off while no devices finish, and follows the rate at
+           which they do otherwise, staying between min_interval and max_interval.
+
+        :param str job_id: The id of the job.
+        :param float timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+        :param float min_interval: Shortest interval between polls, in seconds.
+        :param float max_interval: Longest interval between polls, in seconds.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The most recently retrieved JobResponse. If the timeout expired its
+            status will not be terminal.
+        """
+        return import_export.wait_for_job(
+            self.get_scheduled_job,
+            job_id,
+            timeout,
+            min_interval,
+            max_interval,
+            get_progress=_get_job_progress,
+        )
+
+    def iter_device_job_results(self, job_id, page_size=None):
+        """Retrieve the per-device results of a scheduled job.
+
+           Results are fetched a page at a time as the generator is consumed. Devices the job
+           has not yet run on are reported with a status such as 'scheduled' or 'running'.
+
+        :param str job_id: The id of the job.
+        :param int page_size: Maximum number of results requested per page.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: A generator of DeviceJobResult objects.
+        """
+        query_specification = QuerySpecification(
+            query="SELECT * FROM devices.jobs WHERE devices.jobs.jobId = {}".format(
+                quote_string(job_id)
+            )
+        )
+        continuation_token = None
+        while True:
+            # The device jobs are not twins, so are read from the raw response rather than
+            # the deserialized output
+            raw_response = self.protocol.registry_manager.query_iot_hub(
+                query_specification, continuation_token, page_size, None, True
+            )
+            for item in raw_response.response.json():
+                yield DeviceJobResult.from_dict(item)
+            continuation_token = (raw_response.headers or {}).get("x-ms-continuation")
+            if not continuation_token:
+                return
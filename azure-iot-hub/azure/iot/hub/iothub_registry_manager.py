@@ -4,8 +4,15 @@
 # license information.
 # --------------------------------------------------------------------------
 
+import json
+import six
+from concurrent.futures import ThreadPoolExecutor
+from msrest.exceptions import ClientException
 from .auth import ConnectionStringAuthentication
+from . import fanout
+from . import import_export
 from .protocol.iot_hub_gateway_service_ap_is import IotHubGatewayServiceAPIs as protocol_client
+from .protocol.operations import RegistryManagerOperations
 from .protocol.models import (
     Device,
     Module,
@@ -18,8 +25,30 @@ from .protocol.models import (
     Twin,
     CloudToDeviceMethod,
     CloudToDeviceMethodResult,
+    BulkRegistryOperationResult,
+    DeviceRegistryOperationError,
+    JobProperties,
 )
 
+# Maximum number of devices the IoTHub accepts in a single bulk registry operation
+BULK_OPERATION_MAX_DEVICES = 100
+
+
+class _RawDeserializer(object):
+    """An msrest deserializer that returns lists of devices, modules and twins as the plain
+    dictionaries parsed from the response, deferring anything else to a real deserializer.
+    """
+
+    raw_types = ("[Device]", "[Module]", "[Twin]")
+
+    def __init__(self, deserializer):
+        self._deserializer = deserializer
+
+    def __call__(self, target_obj, response_data, content_type=None):
+        if target_obj in self.raw_types:
+            return json.loads(response_data.content)
+        return self._deserializer(target_obj, response_data, content_type)
+
 
 class QueryResult(object):
     """The query result.
@@ -51,7 +80,7 @@ class IoTHubRegistryManager(object):
     based on top of the auto generated IotHub REST APIs
     """
 
-    def __init__(self, connection_string):
+    def __init__(self, connection_string, connection_pool=None, cache=None):
         """Initializer for a Registry Manager Service client.
 
         After a successful creation the class has been authenticated with IoTHub and
@@ -59,6 +88,13 @@ class IoTHubRegistryManager(object):
 
         :param str connection_string: The IoTHub connection string used to authenticate connection
             with IoTHub.
+        :param connection_pool: A pool of HTTP connections to send requests over, which may be
+            shared with other managers. By default the manager uses its own connections.
+        :type connection_pool: :class:`azure.iot.hub.connection_pool.ConnectionPool`
+        :param cache: A cache for device, module and twin reads, which are then revalidated
+            with the IoTHub instead of transferred again when unchanged. It may be shared with
+            other managers for the same IoTHub. By default nothing is cached.
+        :type cache: :class:`azure.iot.hub.etag_cache.ETagCache`
 
         :returns: Instance of the IoTHubRegistryManager object.
         :rtype: :class:`azure.iot.hub.IoTHubRegistryManager`
@@ -66,6 +102,31 @@ class IoTHubRegistryManager(object):
 
         self.auth = ConnectionStringAuthentication(connection_string)
         self.protocol = protocol_client(self.auth, "https://" + self.auth["HostName"])
+        if connection_pool is not None:
+            connection_pool.attach(self.protocol)
+        self.cache = cache
+        self._raw_registry_manager = None
+
+    @property
+    def raw_registry_manager(self):
+        """Registry manager operations returning plain dictionaries instead of models"""
+        if self._raw_registry_manager is None:
+            self._raw_registry_manager = RegistryManagerOperations(
+                self.protocol._client,
+                self.protocol.config,
+                self.protocol._serialize,
+                _RawDeserializer(self.protocol._deserialize),
+            )
+        return self._raw_registry_manager
+
+    def _invalidate(self, device_id, module_id=None):
+        if self.cache is not None:
+            self.cache.invalidate(device_id, module_id)
+
+    def _invalidate_devices(self, devices):
+        if self.cache is not None:
+            for device in devices:
+                self.cache.invalidate(device.id, device.module_id)
 
     def create_device_with_sas(self, device_id, primary_key, secondary_key, status):
         """Creates a device identity on IoTHub using SAS authentication.
@@ -90,7 +151,9 @@ class IoTHubRegistryManager(object):
         }
         device = Device(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_device(device_id, device)
+        device = self.protocol.registry_manager.create_or_update_device(device_id, device)
+        self._invalidate(device_id)
+        return device
 
     def create_device_with_x509(self, device_id, primary_thumbprint, secondary_thumbprint, status):
         """Creates a device identity on IoTHub using X509 authentication.
@@ -119,7 +182,9 @@ class IoTHubRegistryManager(object):
         }
         device = Device(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_device(device_id, device)
+        device = self.protocol.registry_manager.create_or_update_device(device_id, device)
+        self._invalidate(device_id)
+        return device
 
     def create_device_with_certificate_authority(self, device_id, status):
         """Creates a device identity on IoTHub using certificate authority.
@@ -140,7 +205,9 @@ class IoTHubRegistryManager(object):
         }
         device = Device(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_device(device_id, device)
+        device = self.protocol.registry_manager.create_or_update_device(device_id, device)
+        self._invalidate(device_id)
+        return device
 
     def update_device_with_sas(self, device_id, etag, primary_key, secondary_key, status):
         """Updates a device identity on IoTHub using SAS authentication.
@@ -167,7 +234,9 @@ class IoTHubRegistryManager(object):
         }
         device = Device(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_device(device_id, device, "*")
+        device = self.protocol.registry_manager.create_or_update_device(device_id, device, "*")
+        self._invalidate(device_id)
+        return device
 
     def update_device_with_x509(
         self, device_id, etag, primary_thumbprint, secondary_thumbprint, status
@@ -200,7 +269,9 @@ class IoTHubRegistryManager(object):
         }
         device = Device(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_device(device_id, device)
+        device = self.protocol.registry_manager.create_or_update_device(device_id, device)
+        self._invalidate(device_id)
+        return device
 
     def update_device_with_certificate_authority(self, device_id, etag, status):
         """Updates a device identity on IoTHub using certificate authority.
@@ -223,7 +294,9 @@ class IoTHubRegistryManager(object):
         }
         device = Device(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_device(device_id, device)
+        device = self.protocol.registry_manager.create_or_update_device(device_id, device)
+        self._invalidate(device_id)
+        return device
 
     def get_device(self, device_id):
         """Retrieves a device identity from IoTHub.
@@ -235,6 +308,15 @@ class IoTHubRegistryManager(object):
 
         :returns: The Device object containing the requested device.
         """
+        if self.cache is not None:
+            return self.cache.fetch(
+                "device",
+                device_id,
+                None,
+                lambda headers: self.protocol.registry_manager.get_device(
+                    device_id, custom_headers=headers
+                ),
+            )
         return self.protocol.registry_manager.get_device(device_id)
 
     def delete_device(self, device_id, etag=None):
@@ -252,6 +334,7 @@ class IoTHubRegistryManager(object):
             etag = "*"
 
         self.protocol.registry_manager.delete_device(device_id, etag)
+        self._invalidate(device_id)
 
     def create_module_with_sas(self, device_id, module_id, managed_by, primary_key, secondary_key):
         """Creates a module identity for a device on IoTHub using SAS authentication.
@@ -277,7 +360,11 @@ class IoTHubRegistryManager(object):
         }
         module = Module(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_module(device_id, module_id, module)
+        module = self.protocol.registry_manager.create_or_update_module(
+            device_id, module_id, module
+        )
+        self._invalidate(device_id, module_id)
+        return module
 
     def create_module_with_x509(
         self, device_id, module_id, managed_by, primary_thumbprint, secondary_thumbprint
@@ -309,7 +396,11 @@ class IoTHubRegistryManager(object):
         }
         module = Module(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_module(device_id, module_id, module)
+        module = self.protocol.registry_manager.create_or_update_module(
+            device_id, module_id, module
+        )
+        self._invalidate(device_id, module_id)
+        return module
 
     def create_module_with_certificate_authority(self, device_id, module_id, managed_by):
         """Creates a module identity for a device on IoTHub using certificate authority.
@@ -331,7 +422,11 @@ class IoTHubRegistryManager(object):
         }
         module = Module(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_module(device_id, module_id, module)
+        module = self.protocol.registry_manager.create_or_update_module(
+            device_id, module_id, module
+        )
+        self._invalidate(device_id, module_id)
+        return module
 
     def update_module_with_sas(
         self, device_id, module_id, managed_by, etag, primary_key, secondary_key
@@ -361,9 +456,11 @@ class IoTHubRegistryManager(object):
         }
         module = Module(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_module(
+        module = self.protocol.registry_manager.create_or_update_module(
             device_id, module_id, module, "*"
         )
+        self._invalidate(device_id, module_id)
+        return module
 
     def update_module_with_x509(
         self, device_id, module_id, managed_by, etag, primary_thumbprint, secondary_thumbprint
@@ -397,7 +494,11 @@ class IoTHubRegistryManager(object):
         }
         module = Module(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_module(device_id, module_id, module)
+        module = self.protocol.registry_manager.create_or_update_module(
+            device_id, module_id, module
+        )
+        self._invalidate(device_id, module_id)
+        return module
 
     def update_module_with_certificate_authority(self, device_id, module_id, managed_by, etag):
         """Updates a module identity for a device on IoTHub using certificate authority.
@@ -421,7 +522,11 @@ class IoTHubRegistryManager(object):
         }
         module = Module(**kwargs)
 
-        return self.protocol.registry_manager.create_or_update_module(device_id, module_id, module)
+        module = self.protocol.registry_manager.create_or_update_module(
+            device_id, module_id, module
+        )
+        self._invalidate(device_id, module_id)
+        return module
 
     def get_module(self, device_id, module_id):
         """Retrieves a module identity for a device from IoTHub.
@@ -434,18 +539,32 @@ class IoTHubRegistryManager(object):
 
         :returns: The Module object containing the requested module.
         """
+        if self.cache is not None:
+            return self.cache.fetch(
+                "module",
+                device_id,
+                module_id,
+                lambda headers: self.protocol.registry_manager.get_module(
+                    device_id, module_id, custom_headers=headers
+                ),
+            )
         return self.protocol.registry_manager.get_module(device_id, module_id)
 
-    def get_modules(self, device_id):
+    def get_modules(self, device_id, raw=False):
         """Retrieves all module identities on a device.
 
         :param str device_id: The name (Id) of the device.
+        :param bool raw: Return each module as the dictionary parsed from the response, in the
+            REST API format, rather than as a Module object. This is considerably faster and
+            uses less memory.
 
         :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
             if the HTTP response status is not in [200].
 
         :returns: The list[Module] containing all the modules on the device.
         """
+        if raw:
+            return self.raw_registry_manager.get_modules_on_device(device_id)
         return self.protocol.registry_manager.get_modules_on_device(device_id)
 
     def delete_module(self, device_id, module_id, etag=None):
@@ -464,6 +583,7 @@ class IoTHubRegistryManager(object):
             etag = "*"
 
         self.protocol.registry_manager.delete_module(device_id, module_id, etag)
+        self._invalidate(device_id, module_id)
 
     def get_service_statistics(self):
         """Retrieves the IoTHub service statistics.
@@ -485,7 +605,7 @@ class IoTHubRegistryManager(object):
         """
         return self.protocol.registry_manager.get_device_statistics()
 
-    def get_devices(self, max_number_of_devices=None):
+    def get_devices(self, max_number_of_devices=None, raw=False):
         """Get the identities of multiple devices from the IoTHub identity
            registry. Not recommended. Use the IoTHub query language to retrieve
            device twin and device identity information. See
@@ -497,12 +617,17 @@ class IoTHubRegistryManager(object):
         :param int max_number_of_devices: This parameter when specified, defines the maximum number
            of device identities that are returned. Any value outside the range of
            1-1000 is considered to be 1000
+        :param bool raw: Return each device as the dictionary parsed from the response, in the
+            REST API format, rather than as a Device object. This is considerably faster and
+            uses less memory.
 
         :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
             if the HTTP response status is not in [200].
 
         :returns: List of device info.
         """
+        if raw:
+            return self.raw_registry_manager.get_devices(max_number_of_devices)
         return self.protocol.registry_manager.get_devices(max_number_of_devices)
 
     def bulk_create_or_update_devices(self, devices):
@@ -524,9 +649,182 @@ class IoTHubRegistryManager(object):
 
         :returns: The BulkRegistryOperationResult object.
         """
-        return self.protocol.registry_manager.bulk_device_crud(devices)
+        result = self.protocol.registry_manager.bulk_device_crud(devices)
+        self._invalidate_devices(devices)
+        return result
+
+    def bulk_create_or_update_devices_chunked(
+        self, devices, max_workers=fanout.DEFAULT_MAX_WORKERS, retry_policy=None
+    ):
+        """Create, update, or delete the identities of any number of devices from the
+           IoTHub identity registry.
+
+           The devices are sent in bulk operations of up to 100 devices each, with up to
+           max_workers operations in flight at once. Operations throttled by the IoTHub are
+           retried according to retry_policy. The iterable is consumed lazily, so it may be a
+           generator producing more devices than fit in memory.
+
+           As with bulk_create_or_update_devices, a device identity can be specified only once.
+
+        :param devices: The device objects to operate on.
+        :type devices: iterable[ExportImportDevice]
+        :param int max_workers: Maximum number of concurrent bulk operations.
+        :param retry_policy: The policy for retrying throttled operations.
+        :type retry_policy: :class:`azure.iot.hub.fanout.ThrottlingRetryPolicy`
+
+        :returns: A BulkRegistryOperationResult merging the results of every bulk operation.
+            If an entire bulk operation fails (e.g. it is still throttled after all retries),
+            an error with code 'BulkRegistryOperationFailure' is reported for each of its
+            devices.
+        """
+        if retry_policy is None:
+            retry_policy = fanout.ThrottlingRetryPolicy()
+
+        def run_chunk(chunk):
+            result = retry_policy.call(self.protocol.registry_manager.bulk_device_crud, chunk)
+            self._invalidate_devices(chunk)
+            return result
+
+        errors = []
+        warnings = []
+        chunks = fanout.chunked(devices, BULK_OPERATION_MAX_DEVICES)
+        for chunk, future in fanout.run_bounded(run_chunk, chunks, max_workers):
+            try:
+                result = future.result()
+            except ClientException as e:
+                errors.extend(
+                    DeviceRegistryOperationError(
+                        device_id=device.id,
+                        module_id=device.module_id,
+                        error_code="BulkRegistryOperationFailure",
+                        error_status=str(e),
+                        operation=device.import_mode,
+                    )
+                    for device in chunk
+                )
+                continue
+            errors.extend(result.errors or [])
+            warnings.extend(result.warnings or [])
+
+        return BulkRegistryOperationResult(
+            is_successful=not errors, errors=errors, warnings=warnings
+        )
+
+    def import_devices(
+        self, input_blob_container_uri, output_blob_container_uri, input_blob_name=None
+    ):
+        """Submit a job importing device identities from blob storage into the IoTHub
+           identity registry.
+
+           The input blob holds one serialized ExportImportDevice per line, and can be
+           produced from any iterable of devices with
+           :func:`azure.iot.hub.import_export.write_import_file`.
+           See https://docs.microsoft.com/azure/iot-hub/iot-hub-bulk-identity-mgmt
+           for more information.
+
+        :param str input_blob_container_uri: SAS URI of the container holding the input blob.
+        :param str output_blob_container_uri: SAS URI of a writable container to receive
+            the import job's log.
+        :param str input_blob_name: The name of the input blob. Defaults to devices.txt.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobProperties of the submitted job.
+        """
+        job_properties = JobProperties(
+            type="import",
+            input_blob_container_uri=input_blob_container_uri,
+            input_blob_name=input_blob_name,
+            output_blob_container_uri=output_blob_container_uri,
+        )
+        job = self.protocol.job_client.create_import_export_job(job_properties)
+        # The job may change any device, and runs in the background, so nothing cached
+        # can be relied upon
+        if self.cache is not None:
+            self.cache.clear()
+        return job
+
+    def export_devices(self, output_blob_container_uri, exclude_keys=True, output_blob_name=None):
+        """Submit a job exporting the IoTHub identity registry to blob storage.
+
+           The exported blob holds one device identity per line, and can be parsed with
+           :func:`azure.iot.hub.import_export.iter_exported_devices`.
+           See https://docs.microsoft.com/azure/iot-hub/iot-hub-bulk-identity-mgmt
+           for more information.
+
+        :param str output_blob_container_uri: SAS URI of a writable container to receive
+            the exported blob.
+        :param bool exclude_keys: Whether to leave authentication keys out of the export.
+        :param str output_blob_name: The name of the output blob. Defaults to devices.txt.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobProperties of the submitted job.
+        """
+        job_properties = JobProperties(
+            type="export",
+            output_blob_container_uri=output_blob_container_uri,
+            output_blob_name=output_blob_name,
+            exclude_keys_in_export=exclude_keys,
+        )
+        return self.protocol.job_client.create_import_export_job(job_properties)
+
+    def get_import_export_job(self, job_id):
+        """Retrieves the status of an import or export job.
+
+        :param str job_id: The id of the job.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The JobProperties object.
+        """
+        return self.protocol.job_client.get_import_export_job(job_id)
+
+    def cancel_import_export_job(self, job_id):
+        """Cancels an import or export job.
+
+        :param str job_id: The id of the job.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200, 204].
+
+        :returns: Object.
+        """
+        return self.protocol.job_client.cancel_import_export_job(job_id)
+
+    def wait_for_import_export_job(
+        self,
+        job_id,
+        timeout=None,
+        min_interval=import_export.DEFAULT_MIN_POLL_INTERVAL,
+        max_interval=import_export.DEFAULT_MAX_POLL_INTERVAL,
+    ):
+        """Poll an import or export job until it is completed, failed or cancelled.
+
+           The polling interval adapts to the progress reported by the job, staying between
+           min_interval and max_interval.
+
+        :param str job_id: The id of the job.
+        :param float timeout: Maximum number of seconds to wait, or None to wait indefinitely.
+        :param float min_interval: Shortest interval between polls, in seconds.
+        :param float max_interval: Longest interval between polls, in seconds.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The most recently retrieved JobProperties. If the timeout expired its
+            status will not be terminal.
+        """
+        return import_export.wait_for_job(
+            self.get_import_export_job, job_id, timeout, min_interval, max_interval
+        )
 
-    def query_iot_hub(self, query_specification, continuation_token=None, max_item_count=None):
+    def query_iot_hub(
+        self, query_specification, continuation_token=None, max_item_count=None, raw=False
+    ):
         """Query an IoTHub to retrieve information regarding device twins using a
            SQL-like language.
            See https://docs.microsoft.com/azure/iot-hub/iot-hub-devguide-query-language
@@ -536,13 +834,17 @@ class IoTHubRegistryManager(object):
         :param QuerySpecification query: The query specification.
         :param str continuation_token: Continuation token for paging
         :param str max_item_count: Maximum number of requested device twins
+        :param bool raw: Return each twin as the dictionary parsed from the response, in the
+            REST API format, rather than as a Twin object. This is considerably faster and
+            uses less memory.
 
         :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
             if the HTTP response status is not in [200].
 
         :returns: The QueryResult object.
         """
-        raw_response = self.protocol.registry_manager.query_iot_hub(
+        registry_manager = self.raw_registry_manager if raw else self.protocol.registry_manager
+        raw_response = registry_manager.query_iot_hub(
             query_specification, continuation_token, max_item_count, None, True
         )
 
@@ -554,6 +856,93 @@ class IoTHubRegistryManager(object):
 
         return queryResult
 
+    def query_iter(self, query_specification, page_size=None, prefetch=True, raw=False):
+        """Query an IoTHub for device twins, transparently following continuation tokens
+           until the results are exhausted.
+
+           Twins are yielded one page at a time as each page arrives, so memory use is bounded
+           by the page size rather than the size of the result. While the caller consumes one
+           page, the next page is fetched on a background thread.
+
+        :param query_specification: The query specification, or the query string itself.
+        :type query_specification: QuerySpecification or str
+        :param int page_size: Maximum number of device twins requested per page.
+        :param bool prefetch: Whether to fetch the next page in the background while the
+            current page is consumed.
+        :param bool raw: Yield each twin as the dictionary parsed from the response, in the
+            REST API format, rather than as a Twin object.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: A generator of the Twin objects matching the query.
+        """
+        if isinstance(query_specification, six.string_types):
+            query_specification = QuerySpecification(query=query_specification)
+
+        if not prefetch:
+            continuation_token = None
+            while True:
+                page = self.query_iot_hub(query_specification, continuation_token, page_size, raw)
+                for item in page.items or []:
+                    yield item
+                continuation_token = page.continuation_token
+                if not continuation_token:
+                    return
+
+        # Leaving the with block (including when the generator is closed early) waits for any
+        # in-flight prefetch to complete before shutting down the worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            next_page = executor.submit(
+                self.query_iot_hub, query_specification, None, page_size, raw
+            )
+            while next_page is not None:
+                page = next_page.result()
+                if page.continuation_token:
+                    next_page = executor.submit(
+                        self.query_iot_hub,
+                        query_specification,
+                        page.continuation_token,
+                        page_size,
+                        raw,
+                    )
+                else:
+                    next_page = None
+                items = page.items or []
+                # Drop the reference to the page so that it can be collected once consumed
+                page = None
+                for item in items:
+                    yield item
+
+    def query_to_ndjson(self, query_specification, output, page_size=None):
+        """Query an IoTHub for device twins and stream the results to newline-delimited JSON,
+           one twin per line, in the same format the IoTHub REST API uses for twins.
+
+           Only one page of results is held in memory at a time, making this suitable for
+           scanning a full fleet.
+
+        :param query_specification: The query specification, or the query string itself.
+        :type query_specification: QuerySpecification or str
+        :param output: A writable text stream, or the path of a file to create.
+        :type output: str or file-like object
+        :param int page_size: Maximum number of device twins requested per page.
+
+        :raises: `HttpOperationError<msrest.exceptions.HttpOperationError>`
+            if the HTTP response status is not in [200].
+
+        :returns: The number of twins written.
+        """
+        if isinstance(output, six.string_types):
+            with open(output, "w") as f:
+                return self.query_to_ndjson(query_specification, f, page_size)
+
+        count = 0
+        for twin in self.query_iter(query_specification, page_size):
+            output.write(json.dumps(twin.serialize(keep_readonly=True)))
+            output.write("\n")
+            count += 1
+        return count
+
     def get_twin(self, device_id):
         """Gets a device twin.
 
@@ -564,6 +953,15 @@ class IoTHubRegistryManager(object):
 
         :returns: The Twin object.
         """
+        if self.cache is not None:
+            return self.cache.fetch(
+                "twin",
+                device_id,
+                None,
+                lambda headers: self.protocol.twin.get_device_twin(
+                    device_id, custom_headers=headers
+                ),
+            )
         return self.protocol.twin.get_device_twin(device_id)
 
     def replace_twin(self, device_id, device_twin):
@@ -577,7 +975,9 @@ class IoTHubRegistryManager(object):
 
         :returns: The Twin object.
         """
-        return self.protocol.twin.replace_device_twin(device_id, device_twin)
+        twin = self.protocol.twin.replace_device_twin(device_id, device_twin)
+        self._invalidate(device_id)
+        return twin
 
     def update_twin(self, device_id, device_twin, etag):
         """Updates tags and desired properties of a device twin.
@@ -591,7 +991,9 @@ class IoTHubRegistryManager(object):
 
         :returns: The Twin object.
         """
-        return self.protocol.twin.update_device_twin(device_id, device_twin, etag)
+        twin = self.protocol.twin.update_device_twin(device_id, device_twin, etag)
+        self._invalidate(device_id)
+        return twin
 
     def get_module_twin(self, device_id, module_id):
         """Gets a module twin.
@@ -604,6 +1006,15 @@ class IoTHubRegistryManager(object):
 
         :returns: The Twin object.
         """
+        if self.cache is not None:
+            return self.cache.fetch(
+                "twin",
+                device_id,
+                module_id,
+                lambda headers: self.protocol.twin.get_module_twin(
+                    device_id, module_id, custom_headers=headers
+                ),
+            )
         return self.protocol.twin.get_module_twin(device_id, module_id)
 
     def replace_module_twin(self, device_id, module_id, module_twin):
@@ -618,7 +1029,9 @@ class IoTHubRegistryManager(object):
 
         :returns: The Twin object.
         """
-        return self.protocol.twin.replace_module_twin(device_id, module_id, module_twin)
+        twin = self.protocol.twin.replace_module_twin(device_id, module_id, module_twin)
+        self._invalidate(device_id, module_id)
+        return twin
 
     def update_module_twin(self, device_id, module_id, module_twin, etag):
         """Updates tags and desired properties of a module twin.
@@ -633,7 +1046,9 @@ class IoTHubRegistryManager(object):
 
         :returns: The Twin object.
         """
-        return self.protocol.twin.update_module_twin(device_id, module_id, module_twin, etag)
+        twin = self.protocol.twin.update_module_twin(device_id, module_id, module_twin, etag)
+        self._invalidate(device_id, module_id)
+        return twin
 
     def invoke_device_method(self, device_id, direct_method_request):
         """Invoke a direct method on a device.
@@ -663,3 +1078,136 @@ class IoTHubRegistryManager(object):
         return self.protocol.device_method.invoke_module_method(
             device_id, module_id, direct_method_request
         )
+
+    def invoke_method_on_devices(
+        self,
+        targets,
+        direct_method_request,
+        max_workers=fanout.DEFAULT_METHOD_MAX_WORKERS,
+        deadline=None,
+        retry_policy=None,
+    ):
+        """Invoke a direct method on many devices or modules concurrently.
+
+           Results are streamed back as each invocation completes, so a slow or unreachable
+           device does not hold up the rest. Invocations throttled by the IoTHub are retried
+           according to retry_policy.
+
+        :param targets: The device ids, or (device_id, module_id) tuples, to invoke the method
+            on. A query string (or QuerySpecification) may be given instead, in which case the
+            method is invoked on every device or module twin it returns.
+        :type targets: iterable or str or QuerySpecification
+        :param CloudToDeviceMethod direct_method_request: The method request.
+        :param int max_workers: Maximum number of concurrent invocations.
+        :param float deadline: Maximum number of seconds for any single invocation, including
+            retries of it, to complete in. Each attempt is given only the time left as its
+            timeout, and an invocation with no time left for another attempt has the timed out
+            outcome. As the timeout limits each connect and read rather than the whole request,
+            a response may arrive slightly after the deadline, and is still returned. Defaults
+            to the method's connect and response timeouts plus a margin for the round trip to
+            the IoTHub.
+        :param retry_policy: The policy for retrying throttled invocations.
+        :type retry_policy: :class:`azure.iot.hub.fanout.ThrottlingRetryPolicy`
+
+        :returns: A :class:`azure.iot.hub.fanout.MethodFanout`. Iterate over it for the
+            MethodOutcome of each invocation, and read its succeeded, timed_out, offline and
+            failed counts.
+        """
+        if isinstance(targets, (six.string_types, QuerySpecification)):
+            targets = (
+                (twin.device_id, twin.module_id) if twin.module_id else twin.device_id
+                for twin in self.query_iter(targets)
+            )
+        if retry_policy is None:
+            retry_policy = fanout.ThrottlingRetryPolicy()
+        if deadline is None:
+            deadline = (
+                (
+                    direct_method_request.response_timeout_in_seconds
+                    or fanout.DEFAULT_METHOD_RESPONSE_TIMEOUT
+                )
+                + (
+                    direct_method_request.connect_timeout_in_seconds
+                    or fanout.DEFAULT_METHOD_CONNECT_TIMEOUT
+                )
+                + fanout.METHOD_DEADLINE_MARGIN
+            )
+
+        def invoke(device_id, module_id):
+            invocation_deadline = fanout.Deadline(deadline)
+
+            # Each attempt gets only the time left, so retries cannot run past the deadline
+            def invoke_module_method():
+                return self.protocol.device_method.invoke_module_method(
+                    device_id,
+                    module_id,
+                    direct_method_request,
+                    timeout=invocation_deadline.remaining(),
+                )
+
+            def invoke_device_method():
+                return self.protocol.device_method.invoke_device_method(
+                    device_id, direct_method_request, timeout=invocation_deadline.remaining()
+                )
+
+            return retry_policy.call(invoke_module_method if module_id else invoke_device_method)
+
+        return fanout.MethodFanout(invoke, targets, max_workers)
+
+    def bulk_update_twins(
+        self,
+        targets,
+        mutate,
+        max_workers=fanout.DEFAULT_MAX_WORKERS,
+        max_conflict_retries=fanout.DEFAULT_MAX_CONFLICT_RETRIES,
+        retry_policy=None,
+    ):
+        """Update many device or module twins concurrently with a mutation function.
+
+           Each twin is read, passed to mutate, and the returned patch applied to its tags and
+           desired properties with update_twin, conditional on the etag that was read. If the
+           twin changed in the meantime, it is re-read and the mutation reapplied. Requests
+           throttled by the IoTHub are retried according to retry_policy.
+
+        :param targets: The device ids, or (device_id, module_id) tuples, of the twins to
+            update. A query string (or QuerySpecification) may be given instead, in which case
+            every twin it returns is updated without being read again.
+        :type targets: iterable or str or QuerySpecification
+        :param mutate: A callable taking the current Twin and returning a Twin holding the
+            tags and desired properties to patch, or None to leave the twin unchanged. It may be
+            called more than once for a twin, so should not have side effects.
+        :param int max_workers: Maximum number of twins being updated at once.
+        :param int max_conflict_retries: Maximum number of times to retry an update rejected
+            because the twin changed.
+        :param retry_policy: The policy for retrying throttled requests.
+        :type retry_policy: :class:`azure.iot.hub.fanout.ThrottlingRetryPolicy`
+
+        :returns: A :class:`azure.iot.hub.fanout.TwinUpdateFanout`. Iterate over it for the
+            TwinUpdateOutcome of each twin, and read its updated, skipped, conflict and failed
+            counts.
+        """
+        if isinstance(targets, (six.string_types, QuerySpecification)):
+            targets = self.query_iter(targets)
+        if retry_policy is None:
+            retry_policy = fanout.ThrottlingRetryPolicy()
+
+        def get_twin(device_id, module_id):
+            if module_id:
+                return retry_policy.call(self.protocol.twin.get_module_twin, device_id, module_id)
+            return retry_policy.call(self.protocol.twin.get_device_twin, device_id)
+
+        def update_twin(device_id, module_id, patch, etag):
+            if module_id:
+                twin = retry_policy.call(
+                    self.protocol.twin.update_module_twin, device_id, module_id, patch, etag
+                )
+            else:
+                twin = retry_policy.call(
+                    self.protocol.twin.update_device_twin, device_id, patch, etag
+                )
+            self._invalidate(device_id, module_id)
+            return twin
+
+        return fanout.TwinUpdateFanout(
+            get_twin, update_twin, mutate, targets, max_workers, max_conflict_retries
+        )
@@ -0,0 +1,83 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Code generated by Microsoft (R) AutoRest Code Generator.
+# Changes may cause incorrect behavior and will be lost if the code is
+# regenerated.
+# --------------------------------------------------------------------------
+
+from msrest.async_client import SDKClientAsync
+from msrest import Serializer, Deserializer
+
+from ..iot_hub_gateway_service_ap_is import IotHubGatewayServiceAPIsConfiguration
+from .operations_async.configuration_operations_async import ConfigurationOperations
+from .operations_async.registry_manager_operations_async import RegistryManagerOperations
+from .operations_async.job_client_operations_async import JobClientOperations
+from .operations_async.fault_injection_operations_async import FaultInjectionOperations
+from .operations_async.twin_operations_async import TwinOperations
+from .operations_async.digital_twin_operations_async import DigitalTwinOperations
+from .operations_async.http_runtime_operations_async import HttpRuntimeOperations
+from .operations_async.device_method_operations_async import DeviceMethodOperations
+from .. import models
+
+
+class IotHubGatewayServiceAPIs(SDKClientAsync):
+    """IotHubGatewayServiceAPIs
+
+    :ivar config: Configuration for client.
+    :vartype config: IotHubGatewayServiceAPIsConfiguration
+
+    :ivar configuration: Configuration operations
+    :vartype configuration: protocol.aio.operations_async.ConfigurationOperations
+    :ivar registry_manager: RegistryManager operations
+    :vartype registry_manager: protocol.aio.operations_async.RegistryManagerOperations
+    :ivar job_client: JobClient operations
+    :vartype job_client: protocol.aio.operations_async.JobClientOperations
+    :ivar fault_injection: FaultInjection operations
+    :vartype fault_injection: protocol.aio.operations_async.FaultInjectionOperations
+    :ivar twin: Twin operations
+    :vartype twin: protocol.aio.operations_async.TwinOperations
+    :ivar digital_twin: DigitalTwin operations
+    :vartype digital_twin: protocol.aio.operations_async.DigitalTwinOperations
+    :ivar http_runtime: HttpRuntime operations
+    :vartype http_runtime: protocol.aio.operations_async.HttpRuntimeOperations
+    :ivar device_method: DeviceMethod operations
+    :vartype device_method: protocol.aio.operations_async.DeviceMethodOperations
+
+    :param credentials: Subscription credentials which uniquely identify
+     client subscription.
+    :type credentials: None
+    :param str base_url: Service URL
+    """
+
+    def __init__(self, credentials, base_url=None):
+
+        self.config = IotHubGatewayServiceAPIsConfiguration(credentials, base_url)
+        super(IotHubGatewayServiceAPIs, self).__init__(self.config)
+
+        client_models = {k: v for k, v in models.__dict__.items() if isinstance(v, type)}
+        self.api_version = "2020-03-01"
+        self._serialize = Serializer(client_models)
+        self._deserialize = Deserializer(client_models)
+
+        self.configuration = ConfigurationOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
+        self.registry_manager = RegistryManagerOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
+        self.job_client = JobClientOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
+        self.fault_injection = FaultInjectionOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
+        self.twin = TwinOperations(self._client, self.config, self._serialize, self._deserialize)
+        self.digital_twin = DigitalTwinOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
+        self.http_runtime = HttpRuntimeOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
+        self.device_method = DeviceMethodOperations(
+            self._client, self.config, self._serialize, self._deserialize
+        )
@@ -0,0 +1,26 @@
+# coding=utf-8
+# --------------------------------------------------------------------------
+# Code generated by Microsoft (R) AutoRest Code Generator.
+# Changes may cause incorrect behavior and will be lost if the code is
+# regenerated.
+# --------------------------------------------------------------------------
+
+from .configuration_operations_async import ConfigurationOperations
+from .registry_manager_operations_async import RegistryManagerOperations
+from .job_client_operations_async import JobClientOperations
+from .fault_injection_operations_async import FaultInjectionOperations
+from .twin_operations_async import TwinOperations
+from .digital_twin_operations_async import DigitalTwinOperations
+from .http_runtime_operations_async import HttpRuntimeOperations
+from .device_method_operations_async import DeviceMethodOperations
+
+__all__ = [
+    "ConfigurationOperations",
+    "RegistryManagerOperations",
+    "JobClientOperations",
+    "FaultInjectionOperations",
+    "TwinOperations",
+    "DigitalTwinOperations",
+    "HttpRuntimeOperations",
+    "DeviceMethodOperations",
+]
@@ -0,0 +1,20 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains helpers for building IoTHub query language queries."""
+
+__all__ = ["quote_string"]
+
+
+def quote_string(value):
+    """Return a value as a string literal of the IoTHub query language.
+
+    Quotes in the value are doubled, so a value such as a device id cannot end the literal
+    early and change the meaning of the query.
+
+    :param str value: The value, such as a device id or job id.
+    :returns: The value in single quotes, e.g. "'my-device'".
+    """
+    return "'{}'".format(value.replace("'", "''"))
@@ -0,0 +1,307 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""This module contains an in-memory index of the device twins of an IoTHub, kept up to date
+with incremental queries rather than repeated scans of the whole fleet.
+"""
+
+import datetime
+import threading
+from msrest.serialization import Deserializer, Serializer
+from . import fanout
+from .query import quote_string
+
+__all__ = ["TwinIndex", "TwinRecord"]
+
+FULL_QUERY = "SELECT * FROM devices"
+VERSION_QUERY = "SELECT deviceId, version FROM devices"
+# Twins whose activity or properties changed at or after the watermark. Tag-only changes
+# carry no timestamp, so are picked up by TwinIndex.reconcile() instead.
+WATERMARK_QUERY = (
+    "SELECT * FROM devices WHERE lastActivityTime >= '{watermark}'"
+    " OR properties.reported.$metadata.$lastUpdated >= '{watermark}'"
+    " OR properties.desired.$metadata.$lastUpdated >= '{watermark}'"
+)
+DEVICE_IDS_QUERY = "SELECT * FROM devices WHERE deviceId IN [{device_ids}]"
+
+# Maximum number of device ids in a single IN clause when re-reading changed twins
+MAX_IDS_PER_QUERY = 100
+
+
+def _strip_metadata(properties):
+    """Return twin properties without the $metadata and $version bookkeeping"""
+    if not properties:
+        return {}
+    return dict((k, v) for k, v in properties.items() if not k.startswith("$"))
+
+
+def _parse_time(value):
+    """Return an ISO 8601 timestamp (string or datetime) as a datetime, or None"""
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    try:
+        return Deserializer.deserialize_iso(value)
+    except Exception:
+        return None
+
+
+def _last_updated(properties):
+    metadata = (properties or {}).get("$metadata") or {}
+    return _parse_time(metadata.get("$lastUpdated"))
+
+
+class TwinRecord(object):
+    """A compact, read-only copy of a device twin.
+
+    Desired and reported properties are stored without their $metadata, which typically
+    makes up most of the size of a twin.
+    """
+
+    __slots__ = (
+        "device_id",
+        "etag",
+        "version",
+        "status",
+        "connection_state",
+        "last_activity_time",
+        "tags",
+        "desired",
+        "reported",
+    )
+
+    _top_level = {
+        "deviceId": "device_id",
+        "etag": "etag",
+        "version": "version",
+        "status": "status",
+        "connectionState": "connection_state",
+        "lastActivityTime": "last_activity_time",
+    }
+
+    def __init__(self, twin):
+        properties = twin.properties
+        self.device_id = twin.device_id
+        self.etag = twin.etag
+        self.version = twin.version
+        self.status = twin.status
+        self.connection_state = twin.connection_state
+        self.last_activity_time = twin.last_activity_time
+        self.tags = twin.tags or {}
+        self.desired = _strip_metadata(properties.desired if properties else None)
+        self.reported = _strip_metadata(properties.reported if properties else None)
+
+    def get(self, path, default=None):
+        """Return the value at a path in IoTHub query syntax, e.g. 'tags.location.region',
+        'properties.reported.firmware' or 'connectionState'.
+        """
+        parts = path.split(".")
+        if parts[0] == "tags":
+            value, parts = self.tags, parts[1:]
+        elif parts[0] == "properties" and len(parts) > 1 and parts[1] in ("desired", "reported"):
+            value, parts = getattr(self, parts[1]), parts[2:]
+        elif len(parts) == 1 and parts[0] in self._top_level:
+            return getattr(self, self._top_level[parts[0]])
+        else:
+            return default
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                return default
+            value = value[part]
+        return value
+
+    def __repr__(self):
+        return "TwinRecord(device_id={!r}, version={!r})".format(self.device_id, self.version)
+
+
+_missing = object()
+
+
+class TwinIndex(object):
+    """An in-memory index of the device twins of an IoTHub.
+
+    load() reads every twin once. After that, refresh() only fetches twins whose activity or
+    properties changed since the last refresh, using the latest timestamp seen as a
+    watermark, and reconcile() catches tag-only changes and deleted devices by comparing twin
+    versions. Secondary indexes on the given paths make find() on those paths a dictionary
+    lookup.
+
+    The index is safe to read from while it is being refreshed on another thread.
+
+    :param registry_manager: The IoTHubRegistryManager used to query the IoTHub.
+    :param indexed_paths: Paths in IoTHub query syntax to build secondary indexes on, e.g.
+        'tags.location.region' or 'properties.reported.firmware'.
+    :param int page_size: Maximum number of twins requested per query page.
+    """
+
+    def __init__(self, registry_manager, indexed_paths=(), page_size=None):
+        self._registry_manager = registry_manager
+        self._page_size = page_size
+        self._records = {}
+        self._indexes = dict((path, {}) for path in indexed_paths)
+        self._lock = threading.Lock()
+        self.watermark = None
+
+    def __len__(self):
+        return len(self._records)
+
+    def __contains__(self, device_id):
+        return device_id in self._records
+
+    def __iter__(self):
+        with self._lock:
+            records = list(self._records.values())
+        return iter(records)
+
+    def get(self, device_id):
+        """Return the TwinRecord for a device, or None if it is not in the index"""
+        return self._records.get(device_id)
+
+    def find(self, criteria=None, predicate=None):
+        """Return the records matching every path/value pair in criteria and the predicate.
+
+        Indexed paths are resolved from their indexes, starting with the most selective; any
+        remaining criteria and the predicate are checked against those candidates only.
+
+        :param dict criteria: A mapping of paths in IoTHub query syntax to required values.
+        :param predicate: A callable taking a TwinRecord and returning True to include it.
+
+        :returns: A list of TwinRecord objects.
+        """
+        criteria = criteria or {}
+        with self._lock:
+            candidate_sets = []
+            unindexed = []
+            for path, value in criteria.items():
+                index = self._indexes.get(path)
+                try:
+                    ids = index.get(value, ()) if index is not None else None
+                except TypeError:
+                    # Unhashable values cannot be looked up in an index
+                    ids = None
+                if ids is None:
+                    unindexed.append((path, value))
+                else:
+                    candidate_sets.append(ids)
+
+            if candidate_sets:
+                candidate_sets.sort(key=len)
+                ids = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+                candidates = [self._records[device_id] for device_id in ids]
+            else:
+                candidates = list(self._records.values())
+
+        return [
+            record
+            for record in candidates
+            if all(record.get(path, _missing) == value for path, value in unindexed)
+            and (predicate is None or predicate(record))
+        ]
+
+    def load(self):
+        """Discard the index and rebuild it from a full query of the IoTHub.
+
+        :returns: The number of twins loaded.
+        """
+        with self._lock:
+            self._records = {}
+            for index in self._indexes.values():
+                index.clear()
+            self.watermark = None
+        return self._apply(self._registry_manager.query_iter(FULL_QUERY, self._page_size))
+
+    def refresh(self):
+        """Fetch and index the twins that changed since the last load or refresh.
+
+        :returns: The number of twins added or updated.
+        """
+        if self.watermark is None:
+            return self.load()
+        query = WATERMARK_QUERY.format(watermark=Serializer.serialize_iso(self.watermark))
+        return self._apply(self._registry_manager.query_iter(query, self._page_size))
+
+    def reconcile(self):
+        """Compare the version of every twin with the index, re-reading those that changed
+        and removing devices that no longer exist.
+
+        Only device ids and versions are transferred for unchanged twins, so this is much
+        cheaper than load().
+
+        :returns: A tuple of the number of twins updated and the number removed.
+        """
+        versions = dict(
+            (twin.device_id, twin.version)
+            for twin in self._registry_manager.query_iter(VERSION_QUERY, self._page_size)
+        )
+        with self._lock:
+            removed = [device_id for device_id in self._records if device_id not in versions]
+            for device_id in removed:
+                self._remove(device_id)
+            changed = [
+                device_id
+                for device_id, version in versions.items()
+                if device_id not in self._records or self._records[device_id].version != version
+            ]
+
+        updated = 0
+        for chunk in fanout.chunked(changed, MAX_IDS_PER_QUERY):
+            query = DEVICE_IDS_QUERY.format(
+                device_ids=", ".join(quote_string(device_id) for device_id in chunk)
+            )
+            updated += self._apply(self._registry_manager.query_iter(query, self._page_size))
+        return updated, len(removed)
+
+    def _apply(self, twins):
+        count = 0
+        for twin in twins:
+            record = TwinRecord(twin)
+            watermark = max(
+                [
+                    t
+                    for t in (
+                        _parse_time(twin.last_activity_time),
+                        _last_updated(twin.properties.desired if twin.properties else None),
+                        _last_updated(twin.properties.reported if twin.properties else None),
+                    )
+                    if t is not None
+                ]
+                or [None]
+            )
+            with self._lock:
+                if watermark is not None and (self.watermark is None or watermark > self.watermark):
+                    self.watermark = watermark
+                existing = self._records.get(record.device_id)
+                if (
+                    existing is not None
+                    and existing.version == record.version
+                    and existing.last_activity_time == record.last_activity_time
+                ):
+                    continue
+                if existing is not None:
+                    self._remove(record.device_id)
+                self._records[record.device_id] = record
+                for path, index in self._indexes.items():
+                    value = record.get(path, _missing)
+                    if value is _missing:
+                        continue
+                    try:
+                        index.setdefault(value, set()).add(record.device_id)
+                    except TypeError:
+                        pass
+            count += 1
+        return count
+
+    def _remove(self, device_id):
+        """Remove a record and its index entries. The lock must be held."""
+        record = self._records.pop(device_id)
+        for path, index in self._indexes.items():
+            value = record.get(path, _missing)
+            try:
+                ids = index.get(value)
+            except TypeError:
+                continue
+            if ids is not None:
+                ids.discard(device_id)
+                if not ids:
+                    del index[value]
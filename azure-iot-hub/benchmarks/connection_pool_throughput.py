@@ -0,0 +1,66 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""Compare parallel get_twin throughput with and without a shared ConnectionPool.
+
+Several managers (e.g. one per tenant, or registry and configuration managers side by side)
+are called from a pool of worker threads over HTTPS. By default every request opens a new
+connection, paying for a TLS handshake each time; with a shared ConnectionPool the sockets
+are kept open and reused across managers and threads.
+
+Usage:
+    python connection_pool_throughput.py [--calls N] [--threads N] [--managers N] [--pool-size N]
+"""
+
+import argparse
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from azure.iot.hub import IoTHubRegistryManager
+from azure.iot.hub.connection_pool import ConnectionPool
+from stub_service import StubService, FAKE_CONNECTION_STRING, point_at
+
+
+def measure(managers, calls, threads):
+    cycle = itertools.cycle(managers)
+    targets = [(next(cycle), "device{}".format(i)) for i in range(calls)]
+    # Short lived worker threads, as in a typical request handler or job runner
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(lambda t: t[0].get_twin(t[1]), targets))
+    return calls / (time.time() - start)
+
+
+def run(args, connection_pool):
+    with StubService(tls=True) as stub:
+        managers = [
+            point_at(IoTHubRegistryManager(FAKE_CONNECTION_STRING, connection_pool), stub)
+            for _ in range(args.managers)
+        ]
+        rate = measure(managers, args.calls, args.threads)
+        return rate, stub.connection_count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="total number of calls")
+    parser.add_argument("--threads", type=int, default=16, help="number of calling threads")
+    parser.add_argument("--managers", type=int, default=4, help="number of managers")
+    parser.add_argument("--pool-size", type=int, default=16, help="shared pool size")
+    args = parser.parse_args()
+
+    results = [
+        ("per-manager connections", run(args, None)),
+        ("shared ConnectionPool", run(args, ConnectionPool(pool_size=args.pool_size))),
+    ]
+    print(
+        "{} calls, {} threads, {} managers, HTTPS".format(args.calls, args.threads, args.managers)
+    )
+    for name, (rate, connections) in results:
+        print("{:<25} {:>8.0f} calls/sec {:>6} connections".format(name, rate, connections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+"""A minimal in-process stand-in for the IoTHub service REST API, used to benchmark the
+service clients without any network or IoTHub dependency.
+
+Only the handful of routes needed by the benchmarks are implemented, and every response is
+canned. Routes can be added or overridden with StubService.add_route().
+
+With tls=True the stub serves HTTPS using a throwaway self-signed certificate, generated with
+the openssl command line tool.
+"""
+
+import json
+import os
+import re
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+
+FAKE_HOSTNAME = "benchmark.azure-devices.net"
+FAKE_CONNECTION_STRING = (
+    "HostName=" + FAKE_HOSTNAME + ";SharedAccessKeyName=iothubowner;SharedAccessKey=Zm9vYmFy"
+)
+
+
+def make_twin(device_id, version=1):
+    """Return a dictionary in the shape of a device twin as returned by the IoTHub"""
+    return {
+        "deviceId": device_id,
+        "etag": "AAAAAAAAAAE=",
+        "deviceEtag": "NzA0NjMxNjE2",
+        "status": "enabled",
+        "statusUpdateTime": "0001-01-01T00:00:00Z",
+        "connectionState": "Disconnected",
+        "lastActivityTime": "0001-01-01T00:00:00Z",
+        "cloudToDeviceMessageCount": 0,
+        "authenticationType": "sas",
+        "x509Thumbprint": {"primaryThumbprint": None, "secondaryThumbprint": None},
+        "version": version,
+        "tags": {"location": {"region": "US", "plant": "Redmond43"}},
+        "properties": {
+            "desired": {"telemetryInterval": 30, "$metadata": {}, "$version": version},
+            "reported": {"telemetryInterval": 30, "$metadata": {}, "$version": version},
+        },
+        "capabilities": {"iotEdge": False},
+    }
+
+
+def make_device(device_id):
+    """Return a dictionary in the shape of a device identity as returned by the IoTHub"""
+    return {
+        "deviceId": device_id,
+        "generationId": "637000000000000000",
+        "etag": "NzA0NjMxNjE2",
+        "connectionState": "Disconnected",
+        "status": "enabled",
+        "statusReason": None,
+        "connectionStateUpdatedTime": "0001-01-01T00:00:00Z",
+        "statusUpdatedTime": "0001-01-01T00:00:00Z",
+        "lastActivityTime": "0001-01-01T00:00:00Z",
+        "cloudToDeviceMessageCount": 0,
+        "authentication": {
+            "symmetricKey": {"primaryKey": "Zm9vYmFy", "secondaryKey": "Zm9vYmFy"},
+            "x509Thumbprint": {"primaryThumbprint": None, "secondaryThumbprint": None},
+            "type": "sas",
+        },
+        "capabilities": {"iotEdge": False},
+    }
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        path = self.path.split("?", 1)[0]
+        for method, pattern, handler in self.server.routes:
+            if method != self.command:
+                continue
+            match = pattern.match(path)
+            if match:
+                status, headers, payload = handler(self, match, body)
+                break
+        else:
+            status, headers, payload = 404, {}, {"Message": "Not Found"}
+
+        if not isinstance(payload, bytes):
+            payload = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.request_count += 1
+
+    do_GET = do_PUT = do_POST = do_PATCH = do_DELETE = _dispatch
+
+    def log_message(self, format, *args):
+        # Request logging would dominate the benchmark
+        pass
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 128
+    ssl_context = None
+
+    def get_request(self):
+        sock, address = self.socket.accept()
+        self.connection_count += 1
+        if self.ssl_context is not None:
+            sock = self.ssl_context.wrap_socket(sock, server_side=True)
+        return sock, address
+
+
+def _make_certificate(directory, host):
+    """Generate a self-signed certificate for host, returning (certfile, keyfile)"""
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    with open(os.devnull, "w") as devnull:
+        subprocess.check_call(
+            [
+                "openssl",
+                "req",
+                "-x509",
+                "-newkey",
+                "rsa:2048",
+                "-nodes",
+                "-days",
+                "1",
+                "-subj",
+                "/CN=" + host,
+                "-addext",
+                "subjectAltName=IP:" + host,
+                "-keyout",
+                keyfile,
+                "-out",
+                certfile,
+            ],
+            stdout=devnull,
+            stderr=devnull,
+        )
+    return certfile, keyfile
+
+
+class StubService(object):
+    """A threaded HTTP server answering a subset of the IoTHub service REST API.
+
+    Use as a context manager; base_url is only valid while the service is running.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, tls=False):
+        self._server = _ThreadingHTTPServer((host, port), _Handler)
+        self._server.routes = []
+        self._server.request_count = 0
+        self._server.connection_count = 0
+        self._thread = None
+        self._cert_dir = None
+        self.certfile = None
+        if tls:
+            self._cert_dir = tempfile.mkdtemp()
+            self.certfile, keyfile = _make_certificate(self._cert_dir, host)
+            context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            context.load_cert_chain(self.certfile, keyfile)
+            self._server.ssl_context = context
+
+        self.add_route("GET", r"/twins/(?P<id>[^/]+)$", self._get_twin)
+        self.add_route("PATCH", r"/twins/(?P<id>[^/]+)$", self._get_twin)
+        self.add_route("PUT", r"/twins/(?P<id>[^/]+)$", self._get_twin)
+        self.add_route("GET", r"/devices/(?P<id>[^/]+)$", self._get_device)
+        self.add_route("PUT", r"/devices/(?P<id>[^/]+)$", self._get_device)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        scheme = "http" if self._server.ssl_context is None else "https"
+        return "{}://{}:{}".format(scheme, host, port)
+
+    @property
+    def request_count(self):
+        return self._server.request_count
+
+    @property
+    def connection_count(self):
+        """The number of connections (and so, with TLS, handshakes) accepted so far"""
+        return self._server.connection_count
+
+    def add_route(self, method, pattern, handler):
+        """Add a route, taking priority over any existing route for the same path.
+
+        :param str method: The HTTP method to match.
+        :param str pattern: A regular expression matched against the request path.
+        :param handler: A callable taking (request_handler, match, body) and returning
+            a tuple of (status, headers, payload). The payload may be bytes or any
+            JSON-serializable object.
+        """
+        self._server.routes.insert(0, (method, re.compile(pattern), handler))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+        if self._cert_dir is not None:
+            shutil.rmtree(self._cert_dir)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @staticmethod
+    def _get_twin(request, match, body):
+        return 200, {"ETag": '"AAAAAAAAAAE="'}, make_twin(match.group("id"))
+
+    @staticmethod
+    def _get_device(request, match, body):
+        return 200, {"ETag": '"NzA0NjMxNjE2"'}, make_device(match.group("id"))
+
+
+def point_at(manager, stub):
+    """Redirect a service manager's protocol client at a running StubService"""
+    manager.protocol.config.base_url = stub.base_url
+    if stub.certfile is not None:
+        manager.protocol.config.connection.verify = stub.certfile
+    return manager
@@ -0,0 +1,37 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import sys
+import os
+from azure.iot.hub import IoTHubJobManager
+from azure.iot.hub.models import Twin, CloudToDeviceMethod
+
+iothub_connection_str = os.getenv("IOTHUB_CONNECTION_STRING")
+query_condition = "tags.building = '43'"
+
+try:
+    # Create IoTHubJobManager
+    iothub_job_manager = IoTHubJobManager(iothub_connection_str)
+
+    # Update the twin of every matching device; the IoTHub fans the update out
+    twin_patch = Twin(tags={"floor": 2}, etag="*")
+    job = iothub_job_manager.schedule_twin_update(query_condition, twin_patch)
+    job = iothub_job_manager.wait_for_scheduled_job(job.job_id, timeout=600)
+    print("Twin update job {} finished with status {}".format(job.job_id, job.status))
+
+    # Invoke a direct method on every matching device
+    method = CloudToDeviceMethod(method_name="reboot", response_timeout_in_seconds=30)
+    job = iothub_job_manager.schedule_device_method(query_condition, method)
+    job = iothub_job_manager.wait_for_scheduled_job(job.job_id, timeout=600)
+    print("Method job {} finished with status {}".format(job.job_id, job.status))
+
+    for result in iothub_job_manager.iter_device_job_results(job.job_id):
+        print("{}: {} {}".format(result.device_id, result.status, result.outcome or result.error))
+
+except Exception as ex:
+    print("Unexpected error {0}".format(ex))
+except KeyboardInterrupt:
+    print("iothub_job_manager_sample stopped")
@@ -0,0 +1,34 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import asyncio
+import os
+from azure.iot.hub.aio import IoTHubRegistryManager
+
+
+iothub_connection_str = os.getenv("IOTHUB_CONNECTION_STRING")
+device_ids = ["device{}".format(i) for i in range(100)]
+
+
+async def main():
+    # At most 16 requests will be in flight at once; the rest wait their turn
+    async with IoTHubRegistryManager(iothub_connection_str, max_concurrency=16) as registry_manager:
+        twins = await asyncio.gather(
+            *[registry_manager.get_twin(device_id) for device_id in device_ids],
+            return_exceptions=True
+        )
+        for device_id, twin in zip(device_ids, twins):
+            if isinstance(twin, Exception):
+                print("{}: error {}".format(device_id, twin))
+            else:
+                print("{}: twin version {}".format(device_id, twin.version))
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.get_event_loop().run_until_complete(main())
+    except KeyboardInterrupt:
+        print("iothub_registry_manager_async_sample stopped")
@@ -78,6 +78,24 @@ try:
 
     iothub_registry_manager.bulk_create_or_update_devices(device_list)
 
+    # Create more devices than a single bulk operation allows. The devices are generated
+    # lazily and sent 100 at a time, with up to 8 bulk operations in flight at once.
+    many_devices = (
+        ExportImportDevice(id="BulkDevice{0}".format(i), status="enabled", import_mode="create")
+        for i in range(3, 1003)
+    )
+    result = iothub_registry_manager.bulk_create_or_update_devices_chunked(many_devices)
+    print("Created 1000 devices, success: {0}".format(result.is_successful))
+    for error in result.errors:
+        print("{0}: {1} {2}".format(error.device_id, error.error_code, error.error_status))
+
+    # Delete them again
+    many_devices = (
+        ExportImportDevice(id="BulkDevice{0}".format(i), import_mode="delete")
+        for i in range(3, 1003)
+    )
+    iothub_registry_manager.bulk_create_or_update_devices_chunked(many_devices)
+
 except Exception as ex:
     print("Unexpected error {0}".format(ex))
 except KeyboardInterrupt:
@@ -0,0 +1,49 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import sys
+import os
+from azure.iot.hub import IoTHubRegistryManager
+from azure.iot.hub.import_export import write_import_file, iter_exported_devices
+from azure.iot.hub.models import ExportImportDevice
+
+iothub_connection_str = os.getenv("IOTHUB_CONNECTION_STRING")
+# SAS URIs of blob containers the IoTHub can read from and write to
+input_container_uri = os.getenv("IOTHUB_IMPORT_CONTAINER_URI")
+output_container_uri = os.getenv("IOTHUB_EXPORT_CONTAINER_URI")
+
+
+def generate_devices(count):
+    for i in range(count):
+        yield ExportImportDevice(id="ImportedDevice{}".format(i), import_mode="create")
+
+
+try:
+    # Create IoTHubRegistryManager
+    iothub_registry_manager = IoTHubRegistryManager(iothub_connection_str)
+
+    # Stream the identities into an import file, without holding them all in memory.
+    # Upload this file as devices.txt to the input container before submitting the job.
+    count = write_import_file(generate_devices(10000), "devices.txt")
+    print("Wrote {} devices to devices.txt".format(count))
+
+    job = iothub_registry_manager.import_devices(input_container_uri, output_container_uri)
+    job = iothub_registry_manager.wait_for_import_export_job(job.job_id, timeout=3600)
+    print("Import job {} finished with status {}".format(job.job_id, job.status))
+
+    job = iothub_registry_manager.export_devices(output_container_uri)
+    job = iothub_registry_manager.wait_for_import_export_job(job.job_id, timeout=3600)
+    print("Export job {} finished with status {}".format(job.job_id, job.status))
+
+    # Download devices.txt from the output container, then parse it a line at a time
+    if os.path.exists("exported_devices.txt"):
+        for device in iter_exported_devices("exported_devices.txt"):
+            print("{} ({})".format(device.id, device.status))
+
+except Exception as ex:
+    print("Unexpected error {0}".format(ex))
+except KeyboardInterrupt:
+    print("iothub_registry_manager_import_export_sample stopped")
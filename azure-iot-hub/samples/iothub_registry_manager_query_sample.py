@@ -73,6 +73,15 @@ try:
         )
         print_query_result("Query all device twins - continued", query_result2)
 
+    # Iterate over every device twin without handling continuation tokens, 100 per page.
+    # The next page is fetched in the background while the current one is printed.
+    for x, twin in enumerate(iothub_registry_manager.query_iter(query_specification, 100)):
+        print_twin("Iterated device twin: {0}".format(x + 1), twin)
+
+    # Stream every device twin to a newline-delimited JSON file
+    count = iothub_registry_manager.query_to_ndjson(query_specification, "twins.ndjson", 1000)
+    print("Wrote {0} device twins to twins.ndjson".format(count))
+
 
 except Exception as ex:
     print("Unexpected error {0}".format(ex))
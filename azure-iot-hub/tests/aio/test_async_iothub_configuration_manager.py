@@ -0,0 +1,156 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+from azure.iot.hub.aio import IoTHubConfigurationManager
+
+pytestmark = pytest.mark.asyncio
+
+"""---Constants---"""
+
+fake_shared_access_key = "Zm9vYmFy"
+fake_shared_access_key_name = "alohomora"
+fake_hostname = "beauxbatons.academy-net"
+fake_device_id = "MyPensieve"
+fake_etag = "taggedbymisnitryofmagic"
+fake_configuration_id = "fake_configuration_id"
+
+
+class fake_configuration_object:
+    id = fake_configuration_id
+
+
+fake_configuration = fake_configuration_object()
+fake_max_count = 42
+fake_configuration_queries = "fake_configuration_queries"
+fake_configuration_content = "fake_configuration_content"
+
+
+"""----Shared fixtures----"""
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_configuration_operations(mocker):
+    mock_configuration_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.aio.iot_hub_gateway_service_ap_is_async.ConfigurationOperations",
+        autospec=True,
+    )
+    return mock_configuration_operations_init.return_value
+
+
+@pytest.fixture(scope="function")
+def iothub_configuration_manager():
+    connection_string = "HostName={hostname};SharedAccessKeyName={skn};SharedAccessKey={sk}".format(
+        hostname=fake_hostname, skn=fake_shared_access_key_name, sk=fake_shared_access_key
+    )
+    return IoTHubConfigurationManager(connection_string)
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .get_configuration()")
+class TestGetConfiguration(object):
+    @pytest.mark.it("Gets configuration")
+    async def test_get(self, mocker, mock_configuration_operations, iothub_configuration_manager):
+        ret_val = await iothub_configuration_manager.get_configuration(fake_configuration_id)
+
+        assert mock_configuration_operations.get.await_count == 1
+        assert mock_configuration_operations.get.call_args == mocker.call(fake_configuration_id)
+        assert ret_val is mock_configuration_operations.get.return_value
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .create_configuration()")
+class TestCreateConfiguration(object):
+    @pytest.mark.it("Creates configuration")
+    async def test_create_configuration(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.create_configuration(fake_configuration)
+
+        assert mock_configuration_operations.create_or_update.await_count == 1
+        assert mock_configuration_operations.create_or_update.call_args == mocker.call(
+            fake_configuration_id, fake_configuration
+        )
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .update_configuration()")
+class TestUpdateConfiguration(object):
+    @pytest.mark.it("Updates configuration")
+    async def test_update_configuration(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.update_configuration(fake_configuration, fake_etag)
+
+        assert mock_configuration_operations.create_or_update.await_count == 1
+        assert mock_configuration_operations.create_or_update.call_args == mocker.call(
+            fake_configuration_id, fake_configuration, fake_etag
+        )
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .delete_configuration()")
+class TestDeleteConfiguration(object):
+    @pytest.mark.it("Deletes configuration")
+    async def test_delete_configuration(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.delete_configuration(fake_configuration_id)
+
+        assert mock_configuration_operations.delete.await_count == 1
+        assert mock_configuration_operations.delete.call_args == mocker.call(
+            fake_configuration_id, "*"
+        )
+
+    @pytest.mark.it("Deletes configuration with an etag")
+    async def test_delete_configuration_with_etag(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.delete_configuration(fake_configuration_id, fake_etag)
+
+        assert mock_configuration_operations.delete.call_args == mocker.call(
+            fake_configuration_id, fake_etag
+        )
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .get_configurations()")
+class TestGetConfigurations(object):
+    @pytest.mark.it("Gets configuration")
+    async def test_get_configurations(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.get_configurations(fake_max_count)
+
+        assert mock_configuration_operations.get_configurations.await_count == 1
+        assert mock_configuration_operations.get_configurations.call_args == mocker.call(
+            fake_max_count
+        )
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .test_configuration_queries()")
+class TestTestConfigurationQueries(object):
+    @pytest.mark.it("Test test_configuration_queries")
+    async def test_test_configuration_queries(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.test_configuration_queries(fake_configuration_queries)
+
+        assert mock_configuration_operations.test_queries.await_count == 1
+        assert mock_configuration_operations.test_queries.call_args == mocker.call(
+            fake_configuration_queries
+        )
+
+
+@pytest.mark.describe("IoTHubConfigurationManager (Async) - .apply_configuration_on_edge_device()")
+class TestApplyConfigurationOnEdgeDevice(object):
+    @pytest.mark.it("Test apply configuration on edge device")
+    async def test_apply_on_edge_device(
+        self, mocker, mock_configuration_operations, iothub_configuration_manager
+    ):
+        await iothub_configuration_manager.apply_configuration_on_edge_device(
+            fake_device_id, fake_configuration_content
+        )
+
+        assert mock_configuration_operations.apply_on_edge_device.await_count == 1
+        assert mock_configuration_operations.apply_on_edge_device.call_args == mocker.call(
+            fake_device_id, fake_configuration_content
+        )
@@ -0,0 +1,423 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import asyncio
+from azure.iot.hub.protocol.models import AuthenticationMechanism
+from azure.iot.hub.aio import IoTHubRegistryManager
+from azure.iot.hub.aio.async_connection import PooledRequestsHTTPSender
+
+pytestmark = pytest.mark.asyncio
+
+"""---Constants---"""
+
+fake_shared_access_key = "Zm9vYmFy"
+fake_shared_access_key_name = "alohomora"
+fake_primary_key = "petrificus"
+fake_secondary_key = "totalus"
+fake_primary_thumbprint = "HELFKCPOXAIR9PVNOA3"
+fake_secondary_thumbprint = "RGSHARLU4VYYFENINUF"
+fake_hostname = "beauxbatons.academy-net"
+fake_device_id = "MyPensieve"
+fake_module_id = "Divination"
+fake_managed_by = "Hogwarts"
+fake_etag = "taggedbymisnitryofmagic"
+fake_status = "flying"
+fake_devices = "fake_devices"
+fake_query_specification = "fake_query_specification"
+fake_continuation_token = "fake_continuation_token"
+fake_max_item_count = 42
+fake_device_twin = "fake_device_twin"
+fake_module_twin = "fake_module_twin"
+fake_direct_method_request = "fake_direct_method_request"
+fake_connection_string = (
+    "HostName={hostname};SharedAccessKeyName={skn};SharedAccessKey={sk}".format(
+        hostname=fake_hostname, skn=fake_shared_access_key_name, sk=fake_shared_access_key
+    )
+)
+
+"""----Shared fixtures----"""
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_registry_manager_operations(mocker):
+    mock_registry_manager_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.aio.iot_hub_gateway_service_ap_is_async.RegistryManagerOperations",
+        autospec=True,
+    )
+    return mock_registry_manager_operations_init.return_value
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_twin_operations(mocker):
+    mock_twin_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.aio.iot_hub_gateway_service_ap_is_async.TwinOperations",
+        autospec=True,
+    )
+    return mock_twin_operations_init.return_value
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_device_method_operations(mocker):
+    mock_device_method_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.aio.iot_hub_gateway_service_ap_is_async.DeviceMethodOperations",
+        autospec=True,
+    )
+    return mock_device_method_operations_init.return_value
+
+
+@pytest.fixture(scope="function")
+def iothub_registry_manager():
+    return IoTHubRegistryManager(fake_connection_string)
+
+
+@pytest.fixture(scope="function")
+def mock_device_constructor(mocker):
+    return mocker.patch("azure.iot.hub.aio.async_iothub_registry_manager.Device")
+
+
+@pytest.fixture(scope="function")
+def mock_module_constructor(mocker):
+    return mocker.patch("azure.iot.hub.aio.async_iothub_registry_manager.Module")
+
+
+@pytest.mark.describe("IoTHubRegistryManager (Async) - Instantiation")
+class TestInstantiation(object):
+    @pytest.mark.it("Sends requests with a pooled HTTP sender sized to max_concurrency")
+    @pytest.mark.parametrize("max_concurrency", [1, 32, 100])
+    async def test_pooled_sender(self, max_concurrency):
+        manager = IoTHubRegistryManager(fake_connection_string, max_concurrency=max_concurrency)
+        driver = manager.protocol.config.pipeline._sender.driver
+        assert isinstance(driver, PooledRequestsHTTPSender)
+        assert driver.pool_size == max_concurrency
+        assert driver.session.get_adapter("https://" + fake_hostname)._pool_maxsize == (
+            max_concurrency
+        )
+        assert manager._limiter.max_concurrency == max_concurrency
+        await manager.close()
+
+    @pytest.mark.it("Raises ValueError if max_concurrency is less than 1")
+    async def test_invalid_max_concurrency(self):
+        with pytest.raises(ValueError):
+            IoTHubRegistryManager(fake_connection_string, max_concurrency=0)
+
+
+@pytest.mark.describe("IoTHubRegistryManager (Async) - .create_device_with_sas()")
+class TestCreateDeviceWithSymmetricKey(object):
+    @pytest.mark.it("Initializes device with device id, status and sas auth")
+    async def test_initializes_device_with_kwargs_for_sas(
+        self, iothub_registry_manager, mock_device_constructor
+    ):
+        await iothub_registry_manager.create_device_with_sas(
+            device_id=fake_device_id,
+            status=fake_status,
+            primary_key=fake_primary_key,
+            secondary_key=fake_secondary_key,
+        )
+
+        assert mock_device_constructor.call_count == 1
+        assert mock_device_constructor.call_args[1]["device_id"] == fake_device_id
+        assert mock_device_constructor.call_args[1]["status"] == fake_status
+        auth_mechanism = mock_device_constructor.call_args[1]["authentication"]
+        assert isinstance(auth_mechanism, AuthenticationMechanism)
+        assert auth_mechanism.type == "sas"
+        assert auth_mechanism.symmetric_key.primary_key == fake_primary_key
+        assert auth_mechanism.symmetric_key.secondary_key == fake_secondary_key
+
+    @pytest.mark.it("Awaits create_or_update_device with device id and the constructed device")
+    async def test_calls_create_or_update_device(
+        self,
+        mocker,
+        mock_device_constructor,
+        mock_registry_manager_operations,
+        iothub_registry_manager,
+    ):
+        ret_val = await iothub_registry_manager.create_device_with_sas(
+            device_id=fake_device_id,
+            status=fake_status,
+            primary_key=fake_primary_key,
+            secondary_key=fake_secondary_key,
+        )
+
+        assert mock_registry_manager_operations.create_or_update_device.await_count == 1
+        assert mock_registry_manager_operations.create_or_update_device.call_args == mocker.call(
+            fake_device_id, mock_device_constructor.return_value
+        )
+        assert ret_val is mock_registry_manager_operations.create_or_update_device.return_value
+
+
+@pytest.mark.describe("IoTHubRegistryManager (Async) - .update_module_with_x509()")
+class TestUpdateModuleWithX509(object):
+    @pytest.mark.it("Initializes module with device id, module id, managed_by, etag and X509 auth")
+    async def test_initializes_module_with_kwargs_for_x509(
+        self, iothub_registry_manager, mock_module_constructor
+    ):
+        await iothub_registry_manager.update_module_with_x509(
+            device_id=fake_device_id,
+            module_id=fake_module_id,
+            managed_by=fake_managed_by,
+            etag=fake_etag,
+            primary_thumbprint=fake_primary_thumbprint,
+            secondary_thumbprint=fake_secondary_thumbprint,
+        )
+
+        assert mock_module_constructor.call_count == 1
+        assert mock_module_constructor.call_args[1]["device_id"] == fake_device_id
+        assert mock_module_constructor.call_args[1]["module_id"] == fake_module_id
+        assert mock_module_constructor.call_args[1]["managed_by"] == fake_managed_by
+        assert mock_module_constructor.call_args[1]["etag"] == fake_etag
+        auth_mechanism = mock_module_constructor.call_args[1]["authentication"]
+        assert auth_mechanism.type == "selfSigned"
+        assert auth_mechanism.x509_thumbprint.primary_thumbprint == fake_primary_thumbprint
+        assert auth_mechanism.x509_thumbprint.secondary_thumbprint == fake_secondary_thumbprint
+
+    @pytest.mark.it("Awaits create_or_update_module with device id, module id and the module")
+    async def test_calls_create_or_update_module(
+        self,
+        mocker,
+        mock_module_constructor,
+        mock_registry_manager_operations,
+        iothub_registry_manager,
+    ):
+        await iothub_registry_manager.update_module_with_x509(
+            device_id=fake_device_id,
+            module_id=fake_module_id,
+            managed_by=fake_managed_by,
+            etag=fake_etag,
+            primary_thumbprint=fake_primary_thumbprint,
+            secondary_thumbprint=fake_secondary_thumbprint,
+        )
+
+        assert mock_registry_manager_operations.create_or_update_module.call_args == mocker.call(
+            fake_device_id, fake_module_id, mock_module_constructor.return_value
+        )
+
+
+@pytest.mark.describe("IoTHubRegistryManager (Async) - Pass-through operations")
+class TestPassThroughOperations(object):
+    @pytest.mark.it("Awaits the corresponding protocol operation and returns its result")
+    @pytest.mark.parametrize(
+        "method_name, args, operations, operation_name, expected_args",
+        [
+            pytest.param(
+                "get_device",
+                (fake_device_id,),
+                "registry_manager",
+                "get_device",
+                (fake_device_id,),
+                id="get_device",
+            ),
+            pytest.param(
+                "delete_device",
+                (fake_device_id,),
+                "registry_manager",
+                "delete_device",
+                (fake_device_id, "*"),
+                id="delete_device (default etag)",
+            ),
+            pytest.param(
+                "delete_device",
+                (fake_device_id, fake_etag),
+                "registry_manager",
+                "delete_device",
+                (fake_device_id, fake_etag),
+                id="delete_device (etag)",
+            ),
+            pytest.param(
+                "get_module",
+                (fake_device_id, fake_module_id),
+                "registry_manager",
+                "get_module",
+                (fake_device_id, fake_module_id),
+                id="get_module",
+            ),
+            pytest.param(
+                "get_modules",
+                (fake_device_id,),
+                "registry_manager",
+                "get_modules_on_device",
+                (fake_device_id,),
+                id="get_modules",
+            ),
+            pytest.param(
+                "delete_module",
+                (fake_device_id, fake_module_id),
+                "registry_manager",
+                "delete_module",
+                (fake_device_id, fake_module_id, "*"),
+                id="delete_module",
+            ),
+            pytest.param(
+                "get_service_statistics",
+                (),
+                "registry_manager",
+                "get_service_statistics",
+                (),
+                id="get_service_statistics",
+            ),
+            pytest.param(
+                "get_device_registry_statistics",
+                (),
+                "registry_manager",
+                "get_device_statistics",
+                (),
+                id="get_device_registry_statistics",
+            ),
+            pytest.param(
+                "get_devices",
+                (fake_max_item_count,),
+                "registry_manager",
+                "get_devices",
+                (fake_max_item_count,),
+                id="get_devices",
+            ),
+            pytest.param(
+                "bulk_create_or_update_devices",
+                (fake_devices,),
+                "registry_manager",
+                "bulk_device_crud",
+                (fake_devices,),
+                id="bulk_create_or_update_devices",
+            ),
+            pytest.param(
+                "get_twin",
+                (fake_device_id,),
+                "twin",
+                "get_device_twin",
+                (fake_device_id,),
+                id="get_twin",
+            ),
+            pytest.param(
+                "replace_twin",
+                (fake_device_id, fake_device_twin),
+                "twin",
+                "replace_device_twin",
+                (fake_device_id, fake_device_twin),
+                id="replace_twin",
+            ),
+            pytest.param(
+                "update_twin",
+                (fake_device_id, fake_device_twin, fake_etag),
+                "twin",
+                "update_device_twin",
+                (fake_device_id, fake_device_twin, fake_etag),
+                id="update_twin",
+            ),
+            pytest.param(
+                "get_module_twin",
+                (fake_device_id, fake_module_id),
+                "twin",
+                "get_module_twin",
+                (fake_device_id, fake_module_id),
+                id="get_module_twin",
+            ),
+            pytest.param(
+                "update_module_twin",
+                (fake_device_id, fake_module_id, fake_module_twin, fake_etag),
+                "twin",
+                "update_module_twin",
+                (fake_device_id, fake_module_id, fake_module_twin, fake_etag),
+                id="update_module_twin",
+            ),
+            pytest.param(
+                "invoke_device_method",
+                (fake_device_id, fake_direct_method_request),
+                "device_method",
+                "invoke_device_method",
+                (fake_device_id, fake_direct_method_request),
+                id="invoke_device_method",
+            ),
+            pytest.param(
+                "invoke_device_module_method",
+                (fake_device_id, fake_module_id, fake_direct_method_request),
+                "device_method",
+                "invoke_module_method",
+                (fake_device_id, fake_module_id, fake_direct_method_request),
+                id="invoke_device_module_method",
+            ),
+        ],
+    )
+    async def test_pass_through(
+        self,
+        mocker,
+        iothub_registry_manager,
+        method_name,
+        args,
+        operations,
+        operation_name,
+        expected_args,
+    ):
+        operation = getattr(getattr(iothub_registry_manager.protocol, operations), operation_name)
+
+        ret_val = await getattr(iothub_registry_manager, method_name)(*args)
+
+        assert operation.await_count == 1
+        assert operation.call_args == mocker.call(*expected_args)
+        if not method_name.startswith("delete_"):
+            assert ret_val is operation.return_value
+
+
+@pytest.mark.describe("IoTHubRegistryManager (Async) - .query_iot_hub()")
+class TestQueryIoTHub(object):
+    @pytest.mark.it("Awaits query_iot_hub requesting the raw response")
+    async def test_query_iot_hub(
+        self, mocker, mock_registry_manager_operations, iothub_registry_manager
+    ):
+        await iothub_registry_manager.query_iot_hub(
+            fake_query_specification, fake_continuation_token, fake_max_item_count
+        )
+
+        assert mock_registry_manager_operations.query_iot_hub.call_args == mocker.call(
+            fake_query_specification, fake_continuation_token, fake_max_item_count, None, True
+        )
+
+    @pytest.mark.it("Returns a QueryResult built from the raw response headers and output")
+    async def test_query_result(self, mock_registry_manager_operations, iothub_registry_manager):
+        raw_response = mock_registry_manager_operations.query_iot_hub.return_value
+        raw_response.headers = {
+            "x-ms-item-type": "twin",
+            "x-ms-continuation": fake_continuation_token,
+        }
+
+        result = await iothub_registry_manager.query_iot_hub(fake_query_specification)
+
+        assert result.type == "twin"
+        assert result.continuation_token == fake_continuation_token
+        assert result.items is raw_response.output
+
+
+@pytest.mark.describe("IoTHubRegistryManager (Async) - Concurrency")
+class TestConcurrency(object):
+    @pytest.mark.it("Never has more than max_concurrency operations in flight")
+    async def test_limits_concurrency(self, mock_twin_operations):
+        manager = IoTHubRegistryManager(fake_connection_string, max_concurrency=3)
+        in_flight = [0]
+        peak = [0]
+
+        async def slow_get_device_twin(device_id):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+            return device_id
+
+        manager.protocol.twin.get_device_twin.side_effect = slow_get_device_twin
+
+        results = await asyncio.gather(*[manager.get_twin("device{}".format(i)) for i in range(20)])
+
+        assert results == ["device{}".format(i) for i in range(20)]
+        assert peak[0] == 3
+        await manager.close()
+
+    @pytest.mark.it("Releases the limiter when an operation raises")
+    async def test_releases_on_error(self, mock_twin_operations):
+        manager = IoTHubRegistryManager(fake_connection_string, max_concurrency=1)
+        manager.protocol.twin.get_device_twin.side_effect = ValueError()
+
+        for _ in range(3):
+            with pytest.raises(ValueError):
+                await manager.get_twin(fake_device_id)
+        await manager.close()
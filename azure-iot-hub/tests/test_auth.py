@@ -0,0 +1,150 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import threading
+import requests
+from azure.iot.hub.auth import ConnectionStringAuthentication
+
+"""---Constants---"""
+
+fake_hostname = "beauxbatons.academy-net"
+fake_shared_access_key_name = "alohomora"
+fake_shared_access_key = "Zm9vYmFy"
+fake_connection_string = "HostName={};SharedAccessKeyName={};SharedAccessKey={}".format(
+    fake_hostname, fake_shared_access_key_name, fake_shared_access_key
+)
+fake_now = 1000000
+
+"""----Shared fixtures----"""
+
+
+@pytest.fixture(scope="function")
+def mock_time(mocker):
+    mock_time = mocker.patch("azure.iot.hub.auth.time")
+    mock_time.time.return_value = fake_now
+    return mock_time
+
+
+@pytest.fixture(scope="function")
+def mock_sastoken_time(mocker):
+    mock_time = mocker.patch("azure.iot.hub.sastoken.time")
+    mock_time.time.return_value = fake_now
+    return mock_time
+
+
+@pytest.fixture(scope="function")
+def auth(mock_time, mock_sastoken_time):
+    return ConnectionStringAuthentication(fake_connection_string)
+
+
+@pytest.mark.describe("ConnectionStringAuthentication - Instantiation")
+class TestConnectionStringAuthenticationInstantiation(object):
+    @pytest.mark.it("Uses a default token TTL of 3600 seconds and refresh margin of 300 seconds")
+    def test_defaults(self):
+        auth = ConnectionStringAuthentication(fake_connection_string)
+        assert auth.token_ttl == 3600
+        assert auth.token_refresh_margin == 300
+
+    @pytest.mark.it("Accepts a custom token TTL and refresh margin")
+    def test_custom_values(self):
+        auth = ConnectionStringAuthentication(
+            fake_connection_string, token_ttl=600, token_refresh_margin=60
+        )
+        assert auth.token_ttl == 600
+        assert auth.token_refresh_margin == 60
+
+    @pytest.mark.it("Raises a ValueError if the refresh margin is not less than the TTL")
+    @pytest.mark.parametrize("margin", [600, 601], ids=["Equal", "Greater"])
+    def test_invalid_margin(self, margin):
+        with pytest.raises(ValueError):
+            ConnectionStringAuthentication(
+                fake_connection_string, token_ttl=600, token_refresh_margin=margin
+            )
+
+    @pytest.mark.it("Does not generate a SasToken until one is needed")
+    def test_lazy_token(self, mocker):
+        mock_sastoken = mocker.patch("azure.iot.hub.auth.SasToken")
+        ConnectionStringAuthentication(fake_connection_string)
+        assert mock_sastoken.call_count == 0
+
+
+@pytest.mark.describe("ConnectionStringAuthentication - .signed_session()")
+class TestConnectionStringAuthenticationSignedSession(object):
+    @pytest.mark.it("Sets the Authorization header to a service SasToken for the IoTHub")
+    def test_sets_authorization_header(self, auth):
+        session = auth.signed_session()
+        token = session.headers["Authorization"]
+        assert token.startswith("SharedAccessSignature sr=" + fake_hostname)
+        assert "skn=" + fake_shared_access_key_name in token
+        assert "se=" + str(fake_now + 3600) in token
+
+    @pytest.mark.it("Configures and returns a provided session")
+    def test_uses_provided_session(self, auth):
+        session = requests.Session()
+        assert auth.signed_session(session) is session
+        assert "Authorization" in session.headers
+
+    @pytest.mark.it("Reuses the cached SasToken on subsequent calls")
+    def test_reuses_token(self, auth, mock_time):
+        first = auth.signed_session().headers["Authorization"]
+        mock_time.time.return_value = fake_now + 100
+        second = auth.signed_session().headers["Authorization"]
+        assert first == second
+
+    @pytest.mark.it("Only builds a single SasToken object across many calls")
+    def test_single_sastoken_construction(self, mocker, mock_time):
+        mock_sastoken = mocker.patch("azure.iot.hub.auth.SasToken")
+        mock_sastoken.return_value.expiry_time = fake_now + 3600
+        auth = ConnectionStringAuthentication(fake_connection_string)
+        for _ in range(10):
+            auth.signed_session()
+        assert mock_sastoken.call_count == 1
+        assert mock_sastoken.return_value.refresh.call_count == 0
+
+    @pytest.mark.it(
+        "Refreshes the cached SasToken once the current time is within the refresh margin of expiry"
+    )
+    @pytest.mark.parametrize(
+        "elapsed, expect_refresh",
+        [
+            pytest.param(3600 - 300 - 1, False, id="Before refresh margin"),
+            pytest.param(3600 - 300, True, id="At refresh margin"),
+            pytest.param(3600 + 1, True, id="After expiry"),
+        ],
+    )
+    def test_refreshes_token(self, auth, mock_time, mock_sastoken_time, elapsed, expect_refresh):
+        first = auth.signed_session().headers["Authorization"]
+        mock_time.time.return_value = fake_now + elapsed
+        mock_sastoken_time.time.return_value = fake_now + elapsed
+        second = auth.signed_session().headers["Authorization"]
+        if expect_refresh:
+            assert first != second
+            assert "se=" + str(fake_now + elapsed + 3600) in second
+        else:
+            assert first == second
+
+    @pytest.mark.it("Refreshes the SasToken only once when many threads request it concurrently")
+    def test_thread_safe_refresh(self, mocker, mock_time):
+        mock_sastoken = mocker.patch("azure.iot.hub.auth.SasToken")
+        mock_sastoken.return_value.expiry_time = fake_now + 3600
+        auth = ConnectionStringAuthentication(fake_connection_string)
+        auth.signed_session()
+        mock_time.time.return_value = fake_now + 3600
+
+        def refresh():
+            mock_sastoken.return_value.expiry_time = fake_now + 7200
+
+        mock_sastoken.return_value.refresh.side_effect = refresh
+
+        threads = [threading.Thread(target=auth.signed_session) for _ in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert mock_sastoken.call_count == 1
+        assert mock_sastoken.return_value.refresh.call_count == 1
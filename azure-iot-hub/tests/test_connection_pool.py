@@ -0,0 +1,123 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import threading
+import json
+import requests
+from azure.iot.hub.connection_pool import ConnectionPool
+from azure.iot.hub.iothub_registry_manager import IoTHubRegistryManager
+from azure.iot.hub.iothub_configuration_manager import IoTHubConfigurationManager
+
+"""---Constants---"""
+
+fake_connection_string = "HostName={};SharedAccessKeyName={};SharedAccessKey={}".format(
+    "beauxbatons.academy-net", "alohomora", "Zm9vYmFy"
+)
+other_connection_string = "HostName={};SharedAccessKeyName={};SharedAccessKey={}".format(
+    "hogwarts.academy-net", "alohomora", "Zm9vYmFy"
+)
+
+"""---Helpers---"""
+
+
+def get_session(manager):
+    """Return the requests Session the manager uses on the calling thread"""
+    return manager.protocol.config.pipeline._sender.driver.session
+
+
+@pytest.mark.describe("ConnectionPool - Instantiation")
+class TestConnectionPoolInstantiation(object):
+    @pytest.mark.it("Sizes the connection pool with the given pool size")
+    def test_pool_size(self):
+        pool = ConnectionPool(pool_size=64, pool_block=True)
+        assert pool.adapter._pool_maxsize == 64
+        assert pool.adapter._pool_block is True
+
+    @pytest.mark.it("Uses the msrest default retry configuration by default")
+    def test_default_retries(self):
+        assert ConnectionPool().adapter.max_retries.total == 3
+
+    @pytest.mark.it("Uses a given retry configuration")
+    def test_retries(self):
+        assert ConnectionPool(max_retries=7).adapter.max_retries.total == 7
+
+    @pytest.mark.it("Raises a ValueError if the pool size is less than 1")
+    def test_invalid_pool_size(self):
+        with pytest.raises(ValueError):
+            ConnectionPool(pool_size=0)
+
+
+@pytest.mark.describe("ConnectionPool - .attach()")
+class TestConnectionPoolAttach(object):
+    @pytest.mark.it("Makes managers send requests through the pool's adapter")
+    def test_mounts_adapter(self):
+        pool = ConnectionPool()
+        manager = IoTHubRegistryManager(fake_connection_string, connection_pool=pool)
+        session = get_session(manager)
+        assert session.get_adapter("https://beauxbatons.academy-net") is pool.adapter
+
+    @pytest.mark.it("Shares the adapter between managers, hubs and threads")
+    def test_shared(self):
+        pool = ConnectionPool()
+        registry_manager = IoTHubRegistryManager(fake_connection_string, connection_pool=pool)
+        configuration_manager = IoTHubConfigurationManager(
+            other_connection_string, connection_pool=pool
+        )
+        sessions = [get_session(registry_manager), get_session(configuration_manager)]
+
+        def get_thread_session():
+            sessions.append(get_session(registry_manager))
+
+        thread = threading.Thread(target=get_thread_session)
+        thread.start()
+        thread.join()
+
+        # Sessions (and so Authorization headers) are separate...
+        assert len(set(id(s) for s in sessions)) == 3
+        # ...but the connections are shared
+        for session in sessions:
+            assert session.get_adapter("https://hub") is pool.adapter
+
+    @pytest.mark.it("Leaves the pool's retry configuration in place")
+    def test_keeps_retries(self):
+        pool = ConnectionPool(max_retries=7)
+        get_session(IoTHubRegistryManager(fake_connection_string, connection_pool=pool))
+        assert pool.adapter.max_retries.total == 7
+
+    @pytest.mark.it("Stops msrest closing the shared connections after each request")
+    def test_msrest_keep_alive(self):
+        manager = IoTHubRegistryManager(fake_connection_string, connection_pool=ConnectionPool())
+        assert manager.protocol.config.keep_alive is True
+
+    @pytest.mark.it("Disables keep-alive if requested")
+    def test_keep_alive(self):
+        pool = ConnectionPool(keep_alive=False)
+        manager = IoTHubRegistryManager(fake_connection_string, connection_pool=pool)
+        assert get_session(manager).headers["Connection"] == "close"
+
+    @pytest.mark.it("Sends authenticated requests over the pool")
+    def test_sends_requests(self, mocker):
+        pool = ConnectionPool()
+        manager = IoTHubRegistryManager(fake_connection_string, connection_pool=pool)
+
+        def send(request, **kwargs):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers["Content-Type"] = "application/json"
+            response._content = json.dumps({"deviceId": "MyPensieve"}).encode("utf-8")
+            response.request = request
+            response.url = request.url
+            return response
+
+        mocker.patch.object(pool.adapter, "send", side_effect=send)
+
+        twin = manager.get_twin("MyPensieve")
+
+        assert twin.device_id == "MyPensieve"
+        request = pool.adapter.send.call_args[0][0]
+        assert request.url.startswith("https://beauxbatons.academy-net/twins/MyPensieve")
+        assert request.headers["Authorization"].startswith("SharedAccessSignature ")
@@ -0,0 +1,219 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import requests
+from msrest.exceptions import HttpOperationError
+from msrest.serialization import Deserializer
+from azure.iot.hub.etag_cache import ETagCache
+from azure.iot.hub.protocol.models import Device, Twin
+
+"""---Constants---"""
+
+fake_device_id = "MyPensieve"
+fake_module_id = "Divination"
+
+"""---Helpers---"""
+
+
+def make_http_error(status_code):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b""
+    return HttpOperationError(Deserializer(), response)
+
+
+class FakeHub(object):
+    """Answers reads like the IoTHub, honouring If-None-Match"""
+
+    def __init__(self):
+        self.objects = {}
+        self.requests = []
+
+    def getter(self, device_id, module_id=None):
+        def get(headers):
+            self.requests.append(headers)
+            value = self.objects[(device_id, module_id)]
+            if headers and headers["If-None-Match"] == '"{}"'.format(value.etag):
+                raise make_http_error(304)
+            return value
+
+        return get
+
+
+@pytest.fixture
+def hub():
+    return FakeHub()
+
+
+@pytest.mark.describe("ETagCache - .fetch()")
+class TestETagCacheFetch(object):
+    @pytest.mark.it("Fetches unconditionally on a miss")
+    def test_miss(self, hub):
+        cache = ETagCache()
+        hub.objects[(fake_device_id, None)] = Device(device_id=fake_device_id, etag="1")
+
+        device = cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+
+        assert device is hub.objects[(fake_device_id, None)]
+        assert hub.requests == [None]
+        assert cache.misses == 1
+        assert len(cache) == 1
+
+    @pytest.mark.it("Returns the cached object when the IoTHub responds 304 (Not Modified)")
+    def test_not_modified(self, hub):
+        cache = ETagCache()
+        original = Device(device_id=fake_device_id, etag="1")
+        hub.objects[(fake_device_id, None)] = original
+        cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+
+        device = cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+
+        assert device == original
+        assert hub.requests == [None, {"If-None-Match": '"1"'}]
+        assert cache.hits == 1
+
+    @pytest.mark.it("Returns a copy of the cached object, so changes to it are not cached")
+    def test_returns_copy(self, hub):
+        cache = ETagCache()
+        hub.objects[(fake_device_id, None)] = Twin(etag="1", tags={"floor": 1})
+        getter = hub.getter(fake_device_id)
+        first = cache.fetch("twin", fake_device_id, None, getter)
+        first.tags["floor"] = 2
+
+        second = cache.fetch("twin", fake_device_id, None, getter)
+        second.tags["floor"] = 3
+
+        assert cache.fetch("twin", fake_device_id, None, getter).tags == {"floor": 1}
+        assert cache.hits == 2
+
+    @pytest.mark.it("Stores and returns the new object when it has changed")
+    def test_modified(self, hub):
+        cache = ETagCache()
+        getter = hub.getter(fake_device_id)
+        hub.objects[(fake_device_id, None)] = Device(device_id=fake_device_id, etag="1")
+        cache.fetch("device", fake_device_id, None, getter)
+        changed = Device(device_id=fake_device_id, etag="2")
+        hub.objects[(fake_device_id, None)] = changed
+
+        assert cache.fetch("device", fake_device_id, None, getter) is changed
+        assert cache.fetch("device", fake_device_id, None, getter) == changed
+        assert hub.requests[-1] == {"If-None-Match": '"2"'}
+        assert cache.hits == 1
+
+    @pytest.mark.it("Does not quote an etag that is already an HTTP entity tag")
+    def test_quoted_etag(self, mocker):
+        cache = ETagCache()
+        get = mocker.MagicMock(return_value=Twin(etag='W/"5"'))
+        cache.fetch("twin", fake_device_id, None, get)
+        cache.fetch("twin", fake_device_id, None, get)
+
+        assert get.call_args == mocker.call({"If-None-Match": 'W/"5"'})
+
+    @pytest.mark.it("Raises errors other than 304 (Not Modified)")
+    def test_error(self, mocker):
+        cache = ETagCache()
+        get = mocker.MagicMock(side_effect=[Twin(etag="1"), make_http_error(404)])
+        cache.fetch("twin", fake_device_id, None, get)
+
+        with pytest.raises(HttpOperationError):
+            cache.fetch("twin", fake_device_id, None, get)
+
+    @pytest.mark.it("Does not cache objects without an etag")
+    def test_no_etag(self, mocker):
+        cache = ETagCache()
+        get = mocker.MagicMock(return_value=Twin())
+        cache.fetch("twin", fake_device_id, None, get)
+
+        assert len(cache) == 0
+
+    @pytest.mark.it("Keeps devices, modules and twins apart")
+    def test_kinds(self, hub):
+        cache = ETagCache()
+        hub.objects[(fake_device_id, None)] = Device(device_id=fake_device_id, etag="1")
+        hub.objects[(fake_device_id, fake_module_id)] = Twin(etag="1")
+        cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+        cache.fetch("twin", fake_device_id, None, hub.getter(fake_device_id))
+        cache.fetch(
+            "twin", fake_device_id, fake_module_id, hub.getter(fake_device_id, fake_module_id)
+        )
+
+        assert len(cache) == 3
+        assert hub.requests == [None, None, None]
+
+    @pytest.mark.it("Discards entries older than the ttl")
+    def test_ttl(self, mocker, hub):
+        mock_time = mocker.patch("azure.iot.hub.etag_cache.time.time", return_value=1000.0)
+        cache = ETagCache(ttl=60)
+        hub.objects[(fake_device_id, None)] = Device(device_id=fake_device_id, etag="1")
+        cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+
+        mock_time.return_value = 1061.0
+        cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+
+        assert hub.requests == [None, None]
+
+    @pytest.mark.it("Evicts the least recently used entry when full")
+    def test_lru(self, hub):
+        cache = ETagCache(max_size=2)
+        for device_id in ("a", "b", "c"):
+            hub.objects[(device_id, None)] = Device(device_id=device_id, etag="1")
+        cache.fetch("device", "a", None, hub.getter("a"))
+        cache.fetch("device", "b", None, hub.getter("b"))
+        cache.fetch("device", "a", None, hub.getter("a"))
+        cache.fetch("device", "c", None, hub.getter("c"))
+        del hub.requests[:]
+
+        cache.fetch("device", "a", None, hub.getter("a"))
+        cache.fetch("device", "b", None, hub.getter("b"))
+
+        assert hub.requests == [{"If-None-Match": '"1"'}, None]
+
+    @pytest.mark.it("Raises a ValueError if max_size is less than 1")
+    def test_bad_max_size(self):
+        with pytest.raises(ValueError):
+            ETagCache(max_size=0)
+
+
+@pytest.mark.describe("ETagCache - .invalidate()")
+class TestETagCacheInvalidate(object):
+    @pytest.fixture
+    def cache(self, hub):
+        cache = ETagCache()
+        hub.objects[(fake_device_id, None)] = Twin(etag="1")
+        hub.objects[(fake_device_id, fake_module_id)] = Twin(etag="1")
+        hub.objects[("other", None)] = Twin(etag="1")
+        cache.fetch("device", fake_device_id, None, hub.getter(fake_device_id))
+        cache.fetch("twin", fake_device_id, None, hub.getter(fake_device_id))
+        cache.fetch(
+            "twin", fake_device_id, fake_module_id, hub.getter(fake_device_id, fake_module_id)
+        )
+        cache.fetch("twin", "other", None, hub.getter("other"))
+        return cache
+
+    @pytest.mark.it("Discards a device and all of its modules")
+    def test_device(self, cache):
+        cache.invalidate(fake_device_id)
+
+        assert len(cache) == 1
+
+    @pytest.mark.it("Discards only the given module")
+    def test_module(self, cache):
+        cache.invalidate(fake_device_id, fake_module_id)
+
+        assert len(cache) == 3
+
+    @pytest.mark.it("Ignores devices that are not cached")
+    def test_not_cached(self, cache):
+        cache.invalidate("unknown")
+
+        assert len(cache) == 4
+
+    @pytest.mark.it("Discards everything on clear")
+    def test_clear(self, cache):
+        cache.clear()
+
+        assert len(cache) == 0
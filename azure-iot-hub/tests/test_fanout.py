@@ -0,0 +1,355 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import threading
+import time
+import requests
+from msrest.exceptions import HttpOperationError, ClientRequestError
+from azure.iot.hub import fanout
+
+"""---Helpers---"""
+
+
+def make_http_error(mocker, status_code, headers=None):
+    response = mocker.MagicMock()
+    response.status_code = status_code
+    response.headers = headers or {}
+    error = HttpOperationError.__new__(HttpOperationError)
+    error.response = response
+    return error
+
+
+@pytest.fixture(scope="function")
+def mock_sleep(mocker):
+    return mocker.patch("azure.iot.hub.fanout.time.sleep")
+
+
+@pytest.mark.describe("fanout - .is_throttled()")
+class TestIsThrottled(object):
+    @pytest.mark.it("Returns True for an HttpOperationError with status 429")
+    def test_throttled(self, mocker):
+        assert fanout.is_throttled(make_http_error(mocker, 429))
+
+    @pytest.mark.it("Returns False for other errors")
+    @pytest.mark.parametrize("status_code", [400, 404, 412, 500, 503])
+    def test_not_throttled(self, mocker, status_code):
+        assert not fanout.is_throttled(make_http_error(mocker, status_code))
+        assert not fanout.is_throttled(ValueError())
+
+
+@pytest.mark.describe("ThrottlingRetryPolicy")
+class TestThrottlingRetryPolicy(object):
+    @pytest.mark.it("Returns the result of a successful call without sleeping")
+    def test_success(self, mocker, mock_sleep):
+        fn = mocker.MagicMock(return_value="result")
+        policy = fanout.ThrottlingRetryPolicy()
+
+        assert policy.call(fn, 1, key=2) == "result"
+        assert fn.call_args == mocker.call(1, key=2)
+        assert mock_sleep.call_count == 0
+
+    @pytest.mark.it("Retries throttled calls until they succeed")
+    def test_retries_throttled(self, mocker, mock_sleep):
+        fn = mocker.MagicMock(
+            side_effect=[make_http_error(mocker, 429), make_http_error(mocker, 429), "result"]
+        )
+        policy = fanout.ThrottlingRetryPolicy()
+
+        assert policy.call(fn) == "result"
+        assert fn.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @pytest.mark.it("Raises the throttling error once max_retries is exhausted")
+    def test_retries_exhausted(self, mocker, mock_sleep):
+        error = make_http_error(mocker, 429)
+        fn = mocker.MagicMock(side_effect=error)
+        policy = fanout.ThrottlingRetryPolicy(max_retries=3)
+
+        with pytest.raises(HttpOperationError) as e_info:
+            policy.call(fn)
+        assert e_info.value is error
+        assert fn.call_count == 4
+
+    @pytest.mark.it("Raises other errors without retrying")
+    def test_other_error(self, mocker, mock_sleep):
+        error = make_http_error(mocker, 400)
+        fn = mocker.MagicMock(side_effect=error)
+
+        with pytest.raises(HttpOperationError):
+            fanout.ThrottlingRetryPolicy().call(fn)
+        assert fn.call_count == 1
+        assert mock_sleep.call_count == 0
+
+    @pytest.mark.it("Backs off exponentially with jitter, up to max_backoff")
+    def test_exponential_backoff(self, mocker):
+        policy = fanout.ThrottlingRetryPolicy(initial_backoff=1.0, max_backoff=10.0)
+        error = make_http_error(mocker, 429)
+        for attempt, expected in [(0, 1.0), (1, 2.0), (2, 4.0), (3, 8.0), (4, 10.0), (9, 10.0)]:
+            backoff = policy.get_backoff(attempt, error)
+            assert expected * 0.5 <= backoff <= expected
+
+    @pytest.mark.it("Uses the Retry-After header when present, up to max_backoff")
+    @pytest.mark.parametrize("retry_after, expected", [("3", 3.0), ("0.5", 0.5), ("120", 10.0)])
+    def test_retry_after(self, mocker, retry_after, expected):
+        policy = fanout.ThrottlingRetryPolicy(max_backoff=10.0)
+        error = make_http_error(mocker, 429, headers={"Retry-After": retry_after})
+        assert policy.get_backoff(0, error) == expected
+
+
+@pytest.mark.describe("fanout - .chunked()")
+class TestChunked(object):
+    @pytest.mark.it("Splits an iterable into lists of at most the given size")
+    @pytest.mark.parametrize(
+        "count, expected_sizes", [(0, []), (3, [3]), (10, [4, 4, 2]), (8, [4, 4])]
+    )
+    def test_chunks(self, count, expected_sizes):
+        chunks = list(fanout.chunked(iter(range(count)), 4))
+        assert [len(chunk) for chunk in chunks] == expected_sizes
+        assert [item for chunk in chunks for item in chunk] == list(range(count))
+
+
+@pytest.mark.describe("fanout - .run_bounded()")
+class TestRunBounded(object):
+    @pytest.mark.it("Yields every item with a future holding the result of calling fn on it")
+    def test_results(self):
+        results = dict(
+            (item, future.result())
+            for item, future in fanout.run_bounded(lambda x: x * 2, range(20))
+        )
+        assert results == dict((i, i * 2) for i in range(20))
+
+    @pytest.mark.it("Yields errors raised by fn through the future")
+    def test_errors(self):
+        def fn(item):
+            if item == 3:
+                raise ValueError(item)
+            return item
+
+        futures = dict(fanout.run_bounded(fn, range(5)))
+        with pytest.raises(ValueError):
+            futures[3].result()
+        assert futures[4].result() == 4
+
+    @pytest.mark.it("Never runs more than max_workers calls at once")
+    def test_bounded(self):
+        lock = threading.Lock()
+        state = {"in_flight": 0, "peak": 0}
+
+        def fn(item):
+            with lock:
+                state["in_flight"] += 1
+                state["peak"] = max(state["peak"], state["in_flight"])
+            time.sleep(0.005)
+            with lock:
+                state["in_flight"] -= 1
+
+        list(fanout.run_bounded(fn, range(30), max_workers=3))
+        assert state["peak"] == 3
+
+    @pytest.mark.it("Consumes the iterable lazily")
+    def test_lazy(self):
+        consumed = []
+
+        def items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+
+        iterator = fanout.run_bounded(lambda x: x, items(), max_workers=2)
+        next(iterator)
+        assert len(consumed) <= 4
+        iterator.close()
+        assert len(consumed) <= 4
+
+
+@pytest.mark.describe("Deadline - .remaining()")
+class TestDeadlineRemaining(object):
+    @pytest.mark.it("Returns the number of seconds left before the deadline")
+    def test_remaining(self, mocker):
+        mocker.patch("azure.iot.hub.fanout._monotonic", side_effect=[10, 12])
+        assert fanout.Deadline(5).remaining() == 3
+
+    @pytest.mark.it("Raises a DeadlineExceededError once the deadline has passed")
+    def test_exceeded(self, mocker):
+        mocker.patch("azure.iot.hub.fanout._monotonic", side_effect=[10, 15])
+        with pytest.raises(fanout.DeadlineExceededError):
+            fanout.Deadline(5).remaining()
+
+
+@pytest.mark.describe("MethodOutcome - .from_error()")
+class TestMethodOutcomeFromError(object):
+    @pytest.mark.it("Classifies a gateway timeout as timed out")
+    def test_gateway_timeout(self, mocker):
+        outcome = fanout.MethodOutcome.from_error("device", None, make_http_error(mocker, 504))
+        assert outcome.status == fanout.MethodOutcome.TIMED_OUT
+
+    @pytest.mark.it("Classifies a client side request timeout as timed out")
+    def test_request_timeout(self):
+        error = ClientRequestError("Error occurred in request.", requests.exceptions.ReadTimeout())
+        outcome = fanout.MethodOutcome.from_error("device", None, error)
+        assert outcome.status == fanout.MethodOutcome.TIMED_OUT
+
+    @pytest.mark.it("Classifies an exceeded deadline as timed out")
+    def test_deadline_exceeded(self):
+        error = fanout.DeadlineExceededError()
+        outcome = fanout.MethodOutcome.from_error("device", None, error)
+        assert outcome.status == fanout.MethodOutcome.TIMED_OUT
+
+    @pytest.mark.it("Classifies a DeviceNotOnline error as offline")
+    def test_offline(self, mocker):
+        error = make_http_error(mocker, 404)
+        error.response.text = '{"Message":"{\\"errorCode\\":404103}"}'
+        outcome = fanout.MethodOutcome.from_error("device", "module", error)
+        assert outcome.status == fanout.MethodOutcome.OFFLINE
+        assert outcome.device_id == "device"
+        assert outcome.module_id == "module"
+        assert outcome.error is error
+
+    @pytest.mark.it("Classifies any other error as failed")
+    def test_failed(self, mocker):
+        error = make_http_error(mocker, 404)
+        error.response.text = '{"Message":"{\\"errorCode\\":404001}"}'
+        assert fanout.MethodOutcome.from_error("d", None, error).status == "failed"
+        assert fanout.MethodOutcome.from_error("d", None, ValueError()).status == "failed"
+
+
+@pytest.mark.describe("MethodFanout")
+class TestMethodFanout(object):
+    @pytest.mark.it("Invokes the method on every target, streaming an outcome for each")
+    def test_outcomes(self, mocker):
+        invoke = mocker.MagicMock(side_effect=lambda device_id, module_id: device_id)
+        method_fanout = fanout.MethodFanout(invoke, ["d0", ("d1", "m1"), "d2"], max_workers=2)
+
+        outcomes = sorted(method_fanout, key=lambda o: o.device_id)
+
+        assert [(o.device_id, o.module_id, o.result) for o in outcomes] == [
+            ("d0", None, "d0"),
+            ("d1", "m1", "d1"),
+            ("d2", None, "d2"),
+        ]
+        assert invoke.call_count == 3
+
+    @pytest.mark.it("Counts successes, timeouts, offline devices and failures")
+    def test_counts(self, mocker):
+        offline = make_http_error(mocker, 404)
+        offline.response.text = "404103"
+        errors = {
+            "timeout": make_http_error(mocker, 504),
+            "offline": offline,
+            "failed": make_http_error(mocker, 500),
+        }
+
+        def invoke(device_id, module_id):
+            if device_id in errors:
+                raise errors[device_id]
+            return "result"
+
+        method_fanout = fanout.MethodFanout(
+            invoke, ["ok0", "ok1", "timeout", "offline", "failed"]
+        ).wait()
+
+        assert method_fanout.succeeded == 2
+        assert method_fanout.timed_out == 1
+        assert method_fanout.offline == 1
+        assert method_fanout.failed == 1
+        assert method_fanout.total == 5
+
+    @pytest.mark.it("Stops invoking the method once closed")
+    def test_close(self, mocker):
+        invoke = mocker.MagicMock(return_value="result")
+        method_fanout = fanout.MethodFanout(invoke, ("d{}".format(i) for i in range(100)), 1)
+        next(iter(method_fanout))
+        method_fanout.close()
+        assert invoke.call_count < 100
+
+
+class FakeTwin(object):
+    def __init__(self, device_id, etag, module_id=None):
+        self.device_id = device_id
+        self.module_id = module_id
+        self.etag = etag
+
+
+@pytest.mark.describe("TwinUpdateFanout")
+class TestTwinUpdateFanout(object):
+    @pytest.fixture
+    def get_twin(self, mocker):
+        return mocker.MagicMock(side_effect=lambda device_id, module_id: FakeTwin(device_id, "e1"))
+
+    @pytest.fixture
+    def update_twin(self, mocker):
+        return mocker.MagicMock(return_value="updated")
+
+    @pytest.mark.it("Reads each twin, applies the mutation and writes it back with the etag")
+    def test_read_modify_write(self, mocker, get_twin, update_twin):
+        mutate = mocker.MagicMock(return_value="patch")
+        twin_fanout = fanout.TwinUpdateFanout(get_twin, update_twin, mutate, ["d0", ("d1", "m1")])
+
+        outcomes = sorted(twin_fanout, key=lambda o: o.device_id)
+
+        assert [(o.device_id, o.module_id, o.status, o.twin) for o in outcomes] == [
+            ("d0", None, "updated", "updated"),
+            ("d1", "m1", "updated", "updated"),
+        ]
+        assert get_twin.call_count == 2
+        assert mocker.call("d0", None, "patch", "e1") in update_twin.call_args_list
+        assert mocker.call("d1", "m1", "patch", "e1") in update_twin.call_args_list
+        assert twin_fanout.updated == 2
+
+    @pytest.mark.it("Does not read twins that are passed in")
+    def test_prefetched_twins(self, mocker, get_twin, update_twin):
+        mutate = mocker.MagicMock(return_value="patch")
+        fanout.TwinUpdateFanout(get_twin, update_twin, mutate, [FakeTwin("d0", "e0")]).wait()
+        assert get_twin.call_count == 0
+        assert update_twin.call_args == mocker.call("d0", None, "patch", "e0")
+
+    @pytest.mark.it("Skips twins for which the mutation returns None")
+    def test_skipped(self, mocker, get_twin, update_twin):
+        twin_fanout = fanout.TwinUpdateFanout(
+            get_twin, update_twin, lambda twin: None, ["d0"]
+        ).wait()
+        assert twin_fanout.skipped == 1
+        assert update_twin.call_count == 0
+
+    @pytest.mark.it("Re-reads the twin and reapplies the mutation when the update conflicts")
+    def test_conflict_retry(self, mocker, get_twin, update_twin):
+        update_twin.side_effect = [make_http_error(mocker, 412), "updated"]
+        mutate = mocker.MagicMock(return_value="patch")
+
+        outcome = list(fanout.TwinUpdateFanout(get_twin, update_twin, mutate, ["d0"]))[0]
+
+        assert outcome.status == fanout.TwinUpdateOutcome.UPDATED
+        assert outcome.attempts == 2
+        assert get_twin.call_count == 2
+        assert mutate.call_count == 2
+
+    @pytest.mark.it("Reports a conflict once the conflict retries are exhausted")
+    def test_conflict_exhausted(self, mocker, get_twin, update_twin):
+        conflict = make_http_error(mocker, 412)
+        update_twin.side_effect = conflict
+
+        twin_fanout = fanout.TwinUpdateFanout(
+            get_twin, update_twin, lambda twin: "patch", ["d0"], max_conflict_retries=2
+        )
+        outcome = list(twin_fanout)[0]
+
+        assert outcome.status == fanout.TwinUpdateOutcome.CONFLICT
+        assert outcome.error is conflict
+        assert update_twin.call_count == 3
+        assert twin_fanout.conflict == 1
+
+    @pytest.mark.it("Reports any other error as a failure")
+    def test_failed(self, mocker, get_twin, update_twin):
+        error = make_http_error(mocker, 404)
+        get_twin.side_effect = error
+
+        twin_fanout = fanout.TwinUpdateFanout(get_twin, update_twin, lambda twin: "patch", ["d0"])
+        outcome = list(twin_fanout)[0]
+
+        assert outcome.status == fanout.TwinUpdateOutcome.FAILED
+        assert outcome.error is error
+        assert twin_fanout.failed == 1
@@ -0,0 +1,148 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import io
+import json
+from azure.iot.hub import import_export
+from azure.iot.hub.protocol.models import ExportImportDevice, JobProperties
+
+"""---Constants---"""
+
+fake_job_id = "fake_job_id"
+exported_line = (
+    '{"id":"device0","eTag":"MA==","status":"enabled","statusReason":null,'
+    '"authentication":{"type":"sas"},"twinETag":"AAAAAAAAAAE=",'
+    '"tags":{"floor":1},"properties":{"desired":{},"reported":{}},'
+    '"capabilities":{"iotEdge":false}}'
+)
+
+
+@pytest.fixture(scope="function")
+def devices():
+    return [ExportImportDevice(id="device{}".format(i), import_mode="create") for i in range(3)]
+
+
+@pytest.fixture(scope="function")
+def mock_time(mocker):
+    mock_time = mocker.patch("azure.iot.hub.import_export.time")
+    mock_time.time.return_value = 0
+    return mock_time
+
+
+@pytest.mark.describe("import_export - .write_import_file()")
+class TestWriteImportFile(object):
+    @pytest.mark.it("Writes one serialized device per line and returns the count")
+    def test_writes_lines(self, devices):
+        output = io.BytesIO()
+        count = import_export.write_import_file(devices, output)
+
+        assert count == 3
+        lines = output.getvalue().decode("utf-8").splitlines()
+        assert [json.loads(line) for line in lines] == [d.serialize() for d in devices]
+
+    @pytest.mark.it("Consumes the devices lazily")
+    def test_lazy(self, devices):
+        lines = import_export.iter_import_lines(iter(devices))
+        next(lines)
+        assert json.loads(next(lines).decode("utf-8"))["id"] == "device1"
+
+    @pytest.mark.it("Writes to a file if given a path")
+    def test_path(self, tmpdir, devices):
+        path = str(tmpdir.join("devices.txt"))
+        assert import_export.write_import_file(devices, path) == 3
+        with open(path, "rb") as f:
+            assert len(f.readlines()) == 3
+
+
+@pytest.mark.describe("import_export - .iter_exported_devices()")
+class TestIterExportedDevices(object):
+    @pytest.mark.it("Parses each line into an ExportedDevice record")
+    def test_parses_records(self):
+        devices = list(import_export.iter_exported_devices([exported_line]))
+
+        assert len(devices) == 1
+        device = devices[0]
+        assert isinstance(device, import_export.ExportedDevice)
+        assert device.id == "device0"
+        assert device.module_id is None
+        assert device.e_tag == "MA=="
+        assert device.status == "enabled"
+        assert device.twin_etag == "AAAAAAAAAAE="
+        assert device.tags == {"floor": 1}
+        assert device.authentication == {"type": "sas"}
+        assert device.capabilities == {"iotEdge": False}
+
+    @pytest.mark.it("Accepts bytes lines, a leading byte order mark and blank lines")
+    def test_bytes_bom_blank(self):
+        lines = [
+            b"\xef\xbb\xbf" + exported_line.encode("utf-8") + b"\n",
+            b"\n",
+            exported_line.replace("device0", "device1").encode("utf-8") + b"\n",
+        ]
+        devices = list(import_export.iter_exported_devices(lines))
+        assert [d.id for d in devices] == ["device0", "device1"]
+
+    @pytest.mark.it("Reads from a file if given a path")
+    def test_path(self, tmpdir):
+        path = tmpdir.join("devices.txt")
+        path.write(exported_line + "\n" + exported_line + "\n")
+        assert len(list(import_export.iter_exported_devices(str(path)))) == 2
+
+    @pytest.mark.it("Round trips devices written by write_import_file")
+    def test_round_trip(self, devices):
+        output = io.BytesIO()
+        import_export.write_import_file(devices, output)
+        output.seek(0)
+        ids = [d.id for d in import_export.iter_exported_devices(output)]
+        assert ids == ["device0", "device1", "device2"]
+
+
+@pytest.mark.describe("import_export - .wait_for_job()")
+class TestWaitForJob(object):
+    @pytest.mark.it("Returns as soon as the job reaches a terminal status")
+    @pytest.mark.parametrize("status", ["completed", "failed", "cancelled"])
+    def test_terminal(self, mocker, mock_time, status):
+        get_job = mocker.MagicMock(return_value=JobProperties(job_id=fake_job_id, status=status))
+        job = import_export.wait_for_job(get_job, fake_job_id)
+        assert job.status == status
+        assert get_job.call_args == mocker.call(fake_job_id)
+        assert mock_time.sleep.call_count == 0
+
+    @pytest.mark.it("Doubles the polling interval while the job makes no progress")
+    def test_backs_off_without_progress(self, mocker, mock_time):
+        get_job = mocker.MagicMock(
+            side_effect=[JobProperties(status="enqueued", progress=0)] * 4
+            + [JobProperties(status="completed", progress=100)]
+        )
+        import_export.wait_for_job(get_job, fake_job_id, min_interval=1, max_interval=6)
+        intervals = [c[0][0] for c in mock_time.sleep.call_args_list]
+        assert intervals == [2, 4, 6, 6]
+
+    @pytest.mark.it("Schedules the next poll from the estimated time remaining when progressing")
+    def test_estimates_from_progress(self, mocker, mock_time):
+        times = iter([0, 10, 20])
+        mock_time.time.side_effect = lambda: next(times)
+        get_job = mocker.MagicMock(
+            side_effect=[
+                JobProperties(status="running", progress=0),
+                JobProperties(status="running", progress=20),
+                JobProperties(status="completed", progress=100),
+            ]
+        )
+        import_export.wait_for_job(get_job, fake_job_id, min_interval=1, max_interval=60)
+        # 20% in 10 seconds leaves an estimated 40 seconds; the next poll is at half of that
+        assert mock_time.sleep.call_args_list[-1] == mocker.call(20)
+
+    @pytest.mark.it("Returns the latest non-terminal job once the timeout expires")
+    def test_timeout(self, mocker, mock_time):
+        times = iter([0, 0, 5, 10])
+        mock_time.time.side_effect = lambda: next(times)
+        get_job = mocker.MagicMock(return_value=JobProperties(status="running", progress=0))
+        job = import_export.wait_for_job(get_job, fake_job_id, timeout=10, min_interval=4)
+        assert job.status == "running"
+        assert get_job.call_count == 3
+        assert [c[0][0] for c in mock_time.sleep.call_args_list] == [8, 5]
@@ -0,0 +1,249 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import datetime
+from azure.iot.hub.protocol.models import (
+    JobResponse,
+    DeviceJobStatistics,
+    Twin,
+    CloudToDeviceMethod,
+)
+from azure.iot.hub.iothub_job_manager import IoTHubJobManager, DeviceJobResult
+
+"""---Constants---"""
+
+fake_shared_access_key = "Zm9vYmFy"
+fake_shared_access_key_name = "alohomora"
+fake_hostname = "beauxbatons.academy-net"
+fake_device_id = "MyPensieve"
+fake_job_id = "fake_job_id"
+fake_job_request = "fake_job_request"
+fake_job_type = "scheduleUpdateTwin"
+fake_job_status = "running"
+fake_query_condition = "tags.building = '43'"
+
+
+"""----Shared fixtures----"""
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_job_client_operations(mocker):
+    mock_job_client_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.iot_hub_gateway_service_ap_is.JobClientOperations"
+    )
+    return mock_job_client_operations_init.return_value
+
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_registry_manager_operations(mocker):
+    mock_registry_manager_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.iot_hub_gateway_service_ap_is.RegistryManagerOperations"
+    )
+    return mock_registry_manager_operations_init.return_value
+
+
+@pytest.fixture(scope="function")
+def iothub_job_manager():
+    connection_string = "HostName={hostname};DeviceId={device_id};SharedAccessKeyName={skn};SharedAccessKey={sk}".format(
+        hostname=fake_hostname,
+        device_id=fake_device_id,
+        skn=fake_shared_access_key_name,
+        sk=fake_shared_access_key,
+    )
+    return IoTHubJobManager(connection_string)
+
+
+def make_job(status, device_count=0, finished=0):
+    return JobResponse(
+        job_id=fake_job_id,
+        status=status,
+        device_job_statistics=DeviceJobStatistics(
+            device_count=device_count, succeeded_count=finished, failed_count=0
+        ),
+    )
+
+
+@pytest.mark.describe("IoTHubJobManager - .create_scheduled_job()")
+class TestCreateScheduledJob(object):
+    @pytest.mark.it("Uses protocol layer JobClient runtime to create the job")
+    def test_create_scheduled_job(self, mocker, mock_job_client_operations, iothub_job_manager):
+        ret_val = iothub_job_manager.create_scheduled_job(fake_job_id, fake_job_request)
+        assert mock_job_client_operations.create_job.call_args == mocker.call(
+            fake_job_id, fake_job_request
+        )
+        assert ret_val == mock_job_client_operations.create_job.return_value
+
+
+@pytest.mark.describe("IoTHubJobManager - .get_scheduled_job()")
+class TestGetScheduledJob(object):
+    @pytest.mark.it("Uses protocol layer JobClient runtime to get the job")
+    def test_get_scheduled_job(self, mocker, mock_job_client_operations, iothub_job_manager):
+        ret_val = iothub_job_manager.get_scheduled_job(fake_job_id)
+        assert mock_job_client_operations.get_job.call_args == mocker.call(fake_job_id)
+        assert ret_val == mock_job_client_operations.get_job.return_value
+
+
+@pytest.mark.describe("IoTHubJobManager - .cancel_scheduled_job()")
+class TestCancelScheduledJob(object):
+    @pytest.mark.it("Uses protocol layer JobClient runtime to cancel the job")
+    def test_cancel_scheduled_job(self, mocker, mock_job_client_operations, iothub_job_manager):
+        ret_val = iothub_job_manager.cancel_scheduled_job(fake_job_id)
+        assert mock_job_client_operations.cancel_job.call_args == mocker.call(fake_job_id)
+        assert ret_val == mock_job_client_operations.cancel_job.return_value
+
+
+@pytest.mark.describe("IoTHubJobManager - .query_scheduled_jobs()")
+class TestQueryScheduledJobs(object):
+    @pytest.mark.it("Uses protocol layer JobClient runtime to query the jobs")
+    def test_query_scheduled_jobs(self, mocker, mock_job_client_operations, iothub_job_manager):
+        ret_val = iothub_job_manager.query_scheduled_jobs(fake_job_type, fake_job_status)
+        assert mock_job_client_operations.query_jobs.call_args == mocker.call(
+            fake_job_type, fake_job_status
+        )
+        assert ret_val == mock_job_client_operations.query_jobs.return_value
+
+
+@pytest.mark.describe("IoTHubJobManager - .schedule_twin_update()")
+class TestScheduleTwinUpdate(object):
+    @pytest.mark.it("Creates a scheduleUpdateTwin job for the query condition")
+    def test_schedule_twin_update(self, mock_job_client_operations, iothub_job_manager):
+        twin = Twin(tags={"floor": 2})
+        iothub_job_manager.schedule_twin_update(fake_query_condition, twin, job_id=fake_job_id)
+
+        job_id, job_request = mock_job_client_operations.create_job.call_args[0]
+        assert job_id == fake_job_id
+        assert job_request.job_id == fake_job_id
+        assert job_request.type == "scheduleUpdateTwin"
+        assert job_request.update_twin is twin
+        assert job_request.query_condition == fake_query_condition
+
+    @pytest.mark.it("Starts the job immediately if no start time is given")
+    def test_default_start_time(self, mock_job_client_operations, iothub_job_manager):
+        before = datetime.datetime.utcnow()
+        iothub_job_manager.schedule_twin_update(fake_query_condition, Twin())
+        after = datetime.datetime.utcnow()
+        start_time = mock_job_client_operations.create_job.call_args[0][1].start_time
+        assert before <= start_time <= after
+
+    @pytest.mark.it("Uses a given start time")
+    def test_start_time(self, mock_job_client_operations, iothub_job_manager):
+        start_time = datetime.datetime(2030, 1, 1)
+        iothub_job_manager.schedule_twin_update(fake_query_condition, Twin(), start_time=start_time)
+        assert mock_job_client_operations.create_job.call_args[0][1].start_time is start_time
+
+    @pytest.mark.it("Generates a unique job id if none is given")
+    def test_generates_job_id(self, mock_job_client_operations, iothub_job_manager):
+        iothub_job_manager.schedule_twin_update(fake_query_condition, Twin())
+        iothub_job_manager.schedule_twin_update(fake_query_condition, Twin())
+        first, second = [c[0][0] for c in mock_job_client_operations.create_job.call_args_list]
+        assert first and second and first != second
+
+
+@pytest.mark.describe("IoTHubJobManager - .schedule_device_method()")
+class TestScheduleDeviceMethod(object):
+    @pytest.mark.it("Creates a scheduleDeviceMethod job for the query condition")
+    def test_schedule_device_method(self, mock_job_client_operations, iothub_job_manager):
+        method = CloudToDeviceMethod(method_name="reboot")
+        iothub_job_manager.schedule_device_method(fake_query_condition, method, job_id=fake_job_id)
+
+        job_id, job_request = mock_job_client_operations.create_job.call_args[0]
+        assert job_id == fake_job_id
+        assert job_request.type == "scheduleDeviceMethod"
+        assert job_request.cloud_to_device_method is method
+        assert job_request.query_condition == fake_query_condition
+
+    @pytest.mark.it("Starts the job immediately if no start time is given")
+    def test_default_start_time(self, mock_job_client_operations, iothub_job_manager):
+        before = datetime.datetime.utcnow()
+        iothub_job_manager.schedule_device_method(
+            fake_query_condition, CloudToDeviceMethod(method_name="reboot")
+        )
+        after = datetime.datetime.utcnow()
+        start_time = mock_job_client_operations.create_job.call_args[0][1].start_time
+        assert before <= start_time <= after
+
+
+@pytest.mark.describe("IoTHubJobManager - .wait_for_scheduled_job()")
+class TestWaitForScheduledJob(object):
+    @pytest.mark.it("Polls the job until it reaches a terminal status")
+    def test_polls_until_terminal(self, mocker, mock_job_client_operations, iothub_job_manager):
+        mock_sleep = mocker.patch("azure.iot.hub.import_export.time.sleep")
+        mock_job_client_operations.get_job.side_effect = [
+            make_job("queued"),
+            make_job("running", 10, 5),
+            make_job("completed", 10, 10),
+        ]
+
+        job = iothub_job_manager.wait_for_scheduled_job(fake_job_id)
+
+        assert job.status == "completed"
+        assert mock_job_client_operations.get_job.call_count == 3
+        assert mock_sleep.call_count == 2
+
+
+@pytest.mark.describe("IoTHubJobManager - .iter_device_job_results()")
+class TestIterDeviceJobResults(object):
+    @pytest.mark.it("Queries the device jobs, following continuation tokens")
+    def test_pages(self, mocker, mock_registry_manager_operations, iothub_job_manager):
+        def make_page(items, continuation_token):
+            raw_response = mocker.MagicMock()
+            raw_response.headers = {"x-ms-continuation": continuation_token}
+            raw_response.response.json.return_value = items
+            return raw_response
+
+        mock_registry_manager_operations.query_iot_hub.side_effect = [
+            make_page(
+                [
+                    {
+                        "deviceId": "d0",
+                        "jobId": fake_job_id,
+                        "status": "completed",
+                        "outcome": {"deviceMethodResponse": {"status": 200, "payload": None}},
+                    }
+                ],
+                "token1",
+            ),
+            make_page(
+                [
+                    {
+                        "deviceId": "d1",
+                        "jobId": fake_job_id,
+                        "status": "failed",
+                        "error": {"code": "JobRunPreconditionFailed"},
+                    }
+                ],
+                None,
+            ),
+        ]
+
+        results = list(iothub_job_manager.iter_device_job_results(fake_job_id))
+
+        assert all(isinstance(r, DeviceJobResult) for r in results)
+        assert [(r.device_id, r.status) for r in results] == [("d0", "completed"), ("d1", "failed")]
+        assert results[0].outcome["deviceMethodResponse"]["status"] == 200
+        assert results[1].error == {"code": "JobRunPreconditionFailed"}
+
+        calls = mock_registry_manager_operations.query_iot_hub.call_args_list
+        assert len(calls) == 2
+        assert calls[0][0][0].query == (
+            "SELECT * FROM devices.jobs WHERE devices.jobs.jobId = '{}'".format(fake_job_id)
+        )
+        assert calls[0][0][1] is None
+        assert calls[1][0][1] == "token1"
+
+    @pytest.mark.it("Escapes quotes in the job id")
+    def test_escapes_job_id(self, mocker, mock_registry_manager_operations, iothub_job_manager):
+        raw_response = mocker.MagicMock()
+        raw_response.headers = {}
+        raw_response.response.json.return_value = []
+        mock_registry_manager_operations.query_iot_hub.return_value = raw_response
+
+        list(iothub_job_manager.iter_device_job_results("job' OR '1' = '1"))
+
+        assert mock_registry_manager_operations.query_iot_hub.call_args[0][0].query == (
+            "SELECT * FROM devices.jobs WHERE devices.jobs.jobId = 'job'' OR ''1'' = ''1'"
+        )
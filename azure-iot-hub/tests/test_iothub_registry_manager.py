@@ -5,7 +5,27 @@
 # --------------------------------------------------------------------------
 
 import pytest
-from azure.iot.hub.protocol.models import AuthenticationMechanism
+import json
+import six
+import time
+import requests
+from msrest.exceptions import HttpOperationError
+from msrest.serialization import Deserializer
+from azure.iot.hub.protocol.models import (
+    AuthenticationMechanism,
+    QuerySpecification,
+    Twin,
+    ExportImportDevice,
+    BulkRegistryOperationResult,
+    DeviceRegistryOperationError,
+    DeviceRegistryOperationWarning,
+    JobProperties,
+    CloudToDeviceMethod,
+    Device,
+    Module,
+)
+from azure.iot.hub.etag_cache import ETagCache
+from azure.iot.hub.fanout import DeadlineExceededError
 from azure.iot.hub.iothub_registry_manager import IoTHubRegistryManager
 
 """---Constants---"""
@@ -1099,3 +1119,672 @@ class TestInvokeDeviceModuleMethod(object):
         assert mock_device_method_operations.invoke_module_method.call_args == mocker.call(
             fake_device_id, fake_module_id, fake_direct_method_request
         )
+
+
+def make_raw_query_response(mocker, items, continuation_token):
+    raw_response = mocker.MagicMock()
+    raw_response.headers = {"x-ms-item-type": "twin", "x-ms-continuation": continuation_token}
+    raw_response.output = items
+    return raw_response
+
+
+@pytest.fixture(scope="function")
+def paged_query_responses(mocker, mock_registry_manager_operations):
+    pages = [
+        make_raw_query_response(mocker, ["twin0", "twin1"], "token1"),
+        make_raw_query_response(mocker, ["twin2", "twin3"], "token2"),
+        make_raw_query_response(mocker, ["twin4"], None),
+    ]
+    mock_registry_manager_operations.query_iot_hub.side_effect = pages
+    return pages
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .query_iter()")
+class TestQueryIter(object):
+    @pytest.mark.it("Yields the items of every page, following continuation tokens")
+    @pytest.mark.parametrize("prefetch", [True, False], ids=["Prefetch", "No prefetch"])
+    def test_yields_all_pages(
+        self,
+        mocker,
+        mock_registry_manager_operations,
+        iothub_registry_manager,
+        paged_query_responses,
+        prefetch,
+    ):
+        query_specification = QuerySpecification(query="SELECT * FROM devices")
+        results = list(
+            iothub_registry_manager.query_iter(query_specification, page_size=2, prefetch=prefetch)
+        )
+
+        assert results == ["twin0", "twin1", "twin2", "twin3", "twin4"]
+        assert mock_registry_manager_operations.query_iot_hub.call_args_list == [
+            mocker.call(query_specification, None, 2, None, True),
+            mocker.call(query_specification, "token1", 2, None, True),
+            mocker.call(query_specification, "token2", 2, None, True),
+        ]
+
+    @pytest.mark.it("Converts a query string into a QuerySpecification")
+    def test_query_string(
+        self, mock_registry_manager_operations, iothub_registry_manager, paged_query_responses
+    ):
+        list(iothub_registry_manager.query_iter("SELECT * FROM devices"))
+
+        query_specification = mock_registry_manager_operations.query_iot_hub.call_args[0][0]
+        assert isinstance(query_specification, QuerySpecification)
+        assert query_specification.query == "SELECT * FROM devices"
+
+    @pytest.mark.it("Does not make any request until iteration begins")
+    def test_lazy(self, mock_registry_manager_operations, iothub_registry_manager):
+        iothub_registry_manager.query_iter(fake_query_specification)
+        assert mock_registry_manager_operations.query_iot_hub.call_count == 0
+
+    @pytest.mark.it("Requests the next page before the current page has been consumed")
+    def test_prefetches_next_page(
+        self, mock_registry_manager_operations, iothub_registry_manager, paged_query_responses
+    ):
+        iterator = iothub_registry_manager.query_iter(fake_query_specification)
+        assert next(iterator) == "twin0"
+        # Wait for the background request for the second page to be made
+        for _ in range(100):
+            if mock_registry_manager_operations.query_iot_hub.call_count == 2:
+                break
+            time.sleep(0.01)
+        assert mock_registry_manager_operations.query_iot_hub.call_count == 2
+        iterator.close()
+
+    @pytest.mark.it("Only requests one page at a time when prefetch is disabled")
+    def test_no_prefetch(
+        self, mock_registry_manager_operations, iothub_registry_manager, paged_query_responses
+    ):
+        iterator = iothub_registry_manager.query_iter(fake_query_specification, prefetch=False)
+        assert next(iterator) == "twin0"
+        assert next(iterator) == "twin1"
+        assert mock_registry_manager_operations.query_iot_hub.call_count == 1
+
+    @pytest.mark.it("Raises errors from the request for a page when that page is reached")
+    def test_raises_page_error(
+        self, mocker, mock_registry_manager_operations, iothub_registry_manager
+    ):
+        error = ValueError()
+        mock_registry_manager_operations.query_iot_hub.side_effect = [
+            make_raw_query_response(mocker, ["twin0"], "token1"),
+            error,
+        ]
+        iterator = iothub_registry_manager.query_iter(fake_query_specification)
+        assert next(iterator) == "twin0"
+        with pytest.raises(ValueError) as e_info:
+            next(iterator)
+        assert e_info.value is error
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .query_to_ndjson()")
+class TestQueryToNdjson(object):
+    @pytest.mark.it("Writes every twin as a line of JSON in the REST API format")
+    def test_writes_ndjson(self, mocker, mock_registry_manager_operations, iothub_registry_manager):
+        twins = [Twin(device_id="device0", etag="etag0"), Twin(device_id="device1", etag="etag1")]
+        mock_registry_manager_operations.query_iot_hub.side_effect = [
+            make_raw_query_response(mocker, twins, None)
+        ]
+        output = six.StringIO()
+
+        count = iothub_registry_manager.query_to_ndjson(fake_query_specification, output)
+
+        assert count == 2
+        lines = output.getvalue().splitlines()
+        assert [json.loads(line) for line in lines] == [
+            {"deviceId": "device0", "etag": "etag0"},
+            {"deviceId": "device1", "etag": "etag1"},
+        ]
+
+    @pytest.mark.it("Creates and writes to a file when given a path")
+    def test_writes_file(
+        self, mocker, tmpdir, mock_registry_manager_operations, iothub_registry_manager
+    ):
+        mock_registry_manager_operations.query_iot_hub.side_effect = [
+            make_raw_query_response(mocker, [Twin(device_id="device0")], None)
+        ]
+        path = str(tmpdir.join("twins.ndjson"))
+
+        iothub_registry_manager.query_to_ndjson(fake_query_specification, path)
+
+        with open(path) as f:
+            assert [json.loads(line) for line in f] == [{"deviceId": "device0"}]
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .bulk_create_or_update_devices_chunked()")
+class TestBulkCreateOrUpdateDevicesChunked(object):
+    @pytest.fixture
+    def devices(self):
+        return [ExportImportDevice(id="device{}".format(i), import_mode="create") for i in range(250)]
+
+    @pytest.fixture
+    def mock_sleep(self, mocker):
+        return mocker.patch("azure.iot.hub.fanout.time.sleep")
+
+    @pytest.mark.it("Sends the devices in bulk operations of at most 100 devices")
+    def test_chunks(self, mock_registry_manager_operations, iothub_registry_manager, devices):
+        mock_registry_manager_operations.bulk_device_crud.return_value = BulkRegistryOperationResult(
+            is_successful=True, errors=[], warnings=[]
+        )
+
+        iothub_registry_manager.bulk_create_or_update_devices_chunked(iter(devices))
+
+        calls = mock_registry_manager_operations.bulk_device_crud.call_args_list
+        assert sorted(len(call[0][0]) for call in calls) == [50, 100, 100]
+        sent = sorted(device.id for call in calls for device in call[0][0])
+        assert sent == sorted(device.id for device in devices)
+
+    @pytest.mark.it("Returns a successful result if every bulk operation succeeds")
+    def test_success(self, mock_registry_manager_operations, iothub_registry_manager, devices):
+        mock_registry_manager_operations.bulk_device_crud.return_value = BulkRegistryOperationResult(
+            is_successful=True, errors=None, warnings=None
+        )
+
+        result = iothub_registry_manager.bulk_create_or_update_devices_chunked(devices)
+
+        assert isinstance(result, BulkRegistryOperationResult)
+        assert result.is_successful is True
+        assert result.errors == []
+        assert result.warnings == []
+
+    @pytest.mark.it("Merges the per-device errors and warnings of every bulk operation")
+    def test_merges(self, mock_registry_manager_operations, iothub_registry_manager, devices):
+        def bulk_device_crud(chunk):
+            return BulkRegistryOperationResult(
+                is_successful=False,
+                errors=[DeviceRegistryOperationError(device_id=chunk[0].id)],
+                warnings=[DeviceRegistryOperationWarning(device_id=chunk[1].id)],
+            )
+
+        mock_registry_manager_operations.bulk_device_crud.side_effect = bulk_device_crud
+
+        result = iothub_registry_manager.bulk_create_or_update_devices_chunked(devices)
+
+        assert result.is_successful is False
+        assert sorted(e.device_id for e in result.errors) == ["device0", "device100", "device200"]
+        assert sorted(w.device_id for w in result.warnings) == [
+            "device1",
+            "device101",
+            "device201",
+        ]
+
+    @pytest.mark.it("Retries bulk operations that are throttled")
+    def test_retries_throttled(
+        self, mocker, mock_sleep, mock_registry_manager_operations, iothub_registry_manager, devices
+    ):
+        throttled = HttpOperationError.__new__(HttpOperationError)
+        throttled.response = mocker.MagicMock(status_code=429, headers={})
+        success = BulkRegistryOperationResult(is_successful=True)
+        mock_registry_manager_operations.bulk_device_crud.side_effect = [
+            throttled,
+            success,
+            success,
+            success,
+        ]
+
+        result = iothub_registry_manager.bulk_create_or_update_devices_chunked(
+            devices, max_workers=1
+        )
+
+        assert result.is_successful is True
+        assert mock_registry_manager_operations.bulk_device_crud.call_count == 4
+        assert mock_sleep.call_count == 1
+
+    @pytest.mark.it("Reports an error for every device of a bulk operation that fails outright")
+    def test_failed_chunk(
+        self, mocker, mock_registry_manager_operations, iothub_registry_manager, devices
+    ):
+        failure = HttpOperationError.__new__(HttpOperationError)
+        failure.response = mocker.MagicMock(status_code=500)
+        failure.message = "Operation returned an invalid status code 'Internal Server Error'"
+
+        def bulk_device_crud(chunk):
+            if chunk[0].id == "device100":
+                raise failure
+            return BulkRegistryOperationResult(is_successful=True)
+
+        mock_registry_manager_operations.bulk_device_crud.side_effect = bulk_device_crud
+
+        result = iothub_registry_manager.bulk_create_or_update_devices_chunked(devices)
+
+        assert result.is_successful is False
+        assert sorted(e.device_id for e in result.errors) == sorted(
+            "device{}".format(i) for i in range(100, 200)
+        )
+        for error in result.errors:
+            assert error.error_code == "BulkRegistryOperationFailure"
+            assert error.operation == "create"
+            assert error.error_status == failure.message
+
+
+@pytest.fixture(scope="function")
+def mock_job_client_operations(mocker):
+    mock_job_client_operations_init = mocker.patch(
+        "azure.iot.hub.protocol.iot_hub_gateway_service_ap_is.JobClientOperations"
+    )
+    return mock_job_client_operations_init.return_value
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .import_devices()")
+class TestImportDevices(object):
+    @pytest.mark.it("Submits an import job with the given blob storage locations")
+    def test_import_devices(self, mock_job_client_operations, iothub_registry_manager):
+        ret_val = iothub_registry_manager.import_devices(
+            "https://input", "https://output", "devices.txt"
+        )
+        assert mock_job_client_operations.create_import_export_job.call_count == 1
+        job_properties = mock_job_client_operations.create_import_export_job.call_args[0][0]
+        assert job_properties.type == "import"
+        assert job_properties.input_blob_container_uri == "https://input"
+        assert job_properties.input_blob_name == "devices.txt"
+        assert job_properties.output_blob_container_uri == "https://output"
+        assert ret_val == mock_job_client_operations.create_import_export_job.return_value
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .export_devices()")
+class TestExportDevices(object):
+    @pytest.mark.it("Submits an export job excluding keys by default")
+    def test_export_devices(self, mock_job_client_operations, iothub_registry_manager):
+        ret_val = iothub_registry_manager.export_devices("https://output")
+        job_properties = mock_job_client_operations.create_import_export_job.call_args[0][0]
+        assert job_properties.type == "export"
+        assert job_properties.output_blob_container_uri == "https://output"
+        assert job_properties.exclude_keys_in_export is True
+        assert ret_val == mock_job_client_operations.create_import_export_job.return_value
+
+    @pytest.mark.it("Submits an export job including keys if requested")
+    def test_export_devices_with_keys(self, mock_job_client_operations, iothub_registry_manager):
+        iothub_registry_manager.export_devices("https://output", exclude_keys=False)
+        job_properties = mock_job_client_operations.create_import_export_job.call_args[0][0]
+        assert job_properties.exclude_keys_in_export is False
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .get_import_export_job()")
+class TestGetImportExportJob(object):
+    @pytest.mark.it("Uses protocol layer JobClient runtime to get the job")
+    def test_get_import_export_job(self, mocker, mock_job_client_operations, iothub_registry_manager):
+        ret_val = iothub_registry_manager.get_import_export_job(fake_job_id)
+        assert mock_job_client_operations.get_import_export_job.call_args == mocker.call(
+            fake_job_id
+        )
+        assert ret_val == mock_job_client_operations.get_import_export_job.return_value
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .cancel_import_export_job()")
+class TestCancelImportExportJob(object):
+    @pytest.mark.it("Uses protocol layer JobClient runtime to cancel the job")
+    def test_cancel_import_export_job(self, mocker, mock_job_client_operations, iothub_registry_manager):
+        ret_val = iothub_registry_manager.cancel_import_export_job(fake_job_id)
+        assert mock_job_client_operations.cancel_import_export_job.call_args == mocker.call(
+            fake_job_id
+        )
+        assert ret_val == mock_job_client_operations.cancel_import_export_job.return_value
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .wait_for_import_export_job()")
+class TestWaitForImportExportJob(object):
+    @pytest.mark.it("Polls the job until it reaches a terminal status")
+    def test_polls_until_terminal(self, mocker, mock_job_client_operations, iothub_registry_manager):
+        mock_sleep = mocker.patch("azure.iot.hub.import_export.time.sleep")
+        mock_job_client_operations.get_import_export_job.side_effect = [
+            JobProperties(job_id=fake_job_id, status="enqueued", progress=0),
+            JobProperties(job_id=fake_job_id, status="running", progress=50),
+            JobProperties(job_id=fake_job_id, status="completed", progress=100),
+        ]
+
+        job = iothub_registry_manager.wait_for_import_export_job(fake_job_id)
+
+        assert job.status == "completed"
+        assert mock_job_client_operations.get_import_export_job.call_count == 3
+        assert mock_sleep.call_count == 2
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .invoke_method_on_devices()")
+class TestInvokeMethodOnDevices(object):
+    @pytest.fixture
+    def method_request(self):
+        return CloudToDeviceMethod(
+            method_name="reboot", response_timeout_in_seconds=20, connect_timeout_in_seconds=5
+        )
+
+    @pytest.mark.it("Invokes device and module methods with a deadline derived from the request")
+    def test_invokes_targets(
+        self, mocker, mock_device_method_operations, iothub_registry_manager, method_request
+    ):
+        method_fanout = iothub_registry_manager.invoke_method_on_devices(
+            ["d0", ("d1", "m1")], method_request
+        ).wait()
+
+        assert method_fanout.succeeded == 2
+        assert mock_device_method_operations.invoke_device_method.call_args == mocker.call(
+            "d0", method_request, timeout=pytest.approx(35, abs=1)
+        )
+        assert mock_device_method_operations.invoke_module_method.call_args == mocker.call(
+            "d1", "m1", method_request, timeout=pytest.approx(35, abs=1)
+        )
+
+    @pytest.mark.it("Uses a given deadline")
+    def test_deadline(
+        self, mocker, mock_device_method_operations, iothub_registry_manager, method_request
+    ):
+        iothub_registry_manager.invoke_method_on_devices(
+            ["d0"], method_request, deadline=3
+        ).wait()
+        assert mock_device_method_operations.invoke_device_method.call_args == mocker.call(
+            "d0", method_request, timeout=pytest.approx(3, abs=1)
+        )
+
+    @pytest.mark.it(
+        "Gives each retry of a throttled invocation only the time left before the deadline"
+    )
+    def test_deadline_covers_retries(
+        self, mocker, mock_device_method_operations, iothub_registry_manager, method_request
+    ):
+        mocker.patch("azure.iot.hub.fanout._monotonic", side_effect=[0, 0, 2])
+        mocker.patch("azure.iot.hub.fanout.time.sleep")
+        response = requests.Response()
+        response.status_code = 429
+        response._content = b""
+        throttled = HttpOperationError(Deserializer(), response)
+        mock_device_method_operations.invoke_device_method.side_effect = [throttled, "result"]
+
+        method_fanout = iothub_registry_manager.invoke_method_on_devices(
+            ["d0"], method_request, deadline=3
+        ).wait()
+
+        assert method_fanout.succeeded == 1
+        timeouts = [
+            c[1]["timeout"]
+            for c in mock_device_method_operations.invoke_device_method.call_args_list
+        ]
+        assert timeouts == [3, 1]
+
+    @pytest.mark.it("Times out an invocation with no time left before the deadline to retry")
+    def test_deadline_exceeded(
+        self, mocker, mock_device_method_operations, iothub_registry_manager, method_request
+    ):
+        mocker.patch("azure.iot.hub.fanout._monotonic", side_effect=[0, 1, 5])
+        mocker.patch("azure.iot.hub.fanout.time.sleep")
+        response = requests.Response()
+        response.status_code = 429
+        response._content = b""
+        throttled = HttpOperationError(Deserializer(), response)
+        mock_device_method_operations.invoke_device_method.side_effect = throttled
+
+        method_fanout = iothub_registry_manager.invoke_method_on_devices(
+            ["d0"], method_request, deadline=3
+        )
+        outcome = next(iter(method_fanout))
+
+        assert outcome.status == "timed_out"
+        assert isinstance(outcome.error, DeadlineExceededError)
+        assert mock_device_method_operations.invoke_device_method.call_count == 1
+        assert mock_device_method_operations.invoke_device_method.call_args[1]["timeout"] == 2
+
+    @pytest.mark.it("Keeps the result of an invocation which completes after the deadline")
+    def test_completes_after_deadline(
+        self, mocker, mock_device_method_operations, iothub_registry_manager, method_request
+    ):
+        mocker.patch("azure.iot.hub.fanout._monotonic", side_effect=[0, 1, 5])
+        mock_device_method_operations.invoke_device_method.return_value = "result"
+
+        method_fanout = iothub_registry_manager.invoke_method_on_devices(
+            ["d0"], method_request, deadline=3
+        )
+        outcome = next(iter(method_fanout))
+
+        assert outcome.status == "succeeded"
+        assert outcome.result == "result"
+
+    @pytest.mark.it("Invokes the method on every twin returned by a query")
+    def test_query(
+        self,
+        mocker,
+        mock_registry_manager_operations,
+        mock_device_method_operations,
+        iothub_registry_manager,
+        method_request,
+    ):
+        mock_registry_manager_operations.query_iot_hub.return_value = make_raw_query_response(
+            mocker, [Twin(device_id="d0"), Twin(device_id="d1", module_id="m1")], None
+        )
+
+        method_fanout = iothub_registry_manager.invoke_method_on_devices(
+            "SELECT * FROM devices", method_request
+        ).wait()
+
+        assert method_fanout.total == 2
+        assert mock_device_method_operations.invoke_device_method.call_count == 1
+        assert mock_device_method_operations.invoke_module_method.call_count == 1
+
+
+@pytest.mark.describe("IoTHubRegistryManager - .bulk_update_twins()")
+class TestBulkUpdateTwins(object):
+    @pytest.mark.it("Reads, mutates and conditionally writes back device and module twins")
+    def test_updates_twins(self, mocker, mock_twin_operations, iothub_registry_manager):
+        mock_twin_operations.get_device_twin.return_value = Twin(device_id="d0", etag="e0")
+        mock_twin_operations.get_module_twin.return_value = Twin(
+            device_id="d1", module_id="m1", etag="e1"
+        )
+        patch = Twin(tags={"floor": 2})
+
+        twin_fanout = iothub_registry_manager.bulk_update_twins(
+            ["d0", ("d1", "m1")], lambda twin: patch
+        ).wait()
+
+        assert twin_fanout.updated == 2
+        assert mock_twin_operations.update_device_twin.call_args == mocker.call("d0", patch, "e0")
+        assert mock_twin_operations.update_module_twin.call_args == mocker.call(
+            "d1", "m1", patch, "e1"
+        )
+
+    @pytest.mark.it("Updates the twins returned by a query without reading them again")
+    def test_query(
+        self, mocker, mock_registry_manager_operations, mock_twin_operations, iothub_registry_manager
+    ):
+        mock_registry_manager_operations.query_iot_hub.return_value = make_raw_query_response(
+            mocker, [Twin(device_id="d0", etag="e0")], None
+        )
+        patch = Twin(tags={"floor": 2})
+
+        twin_fanout = iothub_registry_manager.bulk_update_twins(
+            "SELECT * FROM devices", lambda twin: patch
+        ).wait()
+
+        assert twin_fanout.updated == 1
+        assert mock_twin_operations.get_device_twin.call_count == 0
+        assert mock_twin_operations.update_device_twin.call_args == mocker.call("d0", patch, "e0")
+
+
+@pytest.mark.describe("IoTHubRegistryManager - raw mode")
+class TestRawMode(object):
+    @pytest.fixture
+    def mock_send(self, mocker, iothub_registry_manager):
+        def make_response(payload, headers=None):
+            response = requests.Response()
+            response.status_code = 200
+            response.headers.update(headers or {})
+            response.headers["Content-Type"] = "application/json; charset=utf-8"
+            response._content = json.dumps(payload).encode("utf-8")
+            return response
+
+        mock_send = mocker.patch.object(iothub_registry_manager.protocol._client, "send")
+        mock_send.make_response = make_response
+        return mock_send
+
+    @pytest.mark.it("Returns devices as plain dictionaries from get_devices")
+    def test_get_devices(self, mock_send, iothub_registry_manager):
+        payload = [{"deviceId": "device0", "status": "enabled", "newField": 1}]
+        mock_send.return_value = mock_send.make_response(payload)
+
+        assert iothub_registry_manager.get_devices(raw=True) == payload
+
+    @pytest.mark.it("Returns modules as plain dictionaries from get_modules")
+    def test_get_modules(self, mock_send, iothub_registry_manager):
+        payload = [{"deviceId": fake_device_id, "moduleId": fake_module_id}]
+        mock_send.return_value = mock_send.make_response(payload)
+
+        assert iothub_registry_manager.get_modules(fake_device_id, raw=True) == payload
+
+    @pytest.mark.it("Returns twins as plain dictionaries from query_iot_hub and query_iter")
+    def test_query(self, mock_send, iothub_registry_manager):
+        mock_send.side_effect = [
+            mock_send.make_response(
+                [{"deviceId": "device0"}],
+                {"x-ms-item-type": "twin", "x-ms-continuation": "token1"},
+            ),
+            mock_send.make_response([{"deviceId": "device1"}], {"x-ms-item-type": "twin"}),
+        ]
+
+        page = iothub_registry_manager.query_iot_hub(
+            QuerySpecification(query="SELECT *"), raw=True
+        )
+        assert page.items == [{"deviceId": "device0"}]
+        assert page.continuation_token == "token1"
+        assert page.type == "twin"
+
+        mock_send.side_effect = [
+            mock_send.make_response([{"deviceId": "device0"}], {"x-ms-continuation": "token1"}),
+            mock_send.make_response([{"deviceId": "device1"}]),
+        ]
+        twins = list(
+            iothub_registry_manager.query_iter(QuerySpecification(query="SELECT *"), raw=True)
+        )
+        assert twins == [{"deviceId": "device0"}, {"deviceId": "device1"}]
+
+    @pytest.mark.it("Does not use the raw operations unless requested")
+    def test_default(self, mock_registry_manager_operations, iothub_registry_manager):
+        iothub_registry_manager.get_devices()
+        assert mock_registry_manager_operations.get_devices.call_count == 1
+        assert iothub_registry_manager._raw_registry_manager is None
+
+
+@pytest.mark.describe("IoTHubRegistryManager - with an ETagCache")
+class TestETagCache(object):
+    @pytest.fixture
+    def cache(self):
+        return ETagCache()
+
+    @pytest.fixture
+    def iothub_registry_manager(self, cache):
+        connection_string = "HostName={hostname};SharedAccessKeyName={skn};SharedAccessKey={sk}".format(
+            hostname=fake_hostname, skn=fake_shared_access_key_name, sk=fake_shared_access_key
+        )
+        return IoTHubRegistryManager(connection_string, cache=cache)
+
+    @pytest.fixture
+    def not_modified(self):
+        response = requests.Response()
+        response.status_code = 304
+        response._content = b""
+        return HttpOperationError(Deserializer(), response)
+
+    @pytest.mark.it("Revalidates a cached device with If-None-Match")
+    def test_get_device(
+        self, mocker, mock_registry_manager_operations, iothub_registry_manager, not_modified
+    ):
+        device = Device(device_id=fake_device_id, etag=fake_etag)
+        mock_registry_manager_operations.get_device.side_effect = [device, not_modified]
+
+        assert iothub_registry_manager.get_device(fake_device_id) is device
+        assert iothub_registry_manager.get_device(fake_device_id) == device
+        assert mock_registry_manager_operations.get_device.call_args_list == [
+            mocker.call(fake_device_id, custom_headers=None),
+            mocker.call(fake_device_id, custom_headers={"If-None-Match": '"{}"'.format(fake_etag)}),
+        ]
+
+    @pytest.mark.it("Revalidates a cached module with If-None-Match")
+    def test_get_module(
+        self, mocker, mock_registry_manager_operations, iothub_registry_manager, not_modified
+    ):
+        module = Module(device_id=fake_device_id, module_id=fake_module_id, etag=fake_etag)
+        mock_registry_manager_operations.get_module.side_effect = [module, not_modified]
+
+        iothub_registry_manager.get_module(fake_device_id, fake_module_id)
+        assert iothub_registry_manager.get_module(fake_device_id, fake_module_id) == module
+        assert mock_registry_manager_operations.get_module.call_args == mocker.call(
+            fake_device_id,
+            fake_module_id,
+            custom_headers={"If-None-Match": '"{}"'.format(fake_etag)},
+        )
+
+    @pytest.mark.it("Revalidates cached device and module twins with If-None-Match")
+    def test_get_twin(self, mocker, mock_twin_operations, iothub_registry_manager, not_modified):
+        twin = Twin(etag=fake_etag)
+        module_twin = Twin(etag=fake_etag)
+        mock_twin_operations.get_device_twin.side_effect = [twin, not_modified]
+        mock_twin_operations.get_module_twin.side_effect = [module_twin, not_modified]
+
+        iothub_registry_manager.get_twin(fake_device_id)
+        iothub_registry_manager.get_module_twin(fake_device_id, fake_module_id)
+        assert iothub_registry_manager.get_twin(fake_device_id) == twin
+        assert iothub_registry_manager.get_module_twin(fake_device_id, fake_module_id) == module_twin
+
+    @pytest.mark.it("Invalidates a device on device and device twin writes")
+    @pytest.mark.parametrize(
+        "write",
+        [
+            pytest.param(
+                lambda rm: rm.update_device_with_sas(fake_device_id, fake_etag, "a", "b", "on"),
+                id="update_device_with_sas",
+            ),
+            pytest.param(lambda rm: rm.delete_device(fake_device_id), id="delete_device"),
+            pytest.param(
+                lambda rm: rm.replace_twin(fake_device_id, fake_device_twin), id="replace_twin"
+            ),
+            pytest.param(
+                lambda rm: rm.update_twin(fake_device_id, fake_device_twin, fake_etag),
+                id="update_twin",
+            ),
+            pytest.param(
+                lambda rm: rm.bulk_create_or_update_devices(
+                    [ExportImportDevice(id=fake_device_id)]
+                ),
+                id="bulk_create_or_update_devices",
+            ),
+        ],
+    )
+    def test_device_writes(self, mocker, iothub_registry_manager, cache, write):
+        cache.fetch("twin", fake_device_id, None, lambda headers: Twin(etag=fake_etag))
+        cache.fetch("twin", "other", None, lambda headers: Twin(etag=fake_etag))
+
+        write(iothub_registry_manager)
+
+        assert len(cache) == 1
+
+    @pytest.mark.it("Invalidates only the module on module and module twin writes")
+    @pytest.mark.parametrize(
+        "write",
+        [
+            pytest.param(
+                lambda rm: rm.update_module_with_sas(
+                    fake_device_id, fake_module_id, fake_managed_by, fake_etag, "a", "b"
+                ),
+                id="update_module_with_sas",
+            ),
+            pytest.param(
+                lambda rm: rm.delete_module(fake_device_id, fake_module_id), id="delete_module"
+            ),
+            pytest.param(
+                lambda rm: rm.update_module_twin(
+                    fake_device_id, fake_module_id, fake_module_twin, fake_etag
+                ),
+                id="update_module_twin",
+            ),
+        ],
+    )
+    def test_module_writes(self, mocker, iothub_registry_manager, cache, write):
+        cache.fetch("twin", fake_device_id, None, lambda headers: Twin(etag=fake_etag))
+        cache.fetch("twin", fake_device_id, fake_module_id, lambda headers: Twin(etag=fake_etag))
+
+        write(iothub_registry_manager)
+
+        assert len(cache) == 1
+
+    @pytest.mark.it("Clears the cache when submitting an import job")
+    def test_import_devices(self, mock_job_client_operations, iothub_registry_manager, cache):
+        cache.fetch("twin", fake_device_id, None, lambda headers: Twin(etag=fake_etag))
+
+        iothub_registry_manager.import_devices("https://input", "https://output")
+
+        assert len(cache) == 0
@@ -0,0 +1,67 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+import json
+import subprocess
+import sys
+import azure.iot.hub
+
+"""---Helpers---"""
+
+import_probe = """
+import json, sys
+{statement}
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+def run_import(statement):
+    """Run an import statement in a fresh interpreter, returning the modules it loaded"""
+    output = subprocess.check_output(
+        [sys.executable, "-c", import_probe.format(statement=statement)]
+    )
+    return set(json.loads(output.decode("utf-8")))
+
+
+@pytest.mark.skipif(sys.version_info < (3, 7), reason="Requires Python 3.7+")
+@pytest.mark.describe("azure.iot.hub - Import")
+class TestPackageImport(object):
+    @pytest.mark.it("Does not import the managers, msrest or the protocol models")
+    def test_lazy(self):
+        modules = run_import("import azure.iot.hub")
+        assert "msrest" not in modules
+        assert "azure.iot.hub.protocol.models" not in modules
+
+    @pytest.mark.it("Imports every manager on first use")
+    @pytest.mark.parametrize("name", azure.iot.hub.__all__)
+    def test_public_names(self, name):
+        assert getattr(azure.iot.hub, name).__name__ == name
+
+    @pytest.mark.it("Imports submodules on first use as attributes of the package")
+    @pytest.mark.parametrize(
+        "attribute",
+        [
+            "azure.iot.hub.aio",
+            "azure.iot.hub.auth",
+            "azure.iot.hub.models",
+            "azure.iot.hub.protocol",
+            "azure.iot.hub.protocol.models",
+            "azure.iot.hub.iothub_registry_manager",
+        ],
+    )
+    def test_submodules(self, attribute):
+        modules = run_import("import azure.iot.hub\nassert {}".format(attribute))
+        assert attribute in modules
+
+    @pytest.mark.it("Lists its submodules")
+    def test_dir(self):
+        assert "protocol" in dir(azure.iot.hub)
+
+    @pytest.mark.it("Raises AttributeError for unknown names")
+    def test_unknown_name(self):
+        with pytest.raises(AttributeError):
+            azure.iot.hub.NotAManager
@@ -0,0 +1,20 @@
+# -------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+from azure.iot.hub.query import quote_string
+
+
+@pytest.mark.describe("query - .quote_string()")
+class TestQuoteString(object):
+    @pytest.mark.it("Returns the value in single quotes")
+    def test_quotes(self):
+        assert quote_string("my-device") == "'my-device'"
+
+    @pytest.mark.it("Doubles single quotes in the value")
+    def test_escapes_quotes(self):
+        assert quote_string("it's") == "'it''s'"
+        assert quote_string("' OR '1' = '1") == "''' OR ''1'' = ''1'"
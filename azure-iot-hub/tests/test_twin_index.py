@@ -0,0 +1,179 @@
+# --------------------------------------------------------------------------
+# Copyright (c) Microsoft Corporation. All rights reserved.
+# Licensed under the MIT License. See License.txt in the project root for
+# license information.
+# --------------------------------------------------------------------------
+
+import pytest
+from azure.iot.hub import twin_index
+from azure.iot.hub.twin_index import TwinIndex, TwinRecord
+from azure.iot.hub.protocol.models import Twin, TwinProperties
+
+"""---Helpers---"""
+
+
+def make_twin(device_id, version=1, region="US", firmware="1.0", last_updated=None):
+    reported = {"firmware": firmware, "$version": version}
+    if last_updated:
+        reported["$metadata"] = {"$lastUpdated": last_updated}
+    return Twin(
+        device_id=device_id,
+        etag="etag{}".format(version),
+        version=version,
+        status="enabled",
+        connection_state="Connected",
+        tags={"location": {"region": region}},
+        properties=TwinProperties(desired={}, reported=reported),
+    )
+
+
+@pytest.fixture(scope="function")
+def registry_manager(mocker):
+    return mocker.MagicMock()
+
+
+@pytest.fixture(scope="function")
+def index(registry_manager):
+    registry_manager.query_iter.return_value = [
+        make_twin("d0", region="US", last_updated="2020-01-01T00:00:00Z"),
+        make_twin("d1", region="EU", last_updated="2020-01-02T00:00:00Z"),
+        make_twin("d2", region="US", firmware="2.0"),
+    ]
+    index = TwinIndex(
+        registry_manager, indexed_paths=["tags.location.region", "properties.reported.firmware"]
+    )
+    index.load()
+    return index
+
+
+@pytest.mark.describe("TwinRecord")
+class TestTwinRecord(object):
+    @pytest.mark.it("Strips metadata from the twin properties")
+    def test_strips_metadata(self):
+        record = TwinRecord(make_twin("d0", last_updated="2020-01-01T00:00:00Z"))
+        assert record.reported == {"firmware": "1.0"}
+
+    @pytest.mark.it("Resolves paths in IoTHub query syntax")
+    @pytest.mark.parametrize(
+        "path, expected",
+        [
+            ("tags.location.region", "US"),
+            ("properties.reported.firmware", "1.0"),
+            ("connectionState", "Connected"),
+            ("deviceId", "d0"),
+            ("tags.location.missing", None),
+            ("properties.unknown.firmware", None),
+        ],
+    )
+    def test_get(self, path, expected):
+        assert TwinRecord(make_twin("d0")).get(path) == expected
+
+
+@pytest.mark.describe("TwinIndex - .load()")
+class TestTwinIndexLoad(object):
+    @pytest.mark.it("Loads every twin with a full query")
+    def test_load(self, registry_manager, index):
+        assert len(index) == 3
+        assert "d1" in index
+        assert index.get("d1").get("tags.location.region") == "EU"
+        assert registry_manager.query_iter.call_args[0][0] == "SELECT * FROM devices"
+
+    @pytest.mark.it("Sets the watermark to the latest timestamp seen")
+    def test_watermark(self, index):
+        assert index.watermark.isoformat().startswith("2020-01-02T00:00:00")
+
+
+@pytest.mark.describe("TwinIndex - .find()")
+class TestTwinIndexFind(object):
+    @pytest.mark.it("Finds twins by indexed paths")
+    def test_indexed(self, index):
+        assert sorted(r.device_id for r in index.find({"tags.location.region": "US"})) == [
+            "d0",
+            "d2",
+        ]
+        assert [
+            r.device_id
+            for r in index.find(
+                {"tags.location.region": "US", "properties.reported.firmware": "2.0"}
+            )
+        ] == ["d2"]
+
+    @pytest.mark.it("Finds twins by unindexed paths and predicates")
+    def test_unindexed(self, index):
+        assert len(index.find({"status": "enabled"})) == 3
+        assert [r.device_id for r in index.find(predicate=lambda r: r.device_id == "d1")] == ["d1"]
+
+    @pytest.mark.it("Returns nothing for values that are not present")
+    def test_no_match(self, index):
+        assert index.find({"tags.location.region": "APAC"}) == []
+
+
+@pytest.mark.describe("TwinIndex - .refresh()")
+class TestTwinIndexRefresh(object):
+    @pytest.mark.it("Queries only twins changed since the watermark and reindexes them")
+    def test_refresh(self, registry_manager, index):
+        registry_manager.query_iter.return_value = [
+            make_twin("d0", version=2, region="EU", last_updated="2020-01-03T00:00:00Z")
+        ]
+
+        assert index.refresh() == 1
+
+        query = registry_manager.query_iter.call_args[0][0]
+        assert "lastActivityTime >= '2020-01-02T00:00:00" in query
+        assert sorted(r.device_id for r in index.find({"tags.location.region": "EU"})) == [
+            "d0",
+            "d1",
+        ]
+        assert [r.device_id for r in index.find({"tags.location.region": "US"})] == ["d2"]
+        assert index.watermark.isoformat().startswith("2020-01-03")
+
+    @pytest.mark.it("Does not reindex twins whose version has not changed")
+    def test_unchanged(self, registry_manager, index):
+        registry_manager.query_iter.return_value = [
+            make_twin("d1", region="EU", last_updated="2020-01-02T00:00:00Z")
+        ]
+        assert index.refresh() == 0
+
+    @pytest.mark.it("Performs a full load if the index has not been loaded")
+    def test_not_loaded(self, registry_manager):
+        registry_manager.query_iter.return_value = [make_twin("d0")]
+        index = TwinIndex(registry_manager)
+        assert index.refresh() == 1
+        assert registry_manager.query_iter.call_args[0][0] == "SELECT * FROM devices"
+
+
+@pytest.mark.describe("TwinIndex - .reconcile()")
+class TestTwinIndexReconcile(object):
+    @pytest.mark.it("Re-reads twins whose version changed and removes deleted devices")
+    def test_reconcile(self, registry_manager, index):
+        def query_iter(query, page_size):
+            if query == twin_index.VERSION_QUERY:
+                return [Twin(device_id="d0", version=1), Twin(device_id="d2", version=5)]
+            return [make_twin("d2", version=5, region="EU", firmware="2.0")]
+
+        registry_manager.query_iter.side_effect = query_iter
+
+        assert index.reconcile() == (1, 1)
+
+        assert "d1" not in index
+        assert index.get("d2").version == 5
+        assert index.find({"tags.location.region": "US"})[0].device_id == "d0"
+        assert registry_manager.query_iter.call_args[0][0] == (
+            "SELECT * FROM devices WHERE deviceId IN ['d2']"
+        )
+
+    @pytest.mark.it("Escapes quotes in the device ids of the twins it re-reads")
+    def test_escapes_device_ids(self, registry_manager, index):
+        def query_iter(query, page_size):
+            if query == twin_index.VERSION_QUERY:
+                return [Twin(device_id="d0", version=1), Twin(device_id="d'3", version=1)]
+            return [make_twin("d'3")]
+
+        registry_manager.query_iter.side_effect = query_iter
+
+        index.reconcile()
+
+        assert "d'3" in index
+        assert registry_manager.query_iter.call_args[0][0] == (
+            "SELECT * FROM devices WHERE deviceId IN ['d''3']"
+        )